@@ -172,6 +172,7 @@ def mock_cache_manager(monkeypatch):
     # keeping version bumps and @rcached reads on the same instance.
     from rating_app.ioc_container.services import (
         comment_cache_invalidator,
+        course_vote_counts_cache_invalidator,
         rating_cache_invalidator,
         rating_vote_cache_invalidator,
     )
@@ -179,6 +180,9 @@ def mock_cache_manager(monkeypatch):
     monkeypatch.setattr(comment_cache_invalidator(), "cache_manager", cache)
     monkeypatch.setattr(rating_cache_invalidator(), "cache_manager", cache)
     monkeypatch.setattr(rating_vote_cache_invalidator(), "cache_manager", cache)
+    monkeypatch.setattr(course_vote_counts_cache_invalidator(), "cache_manager", cache)
+    # trailing bumps would otherwise fire from a timer thread into a later test
+    monkeypatch.setattr(course_vote_counts_cache_invalidator(), "schedule", lambda *_: None)
 
     yield cache
 
@@ -5,24 +5,56 @@ set -o pipefail # exit on pipe error
 set -o nounset # exit on unset variable
 set -m # enable job control
 
-gunicorn_process=""
+server_process=""
 
-# function to handle gunicorn shutdown
+# "wsgi" (default) runs the gunicorn service for the API. "asgi" runs the uvicorn
+# service for the long-lived async endpoints (the notification event stream),
+# which nginx routes to it; it leaves migrations and static files to the former.
+SERVER_INTERFACE="${SERVER_INTERFACE:-wsgi}"
+
+# function to handle server shutdown
 shutdown() {
-    echo "Shutting down gunicorn gracefully..."
+    echo "Shutting down $SERVER_INTERFACE server gracefully..."
 
-    if [[ -n ${gunicorn_process:-} ]]; then
-        kill -SIGINT "$gunicorn_process" 2>/dev/null || true
-        wait "$gunicorn_process" 2>/dev/null || true
+    if [[ -n ${server_process:-} ]]; then
+        kill -SIGINT "$server_process" 2>/dev/null || true
+        wait "$server_process" 2>/dev/null || true
     fi
 
-    echo "Gunicorn shutdown complete"
+    echo "Server shutdown complete"
     return 0
 }
 
 # trap SIGTERM and SIGINT
 trap shutdown SIGTERM SIGINT
 
+if [[ "$SERVER_INTERFACE" = "asgi" ]]; then
+    # each async worker parks any number of idle streams, so one per core is plenty
+    ASGI_WORKERS="${ASGI_WORKERS:-$(nproc)}"
+    UVICORN_ARGS=(
+        --host 0.0.0.0
+        --port 8001
+        --proxy-headers
+        # open streams would otherwise hold a shutdown until they time out;
+        # clients reconnect to another worker
+        --timeout-graceful-shutdown 10
+    )
+
+    if [[ "${DJANGO_SETTINGS_MODULE:-}" = "rateukma.settings.dev" ]]; then
+        echo "Development environment detected, hot reload enabled"
+        UVICORN_ARGS+=( --reload )
+    else
+        UVICORN_ARGS+=( --workers "$ASGI_WORKERS" )
+    fi
+
+    echo "Starting uvicorn (ASGI) with $ASGI_WORKERS workers"
+    uvicorn rateukma.asgi:application "${UVICORN_ARGS[@]}" &
+
+    server_process=$!
+    wait "$server_process"
+    exit 0
+fi
+
 # starting django project
 uv run python manage.py migrate --noinput
 mkdir -p "${STATIC_ROOT}"
@@ -79,5 +111,5 @@ fi
 gunicorn rateukma.wsgi:application "${GUNICORN_ARGS[@]}" &
 
 # keeping gunicorn process running
-gunicorn_process=$!
-wait "$gunicorn_process"
+server_process=$!
+wait "$server_process"
@@ -2,6 +2,10 @@
 ASGI config for rateukma project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Long-lived endpoints such as the notification event stream are async views that
+would each hold a sync WSGI worker for minutes, so they are routed only here:
+the handler resolves every request against rateukma.asgi_urls, while the WSGI
+entry point keeps ROOT_URLCONF, which does not include them.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -9,8 +13,24 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rateukma.settings.prod")
 
-application = get_asgi_application()
+ASGI_URLCONF = "rateukma.asgi_urls"
+
+
+class ASGIURLConfHandler(ASGIHandler):
+    urlconf = ASGI_URLCONF
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            # takes precedence over ROOT_URLCONF when Django resolves the request
+            request.urlconf = self.urlconf
+        return request, error_response
+
+
+django.setup(set_prefix=False)
+application = ASGIURLConfHandler()
@@ -0,0 +1,18 @@
+"""
+URL configuration of the ASGI entry point: everything the WSGI workers serve,
+plus the long-lived async endpoints that must not tie up a sync worker.
+"""
+
+from django.urls import path
+
+from rateukma.urls import urlpatterns as wsgi_urlpatterns
+from rating_app.ioc_container.web import notification_stream_view
+
+urlpatterns = [
+    path(
+        "api/v1/notifications/stream/",
+        notification_stream_view(),
+        name="notification-stream",
+    ),
+    *wsgi_urlpatterns,
+]
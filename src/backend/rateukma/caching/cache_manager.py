@@ -26,6 +26,10 @@ class ICacheManager(Protocol):
 
     def set(self, key: str, value: JSON_Serializable, ttl: int | None = None) -> bool: ...
 
+    def add(self, key: str, value: JSON_Serializable, ttl: int | None = None) -> bool:
+        """Sets the key only if it is absent; returns whether it was set."""
+        ...
+
     def invalidate(self, key: str) -> bool: ...
 
     def invalidate_pattern(self, pattern: str, skip_keys: list[str] | None = None) -> int: ...
@@ -40,7 +44,9 @@ class ICacheManager(Protocol):
 class RedisCacheClient(Protocol):
     def get(self, name: str) -> bytes | str | None: ...
 
-    def set(self, name: str, value: bytes) -> bool: ...
+    def set(
+        self, name: str, value: bytes, ex: int | None = None, nx: bool = False
+    ) -> bool | None: ...
 
     def setex(self, name: str, time: int, value: bytes) -> bool: ...
 
@@ -104,6 +110,19 @@ class RedisCacheManager(ICacheManager):
             self._handle_error("set", e)
             return False
 
+    def add(self, key: str, value: JSON_Serializable, ttl: int | None = None) -> bool:
+        cache_key = self._make_key(key)
+
+        serialized = self._serialize(value)
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        try:
+            ok = self.redis_client.set(cache_key, serialized, ex=ttl or None, nx=True)
+            return bool(ok)
+        except RedisError as e:
+            self._handle_error("add", e)
+            return False
+
     def invalidate(self, key: str) -> bool:
         cache_key = self._make_key(key)
         try:
@@ -241,6 +260,12 @@ class InMemoryCacheManager(ICacheManager):
         self._store[key] = value
         return True
 
+    def add(self, key: str, value: JSON_Serializable, ttl: int | None = None) -> bool:
+        if key in self._store:
+            return False
+        self._store[key] = value
+        return True
+
     def invalidate(self, key: str) -> bool:
         if key in self._store:
             del self._store[key]
@@ -7,6 +7,7 @@ FILTER_OPTIONS_PATTERN = "*get_filter_options*"
 COURSES_LIST_NAMESPACE = "courses:list"
 ANALYTICS_LIST_NAMESPACE = "analytics:list"
 FILTER_OPTIONS_NAMESPACE = "courses:filter-options"
+REFERENCE_DATA_NAMESPACE = "reference-data"
 
 
 def course_ratings_pattern(course_id: str) -> str:
@@ -39,3 +40,11 @@ def comment_replies_namespace(comment_id: str) -> str:
 
 def student_ratings_namespace(student_id: str) -> str:
     return f"ratings:student:{student_id}"
+
+
+def student_votes_namespace(student_id: str) -> str:
+    return f"votes:student:{student_id}"
+
+
+def student_enrollments_namespace(student_id: str) -> str:
+    return f"enrollments:student:{student_id}"
@@ -280,6 +280,13 @@ class TestRCachedComponents:
         cache_manager.bump_version("courses:list")
         mock_redis_client.expire.assert_called_with("test:version:courses:list", 60 * 60 * 24 * 30)
 
+    def test_add_sets_only_absent_keys(self, cache_manager, mock_redis_client):
+        mock_redis_client.set.side_effect = [True, None]
+
+        assert cache_manager.add("marker", 1, ttl=2) is True
+        assert cache_manager.add("marker", 1, ttl=2) is False
+        mock_redis_client.set.assert_called_with("test:marker", b"1", ex=2, nx=True)
+
 
 @pytest.mark.integration
 class TestInvalidatePatternSkipKeys:
@@ -1,6 +1,7 @@
 from .decorators import implements
 from .django import IModelSignalHandler
 from .generic import (
+    IBatchEventListener,
     ICloser,
     ICondition,
     IEventBus,
@@ -36,6 +37,7 @@ __all__ = [
     "IService",
     "IFactory",
     "IEventListener",
+    "IBatchEventListener",
     "IEventBus",
     "IModelSignalHandler",
 ]
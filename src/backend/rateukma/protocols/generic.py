@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Any, NewType, ParamSpec, Protocol, TypeVar, runtime_checkable
 
 _P = ParamSpec("_P")
@@ -112,6 +113,13 @@ class IEventListener(Protocol[_T_contra]):
     def on_event(self, event: _T_contra, *args: Any, **kwargs: Any) -> None: ...
 
 
+@runtime_checkable
+class IBatchEventListener(IEventListener[_T_contra], Protocol[_T_contra]):
+    """A listener that can handle a batch of events at once, e.g. to coalesce them."""
+
+    def on_events(self, events: Sequence[_T_contra], *args: Any, **kwargs: Any) -> None: ...
+
+
 @runtime_checkable
 class IEventBus(Protocol[_T]):
     def publish(self, event: _T, *args: Any, **kwargs: Any) -> None: ...
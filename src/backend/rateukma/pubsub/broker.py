@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Protocol
+
+import structlog
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from ..caching.cache_manager import CacheJsonDataEncoder, JSON_Serializable
+
+logger = structlog.get_logger(__name__)
+
+
+class ISubscription(Protocol):
+    """
+    A parked listener on one channel. Owned by a single event loop.
+    """
+
+    async def next_message(self, timeout: float) -> JSON_Serializable | None:
+        """
+        Waits up to `timeout` seconds for the next message; None when nothing arrived.
+        """
+        ...
+
+    async def close(self) -> None: ...
+
+
+class IMessageBroker(Protocol):
+    """
+    Fire-and-forget fan-out of JSON-serializable messages to channel subscribers.
+    Publishing is synchronous so it can be called from request and worker code;
+    subscribing is asynchronous so idle listeners only hold a parked coroutine.
+    """
+
+    def publish(self, channel: str, message: JSON_Serializable) -> None: ...
+
+    async def subscribe(self, channel: str) -> ISubscription: ...
+
+
+class RedisSubscription(ISubscription):
+    def __init__(self, client: AsyncRedis, pubsub: PubSub) -> None:
+        self._client = client
+        self._pubsub = pubsub
+
+    async def next_message(self, timeout: float) -> JSON_Serializable | None:
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self) -> None:
+        try:
+            await self._pubsub.aclose()
+        finally:
+            await self._client.aclose()
+
+
+class RedisMessageBroker(IMessageBroker):
+    def __init__(
+        self,
+        redis_client: Redis,
+        connection_kwargs: dict[str, Any],
+        key_prefix: str = "rateukma",
+        ignore_exceptions: bool = True,
+    ) -> None:
+        self.redis_client = redis_client
+        self.connection_kwargs = connection_kwargs
+        self.key_prefix = key_prefix
+        self.ignore_exceptions = ignore_exceptions
+
+    def publish(self, channel: str, message: JSON_Serializable) -> None:
+        try:
+            self.redis_client.publish(self._make_channel(channel), self._serialize(message))
+        except RedisError as e:
+            logger.error(f"Message publish failed: {str(e)}", channel=channel)
+            if not self.ignore_exceptions:
+                raise
+
+    async def subscribe(self, channel: str) -> ISubscription:
+        # one connection per subscriber: a pub/sub connection cannot be shared
+        # and must be created on the event loop that will read from it
+        client = AsyncRedis(**self.connection_kwargs)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._make_channel(channel))
+        return RedisSubscription(client, pubsub)
+
+    def _make_channel(self, channel: str) -> str:
+        return f"{self.key_prefix}:{channel}"
+
+    def _serialize(self, message: JSON_Serializable) -> bytes:
+        return json.dumps(message, cls=CacheJsonDataEncoder).encode("utf-8")
+
+
+class InMemorySubscription(ISubscription):
+    def __init__(self, broker: "InMemoryMessageBroker", channel: str) -> None:
+        self._broker = broker
+        self._channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[JSON_Serializable] = asyncio.Queue()
+
+    async def next_message(self, timeout: float) -> JSON_Serializable | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._broker.unsubscribe(self._channel, self)
+
+    def deliver(self, message: JSON_Serializable) -> None:
+        # publishers run on request threads, the queue belongs to the listener loop
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+
+class InMemoryMessageBroker(IMessageBroker):
+    """
+    In-process broker for testing and development.
+    Implements the same interface as RedisMessageBroker.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[InMemorySubscription]] = defaultdict(set)
+
+    def publish(self, channel: str, message: JSON_Serializable) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    async def subscribe(self, channel: str) -> ISubscription:
+        subscription = InMemorySubscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel: str, subscription: InMemorySubscription) -> None:
+        with self._lock:
+            self._subscriptions[channel].discard(subscription)
+            if not self._subscriptions[channel]:
+                del self._subscriptions[channel]
@@ -0,0 +1,31 @@
+from django.conf import settings
+
+from redis import Redis
+
+from ..ioc.decorators import once
+from .broker import IMessageBroker, InMemoryMessageBroker, RedisMessageBroker
+
+
+@once
+def message_broker() -> IMessageBroker:
+    if not settings.ENABLE_CACHE:
+        return InMemoryMessageBroker()
+
+    connection_kwargs = {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "db": settings.REDIS_DB,
+        "socket_connect_timeout": 5,
+    }
+    redis_client = Redis(
+        **connection_kwargs,
+        socket_timeout=5,
+        retry_on_timeout=True,
+    )
+
+    return RedisMessageBroker(
+        redis_client=redis_client,
+        connection_kwargs=connection_kwargs,
+        key_prefix="rateukma",
+        ignore_exceptions=True,  # a lost push only delays the next refresh
+    )
@@ -0,0 +1,62 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+from redis.exceptions import RedisError
+
+from rateukma.pubsub.broker import InMemoryMessageBroker, RedisMessageBroker
+
+
+def test_in_memory_broker_delivers_to_channel_subscribers_only():
+    broker = InMemoryMessageBroker()
+
+    async def scenario():
+        subscription = await broker.subscribe("user:1")
+        other = await broker.subscribe("user:2")
+        broker.publish("user:1", {"unread_count": 3})
+        received = await subscription.next_message(timeout=1)
+        idle = await other.next_message(timeout=0.01)
+        await subscription.close()
+        await other.close()
+        return received, idle
+
+    received, idle = asyncio.run(scenario())
+
+    assert received == {"unread_count": 3}
+    assert idle is None
+
+
+def test_in_memory_broker_forgets_closed_subscriptions():
+    broker = InMemoryMessageBroker()
+
+    async def scenario():
+        subscription = await broker.subscribe("user:1")
+        await subscription.close()
+
+    asyncio.run(scenario())
+    broker.publish("user:1", {"unread_count": 1})
+
+    assert broker._subscriptions == {}
+
+
+def test_redis_broker_publishes_json_on_prefixed_channel():
+    client = Mock()
+    broker = RedisMessageBroker(redis_client=client, connection_kwargs={}, key_prefix="test")
+
+    broker.publish("user:1", {"unread_count": 2})
+
+    channel, payload = client.publish.call_args.args
+    assert channel == "test:user:1"
+    assert json.loads(payload) == {"unread_count": 2}
+
+
+def test_redis_broker_swallows_publish_errors_when_configured():
+    client = Mock()
+    client.publish.side_effect = RedisError("down")
+
+    RedisMessageBroker(redis_client=client, connection_kwargs={}).publish("c", 1)
+    with pytest.raises(RedisError):
+        RedisMessageBroker(
+            redis_client=client, connection_kwargs={}, ignore_exceptions=False
+        ).publish("c", 1)
@@ -86,6 +86,7 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+# the ASGI entry point serves rateukma.asgi_urls, which adds the long-lived async views
 ROOT_URLCONF = "rateukma.urls"
 
 TEMPLATES = [
@@ -154,6 +155,28 @@ CACHES = {
     },
 }
 ENABLE_CACHE = True
+# how long a worker reuses its reference-data snapshot when caching is disabled
+REFERENCE_DATA_UNCACHED_TTL = config("REFERENCE_DATA_UNCACHED_TTL", default=5.0, cast=float)
+
+
+# Domain event outbox
+# When enabled, the slow event listeners (course aggregates, notifications) run in
+# the `run_outbox_worker` process instead of the request that raised the event
+
+DOMAIN_EVENTS_OUTBOX = config("DOMAIN_EVENTS_OUTBOX", default=False, cast=bool)
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=200, cast=int)
+OUTBOX_POLL_INTERVAL = config("OUTBOX_POLL_INTERVAL", default=1.0, cast=float)
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+# votes on a popular rating arrive in bursts; wait a moment to coalesce them
+OUTBOX_VOTE_SETTLE_SECONDS = config("OUTBOX_VOTE_SETTLE_SECONDS", default=2.0, cast=float)
+
+
+# Notification retention, enforced by the `purge_notifications` command
+# (0 disables the corresponding limit)
+
+NOTIFICATION_RETENTION_DAYS = config("NOTIFICATION_RETENTION_DAYS", default=180, cast=int)
+NOTIFICATION_MAX_PER_USER = config("NOTIFICATION_MAX_PER_USER", default=500, cast=int)
+NOTIFICATION_PURGE_BATCH_SIZE = config("NOTIFICATION_PURGE_BATCH_SIZE", default=1000, cast=int)
 
 
 # Use Redis for session storage to avoid DB writes on every request
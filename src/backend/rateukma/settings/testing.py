@@ -17,6 +17,8 @@ PASSWORD_HASHERS = [
 AUTH_PASSWORD_VALIDATORS = []
 DEBUG = False
 ENABLE_CACHE = False
+# tests change reference data between requests
+REFERENCE_DATA_UNCACHED_TTL = 0
 
 # Keep tests isolated from the local Redis: waffle caches flag lookups in the
 # default cache, so a real backend leaks state between tests and across runs
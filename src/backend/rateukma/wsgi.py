@@ -10,7 +10,21 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.db import connections
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rateukma.settings.prod")
 
 application = get_wsgi_application()
+
+
+def _warm_reference_data() -> None:
+    from rating_app.ioc_container.services import reference_data_cache
+
+    # under gunicorn --preload this runs once in the master and the forked
+    # workers inherit the snapshot instead of each loading their own
+    reference_data_cache().warm()
+    # a connection opened before the fork must not be shared between workers
+    connections.close_all()
+
+
+_warm_reference_data()
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+
+from rating_app.constants import MAX_RATING_VALUE, MIN_RATING_VALUE
+from rating_app.models.choices import SemesterTerm
+
+RATING_SCORES = tuple(range(MIN_RATING_VALUE, MAX_RATING_VALUE + 1))
+
+
+def empty_histogram() -> dict[int, int]:
+    return dict.fromkeys(RATING_SCORES, 0)
+
+
+@dataclass(frozen=True)
+class RatingRollupDelta:
+    """Change one rating event makes to a course's histograms for a semester.
+
+    ``difficulty`` and ``usefulness`` map a score to the change of its count.
+    """
+
+    year: int
+    term: SemesterTerm
+    ratings_count: int = 0
+    difficulty: dict[int, int] = field(default_factory=dict)
+    usefulness: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.ratings_count or any(self.difficulty.values()) or any(self.usefulness.values())
+        )
+
+
+@dataclass(frozen=True)
+class SemesterRatingStats:
+    year: int
+    term: SemesterTerm
+    ratings_count: int
+    difficulty: dict[int, int]
+    usefulness: dict[int, int]
+
+    @property
+    def avg_difficulty(self) -> float | None:
+        return _histogram_average(self.difficulty, self.ratings_count)
+
+    @property
+    def avg_usefulness(self) -> float | None:
+        return _histogram_average(self.usefulness, self.ratings_count)
+
+
+@dataclass(frozen=True)
+class CourseRatingDistribution:
+    """Score histograms of a course overall and per semester, oldest semester first."""
+
+    ratings_count: int
+    difficulty: dict[int, int]
+    usefulness: dict[int, int]
+    semesters: list[SemesterRatingStats]
+
+
+def _histogram_average(histogram: dict[int, int], count: int) -> float | None:
+    if count <= 0:
+        return None
+    return round(sum(score * n for score, n in histogram.items()) / count, 2)
@@ -165,6 +165,24 @@ class CommentDTO(BaseModel):
     created_at: datetime.datetime
 
     replies_count: int
+    reply_previews: list["CommentDTO"] = Field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CommentThreadNode:
+    """A comment of a loaded thread with its distance from the thread root."""
+
+    comment: CommentDTO
+    depth: int
+
+
+@dataclass(frozen=True)
+class CommentThreadKeys:
+    """Identifiers around a comment that its events hand to listeners."""
+
+    rating_author_user_id: int | None
+    parent_rating_id: uuid.UUID | None = None
+    parent_parent_id: uuid.UUID | None = None
 
 
 @dataclass(frozen=True)
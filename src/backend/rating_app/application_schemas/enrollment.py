@@ -1,6 +1,7 @@
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 
 from rating_app.models.choices import EnrollmentStatus
 
@@ -19,3 +20,28 @@ class Enrollment:
     offering_id: uuid.UUID
     status: EnrollmentStatus | str
     enrolled_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class StudentEligibility:
+    """
+    Offerings and courses a student is actively enrolled in. Ids are kept as
+    strings so the value caches as JSON; lookups go through sets built on first use.
+    """
+
+    offering_ids: tuple[str, ...] = ()
+    course_ids: tuple[str, ...] = ()
+
+    @cached_property
+    def _offering_id_set(self) -> frozenset[str]:
+        return frozenset(self.offering_ids)
+
+    @cached_property
+    def _course_id_set(self) -> frozenset[str]:
+        return frozenset(self.course_ids)
+
+    def is_enrolled(self, offering_id: uuid.UUID | str) -> bool:
+        return str(uuid.UUID(str(offering_id))) in self._offering_id_set
+
+    def is_enrolled_in_course(self, course_id: uuid.UUID | str) -> bool:
+        return str(uuid.UUID(str(course_id))) in self._course_id_set
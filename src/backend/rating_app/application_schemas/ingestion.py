@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class UpsertCounts:
+    """Distinct rows an upsert inserted, changed, or matched without changes."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def add(self, inserted: int = 0, updated: int = 0, unchanged: int = 0) -> None:
+        self.inserted += inserted
+        self.updated += updated
+        self.unchanged += unchanged
+
+
+@dataclass
+class ChangeCounts:
+    """Scraped records that are new, changed, or identical to what was last ingested."""
+
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: "ChangeCounts") -> "ChangeCounts":
+        return ChangeCounts(
+            new=self.new + other.new,
+            changed=self.changed + other.changed,
+            unchanged=self.unchanged + other.unchanged,
+        )
+
+
+@dataclass(frozen=True)
+class CheckpointPosition:
+    """Where a resumed ingestion run picks up: after this byte and batch number."""
+
+    byte_offset: int = 0
+    batch_number: int = 0
@@ -1,6 +1,6 @@
 import uuid
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.contrib.contenttypes.models import ContentType
 
@@ -26,3 +26,31 @@ class NotificationGroup:
     count: int
     latest_created_at: datetime
     is_unread: bool
+
+
+@dataclass(frozen=True)
+class NotificationFeedCursor:
+    latest_created_at: datetime
+    group_key: str
+
+
+@dataclass(frozen=True)
+class NotificationFeedPage:
+    items: list[NotificationGroup]
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class NotificationRetentionPolicy:
+    max_age: timedelta | None = None
+    max_per_user: int | None = None
+
+
+@dataclass(frozen=True)
+class NotificationPurgeResult:
+    expired: int = 0
+    over_cap: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.expired + self.over_cap
@@ -0,0 +1,20 @@
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from rating_app.models.choices import OutboxTopic
+
+
+@dataclass(frozen=True)
+class PendingOutboxMessage:
+    id: uuid.UUID
+    topic: OutboxTopic
+    payload: dict[str, Any]
+    attempts: int
+
+
+@dataclass(frozen=True)
+class OutboxDrainResult:
+    claimed: int = 0
+    delivered: int = 0
+    failed: int = 0
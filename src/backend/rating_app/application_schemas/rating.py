@@ -20,6 +20,7 @@ from rating_app.constants import (
 from rating_app.models.choices import RatingVoteStrType, SemesterTerm
 
 from .pagination import PaginationMetadata
+from .semester import SemesterInput
 
 RatingValue = Annotated[int, Field(ge=MIN_RATING_VALUE, le=MAX_RATING_VALUE)]
 
@@ -277,3 +278,28 @@ class AggregatedCourseRatingStats:
     avg_difficulty: Decimal
     avg_usefulness: Decimal
     ratings_count: int
+    difficulty_sum: int = 0
+    usefulness_sum: int = 0
+
+
+@dataclass(frozen=True)
+class CourseRatingAggregatesDelta:
+    ratings_count: int = 0
+    difficulty_sum: int = 0
+    usefulness_sum: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.ratings_count or self.difficulty_sum or self.usefulness_sum)
+
+
+@dataclass(frozen=True)
+class RatingEligibility:
+    """What creating a rating needs to know about an enrolled student and offering."""
+
+    student_id: uuid.UUID
+    student_name: str
+    student_avatar_url: str | None
+    course_offering_id: uuid.UUID
+    course_id: uuid.UUID
+    semester: SemesterInput
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from pydantic import BaseModel, Field
 
 from ..models.choices import RatingVoteStrType, RatingVoteType
+from .semester import SemesterInput
 
 
 @dataclass(frozen=True)
@@ -14,6 +15,17 @@ class RatingVote:
     vote_type: RatingVoteType | int
 
 
+@dataclass(frozen=True)
+class RatingVoteTarget:
+    """The keys of a rating that voting on it needs, without the rating itself."""
+
+    rating_id: uuid.UUID
+    course_id: uuid.UUID
+    semester: SemesterInput
+    author_student_id: uuid.UUID | None
+    author_user_id: int | None
+
+
 class RatingVoteCreateSchema(BaseModel):
     rating_id: str = Field(description="The unique identifier of the rating")
     student_id: str = Field(description="The unique identifier of the student")
@@ -0,0 +1,85 @@
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from rating_app.application_schemas.department import Department
+from rating_app.application_schemas.faculty import Faculty
+from rating_app.application_schemas.semester import Semester
+from rating_app.application_schemas.speciality import Speciality
+from rating_app.models.choices import SemesterTerm
+
+
+@dataclass(frozen=True)
+class ReferenceDataSnapshot:
+    """
+    Immutable view of the reference entities that only change during ingestion,
+    indexed for dict lookups. Readers hold on to one snapshot; refreshes swap it whole.
+    """
+
+    version: int
+    semesters: tuple[Semester, ...]
+    faculties: tuple[Faculty, ...]
+    departments: tuple[Department, ...]
+    specialities: tuple[Speciality, ...]
+    semesters_by_id: Mapping[uuid.UUID, Semester]
+    semesters_by_year_and_term: Mapping[tuple[int, str], Semester]
+    faculties_by_id: Mapping[uuid.UUID, Faculty]
+    faculties_by_name: Mapping[str, Faculty]
+    departments_by_id: Mapping[uuid.UUID, Department]
+    specialities_by_id: Mapping[uuid.UUID, Speciality]
+    specialities_by_name: Mapping[str, Speciality]
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        semesters: Sequence[Semester],
+        faculties: Sequence[Faculty],
+        departments: Sequence[Department],
+        specialities: Sequence[Speciality],
+    ) -> "ReferenceDataSnapshot":
+        return cls(
+            version=version,
+            semesters=tuple(semesters),
+            faculties=tuple(faculties),
+            departments=tuple(departments),
+            specialities=tuple(specialities),
+            semesters_by_id=MappingProxyType({s.id: s for s in semesters}),
+            semesters_by_year_and_term=MappingProxyType(
+                {(s.year, str(s.term)): s for s in semesters}
+            ),
+            faculties_by_id=MappingProxyType({f.id: f for f in faculties}),
+            faculties_by_name=MappingProxyType({f.name: f for f in faculties}),
+            departments_by_id=MappingProxyType({d.id: d for d in departments}),
+            specialities_by_id=MappingProxyType({s.id: s for s in specialities}),
+            specialities_by_name=MappingProxyType({s.name: s for s in specialities}),
+        )
+
+    def get_semester(self, semester_id: uuid.UUID | str) -> Semester | None:
+        key = _as_uuid(semester_id)
+        return self.semesters_by_id.get(key) if key else None
+
+    def get_semester_by_year_and_term(self, year: int, term: SemesterTerm | str) -> Semester | None:
+        return self.semesters_by_year_and_term.get((year, str(term)))
+
+    def get_faculty(self, faculty_id: uuid.UUID | str) -> Faculty | None:
+        key = _as_uuid(faculty_id)
+        return self.faculties_by_id.get(key) if key else None
+
+    def get_department(self, department_id: uuid.UUID | str) -> Department | None:
+        key = _as_uuid(department_id)
+        return self.departments_by_id.get(key) if key else None
+
+    def get_speciality(self, speciality_id: uuid.UUID | str) -> Speciality | None:
+        key = _as_uuid(speciality_id)
+        return self.specialities_by_id.get(key) if key else None
+
+
+def _as_uuid(value: uuid.UUID | str) -> uuid.UUID | None:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
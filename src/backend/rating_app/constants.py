@@ -21,6 +21,23 @@ MIN_RATING_VALUE = 1
 MAX_RATING_VALUE = 5
 
 COMMENT_AUTHOR_PREVIEW_LIMIT = 3
+COMMENT_REPLY_PREVIEW_LIMIT = 3
+
+# ENROLLMENTS
+ENROLLMENT_ELIGIBILITY_CACHE_TTL = 3600  # seconds; ingestion bumps the student's namespace anyway
+
+# INGESTION
+INGESTION_BULK_WRITE_BATCH_SIZE = 1000  # rows per statement, keeps bind parameters well below 65535
+
+# REFERENCE DATA
+REFERENCE_DATA_VERSION_CHECK_SECONDS = 5  # how stale a worker's snapshot may get after ingestion
+
+# VOTES
+COURSE_VOTE_COUNTS_DEBOUNCE_SECONDS = 2  # a burst of votes on a course costs two version bumps
+
+# NOTIFICATIONS
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = 25  # below common proxy idle timeouts
+NOTIFICATION_STREAM_MAX_SECONDS = 300  # clients reconnect, so workers get recycled
 
 # ORDERING
 AVG_ORDER_CHOICES = ["asc", "desc"]
@@ -1,6 +1,11 @@
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
 
 
 class NotificationCursorNotFoundError(NotFound):
     default_detail = "Notification cursor not found for this user"
     default_code = "notification_cursor_not_found"
+
+
+class InvalidNotificationFeedCursorError(ValidationError):
+    default_detail = "Invalid notification feed cursor"
+    default_code = "invalid_notification_feed_cursor"
@@ -8,6 +8,12 @@ class VoteAlreadyExistsException(APIException):
     status_code = status.HTTP_409_CONFLICT
 
 
+class VoteConflictException(APIException):
+    default_detail = "The vote changed while it was being saved; please try again"
+    default_code = "vote_conflict"
+    status_code = status.HTTP_409_CONFLICT
+
+
 class VoteOnUnenrolledCourseException(APIException):
     default_detail = "You cannot vote on a rating for a course you are not enrolled in"
     default_code = "unenrolled_course_vote"
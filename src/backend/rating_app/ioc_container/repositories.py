@@ -27,11 +27,15 @@ from ..repositories import (
     CourseInstructorRepository,
     CourseMapper,
     CourseOfferingRepository,
+    CourseRatingRollupRepository,
     CourseRepository,
     DepartmentRepository,
     EnrollmentRepository,
     FacultyRepository,
+    IngestionCheckpointRepository,
+    IngestionFingerprintRepository,
     InstructorRepository,
+    OutboxRepository,
     PromoBannerRepository,
     RatingMapper,
     RatingRepository,
@@ -131,6 +135,11 @@ def course_repository() -> CourseRepository:
     return CourseRepository(mapper=course_mapper(), paginator=paginator)
 
 
+@once
+def course_rating_rollup_repository() -> CourseRatingRollupRepository:
+    return CourseRatingRollupRepository()
+
+
 @once
 def department_repository() -> DepartmentRepository:
     return DepartmentRepository(mapper=department_mapper())
@@ -221,3 +230,18 @@ def notification_repository() -> NotificationRepository:
 @once
 def notification_cursor_repository() -> NotificationCursorRepository:
     return NotificationCursorRepository()
+
+
+@once
+def outbox_repository() -> OutboxRepository:
+    return OutboxRepository()
+
+
+@once
+def ingestion_fingerprint_repository() -> IngestionFingerprintRepository:
+    return IngestionFingerprintRepository()
+
+
+@once
+def ingestion_checkpoint_repository() -> IngestionCheckpointRepository:
+    return IngestionCheckpointRepository()
@@ -1,8 +1,16 @@
+from datetime import timedelta
+from typing import TypeVar
+
+from django.conf import settings
+
 from rateukma.caching.instances import redis_cache_manager
 from rateukma.ioc.decorators import once
+from rateukma.protocols.generic import IEventListener, IObservable
+from rateukma.pubsub.instances import message_broker
 from rating_app.ioc_container.repositories import (
     comment_repository,
     course_offering_repository,
+    course_rating_rollup_repository,
     course_repository,
     department_repository,
     enrollment_repository,
@@ -11,6 +19,7 @@ from rating_app.ioc_container.repositories import (
     instructor_repository,
     notification_cursor_repository,
     notification_repository,
+    outbox_repository,
     promo_banner_repository,
     rating_repository,
     rating_vote_mapper,
@@ -21,6 +30,7 @@ from rating_app.ioc_container.repositories import (
     user_repository,
     vote_repository,
 )
+from rating_app.models.choices import OutboxTopic
 from rating_app.pagination.paginator import GenericQuerysetPaginator
 from rating_app.services import (
     CommentNormalizer,
@@ -28,6 +38,7 @@ from rating_app.services import (
     CourseOfferingService,
     CourseService,
     DepartmentService,
+    EnrollmentService,
     FacultyService,
     InstructorService,
     PromoBannerService,
@@ -37,12 +48,15 @@ from rating_app.services import (
     SpecialityService,
     StudentService,
 )
+from rating_app.services.comment_events import CommentEvent
 from rating_app.services.course_page_service import CoursePageService
 from rating_app.services.domain_event_listeners.aggregates_update import (
     CourseModelAggregatesUpdateObserver,
+    CourseRatingRollupUpdateObserver,
 )
 from rating_app.services.domain_event_listeners.cache_invalidator import (
     CommentCacheInvalidator,
+    CourseVoteCountsCacheInvalidator,
     RatingCacheInvalidator,
     RatingVoteCacheInvalidator,
 )
@@ -53,32 +67,65 @@ from rating_app.services.domain_event_listeners.vote_notification import (
     VoteNotificationObserver,
 )
 from rating_app.services.notification_service import NotificationService
+from rating_app.services.notification_updates import NotificationUpdatesChannel
+from rating_app.services.outbox import OutboxDispatcher, OutboxWriter
+from rating_app.services.rating_events import RatingEvent
+from rating_app.services.reference_data import ReferenceDataCache
+from rating_app.services.vote_events import RatingVoteEvent
+
+_E = TypeVar("_E")
+
+
+@once
+def reference_data_cache() -> ReferenceDataCache:
+    return ReferenceDataCache(
+        semester_repository=semester_repository(),
+        faculty_repository=faculty_repository(),
+        department_repository=department_repository(),
+        speciality_repository=speciality_repository(),
+        cache_manager=redis_cache_manager(),
+        enabled=settings.ENABLE_CACHE,
+        uncached_ttl=settings.REFERENCE_DATA_UNCACHED_TTL,
+    )
 
 
 @once
 def faculty_service() -> FacultyService:
-    return FacultyService(faculty_repository=faculty_repository())
+    return FacultyService(
+        faculty_repository=faculty_repository(),
+        reference_data=reference_data_cache(),
+    )
 
 
 @once
 def department_service() -> DepartmentService:
-    return DepartmentService(department_repository=department_repository())
+    return DepartmentService(
+        department_repository=department_repository(),
+        reference_data=reference_data_cache(),
+    )
 
 
 @once
 def speciality_service() -> SpecialityService:
-    return SpecialityService(speciality_repository=speciality_repository())
+    return SpecialityService(
+        speciality_repository=speciality_repository(),
+        reference_data=reference_data_cache(),
+    )
 
 
 @once
 def semester_service() -> SemesterService:
-    return SemesterService(semester_repository=semester_repository())
+    return SemesterService(
+        semester_repository=semester_repository(),
+        reference_data=reference_data_cache(),
+    )
 
 
 @once
 def course_service() -> CourseService:
     return CourseService(
         course_repository=course_repository(),
+        rating_rollup_repository=course_rating_rollup_repository(),
         instructor_service=instructor_service(),
         faculty_service=faculty_service(),
         department_service=department_service(),
@@ -101,8 +148,6 @@ def course_page_service() -> CoursePageService:
 def rating_service() -> RatingService:
     return RatingService(
         rating_repository=rating_repository(),
-        enrollment_repository=enrollment_repository(),
-        course_offering_service=course_offering_service(),
         semester_service=semester_service(),
         vote_repository=vote_repository(),
         vote_mapper=rating_vote_mapper(),
@@ -121,10 +166,12 @@ def comment_service() -> CommentService:
 
 @once
 def course_model_aggregates_update_observer() -> CourseModelAggregatesUpdateObserver:
-    return CourseModelAggregatesUpdateObserver(
-        course_service=course_service(),
-        rating_service=rating_service(),
-    )
+    return CourseModelAggregatesUpdateObserver(course_service=course_service())
+
+
+@once
+def course_rating_rollup_update_observer() -> CourseRatingRollupUpdateObserver:
+    return CourseRatingRollupUpdateObserver(course_service=course_service())
 
 
 @once
@@ -154,9 +201,15 @@ def student_service() -> StudentService:
         semester_service=semester_service(),
         user_repository=user_repository(),
         rating_service=rating_service(),
+        enrollment_service=enrollment_service(),
     )
 
 
+@once
+def enrollment_service() -> EnrollmentService:
+    return EnrollmentService(enrollment_repository=enrollment_repository())
+
+
 @once
 def course_offering_service() -> CourseOfferingService:
     return CourseOfferingService(course_offering_repository=course_offering_repository())
@@ -166,10 +219,9 @@ def course_offering_service() -> CourseOfferingService:
 def vote_service() -> RatingFeedbackService:
     return RatingFeedbackService(
         vote_repository=vote_repository(),
-        enrollment_repository=enrollment_repository(),
+        enrollment_service=enrollment_service(),
         rating_repository=rating_repository(),
         rating_service=rating_service(),
-        course_offering_service=course_offering_service(),
         semester_service=semester_service(),
         vote_mapper=rating_vote_mapper(),
     )
@@ -177,10 +229,12 @@ def vote_service() -> RatingFeedbackService:
 
 @once
 def rating_vote_cache_invalidator() -> RatingVoteCacheInvalidator:
-    return RatingVoteCacheInvalidator(
-        cache_manager=redis_cache_manager(),
-        rating_repository=rating_repository(),
-    )
+    return RatingVoteCacheInvalidator(cache_manager=redis_cache_manager())
+
+
+@once
+def course_vote_counts_cache_invalidator() -> CourseVoteCountsCacheInvalidator:
+    return CourseVoteCountsCacheInvalidator(cache_manager=redis_cache_manager())
 
 
 @once
@@ -188,11 +242,17 @@ def comment_cache_invalidator() -> CommentCacheInvalidator:
     return CommentCacheInvalidator(cache_manager=redis_cache_manager())
 
 
+@once
+def notification_updates_channel() -> NotificationUpdatesChannel:
+    return NotificationUpdatesChannel(broker=message_broker())
+
+
 @once
 def notification_service() -> NotificationService:
     return NotificationService(
         notification_repository=notification_repository(),
         cursor_repository=notification_cursor_repository(),
+        updates_channel=notification_updates_channel(),
     )
 
 
@@ -200,27 +260,66 @@ def notification_service() -> NotificationService:
 def vote_notification_observer() -> VoteNotificationObserver:
     return VoteNotificationObserver(
         notification_service=notification_service(),
-        rating_repository=rating_repository(),
         student_repository=student_repository(),
     )
 
 
 @once
 def comment_notification_observer() -> CommentNotificationObserver:
-    return CommentNotificationObserver(
-        notification_service=notification_service(),
-        rating_repository=rating_repository(),
-        student_repository=student_repository(),
+    return CommentNotificationObserver(notification_service=notification_service())
+
+
+@once
+def outbox_dispatcher() -> OutboxDispatcher:
+    return OutboxDispatcher(
+        outbox_repository=outbox_repository(),
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        settle_windows={
+            OutboxTopic.RATING_VOTE: timedelta(seconds=settings.OUTBOX_VOTE_SETTLE_SECONDS),
+        },
     )
 
 
+def _add_deferred_observers(
+    observable: IObservable[_E],
+    topic: OutboxTopic,
+    event_type: type[_E],
+    listeners: list[IEventListener[_E]],
+) -> None:
+    if not settings.DOMAIN_EVENTS_OUTBOX:
+        for listener in listeners:
+            observable.add_observer(listener)
+        return
+
+    observable.add_observer(OutboxWriter(outbox_repository(), topic, event_type))
+    for listener in listeners:
+        outbox_dispatcher().subscribe(topic, event_type, listener)
+
+
 def register_observers() -> None:
-    rating_service().add_observer(course_model_aggregates_update_observer())
+    _add_deferred_observers(
+        rating_service(),
+        OutboxTopic.RATING,
+        RatingEvent,
+        [course_model_aggregates_update_observer(), course_rating_rollup_update_observer()],
+    )
+    _add_deferred_observers(
+        comment_service(),
+        OutboxTopic.COMMENT,
+        CommentEvent,
+        [comment_notification_observer()],
+    )
+    _add_deferred_observers(
+        vote_service(),
+        OutboxTopic.RATING_VOTE,
+        RatingVoteEvent,
+        [course_vote_counts_cache_invalidator(), vote_notification_observer()],
+    )
+
+    # cache invalidation stays in the request so writers read their own writes
     rating_service().add_observer(rating_cache_invalidator())
     comment_service().add_observer(comment_cache_invalidator())
-    comment_service().add_observer(comment_notification_observer())
     vote_service().add_observer(rating_vote_cache_invalidator())
-    vote_service().add_observer(vote_notification_observer())
 
 
 __all__ = [
@@ -232,6 +331,10 @@ __all__ = [
     "faculty_service",
     "department_service",
     "speciality_service",
+    "enrollment_service",
+    "reference_data_cache",
     "vote_service",
     "notification_service",
+    "notification_updates_channel",
+    "outbox_dispatcher",
 ]
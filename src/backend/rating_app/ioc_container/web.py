@@ -20,6 +20,7 @@ from ..views import (
 )
 from ..views.auth import csrf_token, login, logout, microsoft_login, session
 from ..views.course_page_view import CoursePageView
+from ..views.notification_stream_view import NotificationStreamView
 from .services import (
     comment_service,
     course_offering_service,
@@ -27,6 +28,7 @@ from .services import (
     course_service,
     instructor_service,
     notification_service,
+    notification_updates_channel,
     promo_banner_service,
     rating_service,
     student_service,
@@ -200,6 +202,22 @@ def notification_list_view():
     )
 
 
+@once
+def notification_feed_view():
+    return NotificationViewSet.as_view(
+        {"get": "feed"},
+        notification_service=notification_service(),
+    )
+
+
+@once
+def notification_stream_view():
+    return NotificationStreamView.as_view(
+        notification_service=notification_service(),
+        updates_channel=notification_updates_channel(),
+    )
+
+
 @once
 def notification_unread_count_view():
     return NotificationViewSet.as_view(
@@ -360,6 +378,11 @@ def rest_urlpatterns() -> list:
             notification_list_view(),
             name="notification-list",
         ),
+        path(
+            "notifications/feed/",
+            notification_feed_view(),
+            name="notification-feed",
+        ),
         path(
             "notifications/unread-count/",
             notification_unread_count_view(),
@@ -1,11 +1,14 @@
 import csv
 import unicodedata
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import batched
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 import structlog
 
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
 from rating_app.models import Instructor
 
 logger = structlog.get_logger(__name__)
@@ -14,6 +17,7 @@ logger = structlog.get_logger(__name__)
 _REQUIRED_COLUMNS = ("displayName", "userPrincipalName", "userType")
 _INTERNAL_DOMAIN_SUFFIX = "@ukma.edu.ua"
 _EXTERNAL_MARKER = "#ext#"
+_WRITE_CHUNK_SIZE = INGESTION_BULK_WRITE_BATCH_SIZE
 
 _SERVICE_WORDS = frozenset(
     {
@@ -339,44 +343,55 @@ class Command(BaseCommand):
         dry_run: bool = options["dry_run"]
         refresh_names: bool = options["refresh_names"]
 
-        rows = self._load_rows(csv_path)
-        logger.info("instructors_csv_loaded", path=csv_path, row_count=len(rows))
+        counters = {
+            "loaded": 0,
+            "dropped_non_internal": 0,
+            "dropped_service_display": 0,
+            "dropped_service_upn": 0,
+            "kept": 0,
+        }
+        results = {"created": 0, "updated": 0, "kept_as_is": 0}
+        # the one read of existing instructors; new emails are added as the run goes
+        existing = self._existing_emails()
+
+        candidates = self._filter_rows(self._iter_rows(csv_path), counters)
+        for chunk in batched(candidates, _WRITE_CHUNK_SIZE):
+            self._upsert_chunk(chunk, existing, results, dry_run, refresh_names)
 
-        candidates, counters = self._filter_rows(rows)
+        logger.info("instructors_csv_loaded", path=csv_path, row_count=counters["loaded"])
         logger.info(
             "instructors_filtered",
-            **counters,
-            kept=len(candidates),
+            dropped_non_internal=counters["dropped_non_internal"],
+            dropped_service_display=counters["dropped_service_display"],
+            dropped_service_upn=counters["dropped_service_upn"],
+            kept=counters["kept"],
         )
         self.stdout.write(
-            f"  Loaded: {len(rows)}\n"
+            f"  Loaded: {counters['loaded']}\n"
             f"  Dropped non-internal: {counters['dropped_non_internal']}\n"
             f"  Dropped service display: {counters['dropped_service_display']}\n"
             f"  Dropped service UPN: {counters['dropped_service_upn']}\n"
-            f"  Candidates: {len(candidates)}\n"
+            f"  Candidates: {counters['kept']}\n"
         )
 
-        created, updated, kept_as_is = self._upsert(candidates, dry_run, refresh_names)
         logger.info(
             "instructors_ingest_complete",
-            created=created,
-            updated=updated,
-            kept_as_is=kept_as_is,
+            **results,
             refresh_names=refresh_names,
             dry_run=dry_run,
         )
 
+        summary = (
+            f"created={results['created']} updated={results['updated']} "
+            f"kept_as_is={results['kept_as_is']}"
+        )
         if dry_run:
-            self.stdout.write(self.style.WARNING("Dry run — no changes made."))
+            self.stdout.write(self.style.WARNING(f"Dry run — no changes made. Would be {summary}"))
             transaction.set_rollback(True)
         else:
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Done. created={created} updated={updated} kept_as_is={kept_as_is}"
-                )
-            )
+            self.stdout.write(self.style.SUCCESS(f"Done. {summary}"))
 
-    def _load_rows(self, path: str) -> list[dict[str, str]]:
+    def _iter_rows(self, path: str) -> Iterator[dict[str, str]]:
         try:
             handle = _open_csv(path)
         except FileNotFoundError as exc:
@@ -389,19 +404,15 @@ class Command(BaseCommand):
             missing = [c for c in _REQUIRED_COLUMNS if c not in reader.fieldnames]
             if missing:
                 raise CommandError(f"CSV missing required columns: {', '.join(missing)}")
-            return list(reader)
+            yield from reader
 
     def _filter_rows(
         self,
-        rows: list[dict[str, str]],
-    ) -> tuple[list[dict[str, str]], dict[str, int]]:
-        counters = {
-            "dropped_non_internal": 0,
-            "dropped_service_display": 0,
-            "dropped_service_upn": 0,
-        }
-        kept: list[dict[str, str]] = []
+        rows: Iterable[dict[str, str]],
+        counters: dict[str, int],
+    ) -> Iterator[dict[str, str]]:
         for row in rows:
+            counters["loaded"] += 1
             if not _is_internal(row):
                 counters["dropped_non_internal"] += 1
                 continue
@@ -417,33 +428,49 @@ class Command(BaseCommand):
             # Students share the @ukma.edu.ua domain and cannot be told apart
             # from teaching staff in the export, so they are intentionally kept;
             # the ranked instructor list surfaces actually-rated teachers first.
-            kept.append(row)
-        return kept, counters
+            counters["kept"] += 1
+            yield row
 
-    def _upsert(
+    def _existing_emails(self) -> dict[str, str]:
+        """Stored email by its lowercased form, so older mixed-case rows still match."""
+        return {
+            email.lower(): email for email in Instructor.objects.values_list("email", flat=True)
+        }
+
+    def _upsert_chunk(
         self,
-        candidates: list[dict[str, str]],
+        chunk: Sequence[dict[str, str]],
+        existing: dict[str, str],
+        results: dict[str, int],
         dry_run: bool,
         refresh_names: bool,
-    ) -> tuple[int, int, int]:
+    ) -> None:
         """Add people; leave the ones already here alone, so hand fixes survive."""
-        created = 0
-        updated = 0
-        kept_as_is = 0
-        for row in candidates:
+        instructors: dict[str, Instructor] = {}
+        for row in chunk:
             email = (row["userPrincipalName"] or "").lower()
             names = _names_from_row(row, email)
             if names is None:
                 continue
 
-            if not Instructor.objects.filter(email=email).exists():
-                created += 1
+            stored_email = existing.get(email)
+            if stored_email is None:
+                results["created"] += 1
+                stored_email = existing[email] = email
             elif refresh_names:
-                updated += 1
+                results["updated"] += 1
             else:
-                kept_as_is += 1
+                results["kept_as_is"] += 1
                 continue
 
-            if not dry_run:
-                Instructor.objects.update_or_create(email=email, defaults=names)
-        return created, updated, kept_as_is
+            # with --refresh-names a repeated email keeps its last names, as row updates would
+            instructors[stored_email] = Instructor(email=stored_email, **names)
+
+        if dry_run or not instructors:
+            return
+        Instructor.objects.bulk_create(
+            list(instructors.values()),
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=["first_name", "last_name", "patronymic"],
+        )
@@ -10,6 +10,7 @@ from unittest.mock import patch
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import connection
+from django.db.models import Count
 from django.test.utils import CaptureQueriesContext
 
 from rateukma.caching.cache_manager import InMemoryCacheManager
@@ -21,7 +22,7 @@ from rating_app.ioc_container.repositories import (
     rating_repository,
 )
 from rating_app.ioc_container.services import course_service, rating_service
-from rating_app.models import Course, CourseOfferingSpeciality, Rating, Student
+from rating_app.models import Comment, Course, CourseOfferingSpeciality, Rating, Student
 from rating_app.models.choices import SemesterTerm
 
 
@@ -174,6 +175,22 @@ class Command(BaseCommand):
                 )
             )
 
+        busiest_rating_id = self._get_busiest_rating_id()
+        if busiest_rating_id is not None:
+            scenarios.append(
+                Scenario(
+                    name="rating_comment_author_preview",
+                    description="Comment author preview for the rating with the longest thread",
+                    executor=lambda: rating_repository().get_by_id(busiest_rating_id),
+                    queryset_builder=lambda: (
+                        rating_repository()._build_latest_unique_comment_authors_queryset(  # noqa: SLF001
+                            [busiest_rating_id]
+                        )
+                    ),
+                    explain_limit=None,
+                )
+            )
+
         sample_course_id = self._get_sample_course_id()
         if sample_course_id is not None:
             scenarios.append(
@@ -375,5 +392,15 @@ class Command(BaseCommand):
 
         return RatingFilterCriteria.model_validate(payload)
 
+    def _get_busiest_rating_id(self) -> str | None:
+        rating_id = (
+            Comment.objects.values("rating_id")
+            .annotate(comments_count=Count("id"))
+            .order_by("-comments_count", "rating_id")
+            .values_list("rating_id", flat=True)
+            .first()
+        )
+        return str(rating_id) if rating_id is not None else None
+
     def _get_sample_course_id(self):
         return Course.objects.order_by("id").values_list("id", flat=True).first()
@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rating_app.application_schemas.notification import NotificationRetentionPolicy
+from rating_app.ioc_container.services import notification_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete notifications older than the retention period and beyond the per-user "
+        "cap, in small transactions so no lock is held for long."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help="Delete notifications older than this many days (0 keeps them)",
+        )
+        parser.add_argument(
+            "--max-per-user",
+            type=int,
+            default=settings.NOTIFICATION_MAX_PER_USER,
+            help="Keep at most this many newest notifications per user (0 keeps all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NOTIFICATION_PURGE_BATCH_SIZE,
+            help="Notifications deleted per transaction",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to wait between batches to let other writers through",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        policy = NotificationRetentionPolicy(
+            max_age=timedelta(days=options["retention_days"])
+            if options["retention_days"] > 0
+            else None,
+            max_per_user=options["max_per_user"] if options["max_per_user"] > 0 else None,
+        )
+        if policy.max_age is None and policy.max_per_user is None:
+            raise CommandError("Both retention limits are disabled; there is nothing to purge")
+
+        expired = over_cap = 0
+        for result in notification_service().purge_batches(policy, options["batch_size"]):
+            expired += result.expired
+            over_cap += result.over_cap
+            time.sleep(options["pause"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {expired} expired and {over_cap} over-cap notification(s)")
+        )
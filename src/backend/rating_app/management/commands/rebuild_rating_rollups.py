@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from rating_app.ioc_container.services import course_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-semester rating rollups from the ratings table. "
+        "Repairs rollups after lost deltas; safe to run at any time."
+    )
+
+    def handle(self, *args, **options):
+        courses = course_service().rebuild_rating_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating rollups of {courses} course(s)"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rating_app.ioc_container.repositories import rating_repository
+from rating_app.ioc_container.services import course_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify incrementally maintained course rating aggregates against a full "
+        "recompute. Meant to run periodically (e.g. nightly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Overwrite drifted courses with the recomputed aggregates",
+        )
+
+    def handle(self, *args, **options):
+        fix = options["fix"]
+
+        expected = rating_repository().get_aggregated_stats_by_course()
+        drifted = course_service().reconcile_rating_aggregates(expected, fix=fix)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Course aggregates are consistent"))
+            return
+
+        for course_id in drifted:
+            self.stdout.write(f"  drifted: {course_id}")
+
+        if not fix:
+            raise CommandError(
+                f"{len(drifted)} course(s) have drifted aggregates; rerun with --fix to repair"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Repaired aggregates of {len(drifted)} course(s)"))
@@ -0,0 +1,84 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+import structlog
+
+from rating_app.ioc_container.services import outbox_dispatcher
+
+logger = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver domain events recorded in the outbox to the deferred listeners "
+        "(course aggregates, notifications). Runs until stopped unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox until it is empty, then exit",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help="Messages claimed per transaction",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help="Seconds to wait when the outbox is empty",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DOMAIN_EVENTS_OUTBOX:
+            raise CommandError("DOMAIN_EVENTS_OUTBOX is disabled; there is nothing to drain")
+
+        self._stopping = False
+        handlers = {
+            signum: signal.signal(signum, self._stop) for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            delivered, failed = self._run(
+                options["batch_size"], options["poll_interval"], once=options["once"]
+            )
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Delivered {delivered} outbox message(s), {failed} failed")
+        )
+
+    def _run(self, batch_size: int, poll_interval: float, *, once: bool) -> tuple[int, int]:
+        delivered = failed = 0
+        while not self._stopping:
+            close_old_connections()
+            result = outbox_dispatcher().drain(batch_size)
+            delivered += result.delivered
+            failed += result.failed
+            if result.claimed:
+                logger.info(
+                    "outbox_batch_drained",
+                    delivered=result.delivered,
+                    failed=result.failed,
+                )
+
+            # a full batch means more is probably waiting
+            if result.claimed == batch_size:
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
+
+        return delivered, failed
+
+    def _stop(self, *_):
+        self._stopping = True
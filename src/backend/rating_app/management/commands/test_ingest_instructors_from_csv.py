@@ -3,6 +3,8 @@ from pathlib import Path
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 import pytest
 
@@ -372,6 +374,60 @@ def test_idempotent_rerun_updates_instead_of_creating(tmp_path):
     assert Instructor.objects.filter(email="i.petrenko@ukma.edu.ua").count() == 1
 
 
+@pytest.mark.django_db
+def test_writes_each_chunk_with_one_statement(tmp_path):
+    rows = "".join(f"Петренко Іван,i.petrenko{index}@ukma.edu.ua,Member\n" for index in range(30))
+    csv_path = _write_csv(tmp_path, rows)
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("ingest_instructors_from_csv", str(csv_path), stdout=io.StringIO())
+
+    table = Instructor._meta.db_table
+    statements = [q["sql"] for q in queries.captured_queries if f'"{table}"' in q["sql"]]
+    assert len(statements) == 2  # the preload and one insert
+    assert Instructor.objects.count() == 30
+
+
+@pytest.mark.django_db
+def test_dry_run_reports_diff_counts(tmp_path):
+    Instructor.objects.create(email="i.petrenko@ukma.edu.ua", first_name="Іван", last_name="П")
+    csv_path = _write_csv(
+        tmp_path,
+        "Петренко Іван,i.petrenko@ukma.edu.ua,Member\n"
+        "Іваненко Іван,i.ivanenko@ukma.edu.ua,Member\n"
+        "Іваненко Іван,I.Ivanenko@ukma.edu.ua,Member\n",
+    )
+    stdout = io.StringIO()
+
+    call_command(
+        "ingest_instructors_from_csv",
+        str(csv_path),
+        "--dry-run",
+        "--refresh-names",
+        stdout=stdout,
+    )
+
+    assert "created=1 updated=2 kept_as_is=0" in stdout.getvalue()
+    assert Instructor.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_matches_existing_instructor_by_lowercased_email(tmp_path):
+    Instructor.objects.create(email="I.Petrenko@ukma.edu.ua", first_name="Іван", last_name="П")
+    csv_path = _write_csv(tmp_path, "Петренко Іван,i.petrenko@ukma.edu.ua,Member\n")
+
+    call_command(
+        "ingest_instructors_from_csv",
+        str(csv_path),
+        "--refresh-names",
+        stdout=io.StringIO(),
+    )
+
+    instructor = Instructor.objects.get()
+    assert instructor.email == "I.Petrenko@ukma.edu.ua"
+    assert instructor.last_name == "Петренко"
+
+
 @pytest.mark.django_db
 def test_missing_required_column_raises(tmp_path):
     path = tmp_path / "users.csv"
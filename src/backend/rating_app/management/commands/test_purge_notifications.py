@@ -0,0 +1,66 @@
+import io
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+import pytest
+from freezegun import freeze_time
+
+from rating_app.application_schemas.notification import NotificationCreateData
+from rating_app.ioc_container.repositories import notification_repository
+from rating_app.models import Notification, NotificationCursor, NotificationGroupSummary, RatingVote
+from rating_app.models.choices import NotificationEventType
+from rating_app.tests.factories import RatingFactory, UserFactory
+
+
+def _notify(recipient, rating):
+    notification_repository().create(
+        NotificationCreateData(
+            recipient_id=recipient.id,
+            event_type=NotificationEventType.RATING_UPVOTED,
+            group_key=f"{NotificationEventType.RATING_UPVOTED}:{rating.id}",
+            content_type=ContentType.objects.get_for_model(RatingVote),
+            object_id=str(uuid.uuid4()),
+            actor_id=UserFactory().id,
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_purges_expired_and_over_cap_notifications_in_batches():
+    # Arrange
+    recipient = UserFactory()
+    stale_rating, busy_rating = RatingFactory.create_batch(2)
+    with freeze_time("2024-01-01"):
+        _notify(recipient, stale_rating)
+    with freeze_time("2024-05-01"):
+        for _ in range(4):
+            _notify(recipient, busy_rating)
+    out = io.StringIO()
+
+    # Act
+    with freeze_time("2024-05-02"):
+        call_command(
+            "purge_notifications",
+            "--retention-days=30",
+            "--max-per-user=3",
+            "--batch-size=1",
+            "--pause=0",
+            stdout=out,
+        )
+
+    # Assert
+    assert "Purged 1 expired and 1 over-cap notification(s)" in out.getvalue()
+    assert Notification.objects.filter(recipient=recipient).count() == 3
+    summary = NotificationGroupSummary.objects.get(recipient=recipient)
+    assert summary.group_key.endswith(str(busy_rating.id))
+    assert summary.count == 3
+    assert NotificationCursor.objects.get(user=recipient).unread_groups == 1
+
+
+@pytest.mark.django_db
+def test_refuses_to_run_without_limits():
+    with pytest.raises(CommandError, match="disabled"):
+        call_command("purge_notifications", "--retention-days=0", "--max-per-user=0")
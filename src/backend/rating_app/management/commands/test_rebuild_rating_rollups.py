@@ -0,0 +1,21 @@
+import io
+
+from django.core.management import call_command
+
+import pytest
+
+from rating_app.models import CourseRatingRollup
+from rating_app.tests.factories import CourseOfferingFactory, RatingFactory
+
+
+@pytest.mark.django_db
+def test_rebuilds_rollups_of_rated_courses():
+    offering = CourseOfferingFactory()
+    RatingFactory(course_offering=offering, difficulty=3, usefulness=4)
+    out = io.StringIO()
+
+    call_command("rebuild_rating_rollups", stdout=out)
+
+    rollup = CourseRatingRollup.objects.get(course=offering.course)
+    assert (rollup.ratings_count, rollup.difficulty_3, rollup.usefulness_4) == (1, 1, 1)
+    assert "1 course" in out.getvalue()
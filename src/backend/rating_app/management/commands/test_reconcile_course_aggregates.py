@@ -0,0 +1,61 @@
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+import pytest
+
+from rating_app.tests.factories import CourseFactory, CourseOfferingFactory, RatingFactory
+
+
+def _rate(course, *scores):
+    offering = CourseOfferingFactory(course=course)
+    for difficulty, usefulness in scores:
+        RatingFactory(course_offering=offering, difficulty=difficulty, usefulness=usefulness)
+
+
+@pytest.mark.django_db
+def test_reports_consistent_aggregates():
+    course = CourseFactory(
+        avg_difficulty=Decimal("2.50"),
+        avg_usefulness=Decimal("4.00"),
+        ratings_count=2,
+        difficulty_sum=5,
+        usefulness_sum=8,
+    )
+    _rate(course, (2, 3), (3, 5))
+    out = io.StringIO()
+
+    call_command("reconcile_course_aggregates", stdout=out)
+
+    assert "consistent" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_fails_on_drift_without_fix():
+    course = CourseFactory()
+    _rate(course, (4, 4))
+
+    with pytest.raises(CommandError, match="1 course"):
+        call_command("reconcile_course_aggregates", stdout=io.StringIO())
+
+    course.refresh_from_db()
+    assert course.ratings_count == 0
+
+
+@pytest.mark.django_db
+def test_fix_overwrites_drifted_courses_with_recompute():
+    course = CourseFactory()
+    stale = CourseFactory(ratings_count=3, difficulty_sum=9, usefulness_sum=9)
+    _rate(course, (1, 2), (2, 2), (4, 5))
+
+    call_command("reconcile_course_aggregates", "--fix", stdout=io.StringIO())
+
+    course.refresh_from_db()
+    stale.refresh_from_db()
+    assert course.ratings_count == 3
+    assert (course.difficulty_sum, course.usefulness_sum) == (7, 9)
+    assert course.avg_difficulty == Decimal("2.33")
+    assert course.avg_usefulness == Decimal("3.00")
+    assert (stale.ratings_count, stale.difficulty_sum, stale.usefulness_sum) == (0, 0, 0)
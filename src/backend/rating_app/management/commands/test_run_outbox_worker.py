@@ -0,0 +1,24 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+import pytest
+
+
+@pytest.mark.django_db
+@override_settings(DOMAIN_EVENTS_OUTBOX=False)
+def test_refuses_to_run_when_outbox_is_disabled():
+    with pytest.raises(CommandError, match="disabled"):
+        call_command("run_outbox_worker", "--once")
+
+
+@pytest.mark.django_db
+@override_settings(DOMAIN_EVENTS_OUTBOX=True)
+def test_once_exits_when_outbox_is_empty():
+    out = io.StringIO()
+
+    call_command("run_outbox_worker", "--once", stdout=out)
+
+    assert "Delivered 0 outbox message(s), 0 failed" in out.getvalue()
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def backfill_rating_sums(apps, schema_editor):
+    Course = apps.get_model("rating_app", "Course")
+    Rating = apps.get_model("rating_app", "Rating")
+    db_alias = schema_editor.connection.alias
+
+    rows = (
+        Rating.objects.using(db_alias)
+        .values("course_offering__course_id")
+        .annotate(
+            avg_difficulty=Avg("difficulty"),
+            avg_usefulness=Avg("usefulness"),
+            ratings_count=Count("id"),
+            difficulty_sum=Sum("difficulty"),
+            usefulness_sum=Sum("usefulness"),
+        )
+        .order_by()
+    )
+    for row in rows:
+        Course.objects.using(db_alias).filter(pk=row["course_offering__course_id"]).update(
+            avg_difficulty=row["avg_difficulty"],
+            avg_usefulness=row["avg_usefulness"],
+            ratings_count=row["ratings_count"],
+            difficulty_sum=row["difficulty_sum"],
+            usefulness_sum=row["usefulness_sum"],
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0032_deprecate_rating_instructor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="difficulty_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="usefulness_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sums, migrations.RunPython.noop),
+    ]
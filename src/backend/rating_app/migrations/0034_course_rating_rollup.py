@@ -0,0 +1,97 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+SCORES = range(1, 6)
+
+
+def backfill_rating_rollups(apps, schema_editor):
+    CourseRatingRollup = apps.get_model("rating_app", "CourseRatingRollup")
+    Rating = apps.get_model("rating_app", "Rating")
+    db_alias = schema_editor.connection.alias
+
+    histogram = {
+        f"{field}_{score}": Count("id", filter=Q(**{field: score}))
+        for field in ("difficulty", "usefulness")
+        for score in SCORES
+    }
+    rows = (
+        Rating.objects.using(db_alias)
+        .values(
+            "course_offering__course_id",
+            "course_offering__semester__year",
+            "course_offering__semester__term",
+        )
+        .annotate(ratings_count=Count("id"), **histogram)
+        .order_by()
+    )
+    CourseRatingRollup.objects.using(db_alias).bulk_create(
+        [
+            CourseRatingRollup(
+                course_id=row.pop("course_offering__course_id"),
+                semester_year=row.pop("course_offering__semester__year"),
+                semester_term=row.pop("course_offering__semester__term"),
+                **row,
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0033_course_rating_sums"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseRatingRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("semester_year", models.IntegerField()),
+                (
+                    "semester_term",
+                    models.CharField(
+                        choices=[("FALL", "Fall"), ("SPRING", "Spring"), ("SUMMER", "Summer")],
+                        max_length=8,
+                    ),
+                ),
+                ("ratings_count", models.PositiveIntegerField(default=0)),
+                ("difficulty_1", models.PositiveIntegerField(default=0)),
+                ("difficulty_2", models.PositiveIntegerField(default=0)),
+                ("difficulty_3", models.PositiveIntegerField(default=0)),
+                ("difficulty_4", models.PositiveIntegerField(default=0)),
+                ("difficulty_5", models.PositiveIntegerField(default=0)),
+                ("usefulness_1", models.PositiveIntegerField(default=0)),
+                ("usefulness_2", models.PositiveIntegerField(default=0)),
+                ("usefulness_3", models.PositiveIntegerField(default=0)),
+                ("usefulness_4", models.PositiveIntegerField(default=0)),
+                ("usefulness_5", models.PositiveIntegerField(default=0)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rating_rollups",
+                        to="rating_app.course",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("course", "semester_year", "semester_term"),
+                        name="course_rating_rollup_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rating_rollups, migrations.RunPython.noop),
+    ]
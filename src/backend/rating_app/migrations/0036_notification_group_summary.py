@@ -0,0 +1,133 @@
+from datetime import UTC, datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, UUIDField
+
+NOTIFICATION_CURSOR_EPOCH = datetime(2020, 1, 1, tzinfo=UTC)
+
+
+def backfill_notification_groups(apps, schema_editor):
+    Notification = apps.get_model("rating_app", "Notification")
+    NotificationCursor = apps.get_model("rating_app", "NotificationCursor")
+    NotificationGroupRead = apps.get_model("rating_app", "NotificationGroupRead")
+    NotificationGroupSummary = apps.get_model("rating_app", "NotificationGroupSummary")
+    db_alias = schema_editor.connection.alias
+
+    cursors = dict(
+        NotificationCursor.objects.using(db_alias).values_list("user_id", "last_read_at")
+    )
+    group_reads = {
+        (user_id, group_key): read_at
+        for user_id, group_key, read_at in NotificationGroupRead.objects.using(
+            db_alias
+        ).values_list("user_id", "group_key", "read_at")
+    }
+    latest_id_per_group = (
+        Notification.objects.using(db_alias)
+        .filter(recipient_id=OuterRef("recipient_id"), group_key=OuterRef("group_key"))
+        .order_by("-created_at")
+        .values("id")[:1]
+    )
+    rows = (
+        Notification.objects.using(db_alias)
+        .values("recipient_id", "group_key")
+        .annotate(
+            count=Count("id"),
+            latest_created_at=Max("created_at"),
+            latest_id=Subquery(latest_id_per_group, output_field=UUIDField()),
+        )
+        .order_by()
+    )
+
+    summaries = []
+    unread_groups: dict[int, int] = {}
+    for row in rows:
+        recipient_id = row["recipient_id"]
+        latest_at = row["latest_created_at"]
+        cursor_value = cursors.get(recipient_id, NOTIFICATION_CURSOR_EPOCH)
+        read_at = group_reads.get((recipient_id, row["group_key"]))
+        is_unread = latest_at > cursor_value and (read_at is None or latest_at > read_at)
+        if is_unread:
+            unread_groups[recipient_id] = unread_groups.get(recipient_id, 0) + 1
+        summaries.append(
+            NotificationGroupSummary(
+                recipient_id=recipient_id,
+                group_key=row["group_key"],
+                count=row["count"],
+                latest_id=row["latest_id"],
+                latest_created_at=latest_at,
+                is_unread=is_unread,
+            )
+        )
+    NotificationGroupSummary.objects.using(db_alias).bulk_create(summaries, batch_size=1000)
+
+    for user_id, count in unread_groups.items():
+        cursor, _ = NotificationCursor.objects.using(db_alias).get_or_create(user_id=user_id)
+        cursor.unread_groups = count
+        cursor.save(update_fields=["unread_groups"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0035_outbox_message"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationcursor",
+            name="unread_groups",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="NotificationGroupSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("group_key", models.CharField(max_length=255)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("latest_created_at", models.DateTimeField()),
+                ("is_unread", models.BooleanField(default=True)),
+                (
+                    "latest",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="rating_app.notification",
+                    ),
+                ),
+                (
+                    "recipient",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_groups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Group Summary",
+                "verbose_name_plural": "Notification Group Summaries",
+                "indexes": [
+                    models.Index(
+                        fields=["recipient", "-latest_created_at"],
+                        name="notif_group_recipient_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("recipient", "group_key"),
+                        name="unique_recipient_notif_group",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_notification_groups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0036_notification_group_summary"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notificationgroupsummary",
+            name="notif_group_recipient_idx",
+        ),
+        migrations.AddIndex(
+            model_name="notificationgroupsummary",
+            index=models.Index(
+                fields=["recipient", "-latest_created_at", "-group_key"],
+                name="notif_group_feed_idx",
+            ),
+        ),
+    ]
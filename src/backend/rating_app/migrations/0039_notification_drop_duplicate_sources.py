@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def drop_duplicate_notifications(apps, schema_editor):
+    Notification = apps.get_model("rating_app", "Notification")
+    NotificationGroupSummary = apps.get_model("rating_app", "NotificationGroupSummary")
+    db_alias = schema_editor.connection.alias
+    notifications = Notification.objects.using(db_alias)
+
+    duplicated_sources = (
+        notifications.values("recipient_id", "event_type", "content_type_id", "object_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    stale_groups = set()
+    for source in duplicated_sources:
+        source.pop("total")
+        copies = notifications.filter(**source).order_by("-created_at", "-id")
+        stale = list(copies.values_list("id", "group_key")[1:])
+        notifications.filter(id__in=[notification_id for notification_id, _ in stale]).delete()
+        stale_groups.update((source["recipient_id"], group_key) for _, group_key in stale)
+
+    # the newest copy of every source is kept, so only counts shrink and the
+    # unread state of each group stays as it was
+    for recipient_id, group_key in stale_groups:
+        group = notifications.filter(recipient_id=recipient_id, group_key=group_key)
+        latest = group.order_by("-created_at", "-id").values_list("id", "created_at").first()
+        if latest is None:
+            continue
+        NotificationGroupSummary.objects.using(db_alias).filter(
+            recipient_id=recipient_id, group_key=group_key
+        ).update(count=group.count(), latest_id=latest[0], latest_created_at=latest[1])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0038_notification_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_notifications, migrations.RunPython.noop),
+    ]
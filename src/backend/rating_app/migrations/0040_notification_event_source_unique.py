@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # kept apart from the data migration: PostgreSQL refuses to alter a table
+    # with deferred constraint checks pending in the same transaction
+    dependencies = [
+        ("rating_app", "0039_notification_drop_duplicate_sources"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                fields=("recipient", "event_type", "content_type", "object_id"),
+                name="unique_notification_event_source",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rating_app", "0041_ingestion_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("file_fingerprint", models.CharField(max_length=64, unique=True)),
+                ("file_path", models.TextField()),
+                ("byte_offset", models.PositiveBigIntegerField()),
+                ("batch_number", models.PositiveIntegerField()),
+                ("run_id", models.CharField(max_length=32)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
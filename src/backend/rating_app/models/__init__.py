@@ -4,11 +4,15 @@ from .course_instructor import CourseInstructor
 from .course_offering import CourseOffering
 from .course_offering_speciality import CourseOfferingSpeciality
 from .course_offering_term import CourseOfferingTerm
+from .course_rating_rollup import CourseRatingRollup
 from .department import Department
 from .enrollment import Enrollment
 from .faculty import Faculty
+from .ingestion_checkpoint import IngestionCheckpoint
+from .ingestion_fingerprint import IngestionFingerprint
 from .instructor import Instructor
-from .notification import Notification, NotificationCursor
+from .notification import Notification, NotificationCursor, NotificationGroupSummary
+from .outbox_message import OutboxMessage
 from .person import Person
 from .promo_banner import PromoBanner
 from .rating import Rating
@@ -29,6 +33,7 @@ __all__ = [
     "CourseOfferingTerm",
     "CourseOfferingSpeciality",
     "CourseInstructor",
+    "CourseRatingRollup",
     "Enrollment",
     "Rating",
     "Comment",
@@ -36,5 +41,9 @@ __all__ = [
     "RatingVote",
     "Notification",
     "NotificationCursor",
+    "NotificationGroupSummary",
+    "OutboxMessage",
+    "IngestionFingerprint",
+    "IngestionCheckpoint",
     "PromoBanner",
 ]
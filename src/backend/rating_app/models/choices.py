@@ -59,3 +59,14 @@ class NotificationEventType(models.TextChoices):
     RATING_UPVOTED = "RATING_UPVOTED", "Rating Upvoted"
     RATING_DOWNVOTED = "RATING_DOWNVOTED", "Rating Downvoted"
     RATING_COMMENT_CREATED = "RATING_COMMENT_CREATED", "Rating Comment Created"
+
+
+class OutboxTopic(models.TextChoices):
+    RATING = "RATING", "Rating"
+    RATING_VOTE = "RATING_VOTE", "Rating Vote"
+    COMMENT = "COMMENT", "Comment"
+
+
+class IngestionFingerprintKind(models.TextChoices):
+    COURSE = "COURSE", "Course"
+    OFFERING = "OFFERING", "Offering"
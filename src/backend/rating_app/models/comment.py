@@ -5,6 +5,10 @@ from django.db import models
 
 
 class Comment(models.Model):
+    rating_id: uuid.UUID
+    parent_comment_id: uuid.UUID | None
+    user_id: int
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     content = models.TextField()
     rating = models.ForeignKey(
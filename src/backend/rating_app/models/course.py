@@ -36,6 +36,9 @@ class Course(models.Model):
     avg_difficulty = models.DecimalField(max_digits=3, decimal_places=2, default=Decimal("0.0"))
     avg_usefulness = models.DecimalField(max_digits=3, decimal_places=2, default=Decimal("0.0"))
     ratings_count = models.PositiveIntegerField(default=0)
+    # running totals behind the averages, moved by rating deltas
+    difficulty_sum = models.PositiveIntegerField(default=0)
+    usefulness_sum = models.PositiveIntegerField(default=0)
 
     class Meta:
         indexes = [
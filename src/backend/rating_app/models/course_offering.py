@@ -22,6 +22,8 @@ if TYPE_CHECKING:
 class CourseOffering(models.Model):
     enrollments: Manager[EnrollmentType]
     course_offering_specialities: RelatedManager[CourseOfferingSpeciality]
+    course_id: uuid.UUID
+    semester_id: uuid.UUID
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(
@@ -0,0 +1,41 @@
+import uuid
+
+from django.db import models
+
+from .choices import SemesterTerm
+from .course import Course
+
+
+class CourseRatingRollup(models.Model):
+    """Rating histograms of a course for one semester, moved by rating deltas."""
+
+    course_id: uuid.UUID
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="rating_rollups")
+    semester_year = models.IntegerField()
+    semester_term = models.CharField(max_length=8, choices=SemesterTerm.choices)
+    ratings_count = models.PositiveIntegerField(default=0)
+
+    # one counter per score: difficulty_<n> is how many ratings gave difficulty n
+    difficulty_1 = models.PositiveIntegerField(default=0)
+    difficulty_2 = models.PositiveIntegerField(default=0)
+    difficulty_3 = models.PositiveIntegerField(default=0)
+    difficulty_4 = models.PositiveIntegerField(default=0)
+    difficulty_5 = models.PositiveIntegerField(default=0)
+    usefulness_1 = models.PositiveIntegerField(default=0)
+    usefulness_2 = models.PositiveIntegerField(default=0)
+    usefulness_3 = models.PositiveIntegerField(default=0)
+    usefulness_4 = models.PositiveIntegerField(default=0)
+    usefulness_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "semester_year", "semester_term"],
+                name="course_rating_rollup_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.course_id} {self.semester_year} {self.semester_term}: {self.ratings_count}"
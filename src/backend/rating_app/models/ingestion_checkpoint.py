@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class IngestionCheckpoint(models.Model):
+    """
+    How far an ingestion run got through a scraped file: the byte offset just
+    after its last committed batch. Written in that batch's transaction and
+    removed once the file has been ingested completely.
+    """
+
+    file_fingerprint = models.CharField(max_length=64, unique=True)
+    file_path = models.TextField()
+    byte_offset = models.PositiveBigIntegerField()
+    batch_number = models.PositiveIntegerField()
+    run_id = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.file_path} @ {self.byte_offset} (batch {self.batch_number})"
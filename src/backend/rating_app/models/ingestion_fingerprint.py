@@ -0,0 +1,25 @@
+from django.db import models
+
+from .choices import IngestionFingerprintKind
+
+
+class IngestionFingerprint(models.Model):
+    """
+    Content hash of a scraped course or offering as last ingested, keyed by its
+    natural key. Ingestion compares against it to skip records that did not change.
+    """
+
+    kind = models.CharField(max_length=16, choices=IngestionFingerprintKind.choices)
+    key = models.CharField(max_length=64)
+    content_hash = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "key"], name="ingestion_fingerprint_kind_key_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key}"
@@ -43,6 +43,14 @@ class Notification(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
+        constraints = [
+            # one notification per recipient and event source; repeated events
+            # refresh it in place instead of piling up
+            models.UniqueConstraint(
+                fields=["recipient", "event_type", "content_type", "object_id"],
+                name="unique_notification_event_source",
+            ),
+        ]
         indexes = [
             models.Index(
                 fields=["recipient", "-created_at"],
@@ -52,6 +60,8 @@ class Notification(models.Model):
                 fields=["recipient", "group_key", "-created_at"],
                 name="notif_recipient_group_idx",
             ),
+            # age-based retention purges walk the whole table oldest first
+            models.Index(fields=["created_at"], name="notif_created_idx"),
         ]
 
     def __str__(self):
@@ -72,6 +82,8 @@ class NotificationCursor(models.Model):
         related_name="notification_cursor",
     )
     last_read_at = models.DateTimeField(default=NOTIFICATION_CURSOR_EPOCH)
+    # number of the user's notification groups currently unread
+    unread_groups = models.PositiveIntegerField(default=0)
 
     class Meta:
         verbose_name = "Notification Cursor"
@@ -81,6 +93,50 @@ class NotificationCursor(models.Model):
         return f"NotificationCursor(user={self.user_id}, last_read_at={self.last_read_at})"
 
 
+class NotificationGroupSummary(models.Model):
+    """
+    One row per (recipient, group_key), kept in step with notification writes
+    so grouped feeds and unread counts never aggregate the notification log.
+    """
+
+    recipient_id: int
+    latest_id: uuid.UUID | None
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_groups",
+    )
+    group_key = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+    latest = models.ForeignKey(
+        Notification,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    latest_created_at = models.DateTimeField()
+    is_unread = models.BooleanField(default=True)
+
+    class Meta:
+        verbose_name = "Notification Group Summary"
+        verbose_name_plural = "Notification Group Summaries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "group_key"],
+                name="unique_recipient_notif_group",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["recipient", "-latest_created_at", "-group_key"],
+                name="notif_group_feed_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"NotificationGroupSummary(user={self.recipient_id}, group_key={self.group_key})"
+
+
 class NotificationGroupRead(models.Model):
     user_id: int
     user = models.ForeignKey(
@@ -0,0 +1,29 @@
+import uuid
+
+from django.db import models
+
+from .choices import OutboxTopic
+
+
+class OutboxMessage(models.Model):
+    """
+    A domain event recorded in the same transaction as the write that raised it.
+
+    The outbox worker delivers pending messages to the deferred listeners and
+    deletes them; a message that keeps failing stays with its last error.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    topic = models.CharField(max_length=32, choices=OutboxTopic.choices)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="outbox_message_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} ({self.id})"
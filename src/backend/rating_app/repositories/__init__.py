@@ -1,15 +1,19 @@
 from .comment_repository import CommentRepository
 from .course_instructor_repository import CourseInstructorRepository
 from .course_offering_repository import CourseOfferingRepository
+from .course_rating_rollup_repository import CourseRatingRollupRepository
 from .course_repository import CourseRepository
 from .department_repository import DepartmentRepository
 from .enrollment_repository import EnrollmentRepository
 from .faculty_repository import FacultyRepository
+from .ingestion_checkpoint_repository import IngestionCheckpointRepository
+from .ingestion_fingerprint_repository import IngestionFingerprintRepository
 from .instructor_repository import InstructorRepository
 from .notification_repository import (
     NotificationCursorRepository,
     NotificationRepository,
 )
+from .outbox_repository import OutboxRepository
 from .promo_banner_repository import PromoBannerRepository
 from .rating_repository import RatingRepository
 from .semester_repository import SemesterRepository
@@ -46,6 +50,7 @@ __all__ = [
     "StudentRepository",
     "CourseOfferingRepository",
     "CourseInstructorRepository",
+    "CourseRatingRollupRepository",
     "RatingRepository",
     "EnrollmentRepository",
     "StudentStatisticsRepository",
@@ -54,6 +59,9 @@ __all__ = [
     "NotificationRepository",
     "NotificationCursorRepository",
     "NotificationGroupMapper",
+    "OutboxRepository",
+    "IngestionFingerprintRepository",
+    "IngestionCheckpointRepository",
     "PromoBannerRepository",
     "PromoBannerMapper",
 ]
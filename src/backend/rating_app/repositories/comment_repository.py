@@ -1,8 +1,22 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from typing import Any, Literal, overload
 
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import DataError
-from django.db.models import Count, Prefetch, QuerySet
+from django.db import DataError, connection
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    UUIDField,
+    Value,
+    Window,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, RowNumber
 
 import structlog
 
@@ -13,14 +27,17 @@ from rating_app.application_schemas.comment import (
     CommentFilterCriteria,
     CommentPatchParams,
     CommentPutParams,
+    CommentThreadKeys,
+    CommentThreadNode,
     CommentUpsertParams,
 )
 from rating_app.application_schemas.pagination import PaginationFilters, PaginationResult
+from rating_app.constants import COMMENT_REPLY_PREVIEW_LIMIT
 from rating_app.exception.comment_exception import (
     CommentNotFoundError,
     InvalidCommentIdentifierError,
 )
-from rating_app.models import Comment
+from rating_app.models import Comment, Rating
 from rating_app.pagination import GenericQuerysetPaginator
 from rating_app.repositories.protocol import IPaginatedRepository
 
@@ -30,6 +47,8 @@ logger = structlog.get_logger(__name__)
 class CommentRepository(
     IPaginatedRepository[CommentDTO, Comment, CommentFilterCriteria, CommentUpsertParams]
 ):
+    _REPLY_PREVIEW_ATTR = "reply_preview_comments"
+
     def __init__(
         self,
         mapper: IProcessor[[Comment], CommentDTO],
@@ -52,6 +71,89 @@ class CommentRepository(
 
         return self._map_to_domain_model(comment)
 
+    def get_thread(self, comment_id: str, max_depth: int | None = None) -> list[CommentThreadNode]:
+        """
+        Load a comment with its whole reply subtree (or `max_depth` levels of it)
+        in one statement, depth first in reply order.
+        """
+        try:
+            comments = list(
+                self._build_base_queryset().filter(
+                    id__in=self._build_subtree_ids(comment_id, max_depth)
+                )
+            )
+        except (DjangoValidationError, ValueError, TypeError, DataError) as err:
+            raise InvalidCommentIdentifierError(comment_id) from err
+        by_parent: defaultdict[Any, list[Comment]] = defaultdict(list)
+        root = None
+        for comment in comments:
+            if str(comment.pk) == str(comment_id):
+                root = comment
+            else:
+                by_parent[comment.parent_comment_id].append(comment)
+        if root is None:
+            raise CommentNotFoundError(comment_id)
+
+        for replies in by_parent.values():
+            replies.sort(key=lambda reply: (reply.created_at, reply.pk))
+
+        nodes: list[CommentThreadNode] = []
+        stack = [(root, 0)]
+        while stack:
+            comment, depth = stack.pop()
+            nodes.append(CommentThreadNode(comment=self.mapper.process(comment), depth=depth))
+            stack.extend((reply, depth + 1) for reply in reversed(by_parent[comment.pk]))
+        return nodes
+
+    def _build_subtree_ids(self, comment_id: str, max_depth: int | None) -> RawSQL:
+        table = connection.ops.quote_name(Comment._meta.db_table)
+        id_field = Comment._meta.get_field("id")
+        root_id = id_field.get_db_prep_value(comment_id, connection, prepared=False)
+        depth_limit = "" if max_depth is None else "WHERE thread.depth < %s"
+        params = [root_id] if max_depth is None else [root_id, max_depth]
+        return RawSQL(
+            f"""
+            WITH RECURSIVE thread (id, depth) AS (
+                SELECT id, 0 FROM {table} WHERE id = %s
+                UNION ALL
+                SELECT reply.id, thread.depth + 1
+                FROM {table} reply JOIN thread ON reply.parent_comment_id = thread.id
+                {depth_limit}
+            )
+            SELECT id FROM thread
+            """,
+            params,
+        )
+
+    def get_thread_keys(
+        self, rating_id: Any, parent_comment_id: Any | None = None
+    ) -> CommentThreadKeys:
+        """Read the rating author and, for replies, the parent's place in the thread."""
+        ratings = Rating.objects.filter(pk=rating_id)
+        fields = ["student__user_id"]
+        if parent_comment_id is not None:
+            parent = Comment.objects.filter(pk=parent_comment_id)
+            ratings = ratings.annotate(
+                parent_rating_id=Subquery(parent.values("rating_id")[:1], output_field=UUIDField()),
+                parent_parent_id=Subquery(
+                    parent.values("parent_comment_id")[:1], output_field=UUIDField()
+                ),
+            )
+            fields += ["parent_rating_id", "parent_parent_id"]
+
+        try:
+            row = ratings.values(*fields).first()
+        except (DjangoValidationError, ValueError, TypeError, DataError) as err:
+            raise InvalidCommentIdentifierError() from err
+        if row is None:
+            return CommentThreadKeys(rating_author_user_id=None)
+
+        return CommentThreadKeys(
+            rating_author_user_id=row["student__user_id"],
+            parent_rating_id=row.get("parent_rating_id"),
+            parent_parent_id=row.get("parent_parent_id"),
+        )
+
     @overload
     def get_or_create(
         self,
@@ -153,9 +255,9 @@ class CommentRepository(
             is_anonymous=create_params.is_anonymous,
         )
 
-        # Refetch with related fields for mapper
+        # Refetch with related fields for mapper; a new comment has no replies to preview
         comment = self._build_base_queryset().get(pk=comment.pk)
-        return self._map_to_domain_model(comment)
+        return self.mapper.process(comment)
 
     def delete(self, id: str) -> None:
         comment_model = self._get_by_id_shallow(id)
@@ -201,7 +303,7 @@ class CommentRepository(
 
         if pagination is not None:
             result = self.paginator.process(qs, pagination)
-            dtos = [self.mapper.process(model) for model in result.page_objects]
+            dtos = self._map_to_domain_models(result.page_objects)
             return PaginationResult(
                 page_objects=dtos,
                 metadata=result.metadata,
@@ -218,22 +320,49 @@ class CommentRepository(
         return comments
 
     def _build_base_queryset(self) -> QuerySet[Comment]:
+        return Comment.objects.select_related(
+            "user",
+            "user__student_profile",
+            "rating__course_offering",
+        ).annotate(replies_count=self._replies_count())
+
+    def _replies_count(self) -> Coalesce:
+        # a correlated count keeps the page query free of a join and GROUP BY
+        # over every reply of every comment on it
+        replies = (
+            Comment.objects.filter(parent_comment_id=OuterRef("pk"))
+            .order_by()
+            .values("parent_comment_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return Coalesce(Subquery(replies, output_field=IntegerField()), Value(0))
+
+    def _attach_reply_previews(self, comments: Sequence[Comment]) -> None:
+        previews: defaultdict[Any, list[Comment]] = defaultdict(list)
+        if comments:
+            parent_ids = [comment.pk for comment in comments]
+            for reply in self._build_reply_previews_queryset(parent_ids):
+                previews[reply.parent_comment_id].append(reply)
+
+        for comment in comments:
+            setattr(comment, self._REPLY_PREVIEW_ATTR, previews[comment.pk])
+
+    def _build_reply_previews_queryset(self, parent_ids: Sequence[Any]) -> QuerySet[Comment]:
+        # the first replies of every parent on the page, capped per parent in
+        # one statement instead of loading whole threads
         return (
-            Comment.objects.select_related(
-                "user",
-                "user__student_profile",
-                "rating__course_offering",
-            )
-            .prefetch_related(
-                Prefetch(
-                    "comments",
-                    queryset=Comment.objects.select_related(
-                        "user", "user__student_profile"
-                    ).order_by("created_at", "id"),
-                    to_attr="reply_preview_comments",
+            self._build_base_queryset()
+            .filter(parent_comment_id__in=parent_ids)
+            .annotate(
+                preview_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("parent_comment_id")],
+                    order_by=[F("created_at").asc(), F("id").asc()],
                 )
             )
-            .annotate(replies_count=Count("comments", distinct=True))
+            .filter(preview_rank__lte=COMMENT_REPLY_PREVIEW_LIMIT)
+            .order_by("parent_comment_id", "preview_rank")
         )
 
     def _apply_filters(
@@ -265,9 +394,12 @@ class CommentRepository(
         return query_filters
 
     def _map_to_domain_models(self, models: QuerySet[Comment]) -> list[CommentDTO]:
-        return [self._map_to_domain_model(model) for model in models]
+        comments = list(models)
+        self._attach_reply_previews(comments)
+        return [self.mapper.process(model) for model in comments]
 
     def _map_to_domain_model(self, model: Comment) -> CommentDTO:
+        self._attach_reply_previews([model])
         return self.mapper.process(model)
 
     def _get_by_id_shallow(self, comment_id: str) -> Comment:
@@ -1,3 +1,4 @@
+from collections.abc import Mapping, Sequence
 from typing import Literal, overload
 from uuid import UUID
 
@@ -9,6 +10,7 @@ import structlog
 
 from rating_app.application_schemas.course_offering import CourseOffering as CourseOfferingDTO
 from rating_app.application_schemas.course_offering import CourseOfferingInput
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
 from rating_app.exception.course_exceptions import (
     CourseOfferingNotFoundError,
     InvalidCourseOfferingIdentifierError,
@@ -108,6 +110,42 @@ class CourseOfferingRepository(IDomainOrmRepository[CourseOfferingDTO, CourseOff
         full_model = self._build_base_queryset().get(pk=model.pk)
         return self._map_to_domain_model(full_model), created
 
+    def bulk_upsert(
+        self,
+        data: Sequence[CourseOfferingInput],
+        known_ids: Mapping[str, UUID] | None = None,
+    ) -> dict[str, UUID]:
+        """
+        get_or_upsert by code for a whole batch in one INSERT ... ON CONFLICT statement.
+        A code repeated in the batch keeps its last values. Returns offering ids by code.
+
+        ``known_ids`` are ids the caller preloaded for existing codes; those rows keep
+        their ids on conflict, so only the remaining codes are read back.
+        """
+        latest = {item.code: item for item in data}
+        if not latest:
+            return {}
+
+        known_ids = known_ids or {}
+        update_fields = list(self._build_defaults(next(iter(latest.values()))))
+        CourseOffering.objects.bulk_create(
+            [self.to_model(item) for item in latest.values()],
+            update_conflicts=True,
+            unique_fields=["code"],
+            update_fields=update_fields,
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+        ids = {code: known_ids[code] for code in latest if code in known_ids}
+        unknown = [code for code in latest if code not in ids]
+        if unknown:
+            # conflicting rows keep their ids, so read them back rather than trust the new ones
+            ids.update(CourseOffering.objects.filter(code__in=unknown).values_list("code", "id"))
+        return ids
+
+    def to_model(self, data: CourseOfferingInput) -> CourseOffering:
+        """Unsaved model holding the values get_or_upsert writes for this input."""
+        return CourseOffering(code=data.code, **self._build_defaults(data))
+
     def create(self, data: CourseOfferingInput | CourseOfferingDTO) -> CourseOfferingDTO:
         model = CourseOffering.objects.create(
             code=data.code,
@@ -0,0 +1,114 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+
+from rating_app.application_schemas.analytics import (
+    RATING_SCORES,
+    RatingRollupDelta,
+    SemesterRatingStats,
+)
+from rating_app.models import CourseRatingRollup, Rating
+from rating_app.models.choices import SemesterTerm
+
+
+class CourseRatingRollupRepository:
+    """
+    Per-semester score histograms of courses, kept in step with rating writes.
+    """
+
+    def get_for_course(self, course_id: str) -> list[SemesterRatingStats]:
+        rollups = CourseRatingRollup.objects.filter(course_id=course_id)
+        return [self._to_semester_stats(rollup) for rollup in rollups]
+
+    def apply_delta(self, course_id: str, delta: RatingRollupDelta) -> None:
+        rollups = CourseRatingRollup.objects.filter(
+            course_id=course_id,
+            semester_year=delta.year,
+            semester_term=delta.term,
+        )
+        changes = self._build_changes(delta)
+        if not changes or rollups.update(**changes):
+            return
+
+        # first rating of the course in this semester: insert an empty row,
+        # tolerating a concurrent insert of the same one, then apply the delta
+        CourseRatingRollup.objects.bulk_create(
+            [
+                CourseRatingRollup(
+                    course_id=course_id,
+                    semester_year=delta.year,
+                    semester_term=delta.term,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        rollups.update(**changes)
+
+    @transaction.atomic
+    def rebuild(self) -> set[str]:
+        """
+        Replaces every rollup row with a recompute from the ratings, for when
+        deltas were lost. Returns the ids of courses that had or now have rows.
+        """
+        course_ids = {
+            str(course_id)
+            for course_id in CourseRatingRollup.objects.values_list("course_id", flat=True)
+        }
+        histograms = {
+            f"{prefix}_{score}": Count("id", filter=Q(**{prefix: score}))
+            for prefix in ("difficulty", "usefulness")
+            for score in RATING_SCORES
+        }
+        rows = (
+            Rating.objects.values(
+                "course_offering__course_id",
+                "course_offering__semester__year",
+                "course_offering__semester__term",
+            )
+            .annotate(ratings_count=Count("id"), **histograms)
+            .order_by()
+        )
+        rollups = [
+            CourseRatingRollup(
+                course_id=row["course_offering__course_id"],
+                semester_year=row["course_offering__semester__year"],
+                semester_term=row["course_offering__semester__term"],
+                ratings_count=row["ratings_count"],
+                **{column: row[column] for column in histograms},
+            )
+            for row in rows
+        ]
+
+        CourseRatingRollup.objects.all().delete()
+        CourseRatingRollup.objects.bulk_create(rollups)
+        return course_ids | {str(rollup.course_id) for rollup in rollups}
+
+    def _build_changes(self, delta: RatingRollupDelta) -> dict[str, Any]:
+        # F() arithmetic keeps concurrent deltas on one row from overwriting each
+        # other; counters are clamped at zero like the course totals.
+        changes: dict[str, Any] = {}
+        if delta.ratings_count:
+            changes["ratings_count"] = self._shift("ratings_count", delta.ratings_count)
+        for prefix, histogram in (
+            ("difficulty", delta.difficulty),
+            ("usefulness", delta.usefulness),
+        ):
+            for score, change in histogram.items():
+                if change:
+                    column = f"{prefix}_{score}"
+                    changes[column] = self._shift(column, change)
+        return changes
+
+    def _shift(self, column: str, change: int) -> Greatest:
+        return Greatest(F(column) + change, Value(0))
+
+    def _to_semester_stats(self, rollup: CourseRatingRollup) -> SemesterRatingStats:
+        return SemesterRatingStats(
+            year=rollup.semester_year,
+            term=SemesterTerm(rollup.semester_term),
+            ratings_count=rollup.ratings_count,
+            difficulty={score: getattr(rollup, f"difficulty_{score}") for score in RATING_SCORES},
+            usefulness={score: getattr(rollup, f"usefulness_{score}") for score in RATING_SCORES},
+        )
@@ -1,11 +1,17 @@
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
 from typing import Any, Literal, overload
 
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import DataError, IntegrityError, transaction
 from django.db.models import (
     Case,
+    DecimalField,
     Exists,
+    Expression,
     F,
+    FloatField,
     IntegerField,
     Max,
     OuterRef,
@@ -16,6 +22,8 @@ from django.db.models import (
     Value,
     When,
 )
+from django.db.models.functions import Cast, Greatest
+from django.db.models.lookups import GreaterThan
 
 import structlog
 
@@ -27,6 +35,12 @@ from rating_app.application_schemas.course import (
     CourseFilterCriteriaInternal,
     CourseInput,
 )
+from rating_app.application_schemas.ingestion import UpsertCounts
+from rating_app.application_schemas.rating import (
+    AggregatedCourseRatingStats,
+    CourseRatingAggregatesDelta,
+)
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
 from rating_app.exception.course_exceptions import (
     CourseNotFoundError,
     InvalidCourseIdentifierError,
@@ -167,6 +181,79 @@ class CourseRepository(
             return course, created
         return self._mapper.process(course), created
 
+    def bulk_get_or_upsert(
+        self,
+        data: Sequence[CourseInput],
+        counts: UpsertCounts | None = None,
+        candidates: Iterable[Course] | None = None,
+    ) -> list[Course]:
+        """
+        get_or_upsert for a whole batch with the same identity rules. Candidates are
+        loaded in one query, or taken from ``candidates`` when the caller has them
+        preloaded, and matched in input order, so later items see the courses created
+        or adopted by earlier ones; the result is written with one insert and one
+        update. Returns the ORM models in input order and adds the distinct courses
+        written or matched to ``counts`` when given.
+        """
+        by_identity: dict[tuple[str, str, str], list[Course]] = defaultdict(list)
+        if candidates is None:
+            candidates = Course.objects.filter(
+                department_id__in={item.department for item in data},
+                title__in={item.title for item in data},
+            )
+        for course in candidates:
+            key = self._identity_key(course.title, course.department_id, course.education_level)
+            by_identity[key].append(course)
+
+        resolved: list[Course] = []
+        created: list[Course] = []
+        changed: dict[Any, Course] = {}
+        changed_fields: set[str] = set()
+        for item in data:
+            normalized_level = item.education_level or ""
+            matches = by_identity[self._identity_key(item.title, item.department, normalized_level)]
+            course = min(matches, key=lambda c: c.pk) if matches else None
+
+            if course is None and normalized_level:
+                untyped = by_identity[self._identity_key(item.title, item.department, "")]
+                if untyped:
+                    course = min(untyped, key=lambda c: c.pk)
+                    untyped.remove(course)
+                    matches.append(course)
+
+            if course is None:
+                course = Course(
+                    title=item.title,
+                    department_id=item.department,
+                    education_level=normalized_level,
+                    status=item.status,
+                    description=item.description,
+                )
+                matches.append(course)
+                created.append(course)
+            else:
+                updated_fields = self._collect_updated_fields(course=course, data=item)
+                if updated_fields and not course._state.adding:
+                    changed[course.pk] = course
+                    changed_fields.update(updated_fields)
+            resolved.append(course)
+
+        Course.objects.bulk_create(created, batch_size=INGESTION_BULK_WRITE_BATCH_SIZE)
+        if changed:
+            Course.objects.bulk_update(
+                list(changed.values()),
+                fields=sorted(changed_fields),
+                batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+            )
+        if counts is not None:
+            matched = len({course.pk for course in resolved})
+            counts.add(
+                inserted=len(created),
+                updated=len(changed),
+                unchanged=matched - len(created) - len(changed),
+            )
+        return resolved
+
     def update(self, obj: CourseDTO, **course_data: object) -> CourseDTO:
         course_orm = self._get_by_id_shallow(str(obj.id))
         for field, value in course_data.items():
@@ -174,6 +261,62 @@ class CourseRepository(
         course_orm.save()
         return self._mapper.process(course_orm)
 
+    def apply_rating_aggregates_delta(
+        self, course_id: str, delta: CourseRatingAggregatesDelta
+    ) -> bool:
+        # One UPDATE with F() arithmetic: concurrent deltas on the same course
+        # serialize on the row lock instead of overwriting each other's result.
+        # Totals are clamped at zero so drift never trips the unsigned checks;
+        # the reconciliation job repairs it.
+        ratings_count = Greatest(F("ratings_count") + delta.ratings_count, Value(0))
+        difficulty_sum = Greatest(F("difficulty_sum") + delta.difficulty_sum, Value(0))
+        usefulness_sum = Greatest(F("usefulness_sum") + delta.usefulness_sum, Value(0))
+
+        updated = Course.objects.filter(pk=course_id).update(
+            ratings_count=ratings_count,
+            difficulty_sum=difficulty_sum,
+            usefulness_sum=usefulness_sum,
+            avg_difficulty=self._running_average(difficulty_sum, ratings_count),
+            avg_usefulness=self._running_average(usefulness_sum, ratings_count),
+        )
+        return updated > 0
+
+    def set_rating_aggregates(self, course_id: str, stats: AggregatedCourseRatingStats) -> None:
+        Course.objects.filter(pk=course_id).update(
+            avg_difficulty=stats.avg_difficulty,
+            avg_usefulness=stats.avg_usefulness,
+            ratings_count=stats.ratings_count,
+            difficulty_sum=stats.difficulty_sum,
+            usefulness_sum=stats.usefulness_sum,
+        )
+
+    def get_rating_aggregates(self) -> dict[str, AggregatedCourseRatingStats]:
+        rows = Course.objects.values_list(
+            "id",
+            "avg_difficulty",
+            "avg_usefulness",
+            "ratings_count",
+            "difficulty_sum",
+            "usefulness_sum",
+        )
+        return {
+            str(course_id): AggregatedCourseRatingStats(
+                avg_difficulty=avg_difficulty,
+                avg_usefulness=avg_usefulness,
+                ratings_count=ratings_count,
+                difficulty_sum=difficulty_sum,
+                usefulness_sum=usefulness_sum,
+            )
+            for (
+                course_id,
+                avg_difficulty,
+                avg_usefulness,
+                ratings_count,
+                difficulty_sum,
+                usefulness_sum,
+            ) in rows
+        }
+
     def delete(self, id: str) -> None:
         course_orm = self._get_by_id_shallow(id)
         course_orm.delete()
@@ -246,6 +389,9 @@ class CourseRepository(
 
         return course, created
 
+    def _identity_key(self, title: str, department_id: object, level: str) -> tuple[str, str, str]:
+        return (title, str(department_id), str(level))
+
     def _collect_updated_fields(
         self,
         *,
@@ -505,6 +651,14 @@ class CourseRepository(
             .all()
         )
 
+    def _running_average(self, total: Expression, count: Expression) -> Case:
+        # float division avoids SQLite's integer division; the column rounds to two places
+        return Case(
+            When(GreaterThan(count, 0), then=Cast(total, FloatField()) / count),
+            default=Value(Decimal("0")),
+            output_field=DecimalField(),
+        )
+
     def _get_by_id_shallow(self, course_id: str) -> Course:
         try:
             return Course.objects.select_related("department__faculty").get(id=course_id)
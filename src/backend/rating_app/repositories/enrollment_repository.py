@@ -1,9 +1,11 @@
+from collections.abc import Sequence
 from typing import Literal, overload
 
 from django.db.models import QuerySet
 
 from rating_app.application_schemas.enrollment import Enrollment as EnrollmentDTO
-from rating_app.application_schemas.enrollment import EnrollmentInput
+from rating_app.application_schemas.enrollment import EnrollmentInput, StudentEligibility
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
 from rating_app.exception.enrollment_exceptions import EnrollmentNotFoundError
 from rating_app.models import Enrollment
 from rating_app.models.choices import EnrollmentStatus
@@ -87,6 +89,25 @@ class EnrollmentRepository(IDomainOrmRepository[EnrollmentDTO, Enrollment]):
             return model, created
         return self._map_to_domain_model(model), created
 
+    def bulk_upsert(self, data: Sequence[EnrollmentInput]) -> None:
+        """
+        get_or_upsert for a whole batch in one INSERT ... ON CONFLICT statement.
+        A student and offering pair repeated in the batch keeps its last status.
+        """
+        latest = {(item.student_id, item.offering_id): item for item in data}
+        Enrollment.objects.bulk_create(
+            [
+                Enrollment(
+                    student_id=item.student_id, offering_id=item.offering_id, status=item.status
+                )
+                for item in latest.values()
+            ],
+            update_conflicts=True,
+            unique_fields=["student", "offering"],
+            update_fields=["status"],
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+
     def update(self, obj: EnrollmentDTO, **enrollment_data: object) -> EnrollmentDTO:
         model = self._get_by_id(str(obj.id))
         for field, value in enrollment_data.items():
@@ -102,18 +123,29 @@ class EnrollmentRepository(IDomainOrmRepository[EnrollmentDTO, Enrollment]):
         return self.get_all()
 
     def is_student_enrolled(self, student_id: str, offering_id: str) -> bool:
-        return Enrollment.objects.filter(
-            student_id=student_id,
-            offering_id=offering_id,
-            status__in=[EnrollmentStatus.ENROLLED, EnrollmentStatus.FORCED],
-        ).exists()
+        return self._build_active_queryset(student_id).filter(offering_id=offering_id).exists()
 
     def is_student_enrolled_in_course(self, student_id: str, course_id: str) -> bool:
+        return (
+            self._build_active_queryset(student_id).filter(offering__course_id=course_id).exists()
+        )
+
+    def get_student_eligibility(self, student_id: str) -> StudentEligibility:
+        rows = list(
+            self._build_active_queryset(student_id).values_list(
+                "offering_id", "offering__course_id"
+            )
+        )
+        return StudentEligibility(
+            offering_ids=tuple({str(offering_id) for offering_id, _ in rows}),
+            course_ids=tuple({str(course_id) for _, course_id in rows}),
+        )
+
+    def _build_active_queryset(self, student_id: str) -> QuerySet[Enrollment]:
         return Enrollment.objects.filter(
             student_id=student_id,
-            offering__course_id=course_id,
             status__in=[EnrollmentStatus.ENROLLED, EnrollmentStatus.FORCED],
-        ).exists()
+        )
 
     def _get_by_id(self, id: str) -> Enrollment:
         try:
@@ -0,0 +1,28 @@
+from rating_app.application_schemas.ingestion import CheckpointPosition
+from rating_app.models import IngestionCheckpoint
+
+
+class IngestionCheckpointRepository:
+    def get(self, file_fingerprint: str) -> CheckpointPosition | None:
+        checkpoint = IngestionCheckpoint.objects.filter(file_fingerprint=file_fingerprint).first()
+        if checkpoint is None:
+            return None
+        return CheckpointPosition(
+            byte_offset=checkpoint.byte_offset, batch_number=checkpoint.batch_number
+        )
+
+    def save(
+        self, file_fingerprint: str, file_path: str, position: CheckpointPosition, run_id: str
+    ) -> None:
+        IngestionCheckpoint.objects.update_or_create(
+            file_fingerprint=file_fingerprint,
+            defaults={
+                "file_path": file_path,
+                "byte_offset": position.byte_offset,
+                "batch_number": position.batch_number,
+                "run_id": run_id,
+            },
+        )
+
+    def delete(self, file_fingerprint: str) -> None:
+        IngestionCheckpoint.objects.filter(file_fingerprint=file_fingerprint).delete()
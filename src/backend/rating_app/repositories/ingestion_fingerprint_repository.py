@@ -0,0 +1,25 @@
+from collections.abc import Mapping
+
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
+from rating_app.models import IngestionFingerprint
+from rating_app.models.choices import IngestionFingerprintKind
+
+
+class IngestionFingerprintRepository:
+    def get_hashes(self, kind: IngestionFingerprintKind) -> dict[str, str]:
+        """Content hash by natural key, for every fingerprint of the kind."""
+        return dict(
+            IngestionFingerprint.objects.filter(kind=kind).values_list("key", "content_hash")
+        )
+
+    def bulk_upsert(self, kind: IngestionFingerprintKind, hashes: Mapping[str, str]) -> None:
+        IngestionFingerprint.objects.bulk_create(
+            [
+                IngestionFingerprint(kind=kind, key=key, content_hash=content_hash)
+                for key, content_hash in hashes.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["kind", "key"],
+            update_fields=["content_hash", "updated_at"],
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
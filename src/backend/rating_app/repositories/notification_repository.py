@@ -1,15 +1,26 @@
+import uuid
+from collections.abc import Collection, Iterable
 from datetime import datetime
 
-from django.db.models import Count, Max, OuterRef, QuerySet, Subquery
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, QuerySet, Subquery, UUIDField, Value
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 import structlog
 
 from rating_app.application_schemas.notification import (
     NotificationCreateData,
+    NotificationFeedCursor,
     NotificationGroup,
 )
-from rating_app.models.notification import Notification, NotificationCursor, NotificationGroupRead
+from rating_app.models.notification import (
+    NOTIFICATION_CURSOR_EPOCH,
+    Notification,
+    NotificationCursor,
+    NotificationGroupRead,
+    NotificationGroupSummary,
+)
 from rating_app.repositories.protocol import IAppendOnlyRepository, ICursorRepository
 
 from .to_domain_mappers import NotificationGroupMapper
@@ -17,167 +28,339 @@ from .to_domain_mappers import NotificationGroupMapper
 logger = structlog.get_logger(__name__)
 
 
+def _shift_unread_groups(user_id: int, change: int) -> None:
+    # F() arithmetic keeps concurrent inserts and reads on one cursor from
+    # overwriting each other; the counter is clamped at zero
+    cursors = NotificationCursor.objects.filter(user_id=user_id)
+    shifted = Greatest(F("unread_groups") + change, Value(0))
+    if cursors.update(unread_groups=shifted) or change < 0:
+        return
+
+    # the user has never read anything yet: create the cursor, tolerating a
+    # concurrent insert of the same one, then apply the change
+    NotificationCursor.objects.bulk_create(
+        [NotificationCursor(user_id=user_id)], ignore_conflicts=True
+    )
+    cursors.update(unread_groups=shifted)
+
+
 class NotificationRepository(
-    IAppendOnlyRepository[NotificationGroup, NotificationCreateData, datetime],
+    IAppendOnlyRepository[NotificationGroup, NotificationCreateData],
 ):
     def __init__(self, mapper: NotificationGroupMapper) -> None:
         self._mapper = mapper
 
     def create(self, data: NotificationCreateData) -> NotificationGroup:
-        model = Notification.objects.create(
-            recipient_id=data.recipient_id,
-            event_type=data.event_type,
-            group_key=data.group_key,
-            content_type=data.content_type,
-            object_id=data.object_id,
-            actor_id=data.actor_id,
-        )
+        with transaction.atomic():
+            model = Notification.objects.create(
+                recipient_id=data.recipient_id,
+                event_type=data.event_type,
+                group_key=data.group_key,
+                content_type=data.content_type,
+                object_id=data.object_id,
+                actor_id=data.actor_id,
+            )
+            if self._upsert_group(model.recipient_id, model.group_key, model.id, model.created_at):
+                _shift_unread_groups(data.recipient_id, 1)
         return self._mapper.process(model)
 
+    def upsert(
+        self,
+        data: NotificationCreateData,
+        replaced_event_types: Collection[str] = (),
+    ) -> bool:
+        """
+        Records the notification for an event source in one statement: a repeated
+        event refreshes the existing row as the newest of its group instead of
+        adding another. Notifications of `replaced_event_types` for the same
+        source are dropped first. Returns whether a new notification was added.
+        """
+        with transaction.atomic():
+            if replaced_event_types:
+                self.delete_by_event_source(
+                    data.recipient_id,
+                    replaced_event_types,
+                    data.content_type.pk,
+                    data.object_id,
+                )
+
+            new_id = uuid.uuid4()
+            created_at = timezone.now()
+            notification_id, group_key = self._insert_or_refresh(data, new_id, created_at)
+            added = notification_id == new_id
+            if self._upsert_group(
+                data.recipient_id, group_key, notification_id, created_at, added=int(added)
+            ):
+                _shift_unread_groups(data.recipient_id, 1)
+        return added
+
     def get_grouped_for_user(
         self,
         user_id: int,
-        cursor_value: datetime,
         limit: int,
         offset: int = 0,
     ) -> list[NotificationGroup]:
-        group_aggregates = (
-            self._build_base_queryset(user_id)
-            .values("group_key")
-            .annotate(
-                count=Count("id"),
-                latest_created_at=Max("created_at"),
-            )
-            .order_by("-latest_created_at")
-        )[offset : offset + limit]
-
-        group_keys = [row["group_key"] for row in group_aggregates]
-        if not group_keys:
-            return []
+        summaries = self._build_feed_queryset(user_id)[offset : offset + limit]
+        return self._to_groups(summaries)
 
-        aggregates_by_key = {row["group_key"]: row for row in group_aggregates}
-        latest_per_group = self._get_latest_notification_per_group(user_id, group_keys)
-        group_reads = self._get_group_reads(user_id, group_keys)
+    def get_grouped_page(
+        self,
+        user_id: int,
+        limit: int,
+        after: NotificationFeedCursor | None = None,
+    ) -> list[NotificationGroup]:
+        summaries = self._build_feed_queryset(user_id)
+        if after is not None:
+            # keyset seek on the feed ordering, served by notif_group_feed_idx
+            summaries = summaries.filter(
+                Q(latest_created_at__lt=after.latest_created_at)
+                | Q(latest_created_at=after.latest_created_at, group_key__lt=after.group_key)
+            )
+        return self._to_groups(summaries[:limit])
 
-        return self._build_notification_groups(
-            latest_per_group,
-            aggregates_by_key,
-            cursor_value,
-            group_reads,
+    def get_unread_group_count(self, user_id: int) -> int:
+        count = (
+            NotificationCursor.objects.filter(user_id=user_id)
+            .values_list("unread_groups", flat=True)
+            .first()
         )
+        return count or 0
 
-    def get_unread_group_count(self, user_id: int, cursor_value: datetime) -> int:
-        unread_keys = (
-            self._build_base_queryset(user_id)
-            .filter(created_at__gt=cursor_value)
-            .values("group_key")
-            .annotate(latest_created_at=Max("created_at"))
+    def delete_by_event_source(
+        self,
+        recipient_id: int,
+        event_types: Collection[str],
+        content_type_id: int,
+        source_id: str,
+    ) -> None:
+        self._delete(
+            recipient_id,
+            Notification.objects.filter(
+                recipient_id=recipient_id,
+                event_type__in=event_types,
+                content_type_id=content_type_id,
+                object_id=source_id,
+            ),
         )
 
-        group_reads = self._get_group_reads(
-            user_id,
-            [row["group_key"] for row in unread_keys],
+    def purge_created_before(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Deletes up to `batch_size` of the oldest notifications created before
+        `cutoff`; call repeatedly until it returns 0.
+        """
+        batch = Notification.objects.filter(created_at__lt=cutoff).order_by("created_at")
+        return self._purge(batch[:batch_size])
+
+    def get_recipients_over_cap(self, max_per_user: int) -> list[int]:
+        return list(
+            Notification.objects.values("recipient_id")
+            .annotate(total=Count("id"))
+            .filter(total__gt=max_per_user)
+            .order_by()
+            .values_list("recipient_id", flat=True)
         )
 
-        count = 0
-        for row in unread_keys:
-            read_at = group_reads.get(row["group_key"])
-            if read_at is None or row["latest_created_at"] > read_at:
-                count += 1
-        return count
+    def purge_over_cap(self, recipient_id: int, max_per_user: int, batch_size: int) -> int:
+        """
+        Deletes up to `batch_size` of the user's notifications beyond their
+        `max_per_user` newest ones.
+        """
+        batch = self._build_base_queryset(recipient_id).order_by("-created_at", "-id")
+        return self._purge(batch[max_per_user : max_per_user + batch_size])
+
+    def _purge(self, batch: QuerySet[Notification]) -> int:
+        with transaction.atomic():
+            rows = list(batch.values_list("id", "recipient_id", "group_key"))
+            if not rows:
+                return 0
+
+            Notification.objects.filter(
+                id__in=[notification_id for notification_id, *_ in rows]
+            ).delete()
+
+            group_keys_by_recipient: dict[int, set[str]] = {}
+            for _, recipient_id, group_key in rows:
+                group_keys_by_recipient.setdefault(recipient_id, set()).add(group_key)
+            for recipient_id, group_keys in group_keys_by_recipient.items():
+                self._refresh_groups(recipient_id, group_keys)
+        return len(rows)
 
     def _build_base_queryset(self, user_id: int) -> QuerySet[Notification]:
         return Notification.objects.filter(recipient_id=user_id)
 
-    def _get_latest_notification_per_group(
-        self,
-        user_id: int,
-        group_keys: list[str],
-    ) -> QuerySet[Notification]:
-        latest_id_per_group = (
-            Notification.objects.filter(
-                recipient_id=user_id,
-                group_key=OuterRef("group_key"),
-            )
-            .order_by("-created_at")
-            .values("id")[:1]
+    def _build_feed_queryset(self, user_id: int) -> QuerySet[NotificationGroupSummary]:
+        return (
+            NotificationGroupSummary.objects.filter(recipient_id=user_id, latest__isnull=False)
+            .select_related("latest__actor")
+            .prefetch_related("latest__source")
+            .order_by("-latest_created_at", "-group_key")
         )
 
-        latest_ids = (
-            Notification.objects.filter(
-                recipient_id=user_id,
-                group_key__in=group_keys,
+    def _to_groups(self, summaries: QuerySet[NotificationGroupSummary]) -> list[NotificationGroup]:
+        return [
+            self._mapper.process(
+                summary.latest,
+                count=summary.count,
+                latest_created_at=summary.latest_created_at,
+                is_unread=summary.is_unread,
             )
-            .values("group_key")
-            .annotate(latest_id=Subquery(latest_id_per_group))
-            .values("latest_id")
-        )
+            for summary in summaries
+            if summary.latest is not None
+        ]
 
-        return (
-            Notification.objects.filter(
-                id__in=Subquery(latest_ids),
+    def _insert_or_refresh(
+        self,
+        data: NotificationCreateData,
+        new_id: uuid.UUID,
+        created_at: datetime,
+    ) -> tuple[uuid.UUID, str]:
+        meta = Notification._meta
+        table = connection.ops.quote_name(meta.db_table)
+        values = [
+            meta.get_field(name).get_db_prep_value(value, connection, prepared=False)
+            for name, value in (
+                ("id", new_id),
+                ("recipient", data.recipient_id),
+                ("event_type", data.event_type),
+                ("group_key", data.group_key),
+                ("content_type", data.content_type.pk),
+                ("object_id", uuid.UUID(str(data.object_id))),
+                ("actor", data.actor_id),
+                ("created_at", created_at),
             )
-            .select_related("actor")
-            .prefetch_related("source")
+        ]
+        # EXCLUDED is the row that failed to insert; the stored group key is
+        # kept so the row never moves between group summaries
+        sql = (
+            f"INSERT INTO {table} (id, recipient_id, event_type, group_key, content_type_id, "
+            "object_id, actor_id, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (recipient_id, event_type, content_type_id, object_id) "
+            "DO UPDATE SET actor_id = EXCLUDED.actor_id, created_at = EXCLUDED.created_at "
+            "RETURNING id, group_key"
         )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, values)
+            row = cursor.fetchone()
+        # DO UPDATE always returns the written row
+        assert row is not None
+        notification_id, group_key = row
+        return uuid.UUID(str(notification_id)), group_key
 
-    def _build_notification_groups(
+    def _upsert_group(
         self,
-        latest_notifications: QuerySet[Notification],
-        aggregates_by_key: dict[str, dict],
-        cursor_value: datetime,
-        group_reads: dict[str, datetime] | None = None,
-    ) -> list[NotificationGroup]:
-        latest_by_key = {n.group_key: n for n in latest_notifications}
-        group_reads = group_reads or {}
-
-        groups = []
-        for group_key, agg in aggregates_by_key.items():
-            latest = latest_by_key.get(group_key)
-            if latest is None:
-                continue
-
-            latest_at = agg["latest_created_at"]
-            read_at = group_reads.get(group_key)
-            is_unread = latest_at > cursor_value and (read_at is None or latest_at > read_at)
-
-            groups.append(
-                self._mapper.process(
-                    latest,
-                    count=agg["count"],
-                    latest_created_at=latest_at,
-                    is_unread=is_unread,
+        recipient_id: int,
+        group_key: str,
+        notification_id: uuid.UUID,
+        created_at: datetime,
+        added: int = 1,
+    ) -> bool:
+        """
+        Folds a written notification into its group summary as the group's
+        latest and reports whether the group has just turned unread.
+        """
+        groups = NotificationGroupSummary.objects.filter(
+            recipient_id=recipient_id,
+            group_key=group_key,
+        )
+        changes = {
+            "count": F("count") + added,
+            "latest_id": notification_id,
+            "latest_created_at": created_at,
+            "is_unread": True,
+        }
+        if groups.filter(is_unread=False).update(**changes):
+            return True
+        if groups.update(**changes):
+            return False
+
+        # first notification of the group: insert an empty read row, tolerating
+        # a concurrent insert of the same one, then fold the notification in
+        NotificationGroupSummary.objects.bulk_create(
+            [
+                NotificationGroupSummary(
+                    recipient_id=recipient_id,
+                    group_key=group_key,
+                    latest_created_at=created_at,
+                    is_unread=False,
                 )
-            )
+            ],
+            ignore_conflicts=True,
+        )
+        if groups.filter(is_unread=False).update(**changes):
+            return True
+        groups.update(**changes)
+        return False
 
-        groups.sort(key=lambda g: g.latest_created_at, reverse=True)
-        return groups
+    def _delete(self, recipient_id: int, notifications: QuerySet[Notification]) -> None:
+        with transaction.atomic():
+            group_keys = set(notifications.values_list("group_key", flat=True))
+            if not group_keys:
+                return
+            notifications.delete()
+            self._refresh_groups(recipient_id, group_keys)
 
-    def delete_by_actor_and_rating(
-        self,
-        recipient_id: int,
-        actor_id: int,
-        rating_id: str,
-    ) -> None:
-        Notification.objects.filter(
+    def _refresh_groups(self, recipient_id: int, group_keys: Iterable[str]) -> None:
+        summaries = NotificationGroupSummary.objects.filter(
             recipient_id=recipient_id,
-            actor_id=actor_id,
-            group_key__endswith=f":{rating_id}",
+            group_key__in=group_keys,
+        )
+        unread_before = summaries.filter(is_unread=True).count()
+        remaining = self._aggregate_groups(recipient_id, group_keys)
+        vanished = summaries.exclude(group_key__in=list(remaining))
+        # a read marker of a group that no longer exists cannot hide anything newer
+        NotificationGroupRead.objects.filter(
+            user_id=recipient_id,
+            group_key__in=vanished.values("group_key"),
         ).delete()
+        vanished.delete()
 
-    def delete_by_event_source(
-        self,
-        recipient_id: int,
-        event_type: str,
-        content_type_id: int,
-        source_id: str,
-    ) -> None:
-        Notification.objects.filter(
-            recipient_id=recipient_id,
-            event_type=event_type,
-            content_type_id=content_type_id,
-            object_id=source_id,
-        ).delete()
+        unread_after = 0
+        if remaining:
+            cursor_value = self._get_cursor_value(recipient_id)
+            group_reads = self._get_group_reads(recipient_id, list(remaining))
+            for group_key, row in remaining.items():
+                read_at = group_reads.get(group_key)
+                latest_at = row["latest_created_at"]
+                is_unread = latest_at > cursor_value and (read_at is None or latest_at > read_at)
+                unread_after += is_unread
+                summaries.filter(group_key=group_key).update(
+                    count=row["count"],
+                    latest_id=row["latest_id"],
+                    latest_created_at=latest_at,
+                    is_unread=is_unread,
+                )
+
+        if unread_after != unread_before:
+            _shift_unread_groups(recipient_id, unread_after - unread_before)
+
+    def _aggregate_groups(self, user_id: int, group_keys: Iterable[str]) -> dict[str, dict]:
+        latest_id_per_group = (
+            Notification.objects.filter(
+                recipient_id=user_id,
+                group_key=OuterRef("group_key"),
+            )
+            .order_by("-created_at")
+            .values("id")[:1]
+        )
+        rows = (
+            Notification.objects.filter(recipient_id=user_id, group_key__in=group_keys)
+            .values("group_key")
+            .annotate(
+                count=Count("id"),
+                latest_created_at=Max("created_at"),
+                latest_id=Subquery(latest_id_per_group, output_field=UUIDField()),
+            )
+            .order_by()
+        )
+        return {row["group_key"]: row for row in rows}
+
+    def _get_cursor_value(self, user_id: int) -> datetime:
+        cursor_value = (
+            NotificationCursor.objects.filter(user_id=user_id)
+            .values_list("last_read_at", flat=True)
+            .first()
+        )
+        return cursor_value or NOTIFICATION_CURSOR_EPOCH
 
     def _get_group_reads(self, user_id: int, group_keys: list[str]) -> dict[str, datetime]:
         if not group_keys:
@@ -195,15 +378,27 @@ class NotificationCursorRepository(ICursorRepository[datetime]):
         return cursor.last_read_at
 
     def advance_cursor(self, user_id: int) -> None:
-        NotificationCursor.objects.update_or_create(
-            user_id=user_id,
-            defaults={"last_read_at": timezone.now()},
-        )
-        NotificationGroupRead.objects.filter(user_id=user_id).delete()
+        with transaction.atomic():
+            NotificationCursor.objects.update_or_create(
+                user_id=user_id,
+                defaults={"last_read_at": timezone.now(), "unread_groups": 0},
+            )
+            NotificationGroupSummary.objects.filter(recipient_id=user_id, is_unread=True).update(
+                is_unread=False
+            )
+            NotificationGroupRead.objects.filter(user_id=user_id).delete()
 
     def mark_group_read(self, user_id: int, group_key: str) -> None:
-        NotificationGroupRead.objects.update_or_create(
-            user_id=user_id,
-            group_key=group_key,
-            defaults={"read_at": timezone.now()},
-        )
+        with transaction.atomic():
+            NotificationGroupRead.objects.update_or_create(
+                user_id=user_id,
+                group_key=group_key,
+                defaults={"read_at": timezone.now()},
+            )
+            marked = NotificationGroupSummary.objects.filter(
+                recipient_id=user_id,
+                group_key=group_key,
+                is_unread=True,
+            ).update(is_unread=False)
+            if marked:
+                _shift_unread_groups(user_id, -marked)
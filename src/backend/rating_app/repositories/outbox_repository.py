@@ -0,0 +1,56 @@
+from collections.abc import Mapping, Sequence
+from datetime import timedelta
+from typing import Any
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from rating_app.application_schemas.outbox import PendingOutboxMessage
+from rating_app.models import OutboxMessage
+from rating_app.models.choices import OutboxTopic
+
+
+class OutboxRepository:
+    def add(self, topic: OutboxTopic, payload: dict[str, Any]) -> None:
+        OutboxMessage.objects.create(topic=topic, payload=payload)
+
+    def claim_batch(
+        self,
+        limit: int,
+        max_attempts: int,
+        settle_windows: Mapping[OutboxTopic, timedelta] | None = None,
+    ) -> list[PendingOutboxMessage]:
+        """Lock the oldest deliverable messages; must run inside a transaction.
+
+        Locked rows are skipped, so several workers can drain the outbox at once.
+        Messages of a topic with a settle window are left until they are older than
+        it, so bursts of them are delivered together.
+        """
+        now = timezone.now()
+        unsettled = Q()
+        for topic, window in (settle_windows or {}).items():
+            unsettled |= Q(topic=topic, created_at__gt=now - window)
+
+        messages = (
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(attempts__lt=max_attempts)
+            .exclude(unsettled)
+            .order_by("created_at", "id")
+            .values("id", "topic", "payload", "attempts")[:limit]
+        )
+        return [
+            PendingOutboxMessage(
+                id=message["id"],
+                topic=OutboxTopic(message["topic"]),
+                payload=message["payload"],
+                attempts=message["attempts"],
+            )
+            for message in messages
+        ]
+
+    def delete_many(self, ids: Sequence[Any]) -> None:
+        if ids:
+            OutboxMessage.objects.filter(pk__in=ids).delete()
+
+    def record_failure(self, id: Any, error: str) -> None:
+        OutboxMessage.objects.filter(pk=id).update(attempts=F("attempts") + 1, last_error=error)
@@ -6,7 +6,6 @@ T_DTO = TypeVar("T_DTO")  # Domain model type
 T_ORM = TypeVar("T_ORM", covariant=True)  # ORM model type
 T_Criteria = TypeVar("T_Criteria", contravariant=True)  # Filter criteria type
 T_CreateData = TypeVar("T_CreateData", contravariant=True)  # Create/upsert input type
-T_CursorIn = TypeVar("T_CursorIn", contravariant=True)
 T_CursorOut = TypeVar("T_CursorOut", covariant=True)
 
 
@@ -145,7 +144,7 @@ class IPaginatedRepository(Protocol[T_DTO, T_ORM, T_Criteria, T_CreateData]):
     def delete(self, id: str) -> None: ...
 
 
-class IAppendOnlyRepository(Protocol[T_DTO, T_CreateData, T_CursorIn]):
+class IAppendOnlyRepository(Protocol[T_DTO, T_CreateData]):
     """
     Repository for append-only entities with grouped reads (e.g., notifications, audit logs)
     """
@@ -155,12 +154,11 @@ class IAppendOnlyRepository(Protocol[T_DTO, T_CreateData, T_CursorIn]):
     def get_grouped_for_user(
         self,
         user_id: int,
-        cursor_value: T_CursorIn,
         limit: int,
         offset: int = 0,
     ) -> list[T_DTO]: ...
 
-    def get_unread_group_count(self, user_id: int, cursor_value: T_CursorIn) -> int: ...
+    def get_unread_group_count(self, user_id: int) -> int: ...
 
 
 class ICursorRepository(Protocol[T_CursorOut]):
@@ -1,21 +1,24 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from decimal import Decimal
 from typing import Any, Literal, overload
 
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import DataError, IntegrityError
+from django.db import DataError, IntegrityError, transaction
 from django.db.models import (
     Avg,
     Case,
     CharField,
     Count,
-    Exists,
-    OuterRef,
-    Prefetch,
+    F,
     Q,
     QuerySet,
+    Sum,
     When,
+    Window,
 )
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, RowNumber
 
 import structlog
 
@@ -25,21 +28,25 @@ from rating_app.application_schemas.pagination import PaginationFilters, Paginat
 from rating_app.application_schemas.rating import (
     AggregatedCourseRatingStats,
     RatingCreateParams,
+    RatingEligibility,
     RatingFilterCriteria,
+    RatingInstructor,
     RatingPatchParams,
     RatingPutParams,
 )
 from rating_app.application_schemas.rating import (
     Rating as RatingDTO,
 )
+from rating_app.application_schemas.rating_vote import RatingVoteTarget
+from rating_app.application_schemas.semester import SemesterInput
 from rating_app.constants import COMMENT_AUTHOR_PREVIEW_LIMIT
 from rating_app.exception.rating_exceptions import (
     DuplicateRatingException,
     InvalidRatingIdentifierError,
     RatingNotFoundError,
 )
-from rating_app.models import Comment, Rating
-from rating_app.models.choices import RatingVoteType
+from rating_app.models import Comment, Enrollment, Instructor, Rating
+from rating_app.models.choices import EnrollmentStatus, RatingVoteType, SemesterTerm
 from rating_app.pagination import GenericQuerysetPaginator
 from rating_app.queries.rating_popularity import WilsonPopularityAnnotator
 from rating_app.repositories.protocol import IPaginatedRepository
@@ -50,6 +57,8 @@ logger = structlog.get_logger(__name__)
 class RatingRepository(
     IPaginatedRepository[RatingDTO, Rating, RatingFilterCriteria, RatingCreateParams]
 ):
+    _COMMENT_PREVIEW_ATTR = "comment_preview_comments"
+
     def __init__(
         self,
         mapper: IProcessor[[Rating], RatingDTO],
@@ -81,6 +90,35 @@ class RatingRepository(
         )
         return self._map_to_domain_models(ratings)
 
+    def get_vote_target(self, rating_id: str) -> RatingVoteTarget:
+        try:
+            row = (
+                Rating.objects.filter(pk=rating_id)
+                .values(
+                    "course_offering__course_id",
+                    "course_offering__semester__year",
+                    "course_offering__semester__term",
+                    "student_id",
+                    "student__user_id",
+                )
+                .first()
+            )
+        except (DjangoValidationError, ValueError, TypeError, DataError) as err:
+            raise InvalidRatingIdentifierError(rating_id) from err
+        if row is None:
+            raise RatingNotFoundError()
+
+        return RatingVoteTarget(
+            rating_id=uuid.UUID(str(rating_id)),
+            course_id=row["course_offering__course_id"],
+            semester=SemesterInput(
+                year=row["course_offering__semester__year"],
+                term=row["course_offering__semester__term"],
+            ),
+            author_student_id=row["student_id"],
+            author_user_id=row["student__user_id"],
+        )
+
     def get_student_id_by_rating_id(self, rating_id: str) -> str | None:
         try:
             student_id = (
@@ -172,14 +210,34 @@ class RatingRepository(
 
     def get_aggregated_course_stats(self, course: CourseDTO) -> AggregatedCourseRatingStats:
         aggregates = Rating.objects.filter(course_offering__course=str(course.id)).aggregate(
-            avg_difficulty=Avg("difficulty"),
-            avg_usefulness=Avg("usefulness"),
-            ratings_count=Count("id"),
+            **self._course_stats_aggregates()
         )
+        return self._to_course_stats(aggregates)
+
+    def get_aggregated_stats_by_course(self) -> dict[str, AggregatedCourseRatingStats]:
+        rows = (
+            Rating.objects.values("course_offering__course_id")
+            .annotate(**self._course_stats_aggregates())
+            .order_by()
+        )
+        return {str(row["course_offering__course_id"]): self._to_course_stats(row) for row in rows}
+
+    def _course_stats_aggregates(self) -> dict[str, Any]:
+        return {
+            "avg_difficulty": Avg("difficulty"),
+            "avg_usefulness": Avg("usefulness"),
+            "ratings_count": Count("id"),
+            "difficulty_sum": Sum("difficulty"),
+            "usefulness_sum": Sum("usefulness"),
+        }
+
+    def _to_course_stats(self, aggregates: dict[str, Any]) -> AggregatedCourseRatingStats:
         return AggregatedCourseRatingStats(
             avg_difficulty=aggregates.get("avg_difficulty") or Decimal(0),
             avg_usefulness=aggregates.get("avg_usefulness") or Decimal(0),
             ratings_count=aggregates.get("ratings_count") or 0,
+            difficulty_sum=aggregates.get("difficulty_sum") or 0,
+            usefulness_sum=aggregates.get("usefulness_sum") or 0,
         )
 
     def exists(self, student_id: str, course_offering_id: str) -> bool:
@@ -188,6 +246,36 @@ class RatingRepository(
             course_offering_id=course_offering_id,
         ).exists()
 
+    def get_rating_eligibility(
+        self, student_id: str, course_offering_id: str
+    ) -> RatingEligibility | None:
+        """Read the enrollment, offering and semester a new rating depends on.
+
+        Returns ``None`` when the student is not enrolled in the offering.
+        """
+        enrollment = (
+            Enrollment.objects.select_related("student", "offering__semester")
+            .filter(
+                student_id=student_id,
+                offering_id=course_offering_id,
+                status__in=[EnrollmentStatus.ENROLLED, EnrollmentStatus.FORCED],
+            )
+            .first()
+        )
+        if enrollment is None:
+            return None
+
+        student = enrollment.student
+        semester = enrollment.offering.semester
+        return RatingEligibility(
+            student_id=student.id,
+            student_name=f"{student.last_name} {student.first_name}",
+            student_avatar_url=student.avatar.url if student.avatar else None,
+            course_offering_id=enrollment.offering_id,
+            course_id=enrollment.offering.course_id,
+            semester=SemesterInput(year=semester.year, term=semester.term),
+        )
+
     @overload
     def filter(
         self,
@@ -211,7 +299,7 @@ class RatingRepository(
 
         if pagination is not None:
             result = self.paginator.process(qs, pagination)
-            dtos = [self.mapper.process(model) for model in result.page_objects]
+            dtos = self._map_to_domain_models(result.page_objects)
             return PaginationResult(
                 page_objects=dtos,
                 metadata=result.metadata,
@@ -219,37 +307,60 @@ class RatingRepository(
 
         return self._map_to_domain_models(qs)
 
-    def create(self, create_params: RatingCreateParams) -> RatingDTO:
+    def create(
+        self,
+        create_params: RatingCreateParams,
+        *,
+        eligibility: RatingEligibility | None = None,
+        instructors: Sequence[Instructor] = (),
+    ) -> RatingDTO:
+        """Insert a rating together with its instructor links.
+
+        Callers that already hold the ``eligibility`` and the resolved
+        ``instructors`` get the DTO built from them; otherwise it is refetched.
+        The unique (student, course_offering) constraint rejects duplicates.
+        """
         try:
-            rating = Rating.objects.create(
-                student_id=str(create_params.student),
-                course_offering_id=str(create_params.course_offering),
-                difficulty=create_params.difficulty,
-                usefulness=create_params.usefulness,
-                comment=create_params.comment or "",
-                instructor=create_params.instructor or "",
-                is_anonymous=create_params.is_anonymous,
-            )
+            with transaction.atomic():
+                rating = Rating.objects.create(
+                    student_id=str(create_params.student),
+                    course_offering_id=str(create_params.course_offering),
+                    difficulty=create_params.difficulty,
+                    usefulness=create_params.usefulness,
+                    comment=create_params.comment or "",
+                    instructor=create_params.instructor or "",
+                    is_anonymous=create_params.is_anonymous,
+                )
+                self._link_instructors(rating.pk, create_params.instructor_ids)
         except IntegrityError as err:
-            raise DuplicateRatingException() from err
+            # anything else, e.g. a concurrently deleted instructor, is not a duplicate
+            if self.exists(str(create_params.student), str(create_params.course_offering)):
+                raise DuplicateRatingException() from err
+            raise
 
-        if create_params.instructor_ids:
-            rating.instructors.set([str(iid) for iid in create_params.instructor_ids])
+        if eligibility is None:
+            # Refetch with related fields for mapper
+            rating = self._build_lightweight_queryset().get(pk=rating.pk)
+            return self._map_to_domain_model(rating)
 
-        # Refetch with related fields for mapper
-        rating = self._build_lightweight_queryset().get(pk=rating.pk)
-        return self._map_to_domain_model(rating)
+        return self._build_created_rating(rating, eligibility, instructors)
 
     def update(
         self,
         obj: RatingDTO,
         update_data: RatingPutParams | RatingPatchParams,
+        *,
+        instructors: Sequence[Instructor] | None = None,
     ) -> RatingDTO:
-        rating_model = self._get_by_id_shallow(str(obj.id))
+        """Write the changed fields and return ``obj`` with them applied.
+
+        When ``instructor_ids`` change, ``instructors`` should carry the
+        resolved instructors; without them the rating is refetched.
+        """
         is_patch = isinstance(update_data, RatingPatchParams)
         update_data_map = update_data.model_dump(exclude_unset=is_patch)
 
-        # M2M not assignable via setattr — pop it first.
+        # M2M is not a column — pop it first.
         instructor_ids = update_data_map.pop("instructor_ids", None)
 
         # normalizing nullable text fields to empty strings for the DB
@@ -258,16 +369,14 @@ class RatingRepository(
             if field in update_data_map and update_data_map[field] is None:
                 update_data_map[field] = ""
 
-        for attr, value in update_data_map.items():
-            setattr(rating_model, attr, value)
-
-        try:
-            rating_model.save()
-        except IntegrityError as err:
-            raise DuplicateRatingException() from err
-
-        if instructor_ids is not None:
-            rating_model.instructors.set([str(iid) for iid in instructor_ids])
+        # (student, course_offering) never changes here, so no write can duplicate a rating
+        with transaction.atomic():
+            if update_data_map:
+                updated = Rating.objects.filter(pk=obj.id).update(**update_data_map)
+                if not updated:
+                    raise RatingNotFoundError(str(obj.id))
+            if instructor_ids is not None:
+                self._replace_instructors(obj.id, instructor_ids)
 
         logger.info(
             "rating_partially_updated",
@@ -277,14 +386,75 @@ class RatingRepository(
             + (["instructor_ids"] if instructor_ids is not None else []),
         )
 
-        rating_model = self._build_base_queryset().get(pk=rating_model.pk)
-        return self._map_to_domain_model(rating_model)
+        if instructor_ids is not None and instructors is None:
+            return self._map_to_domain_model(self._build_base_queryset().get(pk=obj.id))
+
+        # the DTO keeps empty text fields as None, mirroring RatingMapper
+        changes: dict[str, Any] = dict(update_data_map)
+        for field in ("comment", "instructor"):
+            if field in changes:
+                changes[field] = changes[field] or None
+        if instructors is not None and instructor_ids is not None:
+            changes["instructors"] = self._to_rating_instructors(instructors)
+        return obj.model_copy(update=changes)
 
     def delete(self, id: str) -> None:
-        rating_model = self._get_by_id_shallow(id)
-        rating_model.delete()
+        try:
+            deleted, _ = Rating.objects.filter(pk=id).delete()
+        except (ValueError, TypeError, DataError, DjangoValidationError) as exc:
+            logger.warning("invalid_rating_identifier", rating_id=id, error=str(exc))
+            raise InvalidRatingIdentifierError(id) from exc
+
+        if not deleted:
+            logger.warning("rating_not_found", rating_id=id)
+            raise RatingNotFoundError(id)
         logger.info("rating_deleted", rating_id=id)
 
+    def _link_instructors(self, rating_id: Any, instructor_ids: Iterable[Any]) -> None:
+        through = Rating.instructors.through
+        through.objects.bulk_create(
+            [
+                through(rating_id=rating_id, instructor_id=instructor_id)
+                for instructor_id in dict.fromkeys(instructor_ids)
+            ]
+        )
+
+    def _replace_instructors(self, rating_id: Any, instructor_ids: Iterable[Any]) -> None:
+        Rating.instructors.through.objects.filter(rating_id=rating_id).delete()
+        self._link_instructors(rating_id, instructor_ids)
+
+    def _build_created_rating(
+        self,
+        rating: Rating,
+        eligibility: RatingEligibility,
+        instructors: Sequence[Instructor],
+    ) -> RatingDTO:
+        # a rating that was just inserted has no votes or comments yet
+        return RatingDTO(
+            id=rating.id,
+            student_id=eligibility.student_id,
+            student_name=eligibility.student_name,
+            student_avatar_url=eligibility.student_avatar_url,
+            course_offering=eligibility.course_offering_id,
+            course_offering_term=SemesterTerm(eligibility.semester.term),
+            course_offering_year=eligibility.semester.year,
+            course=eligibility.course_id,
+            difficulty=rating.difficulty,
+            usefulness=rating.usefulness,
+            comment=rating.comment or None,
+            instructor=rating.instructor or None,
+            instructors=self._to_rating_instructors(instructors),
+            is_anonymous=rating.is_anonymous,
+            created_at=rating.created_at,
+            upvotes=0,
+            downvotes=0,
+            viewer_vote=None,
+            comments_count=0,
+        )
+
+    def _to_rating_instructors(self, instructors: Sequence[Instructor]) -> list[RatingInstructor]:
+        return [RatingInstructor.model_validate(instructor) for instructor in instructors]
+
     def _filter(self, criteria: RatingFilterCriteria) -> QuerySet[Rating]:
         ratings = self._build_base_queryset()
         ratings = self._apply_filters(ratings, criteria)
@@ -295,10 +465,13 @@ class RatingRepository(
 
         return ratings
 
-    def _map_to_domain_models(self, models: QuerySet[Rating]) -> list[RatingDTO]:
-        return [self._map_to_domain_model(model) for model in models]
+    def _map_to_domain_models(self, models: Iterable[Rating]) -> list[RatingDTO]:
+        ratings = list(models)
+        self._attach_comment_author_previews(ratings)
+        return [self.mapper.process(model) for model in ratings]
 
     def _map_to_domain_model(self, model: Rating) -> RatingDTO:
+        self._attach_comment_author_previews([model])
         return self.mapper.process(model)
 
     def _build_query_filters(self, criteria: RatingFilterCriteria) -> dict[str, Any]:
@@ -342,26 +515,40 @@ class RatingRepository(
             "course_offering__course",
             "course_offering__semester",
             "student",
-        ).prefetch_related(
-            "instructors",
-            Prefetch(
-                "comments",
-                queryset=self._build_latest_unique_comment_authors_queryset(),
-                to_attr="comment_preview_comments",
-            ),
-        )
+        ).prefetch_related("instructors")
+
+    def _attach_comment_author_previews(self, ratings: Sequence[Rating]) -> None:
+        previews: defaultdict[Any, list[Comment]] = defaultdict(list)
+        if ratings:
+            rating_ids = [rating.pk for rating in ratings]
+            for comment in self._build_latest_unique_comment_authors_queryset(rating_ids):
+                previews[comment.rating_id].append(comment)
 
-    def _build_latest_unique_comment_authors_queryset(self) -> QuerySet[Comment]:
+        for rating in ratings:
+            setattr(rating, self._COMMENT_PREVIEW_ATTR, previews[rating.pk])
+
+    def _build_latest_unique_comment_authors_queryset(
+        self, rating_ids: Sequence[Any]
+    ) -> QuerySet[Comment]:
         # TODO: Consider moving logic to a higher level
         # This query mixes persistence details with preview/business rules
-        author_key = self._comment_author_key()
-        newer_same_author_comment = (
-            Comment.objects.annotate(author_key=author_key)
-            .filter(rating_id=OuterRef("rating_id"), author_key=OuterRef("author_key"))
-            .filter(
-                Q(created_at__gt=OuterRef("created_at"))
-                | Q(created_at=OuterRef("created_at"), id__gt=OuterRef("id"))
+
+        # Two window passes in one statement: the inner one keeps each author's
+        # latest comment per rating, the outer one caps the survivors per rating.
+        # They cannot share a query level: the outer rank must only count rows
+        # that survived the inner filter.
+        newest_first = [F("created_at").desc(), F("id").desc()]
+        latest_comment_per_author = (
+            Comment.objects.filter(rating_id__in=rating_ids)
+            .annotate(
+                author_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("rating_id"), self._comment_author_key()],
+                    order_by=newest_first,
+                )
             )
+            .filter(author_rank=1)
+            .values("id")
         )
 
         return (
@@ -369,9 +556,16 @@ class RatingRepository(
                 "user",
                 "user__student_profile",
             )
-            .annotate(author_key=author_key)
-            .filter(~Exists(newer_same_author_comment))
-            .order_by("-created_at", "-id")[:COMMENT_AUTHOR_PREVIEW_LIMIT]
+            .filter(id__in=latest_comment_per_author)
+            .annotate(
+                preview_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("rating_id")],
+                    order_by=newest_first,
+                )
+            )
+            .filter(preview_rank__lte=COMMENT_AUTHOR_PREVIEW_LIMIT)
+            .order_by("rating_id", "preview_rank")
         )
 
     def _comment_author_key(self):
@@ -415,13 +609,3 @@ class RatingRepository(
     def _apply_time_ordering(self, queryset: QuerySet[Rating], order: str) -> QuerySet[Rating]:
         prefix = "" if order == "asc" else "-"
         return queryset.order_by(f"{prefix}created_at", f"{prefix}id")
-
-    def _get_by_id_shallow(self, rating_id: str) -> Rating:
-        try:
-            return Rating.objects.get(pk=rating_id)
-        except Rating.DoesNotExist as exc:
-            logger.warning("rating_not_found", rating_id=rating_id, error=str(exc))
-            raise RatingNotFoundError(rating_id) from exc
-        except (ValueError, TypeError, DataError) as exc:
-            logger.warning("invalid_rating_identifier", rating_id=rating_id, error=str(exc))
-            raise InvalidRatingIdentifierError(rating_id) from exc
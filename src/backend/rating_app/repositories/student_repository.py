@@ -1,14 +1,18 @@
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from typing import Literal, overload
 
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import DataError
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 
 import structlog
 
+from rating_app.application_schemas.ingestion import UpsertCounts
 from rating_app.application_schemas.student import Student as StudentDTO
 from rating_app.application_schemas.student import StudentInput
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
 from rating_app.exception.student_exceptions import (
     InvalidStudentIdentifierError,
     StudentNotFoundError,
@@ -35,6 +39,12 @@ class StudentRepository(IDomainOrmRepository[StudentDTO, Student]):
         model = self._get_by_id(id)
         return self._map_to_domain_model(model)
 
+    def get_user_id(self, student_id: str) -> int | None:
+        try:
+            return Student.objects.filter(pk=student_id).values_list("user_id", flat=True).first()
+        except (ValueError, TypeError, DjangoValidationError, DataError):
+            return None
+
     def get_by_email(self, email: str) -> StudentDTO | None:
         """Get a student by email that is not yet linked to a user."""
         try:
@@ -128,6 +138,68 @@ class StudentRepository(IDomainOrmRepository[StudentDTO, Student]):
             return model, created
         return self._map_to_domain_model(model), created
 
+    def bulk_get_or_upsert(
+        self,
+        data: Sequence[StudentInput],
+        counts: UpsertCounts | None = None,
+        candidates: Iterable[Student] | None = None,
+    ) -> list[tuple[Student, bool]]:
+        """
+        get_or_upsert for a whole batch with the same matching rules. Candidates are
+        loaded in one query, or taken from ``candidates`` when the caller has them
+        preloaded, and matched in input order, so later items see the students created
+        or changed by earlier ones; the result is written with one insert and one
+        update. Returns (model, created) pairs in input order and adds the distinct
+        students written or matched to ``counts`` when given.
+        """
+        if candidates is None:
+            candidates = self._load_upsert_candidates(data)
+        index = _StudentMatchIndex(candidates)
+
+        resolved: list[tuple[Student, bool]] = []
+        created: list[Student] = []
+        changed: dict[object, Student] = {}
+        changed_fields: set[str] = set()
+        for item in data:
+            model = self._find_in_index(index, item)
+            if model is None:
+                model = Student(
+                    first_name=item.first_name,
+                    last_name=item.last_name,
+                    patronymic=item.patronymic or "",
+                    education_level=item.education_level,
+                    speciality_id=item.speciality_id,
+                    **self._build_defaults(item),
+                )
+                index.add(model)
+                created.append(model)
+                resolved.append((model, True))
+                continue
+
+            index.remove(model)
+            updated_fields = self._apply_updates(model, item)
+            index.add(model)
+            if updated_fields and not model._state.adding:
+                changed[model.pk] = model
+                changed_fields.update(updated_fields)
+            resolved.append((model, False))
+
+        Student.objects.bulk_create(created, batch_size=INGESTION_BULK_WRITE_BATCH_SIZE)
+        if changed:
+            Student.objects.bulk_update(
+                list(changed.values()),
+                fields=sorted(changed_fields),
+                batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+            )
+        if counts is not None:
+            matched = len({model.pk for model, _ in resolved})
+            counts.add(
+                inserted=len(created),
+                updated=len(changed),
+                unchanged=matched - len(created) - len(changed),
+            )
+        return resolved
+
     def update(self, obj: StudentDTO, **student_data: object) -> StudentDTO:
         model = self._get_by_id(str(obj.id))
         for field, value in student_data.items():
@@ -150,6 +222,16 @@ class StudentRepository(IDomainOrmRepository[StudentDTO, Student]):
         model.save(update_fields=["user"])
         return self._map_to_domain_model(model)
 
+    def bulk_link_to_users(self, links: Sequence[tuple[Student, object]]) -> None:
+        """Link each student to its user in one UPDATE per write batch."""
+        for model, user in links:
+            model.user = user  # type: ignore[assignment]
+        Student.objects.bulk_update(
+            [model for model, _ in links],
+            fields=["user"],
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+
     def _build_defaults(self, data: StudentInput | StudentDTO) -> dict:
         return {
             "email": data.email or "",
@@ -187,6 +269,44 @@ class StudentRepository(IDomainOrmRepository[StudentDTO, Student]):
             .first()
         )
 
+    def _load_upsert_candidates(self, data: Sequence[StudentInput]) -> list[Student]:
+        emails = {item.email for item in data if item.email}
+        first_names = {item.first_name for item in data}
+        last_names = {item.last_name for item in data}
+        return list(
+            self._build_base_queryset().filter(
+                Q(email__in=emails) | Q(first_name__in=first_names, last_name__in=last_names)
+            )
+        )
+
+    def _find_in_index(self, index: "_StudentMatchIndex", data: StudentInput) -> Student | None:
+        # mirrors _find_existing_for_upsert against the in-memory candidates
+        if data.email:
+            email_matches = index.get_by_email(data.email)
+            if email_matches:
+                linked_student = next(
+                    (student for student in email_matches if student.user_id is not None),
+                    None,
+                )
+                if len(email_matches) > 1 and data.email not in self._duplicate_email_warnings_seen:
+                    self._duplicate_email_warnings_seen.add(data.email)
+                    logger.warning(
+                        "multiple_students_with_same_email_on_upsert",
+                        email=data.email,
+                        student_ids=[str(student.id) for student in email_matches],
+                    )
+                return linked_student or email_matches[0]
+
+        return index.get_first_by_identity(
+            (
+                data.first_name,
+                data.last_name,
+                data.patronymic or "",
+                str(data.education_level),
+                str(data.speciality_id),
+            )
+        )
+
     def _apply_updates(self, model: Student, data: StudentInput | StudentDTO) -> list[str]:
         updated_fields: list[str] = []
 
@@ -245,3 +365,42 @@ class StudentRepository(IDomainOrmRepository[StudentDTO, Student]):
 
     def _map_to_domain_model(self, model: Student) -> StudentDTO:
         return self._mapper.process(model)
+
+
+class _StudentMatchIndex:
+    """
+    Students indexed by the two keys get_or_upsert matches on; lookups return
+    students in primary key order, like the ordered queries they stand in for.
+    """
+
+    def __init__(self, students: Iterable[Student]) -> None:
+        self._by_email: dict[str, list[Student]] = defaultdict(list)
+        self._by_identity: dict[tuple[str, str, str, str, str], list[Student]] = defaultdict(list)
+        for student in students:
+            self.add(student)
+
+    def add(self, student: Student) -> None:
+        if student.email:
+            self._by_email[student.email].append(student)
+        self._by_identity[self._identity_key(student)].append(student)
+
+    def remove(self, student: Student) -> None:
+        if student.email:
+            self._by_email[student.email].remove(student)
+        self._by_identity[self._identity_key(student)].remove(student)
+
+    def get_by_email(self, email: str) -> list[Student]:
+        return sorted(self._by_email.get(email, ()), key=lambda student: student.pk)
+
+    def get_first_by_identity(self, key: tuple[str, str, str, str, str]) -> Student | None:
+        matches = self._by_identity.get(key)
+        return min(matches, key=lambda student: student.pk) if matches else None
+
+    def _identity_key(self, student: Student) -> tuple[str, str, str, str, str]:
+        return (
+            student.first_name,
+            student.last_name,
+            student.patronymic,
+            str(student.education_level),
+            str(student.speciality_id),
+        )
@@ -1,6 +1,8 @@
+import uuid
+from collections.abc import Collection
 from typing import Any
 
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch, Q, QuerySet
 
 from rating_app.application_schemas.student import Student as StudentDTO
 from rating_app.exception.student_exceptions import StudentNotFoundError
@@ -35,11 +37,15 @@ class StudentStatisticsRepository:
             raise StudentNotFoundError() from err
         return self._mapper.process(model)
 
-    def get_rating_stats(self, student_id: str) -> list[dict[str, Any]]:
+    def get_rating_stats(
+        self,
+        student_id: str,
+        offering_ids: Collection[uuid.UUID | str] | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Returns a lightweight rating history for a student.
         Each record is an attended course with its offerings
-        (those that student was enrolled in).
+        (those that student was enrolled in, or `offering_ids` when already known).
         """
         student_ratings = Prefetch(
             "ratings",
@@ -48,13 +54,9 @@ class StudentStatisticsRepository:
         )
 
         offerings_qs = (
-            CourseOffering.objects.filter(
-                Q(enrollments__student_id=student_id)
-                & (Q(enrollments__status="ENROLLED") | Q(enrollments__status="FORCED"))
-            )
+            self._build_enrolled_offerings_queryset(student_id, offering_ids)
             .select_related("course", "semester")
             .prefetch_related(student_ratings)
-            .distinct()
         )
 
         courses_dict: dict[str, dict[str, Any]] = {}
@@ -92,7 +94,11 @@ class StudentStatisticsRepository:
 
         return list(courses_dict.values())
 
-    def get_detailed_rating_stats(self, student_id: str) -> list[dict[str, Any]]:
+    def get_detailed_rating_stats(
+        self,
+        student_id: str,
+        offering_ids: Collection[uuid.UUID | str] | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Returns detailed rating history for a student.
         Each record is an attended course offering.
@@ -105,13 +111,9 @@ class StudentStatisticsRepository:
         )
 
         offerings_qs = (
-            CourseOffering.objects.filter(
-                Q(enrollments__student_id=student_id)
-                & (Q(enrollments__status="ENROLLED") | Q(enrollments__status="FORCED"))
-            )
+            self._build_enrolled_offerings_queryset(student_id, offering_ids)
             .select_related("course", "semester")
             .prefetch_related(student_ratings)
-            .distinct()
             .order_by("semester__year", "semester__term", "course__title")
         )
 
@@ -144,3 +146,16 @@ class StudentStatisticsRepository:
             )
 
         return result
+
+    def _build_enrolled_offerings_queryset(
+        self,
+        student_id: str,
+        offering_ids: Collection[uuid.UUID | str] | None,
+    ) -> QuerySet[CourseOffering]:
+        if offering_ids is not None:
+            # the cached eligibility set spares the enrollment join and DISTINCT
+            return CourseOffering.objects.filter(id__in=offering_ids)
+        return CourseOffering.objects.filter(
+            Q(enrollments__student_id=student_id)
+            & (Q(enrollments__status="ENROLLED") | Q(enrollments__status="FORCED"))
+        ).distinct()
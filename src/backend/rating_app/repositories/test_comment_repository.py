@@ -1,8 +1,14 @@
 import uuid
 
 import pytest
-
-from rating_app.application_schemas.comment import CommentCreateParams, CommentUpsertParams
+from freezegun import freeze_time
+
+from rating_app.application_schemas.comment import (
+    CommentCreateParams,
+    CommentFilterCriteria,
+    CommentUpsertParams,
+)
+from rating_app.constants import COMMENT_REPLY_PREVIEW_LIMIT
 from rating_app.models import Comment
 from rating_app.pagination import GenericQuerysetPaginator
 from rating_app.repositories.comment_repository import CommentRepository
@@ -77,3 +83,91 @@ def test_get_or_upsert_updates_comment_with_param_id(repo, rating_factory, user)
     comment = Comment.objects.get(id=comment_id)
     assert comment.content == "Updated comment"
     assert comment.is_anonymous is True
+
+
+@pytest.mark.django_db
+def test_get_thread_keys_reads_rating_author_and_parent_chain_in_one_query(
+    django_assert_num_queries, repo, rating_factory, user
+):
+    # Arrange
+    rating = rating_factory(student__user=user)
+    root = Comment.objects.create(rating=rating, user=user, content="Root")
+    reply = Comment.objects.create(rating=rating, user=user, content="Reply", parent_comment=root)
+
+    # Act
+    with django_assert_num_queries(1):
+        keys = repo.get_thread_keys(rating.id, reply.id)
+
+    # Assert
+    assert keys.rating_author_user_id == user.id
+    assert keys.parent_rating_id == rating.id
+    assert keys.parent_parent_id == root.id
+
+
+@pytest.mark.django_db
+def test_get_thread_keys_for_missing_parent_has_no_parent_rating(repo, rating_factory):
+    # Arrange
+    rating = rating_factory()
+
+    # Act
+    keys = repo.get_thread_keys(rating.id, uuid.uuid4())
+
+    # Assert
+    assert keys.rating_author_user_id is None
+    assert keys.parent_rating_id is None
+
+
+@pytest.mark.django_db
+@freeze_time("2024-03-01 12:00:00", auto_tick_seconds=1)
+def test_filter_previews_first_replies_per_comment_in_one_extra_query(
+    django_assert_num_queries, repo, rating_factory, comment_factory
+):
+    # Arrange
+    rating = rating_factory()
+    busy, quiet = comment_factory.create_batch(2, rating=rating)
+    busy_replies = comment_factory.create_batch(
+        COMMENT_REPLY_PREVIEW_LIMIT + 2, rating=rating, parent_comment=busy
+    )
+    quiet_reply = comment_factory(rating=rating, parent_comment=quiet)
+
+    # Act
+    # 1) page of comments with reply counts, 2) capped reply previews
+    with django_assert_num_queries(2):
+        comments = repo.filter(CommentFilterCriteria(rating_id=rating.id))
+
+    # Assert
+    assert [comment.id for comment in comments] == [busy.id, quiet.id]
+    assert comments[0].replies_count == COMMENT_REPLY_PREVIEW_LIMIT + 2
+    assert [reply.id for reply in comments[0].reply_previews] == [
+        reply.id for reply in busy_replies[:COMMENT_REPLY_PREVIEW_LIMIT]
+    ]
+    assert [reply.id for reply in comments[1].reply_previews] == [quiet_reply.id]
+    assert comments[1].reply_previews[0].parent_id == quiet.id
+
+
+@pytest.mark.django_db
+@freeze_time("2024-03-01 12:00:00", auto_tick_seconds=1)
+def test_get_thread_loads_subtree_depth_first_in_one_query(
+    django_assert_num_queries, repo, rating_factory, comment_factory
+):
+    # Arrange
+    rating = rating_factory()
+    root = comment_factory(rating=rating)
+    first = comment_factory(rating=rating, parent_comment=root)
+    second = comment_factory(rating=rating, parent_comment=root)
+    nested = comment_factory(rating=rating, parent_comment=first)
+    comment_factory(rating=rating, parent_comment=nested)
+    comment_factory(rating=rating)
+
+    # Act
+    with django_assert_num_queries(1):
+        thread = repo.get_thread(str(root.id), max_depth=2)
+
+    # Assert
+    assert [(node.comment.id, node.depth) for node in thread] == [
+        (root.id, 0),
+        (first.id, 1),
+        (nested.id, 2),
+        (second.id, 1),
+    ]
+    assert thread[2].comment.replies_count == 1
@@ -0,0 +1,101 @@
+import pytest
+
+from rating_app.application_schemas.analytics import RatingRollupDelta
+from rating_app.models import CourseRatingRollup
+from rating_app.models.choices import SemesterTerm
+from rating_app.repositories.course_rating_rollup_repository import CourseRatingRollupRepository
+from rating_app.tests.factories import (
+    CourseFactory,
+    CourseOfferingFactory,
+    RatingFactory,
+    SemesterFactory,
+)
+
+
+@pytest.fixture
+def repo():
+    return CourseRatingRollupRepository()
+
+
+def _created(difficulty: int, usefulness: int) -> RatingRollupDelta:
+    return RatingRollupDelta(
+        year=2024,
+        term=SemesterTerm.FALL,
+        ratings_count=1,
+        difficulty={difficulty: 1},
+        usefulness={usefulness: 1},
+    )
+
+
+@pytest.mark.django_db
+def test_apply_delta_creates_row_for_first_rating_of_semester(repo):
+    # Arrange
+    course = CourseFactory()
+
+    # Act
+    repo.apply_delta(str(course.id), _created(difficulty=2, usefulness=5))
+
+    # Assert
+    [stats] = repo.get_for_course(str(course.id))
+    assert (stats.year, stats.term, stats.ratings_count) == (2024, SemesterTerm.FALL, 1)
+    assert stats.difficulty == {1: 0, 2: 1, 3: 0, 4: 0, 5: 0}
+    assert stats.usefulness == {1: 0, 2: 0, 3: 0, 4: 0, 5: 1}
+
+
+@pytest.mark.django_db
+def test_apply_delta_moves_existing_row_in_one_update(django_assert_num_queries, repo):
+    # Arrange
+    course = CourseFactory()
+    repo.apply_delta(str(course.id), _created(difficulty=2, usefulness=5))
+    moved = RatingRollupDelta(
+        year=2024, term=SemesterTerm.FALL, difficulty={2: -1, 4: 1}, usefulness={}
+    )
+
+    # Act
+    with django_assert_num_queries(1):
+        repo.apply_delta(str(course.id), moved)
+
+    # Assert
+    rollup = CourseRatingRollup.objects.get(course=course)
+    assert (rollup.ratings_count, rollup.difficulty_2, rollup.difficulty_4) == (1, 0, 1)
+
+
+@pytest.mark.django_db
+def test_apply_delta_never_drops_counters_below_zero(repo):
+    # Arrange
+    course = CourseFactory()
+    removed = RatingRollupDelta(
+        year=2024, term=SemesterTerm.SPRING, ratings_count=-1, difficulty={3: -1}
+    )
+
+    # Act
+    repo.apply_delta(str(course.id), removed)
+
+    # Assert
+    rollup = CourseRatingRollup.objects.get(course=course)
+    assert (rollup.ratings_count, rollup.difficulty_3) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_rebuild_recomputes_rollups_from_ratings(repo):
+    # Arrange
+    course = CourseFactory()
+    stale = CourseFactory()
+    offering = CourseOfferingFactory(
+        course=course, semester=SemesterFactory(year=2024, term=SemesterTerm.FALL)
+    )
+    RatingFactory(course_offering=offering, difficulty=2, usefulness=5)
+    RatingFactory(course_offering=offering, difficulty=2, usefulness=4)
+    repo.apply_delta(str(course.id), _created(difficulty=1, usefulness=1))
+    repo.apply_delta(str(stale.id), _created(difficulty=3, usefulness=3))
+
+    # Act
+    course_ids = repo.rebuild()
+
+    # Assert
+    assert course_ids == {str(course.id), str(stale.id)}
+    assert repo.get_for_course(str(stale.id)) == []
+    [stats] = repo.get_for_course(str(course.id))
+    assert (stats.year, stats.term, stats.ratings_count) == (2024, SemesterTerm.FALL, 2)
+    assert stats.difficulty == {1: 0, 2: 2, 3: 0, 4: 0, 5: 0}
+    assert stats.usefulness == {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}
@@ -1,6 +1,9 @@
+from decimal import Decimal
+
 import pytest
 
 from rating_app.application_schemas.course import CourseFilterCriteriaInternal, CourseInput
+from rating_app.application_schemas.rating import CourseRatingAggregatesDelta
 from rating_app.models import Course
 from rating_app.models.choices import CourseStatus, EducationLevel, SemesterTerm
 from rating_app.pagination import GenericQuerysetPaginator
@@ -257,3 +260,52 @@ def test_get_or_upsert_reuses_legacy_blank_level_course(repo):
     assert course.id == str(legacy_course.id)
     assert course.education_level == EducationLevel.BACHELOR
     assert legacy_course.education_level == EducationLevel.BACHELOR
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_apply_rating_aggregates_delta_derives_averages_from_running_sums(repo):
+    # Arrange
+    course = CourseFactory()
+
+    # Act
+    repo.apply_rating_aggregates_delta(
+        str(course.id), CourseRatingAggregatesDelta(ratings_count=1, difficulty_sum=2)
+    )
+    repo.apply_rating_aggregates_delta(
+        str(course.id),
+        CourseRatingAggregatesDelta(ratings_count=2, difficulty_sum=7, usefulness_sum=10),
+    )
+
+    # Assert
+    course.refresh_from_db()
+    assert course.ratings_count == 3
+    assert (course.difficulty_sum, course.usefulness_sum) == (9, 10)
+    assert course.avg_difficulty == Decimal("3.00")
+    assert course.avg_usefulness == Decimal("3.33")
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_apply_rating_aggregates_delta_resets_averages_when_last_rating_removed(repo):
+    # Arrange
+    course = CourseFactory(
+        avg_difficulty=Decimal("4.00"),
+        avg_usefulness=Decimal("5.00"),
+        ratings_count=1,
+        difficulty_sum=4,
+        usefulness_sum=5,
+    )
+
+    # Act
+    updated = repo.apply_rating_aggregates_delta(
+        str(course.id),
+        CourseRatingAggregatesDelta(ratings_count=-2, difficulty_sum=-8, usefulness_sum=-5),
+    )
+
+    # Assert
+    course.refresh_from_db()
+    assert updated is True
+    assert (course.ratings_count, course.difficulty_sum, course.usefulness_sum) == (0, 0, 0)
+    assert course.avg_difficulty == Decimal("0")
+    assert course.avg_usefulness == Decimal("0")
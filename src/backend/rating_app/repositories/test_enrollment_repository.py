@@ -63,3 +63,24 @@ def test_is_student_enrolled_returns_false_when_no_enrollment(repo):
     result = repo.is_student_enrolled(student.id, offering.id)
 
     assert result is False
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_get_student_eligibility_collects_active_offerings_and_courses(
+    django_assert_num_queries, repo
+):
+    student = StudentFactory()
+    enrolled = EnrollmentFactory(student=student, status=EnrollmentStatus.ENROLLED)
+    forced = EnrollmentFactory(student=student, status=EnrollmentStatus.FORCED)
+    dropped = EnrollmentFactory(student=student, status=EnrollmentStatus.DROPPED)
+    EnrollmentFactory(offering=dropped.offering, status=EnrollmentStatus.ENROLLED)
+
+    with django_assert_num_queries(1):
+        eligibility = repo.get_student_eligibility(str(student.id))
+
+    assert set(eligibility.offering_ids) == {str(enrolled.offering_id), str(forced.offering_id)}
+    assert eligibility.is_enrolled(str(forced.offering_id))
+    assert not eligibility.is_enrolled(dropped.offering_id)
+    assert eligibility.is_enrolled_in_course(enrolled.offering.course_id)
+    assert not eligibility.is_enrolled_in_course(dropped.offering.course_id)
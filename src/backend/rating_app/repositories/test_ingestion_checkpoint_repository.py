@@ -0,0 +1,39 @@
+import pytest
+
+from rating_app.application_schemas.ingestion import CheckpointPosition
+from rating_app.models import IngestionCheckpoint
+from rating_app.repositories.ingestion_checkpoint_repository import (
+    IngestionCheckpointRepository,
+)
+
+
+@pytest.fixture
+def repo():
+    return IngestionCheckpointRepository()
+
+
+@pytest.mark.django_db
+def test_save_keeps_one_checkpoint_per_file(repo):
+    # Arrange
+    repo.save("fp-1", "courses.jsonl", CheckpointPosition(100, 1), "run-1")
+
+    # Act
+    repo.save("fp-1", "courses.jsonl", CheckpointPosition(250, 2), "run-1")
+
+    # Assert
+    assert repo.get("fp-1") == CheckpointPosition(byte_offset=250, batch_number=2)
+    assert IngestionCheckpoint.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_delete_removes_only_that_file(repo):
+    # Arrange
+    repo.save("fp-1", "a.jsonl", CheckpointPosition(100, 1), "run-1")
+    repo.save("fp-2", "b.jsonl", CheckpointPosition(200, 1), "run-2")
+
+    # Act
+    repo.delete("fp-1")
+
+    # Assert
+    assert repo.get("fp-1") is None
+    assert repo.get("fp-2") == CheckpointPosition(200, 1)
@@ -0,0 +1,31 @@
+import pytest
+
+from rating_app.models import IngestionFingerprint
+from rating_app.models.choices import IngestionFingerprintKind
+from rating_app.repositories.ingestion_fingerprint_repository import (
+    IngestionFingerprintRepository,
+)
+
+
+@pytest.fixture
+def repo():
+    return IngestionFingerprintRepository()
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_inserts_and_replaces_hashes_per_kind(repo):
+    # Arrange
+    repo.bulk_upsert(IngestionFingerprintKind.COURSE, {"a": "hash-1", "b": "hash-2"})
+    repo.bulk_upsert(IngestionFingerprintKind.OFFERING, {"a": "hash-3"})
+
+    # Act
+    repo.bulk_upsert(IngestionFingerprintKind.COURSE, {"a": "hash-4", "c": "hash-5"})
+
+    # Assert
+    assert repo.get_hashes(IngestionFingerprintKind.COURSE) == {
+        "a": "hash-4",
+        "b": "hash-2",
+        "c": "hash-5",
+    }
+    assert repo.get_hashes(IngestionFingerprintKind.OFFERING) == {"a": "hash-3"}
+    assert IngestionFingerprint.objects.count() == 4
@@ -0,0 +1,214 @@
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+
+import pytest
+from freezegun import freeze_time
+
+from rating_app.application_schemas.notification import (
+    NotificationCreateData,
+    NotificationFeedCursor,
+)
+from rating_app.models import Notification, NotificationGroupSummary, RatingVote
+from rating_app.models.choices import NotificationEventType
+from rating_app.repositories.notification_repository import (
+    NotificationCursorRepository,
+    NotificationRepository,
+)
+from rating_app.repositories.to_domain_mappers import NotificationGroupMapper
+from rating_app.tests.factories import RatingFactory, UserFactory
+
+
+@pytest.fixture
+def repo():
+    return NotificationRepository(mapper=NotificationGroupMapper())
+
+
+@pytest.fixture
+def cursor_repo():
+    return NotificationCursorRepository()
+
+
+def _vote_notification(recipient, rating, actor, vote_id, event_type):
+    return NotificationCreateData(
+        recipient_id=recipient.id,
+        event_type=event_type,
+        group_key=f"{event_type}:{rating.id}",
+        content_type=ContentType.objects.get_for_model(RatingVote),
+        object_id=str(vote_id),
+        actor_id=actor.id,
+    )
+
+
+def _notify(repo, recipient, rating, actor):
+    return repo.create(
+        _vote_notification(
+            recipient, rating, actor, uuid.uuid4(), NotificationEventType.RATING_UPVOTED
+        )
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_grouped_feed_and_unread_count_are_single_reads(django_assert_num_queries, repo):
+    # Arrange
+    recipient = UserFactory()
+    first, second = RatingFactory.create_batch(2)
+    actors = UserFactory.create_batch(3)
+    for actor in actors:
+        _notify(repo, recipient, first, actor)
+    _notify(repo, recipient, second, actors[0])
+
+    # Act
+    # 1) group summaries with latest notification and actor, 2) notification sources
+    with django_assert_num_queries(2):
+        groups = repo.get_grouped_for_user(recipient.id, limit=10)
+    with django_assert_num_queries(1):
+        unread = repo.get_unread_group_count(recipient.id)
+
+    # Assert
+    assert [group.group_key for group in groups] == [
+        f"{NotificationEventType.RATING_UPVOTED}:{second.id}",
+        f"{NotificationEventType.RATING_UPVOTED}:{first.id}",
+    ]
+    assert [group.count for group in groups] == [1, 3]
+    assert all(group.is_unread for group in groups)
+    assert unread == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_reading_groups_keeps_unread_counter_in_step(repo, cursor_repo):
+    # Arrange
+    recipient, actor = UserFactory.create_batch(2)
+    first, second = RatingFactory.create_batch(2)
+    first_group = _notify(repo, recipient, first, actor)
+    _notify(repo, recipient, second, actor)
+
+    # Act
+    cursor_repo.mark_group_read(recipient.id, first_group.group_key)
+    cursor_repo.mark_group_read(recipient.id, first_group.group_key)
+    after_group_read = repo.get_unread_group_count(recipient.id)
+    _notify(repo, recipient, first, UserFactory())
+    after_new_activity = repo.get_unread_group_count(recipient.id)
+    cursor_repo.advance_cursor(recipient.id)
+
+    # Assert
+    assert after_group_read == 1
+    assert after_new_activity == 2
+    assert repo.get_unread_group_count(recipient.id) == 0
+    assert not any(group.is_unread for group in repo.get_grouped_for_user(recipient.id, limit=10))
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_deleting_notifications_refreshes_their_group(repo, cursor_repo):
+    # Arrange
+    recipient, reader, returning = UserFactory.create_batch(3)
+    rating = RatingFactory()
+    upvoted = NotificationEventType.RATING_UPVOTED
+    reader_vote, returning_vote = uuid.uuid4(), uuid.uuid4()
+    repo.create(_vote_notification(recipient, rating, reader, reader_vote, upvoted))
+    cursor_repo.advance_cursor(recipient.id)
+    repo.create(_vote_notification(recipient, rating, returning, returning_vote, upvoted))
+    content_type_id = ContentType.objects.get_for_model(RatingVote).pk
+
+    # Act
+    repo.delete_by_event_source(recipient.id, [upvoted], content_type_id, str(returning_vote))
+
+    # Assert
+    summary = NotificationGroupSummary.objects.get(recipient=recipient)
+    assert summary.count == 1
+    assert summary.latest_id == Notification.objects.get(actor=reader).id
+    assert not summary.is_unread
+    assert repo.get_unread_group_count(recipient.id) == 0
+
+    repo.delete_by_event_source(recipient.id, [upvoted], content_type_id, str(reader_vote))
+    assert not NotificationGroupSummary.objects.filter(recipient=recipient).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time("2024-03-01 12:00:00")
+def test_keyset_pages_cover_feed_with_tied_timestamps(django_assert_num_queries, repo):
+    # Arrange
+    recipient, actor = UserFactory.create_batch(2)
+    for rating in RatingFactory.create_batch(5):
+        _notify(repo, recipient, rating, actor)
+    expected = [group.group_key for group in repo.get_grouped_for_user(recipient.id, limit=10)]
+
+    # Act
+    seen = []
+    after = None
+    page = None
+    while page is None or len(page) == 2:
+        # 1) page of group summaries seeked past the cursor, 2) notification sources
+        with django_assert_num_queries(2):
+            page = repo.get_grouped_page(recipient.id, limit=2, after=after)
+        seen.extend(group.group_key for group in page)
+        after = NotificationFeedCursor(
+            latest_created_at=page[-1].latest_created_at,
+            group_key=page[-1].group_key,
+        )
+
+    # Assert
+    assert seen == expected
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_upsert_refreshes_repeated_event_in_place(django_assert_num_queries, repo, cursor_repo):
+    # Arrange
+    recipient, actor = UserFactory.create_batch(2)
+    rating = RatingFactory()
+    vote_id = uuid.uuid4()
+    upvote = _vote_notification(
+        recipient, rating, actor, vote_id, NotificationEventType.RATING_UPVOTED
+    )
+    assert repo.upsert(upvote) is True
+    cursor_repo.advance_cursor(recipient.id)
+
+    # Act
+    # savepoint, 1) notification upsert, 2) group summary turned unread,
+    # 3) unread counter, savepoint release
+    with django_assert_num_queries(5):
+        added = repo.upsert(upvote)
+
+    # Assert
+    assert added is False
+    assert Notification.objects.filter(recipient=recipient).count() == 1
+    summary = NotificationGroupSummary.objects.get(recipient=recipient)
+    assert summary.count == 1
+    assert summary.is_unread
+    assert repo.get_unread_group_count(recipient.id) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_upsert_replaces_opposite_vote_notification(repo):
+    # Arrange
+    recipient, actor = UserFactory.create_batch(2)
+    rating = RatingFactory()
+    vote_id = uuid.uuid4()
+    repo.upsert(
+        _vote_notification(recipient, rating, actor, vote_id, NotificationEventType.RATING_UPVOTED)
+    )
+
+    # Act
+    added = repo.upsert(
+        _vote_notification(
+            recipient, rating, actor, vote_id, NotificationEventType.RATING_DOWNVOTED
+        ),
+        replaced_event_types=[NotificationEventType.RATING_UPVOTED],
+    )
+
+    # Assert
+    assert added is True
+    notification = Notification.objects.get(recipient=recipient)
+    assert notification.event_type == NotificationEventType.RATING_DOWNVOTED
+    groups = repo.get_grouped_for_user(recipient.id, limit=10)
+    assert [(group.event_type, group.count) for group in groups] == [
+        (NotificationEventType.RATING_DOWNVOTED, 1)
+    ]
+    assert repo.get_unread_group_count(recipient.id) == 1
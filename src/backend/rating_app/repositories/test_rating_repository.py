@@ -0,0 +1,183 @@
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError
+from django.utils import timezone
+
+import pytest
+
+from rating_app.application_schemas.rating import (
+    RatingCreateParams,
+    RatingFilterCriteria,
+    RatingPatchParams,
+)
+from rating_app.constants import COMMENT_AUTHOR_PREVIEW_LIMIT
+from rating_app.exception.rating_exceptions import DuplicateRatingException
+from rating_app.models import Comment, Rating
+from rating_app.pagination import GenericQuerysetPaginator
+from rating_app.queries.rating_popularity import WilsonPopularityAnnotator
+from rating_app.repositories.rating_repository import RatingRepository
+from rating_app.repositories.to_domain_mappers import RatingMapper
+from rating_app.tests.factories import (
+    CourseOfferingFactory,
+    RatingFactory,
+    StudentFactory,
+    UserFactory,
+)
+
+LONG_THREAD_SIZE = 300
+
+
+@pytest.fixture
+def repo():
+    return RatingRepository(
+        mapper=RatingMapper(),
+        paginator=GenericQuerysetPaginator[Rating](),
+        popularity_annotator=WilsonPopularityAnnotator(),
+    )
+
+
+def _create_thread(rating, authors, size, *, anonymous_every=None):
+    comments = [
+        Comment(
+            rating=rating,
+            user=authors[index % len(authors)],
+            content=f"Comment {index}",
+            is_anonymous=anonymous_every is not None and index % anonymous_every == 0,
+        )
+        for index in range(size)
+    ]
+    Comment.objects.bulk_create(comments)
+
+    # auto_now_add ignores explicit values, so spread timestamps afterwards
+    started_at = timezone.now()
+    for index, comment in enumerate(comments):
+        comment.created_at = started_at + timedelta(seconds=index)
+    Comment.objects.bulk_update(comments, ["created_at"])
+    return comments
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_comment_author_preview_on_long_thread_keeps_latest_distinct_authors(
+    django_assert_num_queries, repo
+):
+    # Arrange
+    rating = RatingFactory()
+    authors = UserFactory.create_batch(5)
+    comments = _create_thread(rating, authors, LONG_THREAD_SIZE)
+    expected_user_ids = [comment.user_id for comment in reversed(comments)][
+        :COMMENT_AUTHOR_PREVIEW_LIMIT
+    ]
+
+    # Act
+    # 1) rating with counters, 2) instructors, 3) windowed comment author preview
+    with django_assert_num_queries(3):
+        result = repo.get_by_id(str(rating.id))
+
+    # Assert
+    assert result.comments_count == LONG_THREAD_SIZE
+    assert [author.user_id for author in result.comment_authors] == expected_user_ids
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_comment_author_preview_treats_each_anonymous_comment_as_own_author(repo):
+    # Arrange
+    rating = RatingFactory()
+    comments = _create_thread(rating, [UserFactory()], 3)
+    Comment.objects.filter(pk__in=[comment.pk for comment in comments[1:]]).update(
+        is_anonymous=True
+    )
+
+    # Act
+    result = repo.get_by_id(str(rating.id))
+
+    # Assert
+    assert [author.is_anonymous for author in result.comment_authors] == [True, True, False]
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_comment_author_preview_is_bounded_per_rating_in_one_query(django_assert_num_queries, repo):
+    # Arrange
+    first = RatingFactory()
+    second = RatingFactory(course_offering=first.course_offering)
+    silent = RatingFactory(course_offering=first.course_offering)
+    authors = UserFactory.create_batch(6)
+    _create_thread(first, authors, LONG_THREAD_SIZE, anonymous_every=7)
+    _create_thread(second, authors[:2], 40)
+    criteria = RatingFilterCriteria(course_id=first.course_offering.course_id)
+
+    # Act
+    # 1) ratings page, 2) instructors, 3) comment author preview for the whole page
+    with django_assert_num_queries(3):
+        results = repo.filter(criteria)
+
+    # Assert
+    previews = {rating.id: rating.comment_authors for rating in results}
+    assert len(previews[first.id]) == COMMENT_AUTHOR_PREVIEW_LIMIT
+    assert len(previews[second.id]) == 2
+    assert previews[silent.id] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_get_vote_target_is_a_single_projection_query(django_assert_num_queries, repo):
+    # Arrange
+    user = UserFactory()
+    rating = RatingFactory(student__user=user)
+
+    # Act
+    with django_assert_num_queries(1):
+        target = repo.get_vote_target(str(rating.id))
+
+    # Assert
+    assert target.course_id == rating.course_offering.course_id
+    assert target.semester.year == rating.course_offering.semester.year
+    assert target.author_student_id == rating.student_id
+    assert target.author_user_id == user.id
+
+
+def _create_params(student, offering, instructor_ids=()):
+    return RatingCreateParams(
+        student=student.id,
+        course_offering=offering.id,
+        difficulty=3,
+        usefulness=4,
+        instructor_ids=list(instructor_ids),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_create_rejects_second_rating_of_same_offering_as_duplicate(repo):
+    # Arrange
+    existing = RatingFactory()
+
+    # Act & Assert
+    with pytest.raises(DuplicateRatingException):
+        repo.create(_create_params(existing.student, existing.course_offering))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.integration
+def test_create_does_not_report_missing_instructor_as_duplicate(repo):
+    # Arrange
+    student, offering = StudentFactory(), CourseOfferingFactory()
+
+    # Act & Assert
+    with pytest.raises(IntegrityError):
+        repo.create(_create_params(student, offering, instructor_ids=[uuid.uuid4()]))
+    assert not Rating.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.integration
+def test_update_does_not_report_missing_instructor_as_duplicate(repo):
+    # Arrange
+    rating = repo.get_by_id(str(RatingFactory().id))
+
+    # Act & Assert
+    with pytest.raises(IntegrityError):
+        repo.update(rating, RatingPatchParams(instructor_ids=[uuid.uuid4()]))
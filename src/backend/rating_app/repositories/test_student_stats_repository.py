@@ -560,3 +560,25 @@ def test_get_rating_stats_returns_empty_instructors_when_none_linked(repo):
     result = repo.get_rating_stats(student_id=str(student.id))
 
     assert result[0]["offerings"][0]["rated"]["instructors"] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_detailed_stats_from_known_offering_ids_match_enrollment_join(repo):
+    # Arrange
+    student = StudentFactory()
+    rating, _, _ = _rated_with_two_instructors(student)
+    EnrollmentFactory(student=student)
+
+    # Act
+    joined = repo.get_detailed_rating_stats(student_id=str(student.id))
+    known = repo.get_detailed_rating_stats(
+        student_id=str(student.id),
+        offering_ids={rating.course_offering_id},
+    )
+
+    # Assert
+    assert len(joined) == 2
+    assert known == [
+        row for row in joined if row["course_offering_id"] == str(rating.course_offering_id)
+    ]
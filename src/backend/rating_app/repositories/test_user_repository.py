@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from rating_app.repositories.user_repository import UserRepository
+from rating_app.tests.factories import StudentFactory
 
 
 @pytest.fixture
@@ -56,3 +57,25 @@ def test_get_by_email_returns_none_and_logs_warning_when_multiple_users_found(re
     mock_logger.warning.assert_called_once_with(
         "multiple_users_with_same_email", email="duplicate@ukma.edu.ua"
     )
+
+
+@pytest.mark.django_db
+def test_get_by_emails_groups_users_and_joins_student_profile(
+    repo, user_factory, django_assert_num_queries
+):
+    # Arrange
+    linked = user_factory(email="linked@ukma.edu.ua")
+    StudentFactory(email="linked@ukma.edu.ua", user=linked)
+    unlinked = user_factory(email="free@ukma.edu.ua")
+    user_factory(email="other@ukma.edu.ua")
+
+    # Act
+    with django_assert_num_queries(1):
+        users = repo.get_by_emails(["linked@ukma.edu.ua", "free@ukma.edu.ua"])
+        profiles = {
+            email: getattr(matches[0], "student_profile", None) for email, matches in users.items()
+        }
+
+    # Assert
+    assert users == {"linked@ukma.edu.ua": [linked], "free@ukma.edu.ua": [unlinked]}
+    assert profiles == {"linked@ukma.edu.ua": linked.student_profile, "free@ukma.edu.ua": None}
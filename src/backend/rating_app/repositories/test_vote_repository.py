@@ -0,0 +1,68 @@
+import pytest
+
+from rating_app.application_schemas.rating_vote import RatingVoteCreateSchema
+from rating_app.models import RatingVote
+from rating_app.models.choices import RatingVoteStrType, RatingVoteType
+from rating_app.repositories.to_domain_mappers import RatingVoteMapper
+from rating_app.repositories.vote_repository import RatingVoteRepository
+from rating_app.tests.factories import RatingFactory, StudentFactory
+
+
+@pytest.fixture
+def repo():
+    return RatingVoteRepository(vote_mapper=RatingVoteMapper())
+
+
+@pytest.fixture
+def params():
+    rating = RatingFactory()
+    student = StudentFactory()
+    return RatingVoteCreateSchema(
+        rating_id=str(rating.id),
+        student_id=str(student.id),
+        vote_type=RatingVoteStrType.UPVOTE,
+    )
+
+
+@pytest.mark.django_db
+def test_upsert_vote_inserts_in_one_statement(django_assert_num_queries, repo, params):
+    # Act
+    with django_assert_num_queries(1):
+        vote, created = repo.upsert_vote(params)
+
+    # Assert
+    assert created
+    assert vote is not None
+    stored = RatingVote.objects.get()
+    assert (stored.id, stored.type) == (vote.id, RatingVoteType.UPVOTE)
+
+
+@pytest.mark.django_db
+def test_upsert_vote_switches_type_of_existing_vote(django_assert_num_queries, repo, params):
+    # Arrange
+    first, _ = repo.upsert_vote(params)
+    params.vote_type = RatingVoteStrType.DOWNVOTE
+
+    # Act
+    with django_assert_num_queries(1):
+        vote, created = repo.upsert_vote(params)
+
+    # Assert
+    assert not created
+    assert vote is not None and first is not None
+    assert vote.id == first.id
+    assert RatingVote.objects.get().type == RatingVoteType.DOWNVOTE
+
+
+@pytest.mark.django_db
+def test_upsert_vote_of_same_type_changes_nothing(repo, params):
+    # Arrange
+    repo.upsert_vote(params)
+
+    # Act
+    vote, created = repo.upsert_vote(params)
+
+    # Assert
+    assert vote is None
+    assert not created
+    assert RatingVote.objects.count() == 1
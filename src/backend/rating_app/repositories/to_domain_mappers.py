@@ -289,13 +289,16 @@ class CommentMapper(IProcessor[[CommentModel], CommentDTO]):
             user_id=model.user.id,
             user_name=user_name,
             user_avatar_url=user_avatar_url,
-            rating_id=model.rating.id,
-            parent_id=model.parent_comment.id if model.parent_comment is not None else None,
+            rating_id=model.rating_id,
+            parent_id=model.parent_comment_id,
             course_id=model.rating.course_offering.course_id,
             content=model.content,
             is_anonymous=model.is_anonymous,
             created_at=model.created_at,
             replies_count=replies_count,
+            reply_previews=[
+                self.process(reply) for reply in getattr(model, "reply_preview_comments", ())
+            ],
         )
 
 
@@ -1,3 +1,6 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
 from django.contrib.auth import get_user_model
 
 import structlog
@@ -18,3 +21,15 @@ class UserRepository:
         except self._user_model.MultipleObjectsReturned:
             logger.warning("multiple_users_with_same_email", email=email)
             return None
+
+    def get_by_emails(self, emails: Iterable[str]) -> dict[str, list]:
+        """Users grouped by email, with their linked student (if any) joined in one query."""
+        users: dict[str, list] = defaultdict(list)
+        queryset = (
+            self._user_model.objects.filter(email__in=set(emails))
+            .select_related("student_profile")
+            .order_by("pk")
+        )
+        for user in queryset:
+            users[user.email].append(user)
+        return users
@@ -1,7 +1,8 @@
+import uuid
 from typing import Literal, cast, overload
 
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import DataError, IntegrityError
+from django.db import DataError, IntegrityError, connection
 from django.db.models import Count, Q, QuerySet
 
 import structlog
@@ -164,6 +165,48 @@ class RatingVoteRepository(IDomainOrmRepository[RatingVoteDTO, RatingVote]):
         except IntegrityError as err:
             raise VoteAlreadyExistsException() from err
 
+    def upsert_vote(self, params: RatingVoteCreateSchema) -> tuple[RatingVoteDTO | None, bool]:
+        """Insert the student's vote or switch its type in a single statement.
+
+        Returns the written vote and whether it was inserted. The vote is ``None``
+        when the student already had a vote of this type and nothing changed.
+        """
+        db_vote_type = self.vote_mapper.to_db(params.vote_type)
+        meta = RatingVote._meta
+        table = connection.ops.quote_name(meta.db_table)
+        new_id = uuid.uuid4()
+        values = [
+            meta.get_field(name).get_db_prep_value(value, connection, prepared=False)
+            for name, value in (
+                ("id", new_id),
+                ("student", uuid.UUID(str(params.student_id))),
+                ("rating", uuid.UUID(str(params.rating_id))),
+                ("type", db_vote_type),
+            )
+        ]
+        # EXCLUDED is the row that failed to insert; the WHERE skips no-op updates
+        sql = (
+            f"INSERT INTO {table} (id, student_id, rating_id, type) VALUES (%s, %s, %s, %s) "
+            "ON CONFLICT (student_id, rating_id) DO UPDATE SET type = EXCLUDED.type "
+            f"WHERE {table}.type <> EXCLUDED.type "
+            "RETURNING id"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, values)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None, False
+
+        vote_id = uuid.UUID(str(row[0]))
+        vote = RatingVoteDTO(
+            id=vote_id,
+            student_id=uuid.UUID(str(params.student_id)),
+            rating_id=uuid.UUID(str(params.rating_id)),
+            vote_type=cast(RatingVoteType, db_vote_type),
+        )
+        return vote, vote_id == new_id
+
     def count_votes_of_type(self, rating_id: str, vote_type: str) -> int:
         db_vote_type = self.vote_mapper.to_db(vote_type)
         return RatingVote.objects.filter(rating_id=rating_id, type=db_vote_type).count()
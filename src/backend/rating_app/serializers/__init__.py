@@ -1,4 +1,4 @@
-from .analytics import CourseAnalyticsSerializer
+from .analytics import CourseAnalyticsDetailSerializer, CourseAnalyticsSerializer
 from .comment_list import CommentListSerializer
 from .comment_read import CommentReadSerializer
 from .course.course_detail import CourseDetailSerializer
@@ -19,6 +19,7 @@ from .student_ratings_detailed import StudentRatingsDetailedSerializer
 
 __all__ = [
     "CourseAnalyticsSerializer",
+    "CourseAnalyticsDetailSerializer",
     "CourseDetailSerializer",
     "CourseListSerializer",
     "RatingReadSerializer",
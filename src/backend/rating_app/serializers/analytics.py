@@ -12,3 +12,31 @@ class CourseAnalyticsSerializer(serializers.Serializer):
     avg_difficulty = serializers.FloatField(read_only=True, allow_null=True)
     ratings_count = serializers.IntegerField(read_only=True, default=0)
     faculty_name = serializers.CharField(read_only=True)
+
+
+class SemesterRatingStatsSerializer(serializers.Serializer):
+    year = serializers.IntegerField(read_only=True)
+    term = serializers.CharField(read_only=True)
+    ratings_count = serializers.IntegerField(read_only=True)
+    avg_difficulty = serializers.FloatField(read_only=True, allow_null=True)
+    avg_usefulness = serializers.FloatField(read_only=True, allow_null=True)
+    difficulty_distribution = serializers.DictField(
+        source="difficulty", child=serializers.IntegerField(), read_only=True
+    )
+    usefulness_distribution = serializers.DictField(
+        source="usefulness", child=serializers.IntegerField(), read_only=True
+    )
+
+
+class CourseAnalyticsDetailSerializer(CourseAnalyticsSerializer):
+    """
+    Course analytics with score distributions and per-semester trends
+    """
+
+    difficulty_distribution = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+    usefulness_distribution = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+    semesters = SemesterRatingStatsSerializer(many=True, read_only=True)
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 
-class CommentReadSerializer(serializers.Serializer):
+class CommentReplyPreviewSerializer(serializers.Serializer):
     """Serializer for reading CommentDto. Nulls identity fields for anonymous comment."""
 
     _ANONYMOUS_HIDDEN_FIELDS = ("user_id", "user_name", "user_avatar_url")
@@ -24,3 +24,9 @@ class CommentReadSerializer(serializers.Serializer):
             for field in self._ANONYMOUS_HIDDEN_FIELDS:
                 data[field] = None
         return data
+
+
+class CommentReadSerializer(CommentReplyPreviewSerializer):
+    """CommentDto with the first few of its replies."""
+
+    reply_previews = CommentReplyPreviewSerializer(many=True, read_only=True)
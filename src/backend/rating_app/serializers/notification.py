@@ -109,6 +109,11 @@ def _parse_rating_id(group_key: str) -> str | None:
     return None
 
 
+class NotificationFeedSerializer(serializers.Serializer):
+    items = NotificationGroupSerializer(many=True, read_only=True)
+    next_cursor = serializers.CharField(allow_null=True, read_only=True)
+
+
 class UnreadCountSerializer(serializers.Serializer):
     count = serializers.IntegerField(read_only=True)
 
@@ -3,6 +3,7 @@ from .comment_service import CommentService
 from .course_offering_service import CourseOfferingService
 from .course_service import CourseService
 from .department_service import DepartmentService
+from .enrollment_service import EnrollmentService
 from .faculty_service import FacultyService
 from .instructor_service import InstructorService
 from .notification_service import NotificationService
@@ -25,6 +26,7 @@ __all__ = [
     "SpecialityService",
     "SemesterService",
     "CourseOfferingService",
+    "EnrollmentService",
     "RatingFeedbackService",
     "NotificationService",
     "PromoBannerService",
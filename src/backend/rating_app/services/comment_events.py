@@ -16,3 +16,4 @@ class CommentEvent:
     comment: CommentDTO
     action: CommentAction
     parent_parent_id: uuid.UUID | None = None
+    rating_author_user_id: int | None = None
@@ -1,6 +1,8 @@
-import uuid
+from dataclasses import replace
 from typing import Any
 
+from django.db import transaction
+
 from rateukma.caching.decorators import rcached
 from rateukma.caching.patterns import comment_replies_namespace, rating_comments_namespace
 from rateukma.protocols import implements
@@ -12,9 +14,14 @@ from rating_app.application_schemas.comment import (
     CommentPatchParams,
     CommentPutParams,
     CommentSearchResult,
+    CommentThreadKeys,
+    CommentThreadNode,
 )
 from rating_app.application_schemas.pagination import PaginationFilters, PaginationMetadata
-from rating_app.exception.comment_exception import CommentParentRatingMismatchError
+from rating_app.exception.comment_exception import (
+    CommentNotFoundError,
+    CommentParentRatingMismatchError,
+)
 from rating_app.repositories.comment_repository import CommentRepository
 from rating_app.services.comment_events import CommentAction, CommentEvent
 from rating_app.services.comment_normalizer import CommentNormalizer
@@ -52,27 +59,22 @@ class CommentService(IObservable[CommentEvent]):
         self._listeners.append(observer)
 
     def create_comment(self, params: CommentCreateParams) -> CommentDTO:
-        parent = self._validate_parent_comment_matches_rating(params)
+        keys = self.comment_repository.get_thread_keys(params.rating_id, params.parent_comment)
+        self._validate_parent_comment_matches_rating(params, keys)
         params.content = self.comment_normalizer.normalize_comment(params.content)
-        comment = self.comment_repository.create(params)
-        self._notify_comment(
-            comment,
-            CommentAction.CREATED,
-            parent_parent_id=parent.parent_id if parent else None,
-        )
+        with transaction.atomic():
+            comment = self.comment_repository.create(params)
+            self._notify_comment(comment, CommentAction.CREATED, keys)
         return self._with_manage_permission(comment, params.user_id)
 
     def get_comment(self, comment_id: str) -> CommentDTO:
         return self.comment_repository.get_by_id(comment_id)
 
     def delete_comment(self, comment: CommentDTO) -> None:
-        parent_parent_id = self._get_parent_parent_id(comment)
-        self.comment_repository.delete(str(comment.id))
-        self._notify_comment(
-            comment,
-            CommentAction.DELETED,
-            parent_parent_id=parent_parent_id,
-        )
+        keys = self.comment_repository.get_thread_keys(comment.rating_id, comment.parent_id)
+        with transaction.atomic():
+            self.comment_repository.delete(str(comment.id))
+            self._notify_comment(comment, CommentAction.DELETED, keys)
 
     def update_comment(
         self,
@@ -82,44 +84,57 @@ class CommentService(IObservable[CommentEvent]):
         if update_data.content is not None:
             update_data.content = self.comment_normalizer.normalize_comment(update_data.content)
 
-        updated_comment = self.comment_repository.update(comment, update_data)
-        self._notify_comment(updated_comment, CommentAction.UPDATED)
+        # a reply is previewed under its parent, which the grandparent's page lists
+        keys = (
+            self.comment_repository.get_thread_keys(comment.rating_id, comment.parent_id)
+            if comment.parent_id is not None
+            else None
+        )
+        with transaction.atomic():
+            updated_comment = self.comment_repository.update(comment, update_data)
+            self._notify_comment(updated_comment, CommentAction.UPDATED, keys)
         return self._with_manage_permission(updated_comment, updated_comment.user_id)
 
+    def get_comment_thread(
+        self,
+        comment_id: str,
+        viewer_user_id: int | None = None,
+        max_depth: int | None = None,
+    ) -> list[CommentThreadNode]:
+        nodes = self.comment_repository.get_thread(comment_id, max_depth)
+        return [
+            replace(node, comment=self._with_manage_permission(node.comment, viewer_user_id))
+            for node in nodes
+        ]
+
     def _notify_comment(
         self,
         comment: CommentDTO,
         action: CommentAction,
-        parent_parent_id: uuid.UUID | None = None,
+        keys: CommentThreadKeys | None = None,
     ) -> None:
         self.notify(
             CommentEvent(
                 comment=comment,
                 action=action,
-                parent_parent_id=parent_parent_id,
+                parent_parent_id=keys.parent_parent_id if keys else None,
+                rating_author_user_id=keys.rating_author_user_id if keys else None,
             )
         )
 
     def _validate_parent_comment_matches_rating(
         self,
         params: CommentCreateParams,
-    ) -> CommentDTO | None:
+        keys: CommentThreadKeys,
+    ) -> None:
         if params.parent_comment is None:
-            return None
+            return
 
-        parent = self.comment_repository.get_by_id(str(params.parent_comment))
-        if parent.rating_id != params.rating_id:
+        if keys.parent_rating_id is None:
+            raise CommentNotFoundError()
+        if keys.parent_rating_id != params.rating_id:
             raise CommentParentRatingMismatchError()
 
-        return parent
-
-    def _get_parent_parent_id(self, comment: CommentDTO) -> uuid.UUID | None:
-        if comment.parent_id is None:
-            return None
-
-        parent = self.comment_repository.get_by_id(str(comment.parent_id))
-        return parent.parent_id
-
     @rcached(ttl=300, versioned_by=_comments_namespace)
     def filter_comments(
         self,
@@ -168,6 +183,12 @@ class CommentService(IObservable[CommentEvent]):
         comment: CommentDTO,
         viewer_user_id: int | None,
     ) -> CommentDTO:
+        reply_previews = [
+            self._with_manage_permission(reply, viewer_user_id) for reply in comment.reply_previews
+        ]
         return comment.model_copy(
-            update={"can_manage": viewer_user_id is not None and comment.user_id == viewer_user_id}
+            update={
+                "can_manage": viewer_user_id is not None and comment.user_id == viewer_user_id,
+                "reply_previews": reply_previews,
+            }
         )
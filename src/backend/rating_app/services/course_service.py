@@ -1,3 +1,8 @@
+from collections.abc import Iterable
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+
 import structlog
 
 from rateukma.caching.decorators import rcached
@@ -9,6 +14,11 @@ from rateukma.caching.patterns import (
     course_analytics_namespace,
     course_detail_namespace,
 )
+from rating_app.application_schemas.analytics import (
+    CourseRatingDistribution,
+    RatingRollupDelta,
+    empty_histogram,
+)
 from rating_app.application_schemas.course import (
     Course as CourseDTO,
 )
@@ -19,9 +29,13 @@ from rating_app.application_schemas.course import (
     CourseSearchResult,
 )
 from rating_app.application_schemas.pagination import PaginationMetadata
-from rating_app.application_schemas.rating import AggregatedCourseRatingStats
+from rating_app.application_schemas.rating import (
+    AggregatedCourseRatingStats,
+    CourseRatingAggregatesDelta,
+)
 from rating_app.models.choices import CourseTypeKind
 from rating_app.pagination import PaginationFilters
+from rating_app.repositories.course_rating_rollup_repository import CourseRatingRollupRepository
 from rating_app.repositories.course_repository import CourseRepository
 from rating_app.services.department_service import DepartmentService
 from rating_app.services.faculty_service import FacultyService
@@ -40,10 +54,15 @@ def _course_detail_namespace(
     return course_detail_namespace(course_id)
 
 
+def _course_analytics_namespace(_self, course_id: str) -> str:
+    return course_analytics_namespace(course_id)
+
+
 class CourseService:
     def __init__(
         self,
         course_repository: CourseRepository,
+        rating_rollup_repository: CourseRatingRollupRepository,
         instructor_service: InstructorService,
         faculty_service: FacultyService,
         department_service: DepartmentService,
@@ -51,6 +70,7 @@ class CourseService:
         semester_service: SemesterService,
     ):
         self.course_repository = course_repository
+        self.rating_rollup_repository = rating_rollup_repository
         self.instructor_service = instructor_service
         self.faculty_service = faculty_service
         self.department_service = department_service
@@ -122,18 +142,119 @@ class CourseService:
     def update_course_aggregates(
         self, course: CourseDTO, aggregates: AggregatedCourseRatingStats
     ) -> None:
-        self.course_repository.update(
-            course,
-            avg_difficulty=aggregates.avg_difficulty,
-            avg_usefulness=aggregates.avg_usefulness,
-            ratings_count=aggregates.ratings_count,
+        self.course_repository.set_rating_aggregates(str(course.id), aggregates)
+        self._invalidate_course_aggregates(str(course.id))
+
+    def apply_rating_aggregates_delta(
+        self, course_id: str, delta: CourseRatingAggregatesDelta
+    ) -> None:
+        if delta.is_empty:
+            return
+
+        if not self.course_repository.apply_rating_aggregates_delta(course_id, delta):
+            logger.warning("course_aggregates_delta_skipped", course_id=course_id)
+            return
+        self._invalidate_course_aggregates(course_id)
+
+    def apply_rating_rollup_delta(self, course_id: str, delta: RatingRollupDelta) -> None:
+        if delta.is_empty:
+            return
+        self.rating_rollup_repository.apply_delta(course_id, delta)
+        self._invalidate_course_analytics(course_id)
+
+    def rebuild_rating_rollups(self) -> int:
+        """Recomputes the rating rollups from the ratings; returns how many courses were touched."""
+        course_ids = self.rating_rollup_repository.rebuild()
+        for course_id in course_ids:
+            self._invalidate_course_analytics(course_id)
+        return len(course_ids)
+
+    @rcached(ttl=300, versioned_by=_course_analytics_namespace)
+    def get_rating_distribution(self, course_id: str) -> CourseRatingDistribution:
+        semesters = sorted(
+            self.rating_rollup_repository.get_for_course(course_id),
+            key=lambda stats: (stats.year, SemesterService.TERM_PRIORITY[stats.term]),
+        )
+        return CourseRatingDistribution(
+            ratings_count=sum(stats.ratings_count for stats in semesters),
+            difficulty=self._merge_histograms(stats.difficulty for stats in semesters),
+            usefulness=self._merge_histograms(stats.usefulness for stats in semesters),
+            semesters=semesters,
+        )
+
+    def _merge_histograms(self, histograms: Iterable[dict[int, int]]) -> dict[int, int]:
+        merged = empty_histogram()
+        for histogram in histograms:
+            for score, count in histogram.items():
+                merged[score] += count
+        return merged
+
+    def reconcile_rating_aggregates(
+        self, expected: dict[str, AggregatedCourseRatingStats], *, fix: bool = False
+    ) -> list[str]:
+        """
+        Compare stored course aggregates with a full recompute.
+
+        Returns ids of drifted courses; with ``fix`` the recomputed values are written back.
+        """
+        stored = self.course_repository.get_rating_aggregates()
+        empty = AggregatedCourseRatingStats(
+            avg_difficulty=Decimal(0),
+            avg_usefulness=Decimal(0),
+            ratings_count=0,
         )
+
+        drifted: list[str] = []
+        for course_id, current in stored.items():
+            target = expected.get(course_id, empty)
+            if self._aggregates_match(current, target):
+                continue
+
+            drifted.append(course_id)
+            logger.warning(
+                "course_aggregates_drift",
+                course_id=course_id,
+                stored_count=current.ratings_count,
+                expected_count=target.ratings_count,
+            )
+            if fix:
+                self.course_repository.set_rating_aggregates(course_id, target)
+                self._invalidate_course_aggregates(course_id)
+
+        return drifted
+
+    def _aggregates_match(
+        self, stored: AggregatedCourseRatingStats, expected: AggregatedCourseRatingStats
+    ) -> bool:
+        return (
+            stored.ratings_count == expected.ratings_count
+            and stored.difficulty_sum == expected.difficulty_sum
+            and stored.usefulness_sum == expected.usefulness_sum
+            and self._round_average(stored.avg_difficulty)
+            == self._round_average(expected.avg_difficulty)
+            and self._round_average(stored.avg_usefulness)
+            == self._round_average(expected.avg_usefulness)
+        )
+
+    def _round_average(self, value: Decimal | float) -> Decimal:
+        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+    def _invalidate_course_aggregates(self, course_id: str) -> None:
+        # bumped once the write commits, so readers cannot re-cache the old values
+        transaction.on_commit(lambda: self._bump_course_aggregates(course_id))
+
+    def _bump_course_aggregates(self, course_id: str) -> None:
         cache_manager = redis_cache_manager()
-        cache_manager.bump_version(course_detail_namespace(str(course.id)))
-        cache_manager.bump_version(course_analytics_namespace(str(course.id)))
+        cache_manager.bump_version(course_detail_namespace(course_id))
+        cache_manager.bump_version(course_analytics_namespace(course_id))
         cache_manager.bump_version(COURSES_LIST_NAMESPACE)
         cache_manager.bump_version(ANALYTICS_LIST_NAMESPACE)
 
+    def _invalidate_course_analytics(self, course_id: str) -> None:
+        transaction.on_commit(
+            lambda: redis_cache_manager().bump_version(course_analytics_namespace(course_id))
+        )
+
     @rcached(ttl=86400, versioned_by=FILTER_OPTIONS_NAMESPACE)  # 24 hours - options rarely change
     def get_filter_options(self) -> CourseFilterOptions:
         semester_filter_options = self.semester_service.get_filter_options()
@@ -2,11 +2,15 @@ from typing import Any
 
 from rating_app.repositories import DepartmentRepository
 from rating_app.services.protocols import IFilterable
+from rating_app.services.reference_data import ReferenceDataCache
 
 
 class DepartmentService(IFilterable):
-    def __init__(self, department_repository: DepartmentRepository):
+    def __init__(
+        self, department_repository: DepartmentRepository, reference_data: ReferenceDataCache
+    ):
         self.department_repository = department_repository
+        self.reference_data = reference_data
 
     def get_filter_options(self) -> list[dict[str, Any]]:
         departments = self._get_sorted_departments()
@@ -23,6 +27,6 @@ class DepartmentService(IFilterable):
 
     def _get_sorted_departments(self):
         return sorted(
-            self.department_repository.get_all(),
+            self.reference_data.get().departments,
             key=lambda department: str(department.name or "").lower(),
         )
@@ -1,17 +1,131 @@
+from collections.abc import Sequence
+
 from rateukma.protocols import implements
-from rateukma.protocols.generic import IEventListener
-from rating_app.application_schemas.rating import Rating as RatingDTO
+from rateukma.protocols.generic import IBatchEventListener
+from rating_app.application_schemas.analytics import RatingRollupDelta
+from rating_app.application_schemas.rating import CourseRatingAggregatesDelta
+from rating_app.models.choices import SemesterTerm
 from rating_app.services.course_service import CourseService
-from rating_app.services.rating_service import RatingService
+from rating_app.services.rating_events import RatingAction, RatingEvent
 
 
-class CourseModelAggregatesUpdateObserver(IEventListener[RatingDTO]):
-    def __init__(self, course_service: CourseService, rating_service: RatingService):
+class CourseModelAggregatesUpdateObserver(IBatchEventListener[RatingEvent]):
+    def __init__(self, course_service: CourseService):
         self.course_service = course_service
-        self.rating_service = rating_service
 
     @implements
-    def on_event(self, event: RatingDTO, *args, **kwargs) -> None:
-        course = self.course_service.get_course(str(event.course), prefetch_related=False)
-        stats = self.rating_service.get_aggregated_course_stats(course)
-        self.course_service.update_course_aggregates(course, stats)
+    def on_event(self, event: RatingEvent, *args, **kwargs) -> None:
+        delta = self._build_delta(event)
+        self.course_service.apply_rating_aggregates_delta(str(event.rating.course), delta)
+
+    @implements
+    def on_events(self, events: Sequence[RatingEvent], *args, **kwargs) -> None:
+        # one delta (and one cache bump) per course however many ratings changed
+        totals: dict[str, CourseRatingAggregatesDelta] = {}
+        for event in events:
+            course_id = str(event.rating.course)
+            total = totals.get(course_id, CourseRatingAggregatesDelta())
+            delta = self._build_delta(event)
+            totals[course_id] = CourseRatingAggregatesDelta(
+                ratings_count=total.ratings_count + delta.ratings_count,
+                difficulty_sum=total.difficulty_sum + delta.difficulty_sum,
+                usefulness_sum=total.usefulness_sum + delta.usefulness_sum,
+            )
+
+        for course_id, delta in totals.items():
+            self.course_service.apply_rating_aggregates_delta(course_id, delta)
+
+    def _build_delta(self, event: RatingEvent) -> CourseRatingAggregatesDelta:
+        rating = event.rating
+        match event.action:
+            case RatingAction.CREATED:
+                return CourseRatingAggregatesDelta(
+                    ratings_count=1,
+                    difficulty_sum=rating.difficulty,
+                    usefulness_sum=rating.usefulness,
+                )
+            case RatingAction.DELETED:
+                return CourseRatingAggregatesDelta(
+                    ratings_count=-1,
+                    difficulty_sum=-rating.difficulty,
+                    usefulness_sum=-rating.usefulness,
+                )
+            case RatingAction.UPDATED if event.previous is not None:
+                return CourseRatingAggregatesDelta(
+                    difficulty_sum=rating.difficulty - event.previous.difficulty,
+                    usefulness_sum=rating.usefulness - event.previous.usefulness,
+                )
+            case _:
+                return CourseRatingAggregatesDelta()
+
+
+class CourseRatingRollupUpdateObserver(IBatchEventListener[RatingEvent]):
+    def __init__(self, course_service: CourseService):
+        self.course_service = course_service
+
+    @implements
+    def on_event(self, event: RatingEvent, *args, **kwargs) -> None:
+        delta = self._build_delta(event)
+        self.course_service.apply_rating_rollup_delta(str(event.rating.course), delta)
+
+    @implements
+    def on_events(self, events: Sequence[RatingEvent], *args, **kwargs) -> None:
+        totals: dict[tuple[str, int, SemesterTerm], RatingRollupDelta] = {}
+        for event in events:
+            delta = self._build_delta(event)
+            key = (str(event.rating.course), delta.year, delta.term)
+            total = totals.get(key)
+            totals[key] = delta if total is None else self._merge(total, delta)
+
+        for (course_id, _, _), delta in totals.items():
+            self.course_service.apply_rating_rollup_delta(course_id, delta)
+
+    def _build_delta(self, event: RatingEvent) -> RatingRollupDelta:
+        rating = event.rating
+        year, term = rating.course_offering_year, rating.course_offering_term
+        match event.action:
+            case RatingAction.CREATED:
+                return RatingRollupDelta(
+                    year=year,
+                    term=term,
+                    ratings_count=1,
+                    difficulty={rating.difficulty: 1},
+                    usefulness={rating.usefulness: 1},
+                )
+            case RatingAction.DELETED:
+                return RatingRollupDelta(
+                    year=year,
+                    term=term,
+                    ratings_count=-1,
+                    difficulty={rating.difficulty: -1},
+                    usefulness={rating.usefulness: -1},
+                )
+            case RatingAction.UPDATED if event.previous is not None:
+                return RatingRollupDelta(
+                    year=year,
+                    term=term,
+                    difficulty=self._move(event.previous.difficulty, rating.difficulty),
+                    usefulness=self._move(event.previous.usefulness, rating.usefulness),
+                )
+            case _:
+                return RatingRollupDelta(year=year, term=term)
+
+    def _merge(self, total: RatingRollupDelta, delta: RatingRollupDelta) -> RatingRollupDelta:
+        return RatingRollupDelta(
+            year=total.year,
+            term=total.term,
+            ratings_count=total.ratings_count + delta.ratings_count,
+            difficulty=self._add_counts(total.difficulty, delta.difficulty),
+            usefulness=self._add_counts(total.usefulness, delta.usefulness),
+        )
+
+    def _add_counts(self, left: dict[int, int], right: dict[int, int]) -> dict[int, int]:
+        merged = dict(left)
+        for score, change in right.items():
+            merged[score] = merged.get(score, 0) + change
+        return merged
+
+    def _move(self, old_score: int, new_score: int) -> dict[int, int]:
+        if old_score == new_score:
+            return {}
+        return {old_score: -1, new_score: 1}
@@ -1,3 +1,9 @@
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+
+from django.db import transaction
+
 from rateukma.caching.cache_manager import ICacheManager
 from rateukma.caching.patterns import (
     comment_replies_namespace,
@@ -6,41 +12,117 @@ from rateukma.caching.patterns import (
     course_ratings_namespace,
     rating_comments_namespace,
     student_ratings_namespace,
+    student_votes_namespace,
 )
 from rateukma.protocols import implements
-from rateukma.protocols.generic import IEventListener
-from rating_app.application_schemas.rating import Rating as RatingDTO
-from rating_app.application_schemas.rating_vote import RatingVote as RatingVoteDTO
-from rating_app.repositories import RatingRepository
-from rating_app.services.comment_events import CommentAction, CommentEvent
+from rateukma.protocols.generic import IBatchEventListener, IEventListener
+from rating_app.constants import COURSE_VOTE_COUNTS_DEBOUNCE_SECONDS
+from rating_app.services.comment_events import CommentEvent
+from rating_app.services.rating_events import RatingEvent
+from rating_app.services.vote_events import RatingVoteEvent
 
 # TODO: implement a generic cache invalidator with patterns
 
 
-class RatingCacheInvalidator(IEventListener[RatingDTO]):
+def _bump_versions_on_commit(cache_manager: ICacheManager, namespaces: Iterable[str]) -> None:
+    # listeners run inside the write's transaction; bumping before it commits would
+    # let a concurrent reader cache the old rows under the new version
+    pending = list(dict.fromkeys(namespaces))
+
+    def bump() -> None:
+        for namespace in pending:
+            cache_manager.bump_version(namespace)
+
+    transaction.on_commit(bump)
+
+
+def _start_timer(delay: float, callback: Callable[[], None]) -> None:
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+
+
+def _window_key(namespace: str) -> str:
+    return f"debounce:{namespace}"
+
+
+def _pending_key(namespace: str) -> str:
+    return f"debounce:{namespace}:pending"
+
+
+class RatingCacheInvalidator(IEventListener[RatingEvent]):
     def __init__(self, cache_manager: ICacheManager):
         self.cache_manager = cache_manager
 
     @implements
-    def on_event(self, event: RatingDTO, *args, **kwargs) -> None:
-        course_id = str(event.course)
-        self.cache_manager.bump_version(course_detail_namespace(course_id))
-        self.cache_manager.bump_version(course_analytics_namespace(course_id))
-        self.cache_manager.bump_version(course_ratings_namespace(course_id))
-        if event.student_id is not None:
-            self.cache_manager.bump_version(student_ratings_namespace(str(event.student_id)))
+    def on_event(self, event: RatingEvent, *args, **kwargs) -> None:
+        rating = event.rating
+        course_id = str(rating.course)
+        namespaces = [
+            course_detail_namespace(course_id),
+            course_analytics_namespace(course_id),
+            course_ratings_namespace(course_id),
+        ]
+        if rating.student_id is not None:
+            namespaces.append(student_ratings_namespace(str(rating.student_id)))
+        _bump_versions_on_commit(self.cache_manager, namespaces)
+
 
+class RatingVoteCacheInvalidator(IEventListener[RatingVoteEvent]):
+    """Invalidates the voter's own rating pages, so they see their vote at once."""
 
-class RatingVoteCacheInvalidator(IEventListener[RatingVoteDTO]):
-    def __init__(self, cache_manager: ICacheManager, rating_repository: RatingRepository):
+    def __init__(self, cache_manager: ICacheManager):
         self.cache_manager = cache_manager
-        self.rating_repository = rating_repository
 
     @implements
-    def on_event(self, event: RatingVoteDTO, *args, **kwargs) -> None:
-        rating = self.rating_repository.get_by_id(str(event.rating_id))
-        course_id = str(rating.course)
-        self.cache_manager.bump_version(course_ratings_namespace(course_id))
+    def on_event(self, event: RatingVoteEvent, *args, **kwargs) -> None:
+        _bump_versions_on_commit(
+            self.cache_manager, [student_votes_namespace(str(event.vote.student_id))]
+        )
+
+
+class CourseVoteCountsCacheInvalidator(IBatchEventListener[RatingVoteEvent]):
+    """
+    Invalidates everyone's rating pages of a course when its votes change, at most
+    twice per burst of votes. A marker shared through the cache opens a window on
+    the first vote, which bumps the course at once; votes inside the window only
+    flag it, and one trailing bump at the end of the window covers them.
+    """
+
+    def __init__(
+        self,
+        cache_manager: ICacheManager,
+        debounce_seconds: int = COURSE_VOTE_COUNTS_DEBOUNCE_SECONDS,
+        schedule: Callable[[float, Callable[[], None]], None] = _start_timer,
+    ):
+        self.cache_manager = cache_manager
+        self.debounce_seconds = debounce_seconds
+        self.schedule = schedule
+
+    @implements
+    def on_event(self, event: RatingVoteEvent, *args, **kwargs) -> None:
+        self.on_events([event])
+
+    @implements
+    def on_events(self, events: Sequence[RatingVoteEvent], *args, **kwargs) -> None:
+        namespaces = list(
+            dict.fromkeys(course_ratings_namespace(str(event.course_id)) for event in events)
+        )
+        transaction.on_commit(partial(self._bump_debounced, namespaces))
+
+    def _bump_debounced(self, namespaces: list[str]) -> None:
+        for namespace in namespaces:
+            if self.cache_manager.add(_window_key(namespace), 1, ttl=self.debounce_seconds):
+                self.cache_manager.bump_version(namespace)
+                self.schedule(self.debounce_seconds, partial(self._bump_trailing, namespace))
+            else:
+                # outlives the window, in case the trailing bump runs late
+                self.cache_manager.set(_pending_key(namespace), 1, ttl=self.debounce_seconds * 2)
+
+    def _bump_trailing(self, namespace: str) -> None:
+        self.cache_manager.invalidate(_window_key(namespace))
+        if self.cache_manager.invalidate(_pending_key(namespace)):
+            self.cache_manager.bump_version(namespace)
 
 
 class CommentCacheInvalidator(IEventListener[CommentEvent]):
@@ -50,15 +132,15 @@ class CommentCacheInvalidator(IEventListener[CommentEvent]):
     @implements
     def on_event(self, event: CommentEvent, *args, **kwargs) -> None:
         comment = event.comment
-        self.cache_manager.bump_version(rating_comments_namespace(str(comment.rating_id)))
-        self.cache_manager.bump_version(comment_replies_namespace(str(comment.id)))
+        namespaces = [
+            rating_comments_namespace(str(comment.rating_id)),
+            comment_replies_namespace(str(comment.id)),
+        ]
         if comment.parent_id is not None:
-            self.cache_manager.bump_version(comment_replies_namespace(str(comment.parent_id)))
-            if event.action in (CommentAction.CREATED, CommentAction.DELETED):
-                self._bump_parent_container_replies_namespace(event)
-
-        self.cache_manager.bump_version(course_ratings_namespace(str(comment.course_id)))
+            namespaces.append(comment_replies_namespace(str(comment.parent_id)))
+            # the parent is listed with its reply count and reply previews
+            if event.parent_parent_id is not None:
+                namespaces.append(comment_replies_namespace(str(event.parent_parent_id)))
 
-    def _bump_parent_container_replies_namespace(self, event: CommentEvent) -> None:
-        if event.parent_parent_id is not None:
-            self.cache_manager.bump_version(comment_replies_namespace(str(event.parent_parent_id)))
+        namespaces.append(course_ratings_namespace(str(comment.course_id)))
+        _bump_versions_on_commit(self.cache_manager, namespaces)
@@ -0,0 +1,159 @@
+import datetime
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from rating_app.application_schemas.analytics import RatingRollupDelta
+from rating_app.application_schemas.rating import CourseRatingAggregatesDelta
+from rating_app.application_schemas.rating import Rating as RatingDTO
+from rating_app.models.choices import SemesterTerm
+from rating_app.services.domain_event_listeners.aggregates_update import (
+    CourseModelAggregatesUpdateObserver,
+    CourseRatingRollupUpdateObserver,
+)
+from rating_app.services.rating_events import RatingAction, RatingEvent
+
+COURSE_ID = uuid.uuid4()
+
+
+def _make_rating_dto(*, difficulty: int = 3, usefulness: int = 4) -> RatingDTO:
+    return RatingDTO(
+        id=uuid.uuid4(),
+        course_offering=uuid.uuid4(),
+        course_offering_term=SemesterTerm.FALL,
+        course_offering_year=2024,
+        student_id=uuid.uuid4(),
+        student_name="Test Student",
+        course=COURSE_ID,
+        difficulty=difficulty,
+        usefulness=usefulness,
+        comment=None,
+        is_anonymous=False,
+        created_at=datetime.datetime.now(),
+        upvotes=0,
+        downvotes=0,
+        viewer_vote=None,
+        comments_count=0,
+    )
+
+
+@pytest.fixture
+def course_service():
+    return MagicMock()
+
+
+@pytest.fixture
+def observer(course_service):
+    return CourseModelAggregatesUpdateObserver(course_service=course_service)
+
+
+def test_created_rating_adds_its_scores(observer, course_service):
+    rating = _make_rating_dto(difficulty=2, usefulness=5)
+
+    observer.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+
+    course_service.apply_rating_aggregates_delta.assert_called_once_with(
+        str(COURSE_ID),
+        CourseRatingAggregatesDelta(ratings_count=1, difficulty_sum=2, usefulness_sum=5),
+    )
+
+
+def test_deleted_rating_subtracts_its_scores(observer, course_service):
+    rating = _make_rating_dto(difficulty=2, usefulness=5)
+
+    observer.on_event(RatingEvent(rating=rating, action=RatingAction.DELETED))
+
+    course_service.apply_rating_aggregates_delta.assert_called_once_with(
+        str(COURSE_ID),
+        CourseRatingAggregatesDelta(ratings_count=-1, difficulty_sum=-2, usefulness_sum=-5),
+    )
+
+
+def test_updated_rating_applies_difference_from_previous(observer, course_service):
+    previous = _make_rating_dto(difficulty=2, usefulness=5)
+    rating = previous.model_copy(update={"difficulty": 4, "usefulness": 3})
+
+    observer.on_event(RatingEvent(rating=rating, action=RatingAction.UPDATED, previous=previous))
+
+    course_service.apply_rating_aggregates_delta.assert_called_once_with(
+        str(COURSE_ID),
+        CourseRatingAggregatesDelta(ratings_count=0, difficulty_sum=2, usefulness_sum=-2),
+    )
+
+
+@pytest.fixture
+def rollup_observer(course_service):
+    return CourseRatingRollupUpdateObserver(course_service=course_service)
+
+
+def test_created_rating_is_counted_in_its_semester_histograms(rollup_observer, course_service):
+    rating = _make_rating_dto(difficulty=2, usefulness=5)
+
+    rollup_observer.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+
+    course_service.apply_rating_rollup_delta.assert_called_once_with(
+        str(COURSE_ID),
+        RatingRollupDelta(
+            year=2024,
+            term=SemesterTerm.FALL,
+            ratings_count=1,
+            difficulty={2: 1},
+            usefulness={5: 1},
+        ),
+    )
+
+
+def test_updated_rating_moves_only_changed_scores_between_buckets(rollup_observer, course_service):
+    previous = _make_rating_dto(difficulty=2, usefulness=5)
+    rating = previous.model_copy(update={"difficulty": 4})
+
+    rollup_observer.on_event(
+        RatingEvent(rating=rating, action=RatingAction.UPDATED, previous=previous)
+    )
+
+    course_service.apply_rating_rollup_delta.assert_called_once_with(
+        str(COURSE_ID),
+        RatingRollupDelta(year=2024, term=SemesterTerm.FALL, difficulty={2: -1, 4: 1}),
+    )
+
+
+def test_batch_of_events_applies_one_delta_per_course(observer, course_service):
+    first = _make_rating_dto(difficulty=2, usefulness=5)
+    second = _make_rating_dto(difficulty=4, usefulness=1)
+
+    observer.on_events(
+        [
+            RatingEvent(rating=first, action=RatingAction.CREATED),
+            RatingEvent(rating=second, action=RatingAction.CREATED),
+            RatingEvent(rating=first, action=RatingAction.DELETED),
+        ]
+    )
+
+    course_service.apply_rating_aggregates_delta.assert_called_once_with(
+        str(COURSE_ID),
+        CourseRatingAggregatesDelta(ratings_count=1, difficulty_sum=4, usefulness_sum=1),
+    )
+
+
+def test_batch_of_events_merges_semester_histograms(rollup_observer, course_service):
+    first = _make_rating_dto(difficulty=2, usefulness=5)
+    second = _make_rating_dto(difficulty=2, usefulness=3)
+
+    rollup_observer.on_events(
+        [
+            RatingEvent(rating=first, action=RatingAction.CREATED),
+            RatingEvent(rating=second, action=RatingAction.CREATED),
+        ]
+    )
+
+    course_service.apply_rating_rollup_delta.assert_called_once_with(
+        str(COURSE_ID),
+        RatingRollupDelta(
+            year=2024,
+            term=SemesterTerm.FALL,
+            ratings_count=2,
+            difficulty={2: 2},
+            usefulness={5: 1, 3: 1},
+        ),
+    )
@@ -10,8 +10,11 @@ import datetime
 import uuid
 from unittest.mock import MagicMock
 
+from django.db import transaction
+
 import pytest
 
+from rateukma.caching.cache_manager import InMemoryCacheManager
 from rateukma.caching.patterns import (
     comment_replies_namespace,
     course_analytics_namespace,
@@ -19,15 +22,21 @@ from rateukma.caching.patterns import (
     course_ratings_namespace,
     rating_comments_namespace,
     student_ratings_namespace,
+    student_votes_namespace,
 )
 from rating_app.application_schemas.comment import CommentDTO
 from rating_app.application_schemas.rating import Rating as RatingDTO
-from rating_app.models.choices import SemesterTerm
+from rating_app.application_schemas.rating_vote import RatingVote as RatingVoteDTO
+from rating_app.models.choices import RatingVoteType, SemesterTerm
 from rating_app.services.comment_events import CommentAction, CommentEvent
 from rating_app.services.domain_event_listeners.cache_invalidator import (
     CommentCacheInvalidator,
+    CourseVoteCountsCacheInvalidator,
     RatingCacheInvalidator,
+    RatingVoteCacheInvalidator,
 )
+from rating_app.services.rating_events import RatingAction, RatingEvent
+from rating_app.services.vote_events import RatingVoteAction, RatingVoteEvent
 
 
 def _make_rating_dto(*, is_anonymous: bool = False) -> RatingDTO:
@@ -73,6 +82,15 @@ def _make_comment_dto(
     )
 
 
+_on_commit = transaction.on_commit
+
+
+@pytest.fixture(autouse=True)
+def _run_on_commit_immediately(monkeypatch):
+    # bumps are deferred to commit; without a database there is nothing to wait for
+    monkeypatch.setattr(transaction, "on_commit", lambda func, *args, **kwargs: func())
+
+
 class TestRatingCacheInvalidator:
     @pytest.fixture
     def cache_manager(self):
@@ -83,39 +101,153 @@ class TestRatingCacheInvalidator:
         return RatingCacheInvalidator(cache_manager=cache_manager)
 
     def test_bumps_course_detail_namespace(self, invalidator, cache_manager):
-        event = _make_rating_dto()
-        invalidator.on_event(event)
-        cache_manager.bump_version.assert_any_call(course_detail_namespace(str(event.course)))
+        rating = _make_rating_dto()
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+        cache_manager.bump_version.assert_any_call(course_detail_namespace(str(rating.course)))
 
     def test_bumps_course_analytics_namespace(self, invalidator, cache_manager):
-        event = _make_rating_dto()
-        invalidator.on_event(event)
-        cache_manager.bump_version.assert_any_call(course_analytics_namespace(str(event.course)))
+        rating = _make_rating_dto()
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+        cache_manager.bump_version.assert_any_call(course_analytics_namespace(str(rating.course)))
 
     def test_bumps_course_ratings_namespace(self, invalidator, cache_manager):
-        event = _make_rating_dto()
-        invalidator.on_event(event)
-        cache_manager.bump_version.assert_any_call(course_ratings_namespace(str(event.course)))
+        rating = _make_rating_dto()
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+        cache_manager.bump_version.assert_any_call(course_ratings_namespace(str(rating.course)))
 
     def test_bumps_student_ratings_namespace(self, invalidator, cache_manager):
-        event = _make_rating_dto()
-        invalidator.on_event(event)
-        cache_manager.bump_version.assert_any_call(student_ratings_namespace(str(event.student_id)))
+        rating = _make_rating_dto()
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+        cache_manager.bump_version.assert_any_call(
+            student_ratings_namespace(str(rating.student_id))
+        )
+
+    @pytest.mark.django_db
+    def test_bumps_only_after_the_write_commits(
+        self, invalidator, cache_manager, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        monkeypatch.setattr(transaction, "on_commit", _on_commit)
+        rating = _make_rating_dto()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+            cache_manager.bump_version.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        assert cache_manager.bump_version.call_count == 4
 
     def test_bumps_all_four_namespaces(self, invalidator, cache_manager):
-        event = _make_rating_dto()
-        invalidator.on_event(event)
+        rating = _make_rating_dto()
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
         assert cache_manager.bump_version.call_count == 4
 
     def test_anonymous_rating_still_bumps_student_namespace(self, invalidator, cache_manager):
         """Anonymous ratings carry the real student_id in the domain model.
         Privacy nulling happens at the serializer layer, not here."""
-        event = _make_rating_dto(is_anonymous=True)
-        invalidator.on_event(event)
-        cache_manager.bump_version.assert_any_call(student_ratings_namespace(str(event.student_id)))
+        rating = _make_rating_dto(is_anonymous=True)
+        invalidator.on_event(RatingEvent(rating=rating, action=RatingAction.CREATED))
+        cache_manager.bump_version.assert_any_call(
+            student_ratings_namespace(str(rating.student_id))
+        )
         assert cache_manager.bump_version.call_count == 4
 
 
+def _make_vote_event(*, course_id: uuid.UUID | None = None) -> RatingVoteEvent:
+    vote = RatingVoteDTO(
+        id=uuid.uuid4(),
+        student_id=uuid.uuid4(),
+        rating_id=uuid.uuid4(),
+        vote_type=RatingVoteType.UPVOTE,
+    )
+    return RatingVoteEvent(
+        vote=vote, action=RatingVoteAction.CREATED, course_id=course_id or uuid.uuid4()
+    )
+
+
+class TestRatingVoteCacheInvalidator:
+    def test_bumps_only_the_voters_namespace(self):
+        cache_manager = MagicMock()
+        invalidator = RatingVoteCacheInvalidator(cache_manager=cache_manager)
+        event = _make_vote_event()
+
+        invalidator.on_event(event)
+
+        cache_manager.bump_version.assert_called_once_with(
+            student_votes_namespace(str(event.vote.student_id))
+        )
+
+
+class TestCourseVoteCountsCacheInvalidator:
+    def test_bumps_course_ratings_namespace_from_event_course_id(self):
+        cache_manager = MagicMock()
+        invalidator = CourseVoteCountsCacheInvalidator(
+            cache_manager=cache_manager, schedule=MagicMock()
+        )
+        event = _make_vote_event()
+
+        invalidator.on_event(event)
+
+        cache_manager.bump_version.assert_called_once_with(
+            course_ratings_namespace(str(event.course_id))
+        )
+
+    def test_batch_bumps_each_course_once(self):
+        cache_manager = MagicMock()
+        invalidator = CourseVoteCountsCacheInvalidator(
+            cache_manager=cache_manager, schedule=MagicMock()
+        )
+        busy_course, other_course = uuid.uuid4(), uuid.uuid4()
+        events = [_make_vote_event(course_id=busy_course) for _ in range(5)]
+        events.append(_make_vote_event(course_id=other_course))
+
+        invalidator.on_events(events)
+
+        assert [call.args[0] for call in cache_manager.bump_version.call_args_list] == [
+            course_ratings_namespace(str(busy_course)),
+            course_ratings_namespace(str(other_course)),
+        ]
+
+    def test_burst_of_votes_bumps_once_then_once_at_window_end(self):
+        cache_manager = InMemoryCacheManager()
+        scheduled = []
+        invalidator = CourseVoteCountsCacheInvalidator(
+            cache_manager=cache_manager,
+            debounce_seconds=2,
+            schedule=lambda delay, callback: scheduled.append((delay, callback)),
+        )
+        course_id = uuid.uuid4()
+        namespace = course_ratings_namespace(str(course_id))
+
+        for _ in range(10):
+            invalidator.on_event(_make_vote_event(course_id=course_id))
+        bumps_during_burst = cache_manager.get_version(namespace)
+        [(delay, trailing_bump)] = scheduled
+        trailing_bump()
+
+        assert bumps_during_burst == 1
+        assert delay == 2
+        assert cache_manager.get_version(namespace) == 2
+
+        # the window is closed, so the next vote is bumped at once again
+        invalidator.on_event(_make_vote_event(course_id=course_id))
+        assert cache_manager.get_version(namespace) == 3
+
+    def test_window_end_without_further_votes_does_not_bump(self):
+        cache_manager = InMemoryCacheManager()
+        scheduled = []
+        invalidator = CourseVoteCountsCacheInvalidator(
+            cache_manager=cache_manager,
+            schedule=lambda delay, callback: scheduled.append(callback),
+        )
+        event = _make_vote_event()
+
+        invalidator.on_event(event)
+        scheduled[0]()
+
+        assert cache_manager.get_version(course_ratings_namespace(str(event.course_id))) == 1
+
+
 class TestCommentCacheInvalidator:
     @pytest.fixture
     def cache_manager(self):
@@ -160,9 +292,9 @@ class TestCommentCacheInvalidator:
 
     @pytest.mark.parametrize(
         "action",
-        [CommentAction.CREATED, CommentAction.DELETED],
+        [CommentAction.CREATED, CommentAction.UPDATED, CommentAction.DELETED],
     )
-    def test_bumps_parent_container_replies_namespace_for_nested_reply_count_changes(
+    def test_bumps_parent_container_replies_namespace_for_nested_reply_changes(
         self,
         invalidator,
         cache_manager,
@@ -1,13 +1,14 @@
+from collections.abc import Sequence
+
 import structlog
 
 from rateukma.protocols import implements
-from rateukma.protocols.generic import IEventListener
-from rating_app.application_schemas.rating_vote import RatingVote as RatingVoteDTO
-from rating_app.exception.student_exceptions import StudentNotFoundError
+from rateukma.protocols.generic import IBatchEventListener
 from rating_app.models.choices import NotificationEventType, RatingVoteType
 from rating_app.models.rating_vote import RatingVote as RatingVoteModel
-from rating_app.repositories import RatingRepository, StudentRepository
+from rating_app.repositories import StudentRepository
 from rating_app.services.notification_service import NotificationService
+from rating_app.services.vote_events import RatingVoteAction, RatingVoteEvent
 
 logger = structlog.get_logger(__name__)
 
@@ -18,64 +19,71 @@ VOTE_TYPE_TO_EVENT: dict[int, NotificationEventType] = {
 }
 
 
-class VoteNotificationObserver(IEventListener[RatingVoteDTO]):
+class VoteNotificationObserver(IBatchEventListener[RatingVoteEvent]):
     def __init__(
         self,
         notification_service: NotificationService,
-        rating_repository: RatingRepository,
         student_repository: StudentRepository,
     ) -> None:
         self.notification_service = notification_service
-        self.rating_repository = rating_repository
         self.student_repository = student_repository
 
     @implements
-    def on_event(self, event: RatingVoteDTO, *args, **kwargs) -> None:
-        rating = self.rating_repository.get_by_id(str(event.rating_id))
-        if rating.student_id is None:
+    def on_event(self, event: RatingVoteEvent, *args, **kwargs) -> None:
+        vote = event.vote
+        recipient_user_id = event.rating_author_user_id
+        if recipient_user_id is None:
             return
 
-        if self._is_self_vote(event, rating.student_id):
+        actor_user_id = self._get_actor_user_id(event)
+        if actor_user_id == recipient_user_id:
             return
 
-        event_type = VOTE_TYPE_TO_EVENT.get(event.vote_type)
+        event_type = VOTE_TYPE_TO_EVENT.get(vote.vote_type)
         if event_type is None:
-            logger.warning("unknown_type", vote_type=event.vote_type)
-            return
-
-        recipient_user_id = self._get_user_id(rating.student_id)
-        if recipient_user_id is None:
-            logger.warning("recipient_not_found", student_id=str(rating.student_id))
+            logger.warning("unknown_type", vote_type=vote.vote_type)
             return
 
-        actor_user_id = self._get_user_id(event.student_id)
-
-        # we remove prior notifications from this actor for this rating
-        # so toggling upvote-downvote doesn't inflate the count
-        if actor_user_id is not None:
-            self.notification_service.delete_actor_notifications_for_rating(
+        if event.action == RatingVoteAction.DELETED:
+            self.notification_service.delete_notifications_for_event_source(
                 recipient_id=recipient_user_id,
-                actor_id=actor_user_id,
-                rating_id=str(event.rating_id),
+                event_types=list(VOTE_TYPE_TO_EVENT.values()),
+                source_model=RatingVoteModel,
+                source_id=str(vote.id),
             )
+            return
 
-        self.notification_service.create_notification(
+        # the vote keeps its id when toggled, so its notification is refreshed in
+        # place and the one for the opposite vote type is dropped; toggling
+        # upvote-downvote doesn't inflate the count
+        self.notification_service.upsert_notification(
             recipient_id=recipient_user_id,
             event_type=event_type,
-            group_key=self._build_group_key(event_type, event.rating_id),
+            group_key=self._build_group_key(event_type, vote.rating_id),
             source_model=RatingVoteModel,
-            source_id=str(event.id),
+            source_id=str(vote.id),
             actor_id=actor_user_id,
+            replaced_event_types=[
+                other for other in VOTE_TYPE_TO_EVENT.values() if other != event_type
+            ],
         )
 
-    def _is_self_vote(self, event: RatingVoteDTO, rating_student_id) -> bool:
-        return str(event.student_id) == str(rating_student_id)
+    @implements
+    def on_events(self, events: Sequence[RatingVoteEvent], *args, **kwargs) -> None:
+        # a student toggling a vote only leaves their last vote to notify about
+        latest: dict[tuple[str, str], RatingVoteEvent] = {}
+        for event in events:
+            key = (str(event.vote.rating_id), str(event.vote.student_id))
+            latest.pop(key, None)
+            latest[key] = event
+
+        for event in latest.values():
+            self.on_event(event)
 
     def _build_group_key(self, event_type: str, rating_id) -> str:
         return f"{event_type}:{rating_id}"
 
-    def _get_user_id(self, student_id) -> int | None:
-        try:
-            return self.student_repository.get_by_id(str(student_id)).user_id
-        except StudentNotFoundError:
-            return None
+    def _get_actor_user_id(self, event: RatingVoteEvent) -> int | None:
+        if event.voter_user_id is not None:
+            return event.voter_user_id
+        return self.student_repository.get_user_id(str(event.vote.student_id))
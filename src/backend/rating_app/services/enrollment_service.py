@@ -0,0 +1,30 @@
+import uuid
+
+from rateukma.caching.decorators import rcached
+from rateukma.caching.patterns import student_enrollments_namespace
+from rating_app.application_schemas.enrollment import StudentEligibility
+from rating_app.constants import ENROLLMENT_ELIGIBILITY_CACHE_TTL
+from rating_app.repositories import EnrollmentRepository
+
+
+class EnrollmentService:
+    """
+    Answers enrollment checks from a cached per-student eligibility set.
+    Enrollments only change during ingestion, which bumps the student's namespace.
+    """
+
+    def __init__(self, enrollment_repository: EnrollmentRepository) -> None:
+        self.enrollment_repository = enrollment_repository
+
+    @rcached(
+        ttl=ENROLLMENT_ELIGIBILITY_CACHE_TTL,
+        versioned_by=lambda self, student_id: student_enrollments_namespace(student_id),
+    )
+    def get_student_eligibility(self, student_id: str) -> StudentEligibility:
+        return self.enrollment_repository.get_student_eligibility(student_id)
+
+    def is_enrolled(self, student_id: str, offering_id: uuid.UUID | str) -> bool:
+        return self.get_student_eligibility(student_id).is_enrolled(offering_id)
+
+    def is_enrolled_in_course(self, student_id: str, course_id: uuid.UUID | str) -> bool:
+        return self.get_student_eligibility(student_id).is_enrolled_in_course(course_id)
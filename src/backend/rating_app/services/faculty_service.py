@@ -2,11 +2,13 @@ from typing import Any
 
 from rating_app.repositories import FacultyRepository
 from rating_app.services.protocols import IFilterable
+from rating_app.services.reference_data import ReferenceDataCache
 
 
 class FacultyService(IFilterable):
-    def __init__(self, faculty_repository: FacultyRepository):
+    def __init__(self, faculty_repository: FacultyRepository, reference_data: ReferenceDataCache):
         self.faculty_repository = faculty_repository
+        self.reference_data = reference_data
 
     def get_filter_options(self) -> list[dict[str, Any]]:
         faculties = self._get_sorted_faculties()
@@ -21,6 +23,6 @@ class FacultyService(IFilterable):
 
     def _get_sorted_faculties(self):
         return sorted(
-            self.faculty_repository.get_all(),
+            self.reference_data.get().faculties,
             key=lambda faculty: str(faculty.name or "").lower(),
         )
@@ -1,15 +1,29 @@
+import base64
+import binascii
+import json
+from collections.abc import Collection, Iterator
+from datetime import datetime
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
 
 import structlog
 
 from rating_app.application_schemas.notification import (
     NotificationCreateData,
+    NotificationFeedCursor,
+    NotificationFeedPage,
     NotificationGroup,
+    NotificationPurgeResult,
+    NotificationRetentionPolicy,
 )
+from rating_app.exception.notification_exceptions import InvalidNotificationFeedCursorError
 from rating_app.repositories.notification_repository import (
     NotificationCursorRepository,
     NotificationRepository,
 )
+from rating_app.services.notification_updates import NotificationUpdatesChannel
 
 logger = structlog.get_logger(__name__)
 
@@ -21,11 +35,13 @@ class NotificationService:
         self,
         notification_repository: NotificationRepository,
         cursor_repository: NotificationCursorRepository,
+        updates_channel: NotificationUpdatesChannel,
     ) -> None:
         self.notification_repository = notification_repository
         self.cursor_repository = cursor_repository
+        self.updates_channel = updates_channel
 
-    def create_notification(
+    def upsert_notification(
         self,
         recipient_id: int,
         event_type: str,
@@ -33,18 +49,23 @@ class NotificationService:
         source_model: type,
         source_id: str,
         actor_id: int | None = None,
-    ) -> NotificationGroup:
-        content_type = ContentType.objects.get_for_model(source_model)
-
+        replaced_event_types: Collection[str] = (),
+    ) -> None:
+        """
+        Notifies about an event source at most once: repeated events refresh the
+        existing notification, and ones of `replaced_event_types` for the same
+        source are dropped.
+        """
         data = NotificationCreateData(
             recipient_id=recipient_id,
             event_type=event_type,
             group_key=group_key,
-            content_type=content_type,
+            content_type=ContentType.objects.get_for_model(source_model),
             object_id=source_id,
             actor_id=actor_id,
         )
-        return self.notification_repository.create(data)
+        self.notification_repository.upsert(data, replaced_event_types)
+        self._publish_unread_count(recipient_id)
 
     def get_notifications_for_user(
         self,
@@ -52,50 +73,117 @@ class NotificationService:
         limit: int = DEFAULT_NOTIFICATION_PAGE_SIZE,
         offset: int = 0,
     ) -> list[NotificationGroup]:
-        cursor_value = self.cursor_repository.get_cursor_value(user_id)
         return self.notification_repository.get_grouped_for_user(
             user_id=user_id,
-            cursor_value=cursor_value,
             limit=limit,
             offset=offset,
         )
 
-    def get_unread_count(self, user_id: int) -> int:
-        cursor_value = self.cursor_repository.get_cursor_value(user_id)
-        return self.notification_repository.get_unread_group_count(
+    def get_notification_feed(
+        self,
+        user_id: int,
+        limit: int = DEFAULT_NOTIFICATION_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> NotificationFeedPage:
+        after = decode_feed_cursor(cursor) if cursor else None
+        # one extra row tells whether another page follows without counting
+        groups = self.notification_repository.get_grouped_page(
             user_id=user_id,
-            cursor_value=cursor_value,
+            limit=limit + 1,
+            after=after,
         )
+        if len(groups) <= limit:
+            return NotificationFeedPage(items=groups)
+
+        items = groups[:limit]
+        last = items[-1]
+        next_cursor = NotificationFeedCursor(
+            latest_created_at=last.latest_created_at,
+            group_key=last.group_key,
+        )
+        return NotificationFeedPage(items=items, next_cursor=encode_feed_cursor(next_cursor))
+
+    def get_unread_count(self, user_id: int) -> int:
+        return self.notification_repository.get_unread_group_count(user_id=user_id)
 
     def mark_all_read(self, user_id: int) -> None:
         self.cursor_repository.advance_cursor(user_id)
+        self._publish_unread_count(user_id)
 
     def mark_group_read(self, user_id: int, group_key: str) -> None:
         self.cursor_repository.mark_group_read(user_id, group_key)
+        self._publish_unread_count(user_id)
 
-    def delete_actor_notifications_for_rating(
-        self,
-        recipient_id: int,
-        actor_id: int,
-        rating_id: str,
-    ) -> None:
-        self.notification_repository.delete_by_actor_and_rating(
-            recipient_id=recipient_id,
-            actor_id=actor_id,
-            rating_id=rating_id,
-        )
-
-    def delete_notification_for_event_source(
+    def delete_notifications_for_event_source(
         self,
         recipient_id: int,
-        event_type: str,
+        event_types: Collection[str],
         source_model: type,
         source_id: str,
     ) -> None:
         content_type = ContentType.objects.get_for_model(source_model)
         self.notification_repository.delete_by_event_source(
             recipient_id=recipient_id,
-            event_type=event_type,
+            event_types=event_types,
             content_type_id=content_type.id,
             source_id=source_id,
         )
+        self._publish_unread_count(recipient_id)
+
+    def purge_batches(
+        self,
+        policy: NotificationRetentionPolicy,
+        batch_size: int,
+    ) -> Iterator[NotificationPurgeResult]:
+        """
+        Applies the retention policy one deletion of at most `batch_size` rows at a
+        time, each in its own transaction, and yields what every batch removed.
+        Expired rows go first; the recipients over the cap are then looked up once
+        and drained one after another. Read cursors are kept, so whatever survives
+        keeps its read state.
+        """
+        expired = over_cap = 0
+        if policy.max_age is not None:
+            cutoff = timezone.now() - policy.max_age
+            while deleted := self.notification_repository.purge_created_before(cutoff, batch_size):
+                expired += deleted
+                yield NotificationPurgeResult(expired=deleted)
+
+        if policy.max_per_user is not None:
+            # one grouped scan per run; draining a recipient never adds another
+            for recipient_id in self.notification_repository.get_recipients_over_cap(
+                policy.max_per_user
+            ):
+                while deleted := self.notification_repository.purge_over_cap(
+                    recipient_id, policy.max_per_user, batch_size
+                ):
+                    over_cap += deleted
+                    yield NotificationPurgeResult(over_cap=deleted)
+
+        if expired or over_cap:
+            logger.info("notifications_purged", expired=expired, over_cap=over_cap)
+
+    def _publish_unread_count(self, user_id: int) -> None:
+        # pushed once the change is committed, so listeners never see a count
+        # that a rollback takes back; the counter read is a single indexed lookup
+        transaction.on_commit(
+            lambda: self.updates_channel.publish_unread_count(
+                user_id, self.get_unread_count(user_id)
+            )
+        )
+
+
+def encode_feed_cursor(cursor: NotificationFeedCursor) -> str:
+    raw = json.dumps([cursor.latest_created_at.isoformat(), cursor.group_key])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_feed_cursor(token: str) -> NotificationFeedCursor:
+    try:
+        latest_created_at, group_key = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return NotificationFeedCursor(
+            latest_created_at=datetime.fromisoformat(latest_created_at),
+            group_key=str(group_key),
+        )
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise InvalidNotificationFeedCursorError() from e
@@ -0,0 +1,19 @@
+from rateukma.pubsub.broker import IMessageBroker, ISubscription
+
+
+class NotificationUpdatesChannel:
+    """
+    Per-user push channel carrying the unread notification group count.
+    """
+
+    def __init__(self, broker: IMessageBroker) -> None:
+        self.broker = broker
+
+    def publish_unread_count(self, user_id: int, count: int) -> None:
+        self.broker.publish(self._channel(user_id), {"unread_count": count})
+
+    async def subscribe(self, user_id: int) -> ISubscription:
+        return await self.broker.subscribe(self._channel(user_id))
+
+    def _channel(self, user_id: int) -> str:
+        return f"notifications:unread:{user_id}"
@@ -0,0 +1,136 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, TypeVar
+
+from django.db import transaction
+
+import structlog
+from pydantic import TypeAdapter
+
+from rateukma.protocols import implements
+from rateukma.protocols.generic import IBatchEventListener, IEventListener
+from rating_app.application_schemas.outbox import OutboxDrainResult, PendingOutboxMessage
+from rating_app.models.choices import OutboxTopic
+from rating_app.repositories import OutboxRepository
+
+logger = structlog.get_logger(__name__)
+
+_E = TypeVar("_E")
+
+
+class OutboxWriter(IEventListener[_E]):
+    """Records events in the outbox instead of handling them in the request."""
+
+    def __init__(
+        self, outbox_repository: OutboxRepository, topic: OutboxTopic, event_type: type[_E]
+    ):
+        self.outbox_repository = outbox_repository
+        self.topic = topic
+        self._adapter = TypeAdapter(event_type)
+
+    @implements
+    def on_event(self, event: _E, *args, **kwargs) -> None:
+        self.outbox_repository.add(self.topic, self._adapter.dump_python(event, mode="json"))
+
+
+@dataclass
+class _Subscription[E]:
+    adapter: TypeAdapter[E]
+    listeners: list[IEventListener[E]] = field(default_factory=list)
+
+    def deliver(self, messages: Sequence[PendingOutboxMessage]) -> None:
+        events = [self.adapter.validate_python(message.payload) for message in messages]
+        for listener in self.listeners:
+            if isinstance(listener, IBatchEventListener):
+                listener.on_events(events)
+                continue
+            for event in events:
+                listener.on_event(event)
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox to the deferred listeners in batches.
+
+    A batch is claimed, delivered and deleted in one transaction, so database
+    side effects happen exactly once. Batch listeners see all events of a topic
+    at once and can coalesce them; a topic's settle window holds its messages back
+    for a moment so that bursts end up in the same batch. When a batch fails, its
+    messages are retried one by one so a single bad message does not hold back
+    the others.
+    """
+
+    def __init__(
+        self,
+        outbox_repository: OutboxRepository,
+        max_attempts: int,
+        settle_windows: Mapping[OutboxTopic, timedelta] | None = None,
+    ):
+        self.outbox_repository = outbox_repository
+        self.max_attempts = max_attempts
+        self.settle_windows = dict(settle_windows or {})
+        self._subscriptions: dict[OutboxTopic, _Subscription[Any]] = {}
+
+    def subscribe(
+        self, topic: OutboxTopic, event_type: type[_E], listener: IEventListener[_E]
+    ) -> None:
+        subscription = self._subscriptions.setdefault(
+            topic, _Subscription(adapter=TypeAdapter(event_type))
+        )
+        subscription.listeners.append(listener)
+
+    def drain(self, batch_size: int) -> OutboxDrainResult:
+        with transaction.atomic():
+            messages = self.outbox_repository.claim_batch(
+                batch_size, self.max_attempts, self.settle_windows
+            )
+            if not messages:
+                return OutboxDrainResult()
+
+            failed: dict[Any, str] = {}
+            for topic, topic_messages in self._group_by_topic(messages).items():
+                failed.update(self._deliver_topic(topic, topic_messages))
+
+            self.outbox_repository.delete_many([m.id for m in messages if m.id not in failed])
+            for message_id, error in failed.items():
+                self.outbox_repository.record_failure(message_id, error)
+
+        return OutboxDrainResult(
+            claimed=len(messages),
+            delivered=len(messages) - len(failed),
+            failed=len(failed),
+        )
+
+    def _deliver_topic(
+        self, topic: OutboxTopic, messages: list[PendingOutboxMessage]
+    ) -> dict[Any, str]:
+        subscription = self._subscriptions.get(topic)
+        if subscription is None:
+            logger.warning("outbox_topic_without_listeners", topic=topic, count=len(messages))
+            return {message.id: f"no listeners for topic {topic}" for message in messages}
+
+        try:
+            with transaction.atomic():
+                subscription.deliver(messages)
+            return {}
+        except Exception:
+            logger.warning("outbox_batch_failed", topic=topic, count=len(messages), exc_info=True)
+
+        failed: dict[Any, str] = {}
+        for message in messages:
+            try:
+                with transaction.atomic():
+                    subscription.deliver([message])
+            except Exception as exc:
+                logger.exception("outbox_message_failed", topic=topic, message_id=str(message.id))
+                failed[message.id] = repr(exc)
+        return failed
+
+    def _group_by_topic(
+        self, messages: list[PendingOutboxMessage]
+    ) -> dict[OutboxTopic, list[PendingOutboxMessage]]:
+        grouped: dict[OutboxTopic, list[PendingOutboxMessage]] = {}
+        for message in messages:
+            grouped.setdefault(message.topic, []).append(message)
+        return grouped
@@ -2,10 +2,12 @@ import uuid
 from datetime import datetime
 from typing import Any
 
+from django.db import transaction
+
 import structlog
 
 from rateukma.caching.decorators import rcached
-from rateukma.caching.patterns import course_ratings_namespace
+from rateukma.caching.patterns import course_ratings_namespace, student_votes_namespace
 from rateukma.protocols import implements
 from rateukma.protocols.generic import IEventListener, IObservable
 from rating_app.application_schemas.course import Course as CourseDTO
@@ -28,19 +30,18 @@ from rating_app.application_schemas.semester import (
 )
 from rating_app.exception.instructor_exceptions import InvalidInstructorIdsError
 from rating_app.exception.rating_exceptions import (
-    DuplicateRatingException,
     NotEnrolledException,
     RatingPeriodNotStarted,
 )
+from rating_app.models import Instructor
 from rating_app.repositories import (
-    EnrollmentRepository,
     RatingRepository,
     RatingVoteMapper,
     RatingVoteRepository,
 )
 from rating_app.repositories.instructor_repository import InstructorRepository
 from rating_app.services.comment_normalizer import CommentNormalizer
-from rating_app.services.course_offering_service import CourseOfferingService
+from rating_app.services.rating_events import RatingAction, RatingEvent
 from rating_app.services.semester_service import SemesterService
 
 logger = structlog.get_logger(__name__)
@@ -50,18 +51,20 @@ def _ratings_course_namespace(
     _self,
     filters: RatingFilterCriteria,
     paginate: bool = True,
-) -> str | None:
+) -> list[str] | None:
     if filters.course_id is None:
         return None
-    return course_ratings_namespace(str(filters.course_id))
+    namespaces = [course_ratings_namespace(str(filters.course_id))]
+    # the viewer's own votes are on the page, so their votes invalidate it right away
+    if filters.viewer_id is not None:
+        namespaces.append(student_votes_namespace(str(filters.viewer_id)))
+    return namespaces
 
 
-class RatingService(IObservable[RatingDTO]):
+class RatingService(IObservable[RatingEvent]):
     def __init__(
         self,
         rating_repository: RatingRepository,
-        enrollment_repository: EnrollmentRepository,
-        course_offering_service: CourseOfferingService,
         semester_service: SemesterService,
         vote_repository: RatingVoteRepository,
         vote_mapper: RatingVoteMapper,
@@ -69,22 +72,20 @@ class RatingService(IObservable[RatingDTO]):
         instructor_repository: InstructorRepository,
     ):
         self.rating_repository = rating_repository
-        self.enrollment_repository = enrollment_repository
-        self.course_offering_service = course_offering_service
         self.semester_service = semester_service
         self.vote_repository = vote_repository
         self.vote_mapper = vote_mapper
         self.comment_normalizer = comment_normalizer
         self.instructor_repository = instructor_repository
-        self._listeners: list[IEventListener[RatingDTO]] = []
+        self._listeners: list[IEventListener[RatingEvent]] = []
 
     @implements
-    def notify(self, event: RatingDTO, *args, **kwargs) -> None:
+    def notify(self, event: RatingEvent, *args, **kwargs) -> None:
         for listener in self._listeners:
             listener.on_event(event, *args, **kwargs)
 
     @implements
-    def add_observer(self, observer: IEventListener[RatingDTO]) -> None:
+    def add_observer(self, observer: IEventListener[RatingEvent]) -> None:
         self._listeners.append(observer)
 
     def get_rating(self, rating_id: str) -> RatingDTO:
@@ -156,49 +157,57 @@ class RatingService(IObservable[RatingDTO]):
         student_id = str(params.student)
         offering_id = str(params.course_offering)
 
-        is_enrolled = self.enrollment_repository.is_student_enrolled(
-            student_id=student_id, offering_id=offering_id
+        eligibility = self.rating_repository.get_rating_eligibility(
+            student_id=student_id, course_offering_id=offering_id
         )
-
-        if not is_enrolled:
+        if eligibility is None:
             raise NotEnrolledException()
 
-        course_offering = self.course_offering_service.get_course_offering(offering_id)
-        semester = self.semester_service.get_by_id(str(course_offering.semester_id))
-        if not self.is_semester_open_for_rating(semester):
+        if not self.is_semester_open_for_rating(
+            eligibility.semester,
+            current_semester=self.semester_service.get_current_term(),
+        ):
             raise RatingPeriodNotStarted()
 
-        rating_exists = self.rating_repository.exists(
-            student_id=student_id, course_offering_id=offering_id
-        )
-        if rating_exists:
-            raise DuplicateRatingException()
-
         params.comment = self.comment_normalizer.normalize_comment(params.comment)
-        self._validate_instructor_ids(params.instructor_ids)
+        instructors = self._resolve_instructors(params.instructor_ids)
 
-        rating = self.rating_repository.create(params)
-        self.notify(rating)
+        # the event is recorded in the same transaction as the rating itself
+        with transaction.atomic():
+            # a second rating for the same offering is rejected by the unique constraint
+            rating = self.rating_repository.create(
+                params, eligibility=eligibility, instructors=instructors
+            )
+            self.notify(RatingEvent(rating=rating, action=RatingAction.CREATED))
         return rating
 
     def update_rating(
         self, rating: RatingDTO, update_data: RatingPutParams | RatingPatchParams
     ) -> RatingDTO:
         update_data.comment = self.comment_normalizer.normalize_comment(update_data.comment)
-        self._validate_instructor_ids(update_data.instructor_ids)
-        updated_rating = self.rating_repository.update(rating, update_data)
-        self.notify(updated_rating)
+        instructors = (
+            self._resolve_instructors(update_data.instructor_ids)
+            if update_data.instructor_ids is not None
+            else None
+        )
+        with transaction.atomic():
+            updated_rating = self.rating_repository.update(
+                rating, update_data, instructors=instructors
+            )
+            self.notify(
+                RatingEvent(rating=updated_rating, action=RatingAction.UPDATED, previous=rating)
+            )
         return updated_rating
 
-    def _validate_instructor_ids(self, instructor_ids: list[uuid.UUID] | None) -> None:
-        """Reject ids that do not reference an existing Instructor.
+    def _resolve_instructors(self, instructor_ids: list[uuid.UUID] | None) -> list[Instructor]:
+        """Load the referenced instructors, rejecting ids that do not exist.
 
         Django's M2M ``.set()`` silently ignores unknown primary keys, which
         would let a client persist a rating with fewer instructors than it asked
         for and no error. Fail loudly with a 400 instead.
         """
         if not instructor_ids:
-            return
+            return []
 
         unique_ids = set(instructor_ids)
         found = self.instructor_repository.get_many_by_ids(list(unique_ids))
@@ -207,10 +216,12 @@ class RatingService(IObservable[RatingDTO]):
             raise InvalidInstructorIdsError(
                 detail=f"Unknown instructor ids: {sorted(str(i) for i in missing)}"
             )
+        return found
 
     def delete_rating(self, rating: RatingDTO) -> None:
-        self.rating_repository.delete(str(rating.id))
-        self.notify(rating)
+        with transaction.atomic():
+            self.rating_repository.delete(str(rating.id))
+            self.notify(RatingEvent(rating=rating, action=RatingAction.DELETED))
 
     def is_semester_open_for_rating(
         self,
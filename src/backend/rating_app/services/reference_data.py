@@ -0,0 +1,112 @@
+import threading
+import time
+
+import structlog
+
+from rateukma.caching.cache_manager import ICacheManager
+from rateukma.caching.patterns import REFERENCE_DATA_NAMESPACE
+from rating_app.application_schemas.reference_data import ReferenceDataSnapshot
+from rating_app.constants import REFERENCE_DATA_VERSION_CHECK_SECONDS
+from rating_app.repositories import (
+    DepartmentRepository,
+    FacultyRepository,
+    SemesterRepository,
+    SpecialityRepository,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class ReferenceDataCache:
+    """
+    Process-local snapshot of semesters, faculties, departments and specialities.
+
+    The snapshot is rebuilt when the shared reference-data version (bumped by the
+    ingestion injector) moves, and swapped in with a single reference assignment,
+    so concurrent readers always see one consistent snapshot. Without a cache
+    backend there is no version to watch, so the snapshot expires after
+    `uncached_ttl` seconds instead.
+    """
+
+    def __init__(
+        self,
+        semester_repository: SemesterRepository,
+        faculty_repository: FacultyRepository,
+        department_repository: DepartmentRepository,
+        speciality_repository: SpecialityRepository,
+        cache_manager: ICacheManager,
+        check_interval: float = REFERENCE_DATA_VERSION_CHECK_SECONDS,
+        enabled: bool = True,
+        uncached_ttl: float = REFERENCE_DATA_VERSION_CHECK_SECONDS,
+    ) -> None:
+        self.semester_repository = semester_repository
+        self.faculty_repository = faculty_repository
+        self.department_repository = department_repository
+        self.speciality_repository = speciality_repository
+        self.cache_manager = cache_manager
+        self.check_interval = check_interval
+        self.enabled = enabled
+        self.uncached_ttl = uncached_ttl
+
+        self._snapshot: ReferenceDataSnapshot | None = None
+        self._next_check_at = 0.0
+        self._rebuild_lock = threading.Lock()
+
+    def get(self) -> ReferenceDataSnapshot:
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now < self._next_check_at:
+            return snapshot
+
+        if not self.enabled:
+            snapshot = self._refresh(version=0, expired=snapshot)
+            self._next_check_at = now + self.uncached_ttl
+            return snapshot
+
+        version = self.cache_manager.get_version(REFERENCE_DATA_NAMESPACE)
+        if snapshot is None or snapshot.version != version:
+            snapshot = self._refresh(version, expired=snapshot)
+        self._next_check_at = now + self.check_interval
+        return snapshot
+
+    def warm(self) -> None:
+        """
+        Builds the snapshot ahead of the first request. Called from the WSGI entry
+        point, which gunicorn imports once in the master under --preload, so the
+        forked workers start with the snapshot already in (copy-on-write) memory.
+        """
+        try:
+            self.get()
+        except Exception as e:
+            # the first request builds it instead
+            logger.warning("reference_data_warmup_failed", error=str(e))
+
+    def _refresh(
+        self, version: int, expired: ReferenceDataSnapshot | None
+    ) -> ReferenceDataSnapshot:
+        with self._rebuild_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot is not expired and snapshot.version == version:
+                return snapshot  # another thread has just rebuilt it
+
+            snapshot = self._load(version)
+            self._snapshot = snapshot
+
+        logger.info(
+            "reference_data_snapshot_rebuilt",
+            version=version,
+            semesters=len(snapshot.semesters),
+            faculties=len(snapshot.faculties),
+            departments=len(snapshot.departments),
+            specialities=len(snapshot.specialities),
+        )
+        return snapshot
+
+    def _load(self, version: int) -> ReferenceDataSnapshot:
+        return ReferenceDataSnapshot.build(
+            version=version,
+            semesters=self.semester_repository.get_all(),
+            faculties=self.faculty_repository.get_all(),
+            departments=self.department_repository.get_all(),
+            specialities=self.speciality_repository.get_all(),
+        )
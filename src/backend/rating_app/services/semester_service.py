@@ -6,6 +6,7 @@ from rating_app.application_schemas.semester import Semester, SemesterInput
 from rating_app.exception.semester_exception import SemesterDoesNotExistError, SemesterNotFoundError
 from rating_app.models.choices import SemesterTerm
 from rating_app.repositories import SemesterRepository
+from rating_app.services.reference_data import ReferenceDataCache
 
 
 @dataclass
@@ -39,37 +40,57 @@ class SemesterService:
         SemesterTerm.FALL: 11,  # November
     }
 
-    def __init__(self, semester_repository: SemesterRepository):
+    def __init__(self, semester_repository: SemesterRepository, reference_data: ReferenceDataCache):
         self.semester_repository = semester_repository
+        self.reference_data = reference_data
 
     def get_by_id(self, semester_id: str) -> Semester:
+        semester = self.reference_data.get().get_semester(semester_id)
+        if semester is not None:
+            return semester
+        # not in the snapshot yet, or not at all: the repository raises the right error
         return self.semester_repository.get_by_id(semester_id)
 
     def get_semesters(self) -> list[Semester]:
-        return self.semester_repository.get_all()
+        return list(self.reference_data.get().semesters)
 
     def get_filter_options(self) -> dict[str, Any]:
         return self._build_filter_options().to_dict()
 
     def get_current(self) -> Semester:
         now = datetime.now()
-        month = now.month
-        if month >= 9:
-            term = SemesterTerm.FALL
-        elif month < 5:
-            term = SemesterTerm.SPRING
-        else:
-            term = SemesterTerm.SUMMER
+        current = self.get_current_term(now)
 
-        year = now.year
+        semester = self.reference_data.get().get_semester_by_year_and_term(
+            current.year, current.term
+        )
+        if semester is not None:
+            return semester
 
         try:
-            return self.semester_repository.get_by_year_and_term(year=year, term=term)
+            return self.semester_repository.get_by_year_and_term(
+                year=current.year, term=SemesterTerm(current.term)
+            )
         except SemesterNotFoundError as exc:
             raise SemesterDoesNotExistError(
                 f"Current semester ({now.year} {now.strftime('%B')})"
             ) from exc
 
+    def get_current_term(self, current_date: datetime | None = None) -> SemesterInput:
+        """Year and term of the current semester, derived from the date alone."""
+        if current_date is None:
+            current_date = datetime.now()
+
+        month = current_date.month
+        if month >= 9:
+            term = SemesterTerm.FALL
+        elif month < 5:
+            term = SemesterTerm.SPRING
+        else:
+            term = SemesterTerm.SUMMER
+
+        return SemesterInput(year=current_date.year, term=term)
+
     def is_midpoint(
         self,
         current_semester: Semester | SemesterInput | None = None,
@@ -106,7 +127,7 @@ class SemesterService:
         )
 
     def _build_filter_options(self) -> SemesterFilterData:
-        semesters = self.semester_repository.get_all()
+        semesters = self.reference_data.get().semesters
         sorted_semesters = self._sort_semesters(semesters)
         term_labels = self._extract_term_labels(sorted_semesters)
         academic_years = self._extract_academic_years(sorted_semesters)
@@ -2,11 +2,15 @@ from typing import Any
 
 from rating_app.repositories import SpecialityRepository
 from rating_app.services.protocols import IFilterable
+from rating_app.services.reference_data import ReferenceDataCache
 
 
 class SpecialityService(IFilterable):
-    def __init__(self, speciality_repository: SpecialityRepository):
+    def __init__(
+        self, speciality_repository: SpecialityRepository, reference_data: ReferenceDataCache
+    ):
         self.speciality_repository = speciality_repository
+        self.reference_data = reference_data
 
     def get_filter_options(self) -> list[dict[str, Any]]:
         specialities = self._get_sorted_specialities()
@@ -22,6 +26,6 @@ class SpecialityService(IFilterable):
 
     def _get_sorted_specialities(self):
         return sorted(
-            self.speciality_repository.get_all(),
+            self.reference_data.get().specialities,
             key=lambda speciality: str(speciality.name or "").lower(),
         )
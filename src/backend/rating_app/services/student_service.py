@@ -1,19 +1,26 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
 import structlog
 
 from rateukma.caching.decorators import rcached
-from rateukma.caching.patterns import student_ratings_namespace
+from rateukma.caching.patterns import student_enrollments_namespace, student_ratings_namespace
 from rating_app.application_schemas.semester import SemesterInput
 from rating_app.application_schemas.student import Student as StudentDTO
+from rating_app.models import Student
 from rating_app.repositories import StudentRepository, StudentStatisticsRepository, UserRepository
+from rating_app.services.enrollment_service import EnrollmentService
 from rating_app.services.rating_service import RatingService
 from rating_app.services.semester_service import SemesterService
 
 logger = structlog.get_logger(__name__)
 
 
+def _student_profile_namespaces(_self, student_id: str) -> list[str]:
+    return [student_ratings_namespace(student_id), student_enrollments_namespace(student_id)]
+
+
 class StudentService:
     def __init__(
         self,
@@ -22,12 +29,14 @@ class StudentService:
         semester_service: SemesterService,
         user_repository: UserRepository,
         rating_service: RatingService,
+        enrollment_service: EnrollmentService,
     ) -> None:
         self.student_stats_repository = student_stats_repository
         self.student_repository = student_repository
         self.semester_service = semester_service
         self.user_repository = user_repository
         self.rating_service = rating_service
+        self.enrollment_service = enrollment_service
 
     def get_student_by_user_id(self, user_id: str) -> StudentDTO:
         return self.student_stats_repository.get_student_by_user_id(user_id=user_id)
@@ -35,9 +44,12 @@ class StudentService:
     def get_by_id(self, student_id: str) -> StudentDTO:
         return self.student_repository.get_by_id(id=student_id)
 
-    @rcached(ttl=3600, versioned_by=lambda self, student_id: student_ratings_namespace(student_id))
+    @rcached(ttl=3600, versioned_by=_student_profile_namespaces)
     def get_ratings(self, student_id: str) -> list[dict[str, Any]]:
-        courses = self.student_stats_repository.get_rating_stats(student_id=student_id)
+        courses = self.student_stats_repository.get_rating_stats(
+            student_id=student_id,
+            offering_ids=self._get_enrolled_offering_ids(student_id),
+        )
         current_semester = self.semester_service.get_current()
         now = datetime.now()
         for course in courses:
@@ -53,9 +65,12 @@ class StudentService:
 
         return courses
 
-    @rcached(ttl=3600, versioned_by=lambda self, student_id: student_ratings_namespace(student_id))
+    @rcached(ttl=3600, versioned_by=_student_profile_namespaces)
     def get_ratings_detail(self, student_id: str) -> list[dict[str, Any]]:
-        result = self.student_stats_repository.get_detailed_rating_stats(student_id=student_id)
+        result = self.student_stats_repository.get_detailed_rating_stats(
+            student_id=student_id,
+            offering_ids=self._get_enrolled_offering_ids(student_id),
+        )
         current_semester = self.semester_service.get_current()
         now = datetime.now()
         for course in result:
@@ -67,6 +82,9 @@ class StudentService:
             )
         return result
 
+    def _get_enrolled_offering_ids(self, student_id: str) -> tuple[str, ...]:
+        return self.enrollment_service.get_student_eligibility(student_id).offering_ids
+
     def link_student_to_user(self, student: StudentDTO) -> bool:
         if not student.email:
             return False
@@ -98,6 +116,49 @@ class StudentService:
         )
         return True
 
+    def link_students_to_users(self, students: Sequence[Student]) -> int:
+        """
+        Batch form of link_student_to_user for ingestion: unlinked students are matched
+        to users by email in one query and linked in one update. The same rules apply;
+        a user claimed by an earlier student of the batch counts as already linked.
+        """
+        unlinked = [student for student in students if student.email and student.user_id is None]
+        if not unlinked:
+            return 0
+
+        users_by_email = self.user_repository.get_by_emails(student.email for student in unlinked)
+        claimed: dict[object, str] = {}
+        links = []
+        for student in unlinked:
+            users = users_by_email.get(student.email, [])
+            if not users:
+                continue
+            if len(users) > 1:
+                logger.warning("multiple_users_with_same_email", email=student.email)
+                continue
+
+            [user] = users
+            existing_student = getattr(user, "student_profile", None)
+            existing_student_id = str(existing_student.id) if existing_student else None
+            existing_student_id = existing_student_id or claimed.get(user.pk)
+            if existing_student_id is not None:
+                logger.warning(
+                    "user_already_linked_to_student",
+                    user_id=user.pk,
+                    user_email=user.email,
+                    existing_student_id=existing_student_id,
+                    new_student_id=str(student.id),
+                )
+                continue
+
+            claimed[user.pk] = str(student.id)
+            links.append((student, user))
+
+        if links:
+            self.student_repository.bulk_link_to_users(links)
+            logger.info("students_linked_to_users", linked=len(links), checked=len(unlinked))
+        return len(links)
+
     def link_user_to_student(self, user) -> bool:
         if not user.email:
             return False
@@ -7,16 +7,28 @@ import pytest
 from rating_app.application_schemas.comment import (
     CommentCreateParams,
     CommentDTO,
+    CommentFilterCriteria,
     CommentPatchParams,
+    CommentThreadKeys,
+)
+from rating_app.exception.comment_exception import (
+    CommentNotFoundError,
+    CommentParentRatingMismatchError,
 )
-from rating_app.exception.comment_exception import CommentParentRatingMismatchError
 from rating_app.services.comment_events import CommentAction, CommentEvent
 from rating_app.services.comment_service import CommentService
 
+# writes and their events share a transaction
+pytestmark = pytest.mark.django_db
+
+RATING_AUTHOR_USER_ID = 7
+
 
 @pytest.fixture
 def comment_repository():
-    return MagicMock()
+    repository = MagicMock()
+    repository.get_thread_keys.return_value = CommentThreadKeys(rating_author_user_id=None)
+    return repository
 
 
 @pytest.fixture
@@ -90,7 +102,6 @@ def test_create_nested_reply_notifies_with_parent_parent_id(
     rating_id = uuid.uuid4()
     parent_id = uuid.uuid4()
     grandparent_id = uuid.uuid4()
-    parent = _make_comment_dto(rating_id=rating_id, parent_id=grandparent_id)
     params = CommentCreateParams(
         rating_id=rating_id,
         user_id=1,
@@ -99,17 +110,24 @@ def test_create_nested_reply_notifies_with_parent_parent_id(
         is_anonymous=False,
     )
     comment = _make_comment_dto(rating_id=rating_id, parent_id=parent_id)
-    comment_repository.get_by_id.return_value = parent
+    comment_repository.get_thread_keys.return_value = CommentThreadKeys(
+        rating_author_user_id=RATING_AUTHOR_USER_ID,
+        parent_rating_id=rating_id,
+        parent_parent_id=grandparent_id,
+    )
     comment_repository.create.return_value = comment
     comment_normalizer.normalize_comment.return_value = "Nested reply"
 
     service.create_comment(params)
 
+    comment_repository.get_thread_keys.assert_called_once_with(rating_id, parent_id)
+    comment_repository.get_by_id.assert_not_called()
     listener.on_event.assert_called_once_with(
         CommentEvent(
             comment=comment,
             action=CommentAction.CREATED,
             parent_parent_id=grandparent_id,
+            rating_author_user_id=RATING_AUTHOR_USER_ID,
         )
     )
 
@@ -121,7 +139,6 @@ def test_create_comment_rejects_parent_from_another_rating(
 ):
     rating_id = uuid.uuid4()
     parent_id = uuid.uuid4()
-    parent = _make_comment_dto(rating_id=uuid.uuid4())
     params = CommentCreateParams(
         rating_id=rating_id,
         user_id=1,
@@ -129,16 +146,33 @@ def test_create_comment_rejects_parent_from_another_rating(
         content="Cross-rating reply",
         is_anonymous=False,
     )
-    comment_repository.get_by_id.return_value = parent
+    comment_repository.get_thread_keys.return_value = CommentThreadKeys(
+        rating_author_user_id=RATING_AUTHOR_USER_ID,
+        parent_rating_id=uuid.uuid4(),
+    )
 
     with pytest.raises(CommentParentRatingMismatchError):
         service.create_comment(params)
 
-    comment_repository.get_by_id.assert_called_once_with(str(parent_id))
     comment_normalizer.normalize_comment.assert_not_called()
     comment_repository.create.assert_not_called()
 
 
+def test_create_comment_rejects_missing_parent(service, comment_repository):
+    params = CommentCreateParams(
+        rating_id=uuid.uuid4(),
+        user_id=1,
+        parent_comment=uuid.uuid4(),
+        content="Reply to nothing",
+        is_anonymous=False,
+    )
+
+    with pytest.raises(CommentNotFoundError):
+        service.create_comment(params)
+
+    comment_repository.create.assert_not_called()
+
+
 def test_delete_comment_notifies_deleted_action(service, comment_repository):
     listener = MagicMock()
     service.add_observer(listener)
@@ -158,22 +192,22 @@ def test_delete_nested_reply_notifies_with_parent_parent_id(service, comment_rep
     parent_id = uuid.uuid4()
     grandparent_id = uuid.uuid4()
     comment = _make_comment_dto(parent_id=parent_id)
-    parent = _make_comment_dto(
-        rating_id=comment.rating_id,
-        parent_id=grandparent_id,
-        course_id=comment.course_id,
+    comment_repository.get_thread_keys.return_value = CommentThreadKeys(
+        rating_author_user_id=RATING_AUTHOR_USER_ID,
+        parent_rating_id=comment.rating_id,
+        parent_parent_id=grandparent_id,
     )
-    comment_repository.get_by_id.return_value = parent
 
     service.delete_comment(comment)
 
-    comment_repository.get_by_id.assert_called_once_with(str(parent_id))
+    comment_repository.get_thread_keys.assert_called_once_with(comment.rating_id, parent_id)
     comment_repository.delete.assert_called_once_with(str(comment.id))
     listener.on_event.assert_called_once_with(
         CommentEvent(
             comment=comment,
             action=CommentAction.DELETED,
             parent_parent_id=grandparent_id,
+            rating_author_user_id=RATING_AUTHOR_USER_ID,
         )
     )
 
@@ -212,6 +246,50 @@ def test_update_comment_notifies_updated_action(
     )
 
 
+def test_update_nested_reply_notifies_with_parent_parent_id(
+    service,
+    comment_repository,
+    comment_normalizer,
+):
+    listener = MagicMock()
+    service.add_observer(listener)
+    parent_id = uuid.uuid4()
+    grandparent_id = uuid.uuid4()
+    comment = _make_comment_dto(parent_id=parent_id)
+    comment_repository.get_thread_keys.return_value = CommentThreadKeys(
+        rating_author_user_id=RATING_AUTHOR_USER_ID,
+        parent_rating_id=comment.rating_id,
+        parent_parent_id=grandparent_id,
+    )
+    comment_normalizer.normalize_comment.return_value = "Updated content"
+    comment_repository.update.return_value = comment
+
+    service.update_comment(comment, CommentPatchParams(content="Updated content"))
+
+    comment_repository.get_thread_keys.assert_called_once_with(comment.rating_id, parent_id)
+    listener.on_event.assert_called_once_with(
+        CommentEvent(
+            comment=comment,
+            action=CommentAction.UPDATED,
+            parent_parent_id=grandparent_id,
+            rating_author_user_id=RATING_AUTHOR_USER_ID,
+        )
+    )
+
+
+def test_filter_comments_marks_own_reply_previews_manageable(service, comment_repository):
+    viewer_reply = _make_comment_dto()
+    other_reply = viewer_reply.model_copy(update={"id": uuid.uuid4(), "user_id": 2})
+    comment = _make_comment_dto().model_copy(update={"reply_previews": [viewer_reply, other_reply]})
+    comment_repository.filter.return_value = [comment]
+    filters = CommentFilterCriteria(rating_id=comment.rating_id, viewer_user_id=1)
+
+    result = service.filter_comments(filters, paginate=False)
+
+    previews = result.items[0].reply_previews
+    assert [reply.can_manage for reply in previews] == [True, False]
+
+
 def test_update_comment_does_not_notify_when_repository_fails(
     service,
     comment_repository,
@@ -2,7 +2,10 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from rateukma.caching.patterns import course_analytics_namespace
+from rating_app.application_schemas.analytics import RatingRollupDelta, SemesterRatingStats
 from rating_app.application_schemas.course import CourseFilterCriteria
+from rating_app.models.choices import SemesterTerm
 from rating_app.services.course_service import CourseService
 
 
@@ -11,6 +14,11 @@ def course_repo():
     return MagicMock()
 
 
+@pytest.fixture
+def rollup_repo():
+    return MagicMock()
+
+
 @pytest.fixture
 def instructor_service():
     return MagicMock()
@@ -39,6 +47,7 @@ def semester_service():
 @pytest.fixture
 def service(
     course_repo,
+    rollup_repo,
     instructor_service,
     faculty_service,
     department_service,
@@ -47,6 +56,7 @@ def service(
 ):
     return CourseService(
         course_repository=course_repo,
+        rating_rollup_repository=rollup_repo,
         instructor_service=instructor_service,
         faculty_service=faculty_service,
         department_service=department_service,
@@ -188,3 +198,61 @@ def test_get_filter_options_includes_all_course_type_choices(service, semester_s
     assert "COMPULSORY" in course_type_values
     assert "ELECTIVE" in course_type_values
     assert "PROF_ORIENTED" in course_type_values
+
+
+def _semester_stats(year, term, difficulty, usefulness):
+    return SemesterRatingStats(
+        year=year,
+        term=term,
+        ratings_count=sum(difficulty.values()),
+        difficulty={score: difficulty.get(score, 0) for score in range(1, 6)},
+        usefulness={score: usefulness.get(score, 0) for score in range(1, 6)},
+    )
+
+
+def test_get_rating_distribution_merges_semesters_in_chronological_order(service, rollup_repo):
+    rollup_repo.get_for_course.return_value = [
+        _semester_stats(2024, SemesterTerm.FALL, {4: 2}, {5: 2}),
+        _semester_stats(2024, SemesterTerm.SPRING, {2: 1}, {3: 1}),
+        _semester_stats(2023, SemesterTerm.FALL, {4: 1}, {1: 1}),
+    ]
+
+    result = service.get_rating_distribution("course-id")
+
+    assert [(s.year, s.term) for s in result.semesters] == [
+        (2023, SemesterTerm.FALL),
+        (2024, SemesterTerm.SPRING),
+        (2024, SemesterTerm.FALL),
+    ]
+    assert result.ratings_count == 4
+    assert result.difficulty == {1: 0, 2: 1, 3: 0, 4: 3, 5: 0}
+    assert result.semesters[2].avg_usefulness == 5.0
+
+
+def test_apply_rating_rollup_delta_skips_empty_delta(service, rollup_repo):
+    service.apply_rating_rollup_delta(
+        "course-id", RatingRollupDelta(year=2024, term=SemesterTerm.FALL)
+    )
+
+    rollup_repo.apply_delta.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_apply_rating_rollup_delta_bumps_analytics_version_after_commit(
+    service, rollup_repo, mock_cache_manager, monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(
+        "rating_app.services.course_service.redis_cache_manager", lambda: mock_cache_manager
+    )
+    namespace = course_analytics_namespace("course-id")
+    version = mock_cache_manager.get_version(namespace)
+    delta = RatingRollupDelta(year=2024, term=SemesterTerm.FALL, ratings_count=1, difficulty={3: 1})
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        service.apply_rating_rollup_delta("course-id", delta)
+        assert mock_cache_manager.get_version(namespace) == version
+
+    for callback in callbacks:
+        callback()
+    rollup_repo.apply_delta.assert_called_once_with("course-id", delta)
+    assert mock_cache_manager.get_version(namespace) != version
@@ -0,0 +1,73 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from rateukma.caching.cache_manager import RedisCacheManager
+from rateukma.caching.patterns import student_enrollments_namespace
+from rating_app.application_schemas.enrollment import StudentEligibility
+from rating_app.services.enrollment_service import EnrollmentService
+
+
+@pytest.fixture
+def enrollment_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(enrollment_repository):
+    return EnrollmentService(enrollment_repository=enrollment_repository)
+
+
+def test_checks_reuse_cached_eligibility_until_namespace_is_bumped(
+    service, enrollment_repository, mock_cache_manager
+):
+    # Arrange
+    student_id = str(uuid.uuid4())
+    offering_id, course_id = uuid.uuid4(), uuid.uuid4()
+    enrollment_repository.get_student_eligibility.side_effect = [
+        StudentEligibility(offering_ids=(str(offering_id),)),
+        StudentEligibility(course_ids=(str(course_id),)),
+    ]
+
+    # Act
+    enrolled = service.is_enrolled(student_id, offering_id)
+    enrolled_in_course = service.is_enrolled_in_course(student_id, course_id)
+    mock_cache_manager.bump_version(student_enrollments_namespace(student_id))
+    refreshed = service.is_enrolled_in_course(student_id, str(course_id))
+
+    # Assert
+    assert enrolled is True
+    assert enrolled_in_course is False
+    assert refreshed is True
+    assert enrollment_repository.get_student_eligibility.call_count == 2
+
+
+def test_eligibility_round_trips_through_redis_serialization(
+    service, enrollment_repository, monkeypatch
+):
+    # Arrange
+    store: dict[str, bytes] = {}
+    redis_client = MagicMock()
+    redis_client.get.side_effect = store.get
+    redis_client.setex.side_effect = lambda name, ttl, value: store.__setitem__(name, value)
+    monkeypatch.setattr(
+        "rateukma.caching.decorators.redis_cache_manager",
+        lambda: RedisCacheManager(redis_client=redis_client, ignore_exceptions=False),
+    )
+    student_id = str(uuid.uuid4())
+    offering_id, course_id = uuid.uuid4(), uuid.uuid4()
+    enrollment_repository.get_student_eligibility.return_value = StudentEligibility(
+        offering_ids=(str(offering_id),), course_ids=(str(course_id),)
+    )
+
+    # Act
+    service.get_student_eligibility(student_id)
+    cached = service.get_student_eligibility(student_id)
+
+    # Assert
+    assert len(store) == 1
+    assert enrollment_repository.get_student_eligibility.call_count == 1
+    assert cached.is_enrolled(offering_id)
+    assert cached.is_enrolled_in_course(str(course_id).upper())
+    assert not cached.is_enrolled(course_id)
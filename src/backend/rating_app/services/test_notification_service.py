@@ -3,11 +3,20 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from rating_app.application_schemas.notification import (
+    NotificationFeedCursor,
+    NotificationPurgeResult,
+    NotificationRetentionPolicy,
+)
 from rating_app.services.notification_service import (
     DEFAULT_NOTIFICATION_PAGE_SIZE,
     NotificationService,
+    decode_feed_cursor,
 )
 
+# read-marking publishes through transaction.on_commit
+pytestmark = pytest.mark.django_db
+
 
 class TestNotificationService:
     @pytest.fixture
@@ -19,35 +28,34 @@ class TestNotificationService:
         return MagicMock()
 
     @pytest.fixture
-    def service(self, notification_repository, cursor_repository):
+    def updates_channel(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, notification_repository, cursor_repository, updates_channel):
         return NotificationService(
             notification_repository=notification_repository,
             cursor_repository=cursor_repository,
+            updates_channel=updates_channel,
         )
 
-    def test_get_notifications_uses_cursor_value(
+    def test_get_notifications_reads_materialized_groups(
         self, service, notification_repository, cursor_repository
     ):
         user_id = 1
-        cursor_time = datetime(2024, 1, 1, tzinfo=UTC)
-        cursor_repository.get_cursor_value.return_value = cursor_time
         notification_repository.get_grouped_for_user.return_value = []
 
         service.get_notifications_for_user(user_id)
 
-        cursor_repository.get_cursor_value.assert_called_once_with(user_id)
+        cursor_repository.get_cursor_value.assert_not_called()
         notification_repository.get_grouped_for_user.assert_called_once_with(
             user_id=user_id,
-            cursor_value=cursor_time,
             limit=DEFAULT_NOTIFICATION_PAGE_SIZE,
             offset=0,
         )
 
-    def test_get_notifications_passes_pagination_params(
-        self, service, notification_repository, cursor_repository
-    ):
+    def test_get_notifications_passes_pagination_params(self, service, notification_repository):
         user_id = 1
-        cursor_repository.get_cursor_value.return_value = datetime.now(tz=UTC)
         notification_repository.get_grouped_for_user.return_value = []
 
         service.get_notifications_for_user(user_id, limit=10, offset=5)
@@ -56,21 +64,17 @@ class TestNotificationService:
         assert call_kwargs["limit"] == 10
         assert call_kwargs["offset"] == 5
 
-    def test_get_unread_count_uses_cursor_value(
+    def test_get_unread_count_reads_materialized_counter(
         self, service, notification_repository, cursor_repository
     ):
         user_id = 1
-        cursor_time = datetime(2024, 1, 1, tzinfo=UTC)
-        cursor_repository.get_cursor_value.return_value = cursor_time
         notification_repository.get_unread_group_count.return_value = 3
 
         count = service.get_unread_count(user_id)
 
         assert count == 3
-        notification_repository.get_unread_group_count.assert_called_once_with(
-            user_id=user_id,
-            cursor_value=cursor_time,
-        )
+        cursor_repository.get_cursor_value.assert_not_called()
+        notification_repository.get_unread_group_count.assert_called_once_with(user_id=user_id)
 
     def test_mark_all_read_advances_cursor(self, service, cursor_repository):
         user_id = 1
@@ -79,26 +83,87 @@ class TestNotificationService:
 
         cursor_repository.advance_cursor.assert_called_once_with(user_id)
 
-    @pytest.mark.django_db
-    def test_create_notification_delegates_to_repository(self, service, notification_repository):
-        from rating_app.models.rating_vote import RatingVote
+    def test_read_marking_pushes_unread_count_after_commit(
+        self,
+        service,
+        notification_repository,
+        updates_channel,
+        django_capture_on_commit_callbacks,
+    ):
+        notification_repository.get_unread_group_count.return_value = 1
 
-        notification_repository.create.return_value = MagicMock()
+        with django_capture_on_commit_callbacks() as callbacks:
+            service.mark_group_read(1, "RATING_UPVOTED:some-id")
+            updates_channel.publish_unread_count.assert_not_called()
+        for callback in callbacks:
+            callback()
 
-        service.create_notification(
+        updates_channel.publish_unread_count.assert_called_once_with(1, 1)
+
+    def test_upsert_notification_passes_replaced_event_types(
+        self, service, notification_repository
+    ):
+        from rating_app.models.rating_vote import RatingVote
+
+        service.upsert_notification(
             recipient_id=1,
             event_type="RATING_UPVOTED",
             group_key="RATING_UPVOTED:some-id",
             source_model=RatingVote,
             source_id="some-id",
             actor_id=2,
+            replaced_event_types=["RATING_DOWNVOTED"],
         )
 
-        notification_repository.create.assert_called_once()
-        call_args = notification_repository.create.call_args
-        data = call_args.args[0]
-        assert data.recipient_id == 1
+        data, replaced = notification_repository.upsert.call_args.args
         assert data.event_type == "RATING_UPVOTED"
-        assert data.group_key == "RATING_UPVOTED:some-id"
-        assert data.object_id == "some-id"
-        assert data.actor_id == 2
+        assert data.content_type.model_class() is RatingVote
+        assert replaced == ["RATING_DOWNVOTED"]
+        notification_repository.create.assert_not_called()
+
+    def test_get_notification_feed_returns_cursor_only_when_more_groups_follow(
+        self, service, notification_repository
+    ):
+        groups = [
+            MagicMock(latest_created_at=datetime(2024, 1, day, tzinfo=UTC), group_key=f"g{day}")
+            for day in (3, 2, 1)
+        ]
+        notification_repository.get_grouped_page.return_value = groups
+
+        page = service.get_notification_feed(1, limit=2)
+        last_page = service.get_notification_feed(1, limit=3, cursor=page.next_cursor)
+
+        assert page.items == groups[:2]
+        assert page.next_cursor is not None
+        assert decode_feed_cursor(page.next_cursor) == NotificationFeedCursor(
+            latest_created_at=groups[1].latest_created_at,
+            group_key="g2",
+        )
+        assert notification_repository.get_grouped_page.call_args.kwargs["after"] == (
+            decode_feed_cursor(page.next_cursor)
+        )
+        assert last_page.next_cursor is None
+
+    def test_purge_batches_finds_over_cap_recipients_once_and_drains_each(
+        self, service, notification_repository
+    ):
+        notification_repository.get_recipients_over_cap.return_value = [1, 2]
+        notification_repository.purge_over_cap.side_effect = [2, 1, 0, 2, 0]
+        policy = NotificationRetentionPolicy(max_per_user=10)
+
+        results = list(service.purge_batches(policy, batch_size=2))
+
+        assert results == [
+            NotificationPurgeResult(over_cap=2),
+            NotificationPurgeResult(over_cap=1),
+            NotificationPurgeResult(over_cap=2),
+        ]
+        notification_repository.get_recipients_over_cap.assert_called_once_with(10)
+        assert [call.args[0] for call in notification_repository.purge_over_cap.call_args_list] == [
+            1,
+            1,
+            1,
+            2,
+            2,
+        ]
+        notification_repository.purge_created_before.assert_not_called()
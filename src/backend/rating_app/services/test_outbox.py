@@ -0,0 +1,158 @@
+import datetime
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from rating_app.application_schemas.rating import Rating as RatingDTO
+from rating_app.models import OutboxMessage
+from rating_app.models.choices import OutboxTopic, SemesterTerm
+from rating_app.repositories import OutboxRepository
+from rating_app.services.outbox import OutboxDispatcher, OutboxWriter
+from rating_app.services.rating_events import RatingAction, RatingEvent
+
+MAX_ATTEMPTS = 3
+
+
+def _make_event(*, difficulty: int = 3) -> RatingEvent:
+    rating = RatingDTO(
+        id=uuid.uuid4(),
+        course_offering=uuid.uuid4(),
+        course_offering_term=SemesterTerm.FALL,
+        course_offering_year=2024,
+        student_id=uuid.uuid4(),
+        student_name="Test Student",
+        course=uuid.uuid4(),
+        difficulty=difficulty,
+        usefulness=4,
+        comment=None,
+        is_anonymous=False,
+        created_at=datetime.datetime.now(tz=datetime.UTC),
+        upvotes=0,
+        downvotes=0,
+        viewer_vote=None,
+        comments_count=0,
+    )
+    return RatingEvent(rating=rating, action=RatingAction.CREATED)
+
+
+class _BatchListener:
+    def __init__(self):
+        self.batches = []
+
+    def on_event(self, event, *args, **kwargs):
+        raise AssertionError("batch listeners get the whole batch")
+
+    def on_events(self, events, *args, **kwargs):
+        self.batches.append(list(events))
+
+
+@pytest.fixture
+def repository():
+    return OutboxRepository()
+
+
+@pytest.fixture
+def writer(repository):
+    return OutboxWriter(repository, OutboxTopic.RATING, RatingEvent)
+
+
+@pytest.fixture
+def dispatcher(repository):
+    return OutboxDispatcher(outbox_repository=repository, max_attempts=MAX_ATTEMPTS)
+
+
+@pytest.mark.django_db
+def test_drain_delivers_recorded_events_and_deletes_them(writer, dispatcher):
+    # Arrange
+    events = [_make_event(difficulty=1), _make_event(difficulty=5)]
+    for event in events:
+        writer.on_event(event)
+    listener = MagicMock(spec=["on_event"])
+    dispatcher.subscribe(OutboxTopic.RATING, RatingEvent, listener)
+
+    # Act
+    result = dispatcher.drain(batch_size=10)
+
+    # Assert
+    assert (result.claimed, result.delivered, result.failed) == (2, 2, 0)
+    assert [call.args[0] for call in listener.on_event.call_args_list] == events
+    assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_hands_batch_listeners_the_whole_batch(writer, dispatcher):
+    # Arrange
+    events = [_make_event(), _make_event()]
+    for event in events:
+        writer.on_event(event)
+    listener = _BatchListener()
+    dispatcher.subscribe(OutboxTopic.RATING, RatingEvent, listener)
+
+    # Act
+    dispatcher.drain(batch_size=10)
+
+    # Assert
+    assert listener.batches == [events]
+
+
+@pytest.mark.django_db
+def test_drain_isolates_failing_message_and_keeps_it_for_retry(writer, dispatcher):
+    # Arrange
+    good, bad = _make_event(difficulty=1), _make_event(difficulty=5)
+    writer.on_event(good)
+    writer.on_event(bad)
+
+    def on_event(event):
+        if event == bad:
+            raise RuntimeError("listener failed")
+
+    listener = MagicMock(spec=["on_event"])
+    listener.on_event.side_effect = on_event
+    dispatcher.subscribe(OutboxTopic.RATING, RatingEvent, listener)
+
+    # Act
+    result = dispatcher.drain(batch_size=10)
+
+    # Assert
+    assert (result.delivered, result.failed) == (1, 1)
+    remaining = OutboxMessage.objects.get()
+    assert remaining.payload["rating"]["id"] == str(bad.rating.id)
+    assert remaining.attempts == 1
+    assert "listener failed" in remaining.last_error
+
+
+@pytest.mark.django_db
+def test_drain_skips_messages_out_of_attempts(writer, dispatcher):
+    # Arrange
+    writer.on_event(_make_event())
+    OutboxMessage.objects.update(attempts=MAX_ATTEMPTS)
+    listener = MagicMock(spec=["on_event"])
+    dispatcher.subscribe(OutboxTopic.RATING, RatingEvent, listener)
+
+    # Act
+    result = dispatcher.drain(batch_size=10)
+
+    # Assert
+    assert result.claimed == 0
+    listener.on_event.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_drain_holds_back_messages_inside_their_settle_window(repository, writer):
+    # Arrange
+    dispatcher = OutboxDispatcher(
+        outbox_repository=repository,
+        max_attempts=MAX_ATTEMPTS,
+        settle_windows={OutboxTopic.RATING: datetime.timedelta(minutes=5)},
+    )
+    writer.on_event(_make_event())
+    listener = MagicMock(spec=["on_event"])
+    dispatcher.subscribe(OutboxTopic.RATING, RatingEvent, listener)
+
+    # Act
+    result = dispatcher.drain(batch_size=10)
+
+    # Assert
+    assert result.claimed == 0
+    assert OutboxMessage.objects.count() == 1
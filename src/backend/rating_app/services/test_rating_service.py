@@ -0,0 +1,125 @@
+import pytest
+from freezegun import freeze_time
+
+from rating_app.application_schemas.rating import (
+    RatingCreateParams,
+    RatingPatchParams,
+)
+from rating_app.exception.rating_exceptions import DuplicateRatingException, NotEnrolledException
+from rating_app.ioc_container.services import rating_service
+from rating_app.models import Rating
+from rating_app.models.choices import SemesterTerm
+from rating_app.tests.factories import (
+    CourseOfferingFactory,
+    EnrollmentFactory,
+    InstructorFactory,
+    SemesterFactory,
+)
+
+AFTER_MIDTERM_DATE = "2023-11-25"
+
+
+@pytest.fixture
+def enrollment():
+    semester = SemesterFactory(year=2023, term=SemesterTerm.FALL)
+    return EnrollmentFactory(offering=CourseOfferingFactory(semester=semester))
+
+
+def _create_params(enrollment, **overrides) -> RatingCreateParams:
+    return RatingCreateParams.model_validate(
+        {
+            "course_offering": enrollment.offering_id,
+            "student": enrollment.student_id,
+            "difficulty": 4,
+            "usefulness": 5,
+            "comment": "Solid course",
+            **overrides,
+        }
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(AFTER_MIDTERM_DATE)
+def test_create_rating_query_count(django_assert_num_queries, enrollment):
+    # Arrange
+    instructors = InstructorFactory.create_batch(2)
+    params = _create_params(enrollment, instructor_ids=[i.id for i in instructors])
+    service = rating_service()
+
+    # Act
+    # 1) eligibility, 2) instructors, 3) savepoint shared by the write and its event,
+    # 4-7) savepoint, insert, instructor links, release, 8) course aggregates delta,
+    # 9-11) semester rollup: update, first-row insert, update, 12) release
+    with django_assert_num_queries(12):
+        rating = service.create_rating(params)
+
+    # Assert
+    assert rating == service.get_rating(str(rating.id))
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(AFTER_MIDTERM_DATE)
+def test_update_rating_query_count(django_assert_num_queries, enrollment):
+    # Arrange
+    service = rating_service()
+    rating = service.create_rating(_create_params(enrollment))
+    instructor = InstructorFactory()
+    update = RatingPatchParams(difficulty=2, comment="", instructor_ids=[instructor.id])
+
+    # Act
+    # 1) instructors, 2) savepoint, 3-7) savepoint, update, unlink, link, release,
+    # 8) aggregates delta, 9) semester rollup, 10) release
+    with django_assert_num_queries(10):
+        updated = service.update_rating(rating, update)
+
+    # Assert
+    assert updated == service.get_rating(str(rating.id))
+    assert updated.difficulty == 2
+    assert updated.comment is None
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(AFTER_MIDTERM_DATE)
+def test_delete_rating_query_count(django_assert_num_queries, enrollment):
+    # Arrange
+    service = rating_service()
+    rating = service.create_rating(_create_params(enrollment))
+
+    # Act
+    # 1) savepoint, 2) rating, 3) its comments, 4-6) instructor links, votes, rating,
+    # 7) aggregates delta, 8) semester rollup, 9) release
+    with django_assert_num_queries(9):
+        service.delete_rating(rating)
+
+    # Assert
+    assert not Rating.objects.filter(pk=rating.id).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(AFTER_MIDTERM_DATE)
+def test_create_rating_twice_is_rejected_by_unique_constraint(enrollment):
+    # Arrange
+    service = rating_service()
+    service.create_rating(_create_params(enrollment))
+
+    # Act / Assert
+    with pytest.raises(DuplicateRatingException):
+        service.create_rating(_create_params(enrollment, difficulty=1))
+    assert Rating.objects.filter(student_id=enrollment.student_id).count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(AFTER_MIDTERM_DATE)
+def test_create_rating_for_dropped_enrollment_is_rejected(enrollment):
+    # Arrange
+    enrollment.status = "DROPPED"
+    enrollment.save()
+
+    # Act / Assert
+    with pytest.raises(NotEnrolledException):
+        rating_service().create_rating(_create_params(enrollment))
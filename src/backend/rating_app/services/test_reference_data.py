@@ -0,0 +1,112 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from rateukma.caching.cache_manager import InMemoryCacheManager
+from rateukma.caching.patterns import REFERENCE_DATA_NAMESPACE
+from rating_app.application_schemas.faculty import Faculty
+from rating_app.application_schemas.semester import Semester
+from rating_app.models.choices import SemesterTerm
+from rating_app.services.reference_data import ReferenceDataCache
+
+
+@pytest.fixture
+def repos():
+    faculty = Faculty(id=uuid.uuid4(), name="FI")
+    semester = Semester(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL)
+    return {
+        "semester_repository": MagicMock(get_all=MagicMock(return_value=[semester])),
+        "faculty_repository": MagicMock(get_all=MagicMock(return_value=[faculty])),
+        "department_repository": MagicMock(get_all=MagicMock(return_value=[])),
+        "speciality_repository": MagicMock(get_all=MagicMock(return_value=[])),
+    }
+
+
+@pytest.fixture
+def cache_manager():
+    return InMemoryCacheManager()
+
+
+def test_snapshot_is_reused_until_reference_data_version_moves(repos, cache_manager):
+    # Arrange
+    cache = ReferenceDataCache(**repos, cache_manager=cache_manager, check_interval=0)
+    first = cache.get()
+
+    # Act
+    unchanged = cache.get()
+    cache_manager.bump_version(REFERENCE_DATA_NAMESPACE)
+    refreshed = cache.get()
+
+    # Assert
+    assert unchanged is first
+    assert refreshed is not first
+    assert refreshed.version == first.version + 1
+    assert repos["semester_repository"].get_all.call_count == 2
+
+
+def test_version_is_not_rechecked_within_check_interval(repos):
+    # Arrange
+    cache_manager = MagicMock(get_version=MagicMock(return_value=0))
+    cache = ReferenceDataCache(**repos, cache_manager=cache_manager, check_interval=60)
+
+    # Act
+    first = cache.get()
+    second = cache.get()
+
+    # Assert
+    assert second is first
+    cache_manager.get_version.assert_called_once_with(REFERENCE_DATA_NAMESPACE)
+
+
+def test_snapshot_expires_after_ttl_when_caching_is_disabled(repos):
+    # Arrange
+    cache_manager = MagicMock()
+    memoized = ReferenceDataCache(
+        **repos, cache_manager=cache_manager, enabled=False, uncached_ttl=60
+    )
+    expiring = ReferenceDataCache(
+        **repos, cache_manager=cache_manager, enabled=False, uncached_ttl=0
+    )
+
+    # Act
+    first = memoized.get()
+    second = memoized.get()
+    reloaded = expiring.get() is not expiring.get()
+
+    # Assert
+    assert second is first
+    assert reloaded
+    assert repos["semester_repository"].get_all.call_count == 3
+    cache_manager.get_version.assert_not_called()
+
+
+def test_snapshot_lookups_are_keyed_by_id_name_and_term(repos, cache_manager):
+    # Arrange
+    cache = ReferenceDataCache(**repos, cache_manager=cache_manager)
+    faculty = repos["faculty_repository"].get_all.return_value[0]
+    semester = repos["semester_repository"].get_all.return_value[0]
+
+    # Act
+    snapshot = cache.get()
+
+    # Assert
+    assert snapshot.get_faculty(str(faculty.id)) == faculty
+    assert snapshot.faculties_by_name["FI"] == faculty
+    assert snapshot.get_semester_by_year_and_term(2024, "FALL") == semester
+    assert snapshot.get_semester("not-a-uuid") is None
+    with pytest.raises(TypeError):
+        snapshot.faculties_by_name["FEN"] = faculty  # type: ignore[index]
+
+
+def test_warm_swallows_load_errors(repos, cache_manager):
+    # Arrange
+    repos["semester_repository"].get_all.side_effect = RuntimeError("db is down")
+    cache = ReferenceDataCache(**repos, cache_manager=cache_manager)
+
+    # Act
+    cache.warm()
+
+    # Assert
+    repos["semester_repository"].get_all.side_effect = None
+    assert cache.get().semesters
@@ -1,9 +1,14 @@
+import uuid
+from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 
+from rating_app.application_schemas.semester import Semester
+from rating_app.exception.semester_exception import SemesterNotFoundError
 from rating_app.models.choices import SemesterTerm
+from rating_app.services.reference_data import ReferenceDataCache
 from rating_app.services.semester_service import SemesterService
 
 
@@ -13,8 +18,21 @@ def semester_repo():
 
 
 @pytest.fixture
-def service(semester_repo):
-    return SemesterService(semester_repository=semester_repo)
+def reference_data(semester_repo):
+    empty_repo = MagicMock(get_all=MagicMock(return_value=[]))
+    return ReferenceDataCache(
+        semester_repository=semester_repo,
+        faculty_repository=empty_repo,
+        department_repository=empty_repo,
+        speciality_repository=empty_repo,
+        cache_manager=MagicMock(),
+        enabled=False,
+    )
+
+
+@pytest.fixture
+def service(semester_repo, reference_data):
+    return SemesterService(semester_repository=semester_repo, reference_data=reference_data)
 
 
 def test_get_semesters_returns_all_semesters_from_repository(service, semester_repo):
@@ -37,9 +55,9 @@ def test_get_filter_options_returns_empty_lists_when_no_semesters(service, semes
 
 def test_get_filter_options_orders_terms_by_priority_spring_summer_fall(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2024, term=SemesterTerm.SUMMER),
-        SimpleNamespace(year=2024, term=SemesterTerm.SPRING),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.SUMMER),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.SPRING),
     ]
 
     result = service.get_filter_options()
@@ -50,9 +68,9 @@ def test_get_filter_options_orders_terms_by_priority_spring_summer_fall(service,
 
 def test_get_filter_options_orders_years_descending(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2022, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2024, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2023, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2022, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2023, term=SemesterTerm.FALL),
     ]
 
     result = service.get_filter_options()
@@ -63,7 +81,7 @@ def test_get_filter_options_orders_years_descending(service, semester_repo):
 
 def test_get_filter_options_includes_term_labels(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term=SemesterTerm.SPRING),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.SPRING),
     ]
 
     result = service.get_filter_options()
@@ -75,9 +93,9 @@ def test_get_filter_options_includes_term_labels(service, semester_repo):
 
 def test_get_filter_options_deduplicates_terms_across_years(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2023, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2022, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2023, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2022, term=SemesterTerm.FALL),
     ]
 
     result = service.get_filter_options()
@@ -88,9 +106,9 @@ def test_get_filter_options_deduplicates_terms_across_years(service, semester_re
 
 def test_get_filter_options_includes_all_unique_academic_years(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term=SemesterTerm.FALL),
-        SimpleNamespace(year=2024, term=SemesterTerm.SPRING),
-        SimpleNamespace(year=2023, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.SPRING),
+        SimpleNamespace(id=uuid.uuid4(), year=2023, term=SemesterTerm.FALL),
     ]
 
     result = service.get_filter_options()
@@ -102,9 +120,9 @@ def test_get_filter_options_includes_all_unique_academic_years(service, semester
 
 def test_get_filter_options_handles_semesters_with_missing_attributes(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term=SemesterTerm.FALL),
-        SimpleNamespace(year=None, term=SemesterTerm.SPRING),
-        SimpleNamespace(year=2023, term=None),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term=SemesterTerm.FALL),
+        SimpleNamespace(id=uuid.uuid4(), year=None, term=SemesterTerm.SPRING),
+        SimpleNamespace(id=uuid.uuid4(), year=2023, term=None),
     ]
 
     result = service.get_filter_options()
@@ -117,7 +135,7 @@ def test_get_filter_options_handles_semesters_with_missing_attributes(service, s
 
 def test_get_filter_options_handles_unknown_term_values(service, semester_repo):
     semester_repo.get_all.return_value = [
-        SimpleNamespace(year=2024, term="UNKNOWN_TERM"),
+        SimpleNamespace(id=uuid.uuid4(), year=2024, term="UNKNOWN_TERM"),
     ]
 
     result = service.get_filter_options()
@@ -125,3 +143,48 @@ def test_get_filter_options_handles_unknown_term_values(service, semester_repo):
     assert len(result["terms"]) == 1
     assert result["terms"][0]["value"] == "UNKNOWN_TERM"
     assert result["terms"][0]["label"] == "Unknown_Term"
+
+
+@pytest.mark.parametrize(
+    ("current_date", "expected_term"),
+    [
+        (datetime(2024, 2, 10), SemesterTerm.SPRING),
+        (datetime(2024, 6, 10), SemesterTerm.SUMMER),
+        (datetime(2024, 10, 10), SemesterTerm.FALL),
+    ],
+)
+def test_get_current_term_is_derived_without_repository(
+    service, semester_repo, current_date, expected_term
+):
+    result = service.get_current_term(current_date)
+
+    assert (result.year, result.term) == (2024, expected_term)
+    semester_repo.get_by_year_and_term.assert_not_called()
+
+
+def test_get_by_id_and_get_current_are_served_from_reference_data(service, semester_repo):
+    # Arrange
+    current = service.get_current_term()
+    semester = Semester(id=uuid.uuid4(), year=current.year, term=current.term)
+    semester_repo.get_all.return_value = [semester]
+
+    # Act
+    by_id = service.get_by_id(str(semester.id))
+    by_date = service.get_current()
+
+    # Assert
+    assert by_id == semester
+    assert by_date == semester
+    semester_repo.get_by_id.assert_not_called()
+    semester_repo.get_by_year_and_term.assert_not_called()
+
+
+def test_get_by_id_falls_back_to_repository_when_not_in_reference_data(service, semester_repo):
+    # Arrange
+    semester_repo.get_all.return_value = []
+    semester_repo.get_by_id.side_effect = SemesterNotFoundError()
+
+    # Act & Assert
+    with pytest.raises(SemesterNotFoundError):
+        service.get_by_id("not-a-uuid")
+    semester_repo.get_by_id.assert_called_once_with("not-a-uuid")
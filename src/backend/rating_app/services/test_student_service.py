@@ -1,6 +1,10 @@
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 import pytest
 
 from rating_app.ioc_container.services import student_service
@@ -49,13 +53,26 @@ def rating_service():
 
 
 @pytest.fixture
-def service(student_stats_repo, student_repo, user_repo, semester_service, rating_service):
+def enrollment_service():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(
+    student_stats_repo,
+    student_repo,
+    user_repo,
+    semester_service,
+    rating_service,
+    enrollment_service,
+):
     return StudentService(
         student_stats_repository=student_stats_repo,
         student_repository=student_repo,
         user_repository=user_repo,
         semester_service=semester_service,
         rating_service=rating_service,
+        enrollment_service=enrollment_service,
     )
 
 
@@ -123,6 +140,60 @@ class TestLinkStudentToUser:
         student_repo.link_to_user.assert_called_once_with("student-id", user)
 
 
+class TestLinkStudentsToUsers:
+    def test_links_matched_students_in_one_update(self, service, user_repo, student_repo):
+        # Arrange
+        linked = SimpleNamespace(id="s1", email="a@ukma.edu.ua", user_id=None)
+        unmatched = SimpleNamespace(id="s2", email="b@ukma.edu.ua", user_id=None)
+        no_email = SimpleNamespace(id="s3", email="", user_id=None)
+        user = SimpleNamespace(pk=1, email="a@ukma.edu.ua", student_profile=None)
+        user_repo.get_by_emails.return_value = {"a@ukma.edu.ua": [user]}
+
+        # Act
+        result = service.link_students_to_users([linked, unmatched, no_email])
+
+        # Assert
+        assert result == 1
+        user_repo.get_by_emails.assert_called_once()
+        student_repo.bulk_link_to_users.assert_called_once_with([(linked, user)])
+
+    def test_skips_ambiguous_and_already_linked_users(self, service, user_repo, student_repo):
+        # Arrange
+        ambiguous = SimpleNamespace(id="s1", email="dup@ukma.edu.ua", user_id=None)
+        taken = SimpleNamespace(id="s2", email="taken@ukma.edu.ua", user_id=None)
+        user_repo.get_by_emails.return_value = {
+            "dup@ukma.edu.ua": [SimpleNamespace(pk=1), SimpleNamespace(pk=2)],
+            "taken@ukma.edu.ua": [
+                SimpleNamespace(
+                    pk=3,
+                    email="taken@ukma.edu.ua",
+                    student_profile=SimpleNamespace(id="existing-student"),
+                )
+            ],
+        }
+
+        # Act
+        result = service.link_students_to_users([ambiguous, taken])
+
+        # Assert
+        assert result == 0
+        student_repo.bulk_link_to_users.assert_not_called()
+
+    def test_links_a_user_to_the_first_student_of_the_batch(self, service, user_repo, student_repo):
+        # Arrange
+        first = SimpleNamespace(id="s1", email="a@ukma.edu.ua", user_id=None)
+        second = SimpleNamespace(id="s2", email="a@ukma.edu.ua", user_id=None)
+        user = SimpleNamespace(pk=1, email="a@ukma.edu.ua", student_profile=None)
+        user_repo.get_by_emails.return_value = {"a@ukma.edu.ua": [user]}
+
+        # Act
+        result = service.link_students_to_users([first, second])
+
+        # Assert
+        assert result == 1
+        student_repo.bulk_link_to_users.assert_called_once_with([(first, user)])
+
+
 class TestLinkUserToStudent:
     def test_returns_false_when_user_has_no_email(self, service):
         # Arrange
@@ -228,6 +299,57 @@ def test_db_ingestion_links_student_to_existing_user(user_factory):
     assert student.user.id == user.id
 
 
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_db_ingestion_links_a_batch_of_students_with_one_user_lookup(user_factory):
+    speciality = SpecialityFactory(name="Computer Science")
+    emails = [f"student{index}@ukma.edu.ua" for index in range(5)]
+    users = [user_factory(email=email) for email in emails]
+    enrollments = [
+        DeduplicatedEnrollment(
+            student=DeduplicatedStudent(
+                first_name=f"Student{index}",
+                last_name="Test",
+                email=email,
+                speciality=speciality.name,
+                education_level=EducationLevel.BACHELOR,
+            ),
+            status=EnrollmentStatus.ENROLLED,
+        )
+        for index, email in enumerate(emails)
+    ]
+    course_data = [
+        DeduplicatedCourse(
+            title="Test Course",
+            description="Test",
+            status=CourseStatus.ACTIVE,
+            department="CS Department",
+            faculty=speciality.faculty.name,
+            offerings=[
+                DeduplicatedCourseOffering(
+                    code="CS101",
+                    semester=DeduplicatedSemester(year=2024, term=SemesterTerm.FALL),
+                    credits=3.0,
+                    weekly_hours=4,
+                    exam_type=ExamType.EXAM,
+                    enrollments=enrollments,
+                )
+            ],
+        )
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        course_db_injector().execute(course_data)
+
+    user_table = get_user_model()._meta.db_table
+    user_lookups = [
+        query for query in queries.captured_queries if f'FROM "{user_table}"' in query["sql"]
+    ]
+    assert len(user_lookups) == 1
+    linked = dict(Student.objects.filter(email__in=emails).values_list("email", "user_id"))
+    assert linked == {user.email: user.pk for user in users}
+
+
 @pytest.mark.django_db
 @pytest.mark.integration
 def test_db_ingestion_does_not_link_when_no_matching_user():
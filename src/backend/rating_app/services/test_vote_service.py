@@ -0,0 +1,60 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from rating_app.application_schemas.rating_vote import RatingVoteCreateSchema
+from rating_app.exception.vote_exceptions import VoteConflictException
+from rating_app.services.vote_service import RatingFeedbackService
+
+
+@pytest.fixture
+def vote_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(vote_repository):
+    rating_repository = MagicMock()
+    rating_repository.get_vote_target.return_value.author_student_id = None
+    return RatingFeedbackService(
+        vote_repository=vote_repository,
+        enrollment_service=MagicMock(),
+        rating_repository=rating_repository,
+        rating_service=MagicMock(),
+        semester_service=MagicMock(),
+        vote_mapper=MagicMock(),
+    )
+
+
+def _params() -> RatingVoteCreateSchema:
+    return RatingVoteCreateSchema(
+        student_id=str(uuid.uuid4()), rating_id=str(uuid.uuid4()), vote_type="UPVOTE"
+    )
+
+
+@pytest.mark.django_db
+def test_upsert_writes_again_once_when_vote_is_deleted_concurrently(service, vote_repository):
+    # Arrange
+    written = MagicMock()
+    vote_repository.upsert_vote.side_effect = [(None, False), (written, True)]
+    vote_repository.get_vote_by_student_and_rating.return_value = None
+
+    # Act
+    vote, created = service.upsert(_params())
+
+    # Assert
+    assert (vote, created) == (written, True)
+    assert vote_repository.upsert_vote.call_count == 2
+
+
+@pytest.mark.django_db
+def test_upsert_raises_conflict_when_vote_keeps_disappearing(service, vote_repository):
+    # Arrange
+    vote_repository.upsert_vote.return_value = (None, False)
+    vote_repository.get_vote_by_student_and_rating.return_value = None
+
+    # Act & Assert
+    with pytest.raises(VoteConflictException):
+        service.upsert(_params())
+    assert vote_repository.upsert_vote.call_count == 2
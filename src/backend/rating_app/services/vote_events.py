@@ -0,0 +1,20 @@
+import uuid
+from dataclasses import dataclass
+from enum import StrEnum
+
+from rating_app.application_schemas.rating_vote import RatingVote as RatingVoteDTO
+
+
+class RatingVoteAction(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class RatingVoteEvent:
+    vote: RatingVoteDTO
+    action: RatingVoteAction
+    course_id: uuid.UUID
+    rating_author_user_id: int | None = None
+    voter_user_id: int | None = None
@@ -1,3 +1,5 @@
+from dataclasses import asdict
+
 from rest_framework import status, viewsets
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
@@ -13,9 +15,12 @@ from rating_app.application_schemas.course import (
     CourseSearchResult,
 )
 from rating_app.ioc_container.common import pydantic_to_openapi_request_mapper
-from rating_app.serializers.analytics import CourseAnalyticsSerializer
+from rating_app.serializers.analytics import (
+    CourseAnalyticsDetailSerializer,
+    CourseAnalyticsSerializer,
+)
 from rating_app.services import CourseService
-from rating_app.views.responses import R_ANALYTICS
+from rating_app.views.responses import R_ANALYTICS, R_ANALYTICS_DETAIL
 
 logger = structlog.get_logger(__name__)
 to_openapi = pydantic_to_openapi_request_mapper().map
@@ -60,9 +65,10 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @extend_schema(
         summary="Get course analytics",
         description="Get course analytics with optional filters"
-        "Returns course's analytics with aggregated ratings.",
+        "Returns course's analytics with aggregated ratings, "
+        "score distributions and per-semester trends.",
         parameters=to_openapi((CourseReadParams, OpenApiParameter.PATH)),
-        responses=R_ANALYTICS,
+        responses=R_ANALYTICS_DETAIL,
     )
     def retrieve(self, request, course_id=None, *args, **kwargs) -> Response:
         assert self.course_service is not None
@@ -72,7 +78,16 @@ class AnalyticsViewSet(viewsets.ViewSet):
         except ModelValidationError as e:
             raise ValidationError(detail=e.errors()) from e
 
-        course = self.course_service.get_course(str(params.course_id), prefetch_related=False)
+        course_id = str(params.course_id)
+        course = self.course_service.get_course(course_id, prefetch_related=False)
+        distribution = self.course_service.get_rating_distribution(course_id)
 
-        serialized = self.serializer_class(course).data
+        serialized = CourseAnalyticsDetailSerializer(
+            {
+                **asdict(course),
+                "difficulty_distribution": distribution.difficulty,
+                "usefulness_distribution": distribution.usefulness,
+                "semesters": distribution.semesters,
+            }
+        ).data
         return Response(serialized, status=status.HTTP_200_OK)
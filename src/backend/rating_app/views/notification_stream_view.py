@@ -0,0 +1,84 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.views import View
+
+import structlog
+from asgiref.sync import sync_to_async
+
+from rateukma.pubsub.broker import ISubscription
+from rating_app.constants import (
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS,
+    NOTIFICATION_STREAM_MAX_SECONDS,
+)
+from rating_app.services.notification_service import NotificationService
+from rating_app.services.notification_updates import NotificationUpdatesChannel
+
+logger = structlog.get_logger(__name__)
+
+
+class NotificationStreamView(View):
+    """
+    Server-sent events stream of the unread notification group count.
+
+    Meant to be served through the ASGI entry point: an idle client parks a
+    coroutine on its pub/sub channel instead of polling the unread-count endpoint.
+    """
+
+    # IoC args
+    notification_service: NotificationService | None = None
+    updates_channel: NotificationUpdatesChannel | None = None
+
+    heartbeat_seconds: float = NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+    max_seconds: float = NOTIFICATION_STREAM_MAX_SECONDS
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        assert self.notification_service is not None
+        assert self.updates_channel is not None
+
+        user = await request.auser()  # pyright: ignore[reportAttributeAccessIssue]
+        if not user.is_authenticated:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided", "status": 401},
+                status=401,
+            )
+
+        # subscribe before reading the count so no update in between is lost
+        subscription = await self.updates_channel.subscribe(user.id)
+        try:
+            count = await sync_to_async(self.notification_service.get_unread_count)(user.id)
+        except Exception:
+            await subscription.close()
+            raise
+
+        response = StreamingHttpResponse(
+            self._stream(subscription, count),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # keeps nginx and the compression middleware from buffering the events
+        response["X-Accel-Buffering"] = "no"
+        response["Content-Encoding"] = "identity"
+        return response
+
+    async def _stream(self, subscription: ISubscription, count: int) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_seconds
+        try:
+            yield self._format_event(count)
+            while (remaining := deadline - loop.time()) > 0:
+                message = await subscription.next_message(
+                    timeout=min(self.heartbeat_seconds, remaining)
+                )
+                if isinstance(message, dict) and "unread_count" in message:
+                    yield self._format_event(message["unread_count"])
+                else:
+                    yield b": keep-alive\n\n"
+        finally:
+            await subscription.close()
+
+    def _format_event(self, count: int) -> bytes:
+        return f"event: unread_count\ndata: {json.dumps({'count': count})}\n\n".encode()
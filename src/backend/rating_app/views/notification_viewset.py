@@ -18,6 +18,7 @@ from rating_app.services.notification_service import (
     NotificationService,
 )
 from rating_app.views.responses import (
+    R_NOTIFICATION_FEED,
     R_NOTIFICATION_GROUP_MARK_READ,
     R_NOTIFICATION_LIST,
     R_NOTIFICATION_MARK_READ,
@@ -68,6 +69,46 @@ class NotificationViewSet(viewsets.ViewSet):
         serializer = NotificationGroupSerializer(notifications, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        summary="Page through notifications of the authenticated user",
+        description=(
+            "Keyset-paginated variant of the notification list. Pass the returned "
+            "`next_cursor` back as `cursor` to fetch the following page; every page "
+            "costs the same regardless of how deep it is."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                int,
+                OpenApiParameter.QUERY,
+                description="Number of notification groups to return",
+                default=DEFAULT_NOTIFICATION_PAGE_SIZE,
+            ),
+            OpenApiParameter(
+                "cursor",
+                str,
+                OpenApiParameter.QUERY,
+                description="Opaque cursor returned as `next_cursor` by the previous page",
+            ),
+        ],
+        responses=R_NOTIFICATION_FEED,
+    )
+    @action(detail=False, methods=["get"], url_path="feed")
+    def feed(self, request) -> Response:
+        assert self.notification_service is not None
+
+        page = self.notification_service.get_notification_feed(
+            user_id=request.user.id,
+            limit=self._parse_limit(request),
+            cursor=request.query_params.get("cursor") or None,
+        )
+        # items are serialized as a root list so their course ids resolve in one query
+        items = NotificationGroupSerializer(page.items, many=True).data
+        return Response(
+            {"items": items, "next_cursor": page.next_cursor},
+            status=status.HTTP_200_OK,
+        )
+
     @extend_schema(
         summary="Get unread notification count",
         responses=R_NOTIFICATION_UNREAD_COUNT,
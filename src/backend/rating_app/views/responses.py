@@ -19,13 +19,17 @@ from rating_app.serializers import (
     StudentRatingsLightSerializer,
 )
 from rating_app.serializers import ErrorEnvelopeSerializer as Err
-from rating_app.serializers.analytics import CourseAnalyticsSerializer
+from rating_app.serializers.analytics import (
+    CourseAnalyticsDetailSerializer,
+    CourseAnalyticsSerializer,
+)
 from rating_app.serializers.auth import CSRFTokenSerializer, SessionSerializer
 from rating_app.serializers.course_offering import (
     CourseOfferingListResponseSerializer,
     CourseOfferingSerializer,
 )
 from rating_app.serializers.notification import (
+    NotificationFeedSerializer,
     NotificationGroupSerializer,
     UnreadCountSerializer,
 )
@@ -202,6 +206,11 @@ R_ANALYTICS = {
     **common_errors(include_404=True),
 }
 
+R_ANALYTICS_DETAIL = {
+    200: OpenApiResponse(CourseAnalyticsDetailSerializer, "OK"),
+    **common_errors(include_404=True),
+}
+
 R_COURSE_OFFERING_LIST = {
     200: OpenApiResponse(forced_singular_serializer(CourseOfferingListResponseSerializer), "OK"),
     **common_errors(include_404=True),
@@ -239,6 +248,12 @@ R_NOTIFICATION_LIST = {
     401: OpenApiResponse(Err, UNAUTHORIZED, [EX_401]),
 }
 
+R_NOTIFICATION_FEED = {
+    200: OpenApiResponse(NotificationFeedSerializer, "OK"),
+    400: OpenApiResponse(Err, BAD_REQUEST, [EX_400]),
+    401: OpenApiResponse(Err, UNAUTHORIZED, [EX_401]),
+}
+
 R_NOTIFICATION_UNREAD_COUNT = {
     200: OpenApiResponse(UnreadCountSerializer, "OK"),
     401: OpenApiResponse(Err, UNAUTHORIZED, [EX_401]),
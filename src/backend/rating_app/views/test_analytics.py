@@ -2,6 +2,8 @@ import pytest
 
 from rating_app.ioc_container.repositories import rating_repository
 from rating_app.ioc_container.services import course_service
+from rating_app.models import CourseRatingRollup
+from rating_app.models.choices import SemesterTerm
 
 
 @pytest.fixture
@@ -161,7 +163,8 @@ def test_analytics_single_course_no_n_plus_1(
     # Act & Assert: Retrieving single course should use select_related for department/faculty
     # Expected queries:
     # 1. Main query with select_related(department__faculty) and annotations
-    with django_assert_num_queries(1):
+    # 2. Per-semester rating rollups of the course (ratings themselves are not scanned)
+    with django_assert_num_queries(2):
         response = token_client.get(url)
 
     # Verify response
@@ -208,3 +211,63 @@ def test_analytics_filter_by_ratings_count(
     data_all = response_all.json()
     assert response_all.status_code == 200
     assert len(data_all) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_analytics_retrieve_returns_distributions_and_semester_trends(
+    token_client, course_factory, analytics_url
+):
+    # Arrange
+    course = course_factory.create()
+    CourseRatingRollup.objects.create(
+        course=course,
+        semester_year=2024,
+        semester_term=SemesterTerm.FALL,
+        ratings_count=2,
+        difficulty_2=1,
+        difficulty_4=1,
+        usefulness_5=2,
+    )
+    CourseRatingRollup.objects.create(
+        course=course,
+        semester_year=2024,
+        semester_term=SemesterTerm.SPRING,
+        ratings_count=1,
+        difficulty_1=1,
+        usefulness_3=1,
+    )
+
+    # Act
+    response = token_client.get(f"{analytics_url}{course.id}/")
+
+    # Assert
+    data = response.json()
+    assert response.status_code == 200
+    assert data["difficulty_distribution"] == {"1": 1, "2": 1, "3": 0, "4": 1, "5": 0}
+    assert data["usefulness_distribution"] == {"1": 0, "2": 0, "3": 1, "4": 0, "5": 2}
+    assert [(s["year"], s["term"]) for s in data["semesters"]] == [
+        (2024, "SPRING"),
+        (2024, "FALL"),
+    ]
+    assert data["semesters"][1]["ratings_count"] == 2
+    assert data["semesters"][1]["avg_difficulty"] == 3.0
+    assert data["semesters"][1]["avg_usefulness"] == 5.0
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_analytics_retrieve_course_without_ratings_has_empty_distribution(
+    token_client, course_factory, analytics_url
+):
+    # Arrange
+    course = course_factory.create()
+
+    # Act
+    response = token_client.get(f"{analytics_url}{course.id}/")
+
+    # Assert
+    data = response.json()
+    assert response.status_code == 200
+    assert data["difficulty_distribution"] == {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
+    assert data["semesters"] == []
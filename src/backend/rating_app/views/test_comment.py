@@ -77,7 +77,7 @@ def test_comments_list_response_is_cached_between_calls(
     assert response.json()["items"][0]["id"] == str(comment.id)
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_comments_list_cache_invalidated_after_top_level_comment_create(
     token_client,
@@ -104,7 +104,7 @@ def test_comments_list_cache_invalidated_after_top_level_comment_create(
     assert data["items"][0]["content"] == "Fresh top-level comment"
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_comment_create_invalidates_course_ratings_comments_count(
     token_client,
@@ -130,7 +130,7 @@ def test_comment_create_invalidates_course_ratings_comments_count(
     assert response.json()["items"]["ratings"][0]["comments_count"] == 1
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_comment_reply_caches_invalidated_after_reply_create(
     token_client,
@@ -167,7 +167,7 @@ def test_comment_reply_caches_invalidated_after_reply_create(
     assert data["items"][0]["content"] == "Fresh reply"
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_nested_reply_create_invalidates_parent_replies_cache(
     token_client,
@@ -234,7 +234,7 @@ def test_comment_reply_parent_must_belong_to_rating(
     ).exists()
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_comments_list_cache_invalidated_after_comment_update(
     token_client,
@@ -260,7 +260,7 @@ def test_comments_list_cache_invalidated_after_comment_update(
     assert response.json()["items"][0]["content"] == "Updated content"
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 @pytest.mark.integration
 def test_comment_reply_caches_invalidated_after_reply_delete(
     token_client,
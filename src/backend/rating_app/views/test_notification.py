@@ -14,6 +14,7 @@ from .test_rating import (
 )
 
 NOTIFICATIONS_URL = "/api/v1/notifications/"
+FEED_URL = "/api/v1/notifications/feed/"
 UNREAD_COUNT_URL = "/api/v1/notifications/unread-count/"
 MARK_READ_URL = "/api/v1/notifications/mark-read/"
 
@@ -456,3 +457,48 @@ def test_notifications_list_with_pagination(token_client):
 
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@freeze_time(DEFAULT_AFTER_MIDTERM_DATE)
+def test_notification_feed_pages_with_cursor(
+    enrolled_voter_setup,
+    rating_factory,
+    student_factory,
+    enrollment_factory,
+    user_factory,
+):
+    # Arrange
+    rating = enrolled_voter_setup["rating"]
+    other_rating = rating_factory(
+        student=rating.student,
+        course_offering__semester=rating.course_offering.semester,
+    )
+    for target in (rating, other_rating):
+        voter = student_factory(user=user_factory())
+        enrollment_factory(offering=target.course_offering, student=voter)
+        _cast_vote(_make_client(voter.user), target.id)
+    author_client = _make_author_client(rating.student)
+
+    # Act
+    first_page = author_client.get(f"{FEED_URL}?limit=1").json()
+    second_page = author_client.get(
+        FEED_URL, {"limit": 1, "cursor": first_page["next_cursor"]}
+    ).json()
+
+    # Assert
+    assert first_page["next_cursor"] is not None
+    assert second_page["next_cursor"] is None
+    assert {first_page["items"][0]["rating_id"], second_page["items"][0]["rating_id"]} == {
+        str(rating.id),
+        str(other_rating.id),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_notification_feed_rejects_malformed_cursor(token_client):
+    response = token_client.get(FEED_URL, {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory
+from django.urls import Resolver404, resolve
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+
+from rateukma.pubsub.broker import InMemoryMessageBroker
+from rating_app.services.notification_updates import NotificationUpdatesChannel
+from rating_app.views.notification_stream_view import NotificationStreamView
+
+STREAM_URL = "/api/v1/notifications/stream/"
+
+
+def _make_view(notification_service, updates_channel):
+    return NotificationStreamView.as_view(
+        notification_service=notification_service,
+        updates_channel=updates_channel,
+        heartbeat_seconds=0.05,
+        max_seconds=1,
+    )
+
+
+def _make_request(user):
+    request = AsyncRequestFactory().get(STREAM_URL)
+
+    async def auser():
+        return user
+
+    request.auser = auser
+    return request
+
+
+def test_stream_pushes_current_count_then_published_updates():
+    # Arrange
+    notification_service = MagicMock()
+    notification_service.get_unread_count.return_value = 2
+    updates_channel = NotificationUpdatesChannel(InMemoryMessageBroker())
+    view = _make_view(notification_service, updates_channel)
+    user = SimpleNamespace(id=7, is_authenticated=True)
+
+    async def scenario():
+        response = await view(_make_request(user))
+        events = aiter(response.streaming_content)
+        initial = await anext(events)
+        updates_channel.publish_unread_count(7, 0)
+        update = await anext(events)
+        await events.aclose()
+        return response, initial, update
+
+    # Act
+    response, initial, update = asyncio.run(scenario())
+
+    # Assert
+    assert response["Content-Type"] == "text/event-stream"
+    assert initial == b'event: unread_count\ndata: {"count": 2}\n\n'
+    assert update == b'event: unread_count\ndata: {"count": 0}\n\n'
+
+
+def test_stream_sends_heartbeats_while_idle():
+    # Arrange
+    notification_service = MagicMock()
+    notification_service.get_unread_count.return_value = 0
+    view = _make_view(notification_service, NotificationUpdatesChannel(InMemoryMessageBroker()))
+    user = SimpleNamespace(id=7, is_authenticated=True)
+
+    async def scenario():
+        response = await view(_make_request(user))
+        events = aiter(response.streaming_content)
+        await anext(events)
+        heartbeat = await anext(events)
+        await events.aclose()
+        return heartbeat
+
+    # Act
+    heartbeat = asyncio.run(scenario())
+
+    # Assert
+    assert heartbeat == b": keep-alive\n\n"
+
+
+def test_stream_requires_authentication():
+    # Arrange
+    notification_service = MagicMock()
+    view = _make_view(notification_service, NotificationUpdatesChannel(InMemoryMessageBroker()))
+
+    # Act
+    response = asyncio.run(view(_make_request(AnonymousUser())))
+
+    # Assert
+    assert response.status_code == 401
+    notification_service.get_unread_count.assert_not_called()
+
+
+@pytest.mark.urls("rateukma.asgi_urls")
+def test_stream_is_routed_by_the_asgi_urlconf():
+    # Act
+    match = resolve(STREAM_URL)
+
+    # Assert
+    assert match.url_name == "notification-stream"
+
+
+def test_asgi_application_serves_the_stream():
+    # Arrange
+    from rateukma.asgi import application
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": STREAM_URL,
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+    }
+
+    async def scenario():
+        communicator = ApplicationCommunicator(application, scope)
+        await communicator.send_input({"type": "http.request", "body": b""})
+        start = await communicator.receive_output(timeout=5)
+        await communicator.wait(timeout=5)
+        return start
+
+    # Act
+    start = asyncio.run(scenario())
+
+    # Assert
+    assert start["status"] == 401
+
+
+def test_stream_is_not_routed_by_the_wsgi_urlconf():
+    # Act & Assert
+    with pytest.raises(Resolver404):
+        resolve(STREAM_URL, urlconf="rateukma.urls")
@@ -249,7 +249,14 @@ def test_update_rating(
     rating_factory,
 ):
     client, _user = token_client
-    course = course_factory()
+    # aggregates are maintained incrementally, so seed them for the factory-made rating
+    course = course_factory(
+        avg_difficulty=Decimal("3.00"),
+        avg_usefulness=Decimal("4.00"),
+        ratings_count=1,
+        difficulty_sum=3,
+        usefulness_sum=4,
+    )
     offering = course_offering_factory(course=course)
     student = student_factory(user=token_client.user)
     enrollment_factory(offering=offering, student=student)
@@ -22,7 +22,8 @@ DEFAULT_AFTER_MIDTERM_DATE = "2023-11-25"
 DEFAULT_YEAR = 2023
 DEFAULT_TERM = "FALL"
 
-pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+# cache versions are bumped on commit, so the writes must really commit
+pytestmark = [pytest.mark.django_db(transaction=True), pytest.mark.integration]
 
 
 @pytest.fixture(autouse=True)
@@ -1,6 +1,8 @@
 import pytest
 from freezegun import freeze_time
 
+from rateukma.caching.patterns import course_ratings_namespace
+from rating_app.ioc_container.services import course_vote_counts_cache_invalidator
 from rating_app.models.choices import RatingVoteStrType, RatingVoteType
 
 from .test_rating import (
@@ -120,6 +122,35 @@ def test_create_vote_toggle(token_client, enrolled_student_setup, vote_factory):
     assert response.json()["vote_type"] == RatingVoteStrType.DOWNVOTE
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.integration
+@freeze_time(DEFAULT_AFTER_MIDTERM_DATE)
+def test_vote_burst_bumps_course_ratings_once_then_once_at_window_end(
+    token_client, enrolled_student_setup, rating_factory, mock_cache_manager, monkeypatch
+):
+    offering = enrolled_student_setup["offering"]
+    ratings = [enrolled_student_setup["rating"]]
+    ratings += [rating_factory(course_offering=offering) for _ in range(4)]
+    scheduled = []
+    monkeypatch.setattr(
+        course_vote_counts_cache_invalidator(),
+        "schedule",
+        lambda delay, callback: scheduled.append(callback),
+    )
+    namespace = course_ratings_namespace(str(offering.course_id))
+
+    for rating in ratings:
+        response = make_vote_request(token_client, rating.id, RatingVoteStrType.UPVOTE)
+        assert response.status_code == 201
+    bumps_during_burst = mock_cache_manager.get_version(namespace)
+    for trailing_bump in scheduled:
+        trailing_bump()
+
+    assert bumps_during_burst == 1
+    assert len(scheduled) == 1
+    assert mock_cache_manager.get_version(namespace) == 2
+
+
 @pytest.mark.django_db
 @pytest.mark.integration
 @freeze_time(DEFAULT_AFTER_MIDTERM_DATE)
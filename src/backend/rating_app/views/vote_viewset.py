@@ -55,7 +55,7 @@ class RatingVoteViewSet(viewsets.ViewSet):
         except ModelValidationError as e:
             raise ValidationError(detail=e.errors()) from e
 
-        vote, created = self.vote_service.upsert(schema)
+        vote, created = self.vote_service.upsert(schema, voter_user_id=student.user_id)
         serializer = RatingVoteReadSerializer(vote)
 
         response_status = status.HTTP_201_CREATED if created else status.HTTP_200_OK
@@ -73,6 +73,7 @@ class RatingVoteViewSet(viewsets.ViewSet):
         self.vote_service.delete_vote_by_student(
             student_id=str(student.id),
             rating_id=rating_id,
+            voter_user_id=student.user_id,
         )
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,5 @@
+from functools import partial
+
 from rateukma.caching.instances import redis_cache_manager
 from rating_app.ioc_container.repositories import (
     course_offering_repository,
@@ -5,6 +7,8 @@ from rating_app.ioc_container.repositories import (
     department_repository,
     enrollment_repository,
     faculty_repository,
+    ingestion_checkpoint_repository,
+    ingestion_fingerprint_repository,
     semester_repository,
     speciality_repository,
     student_mapper,
@@ -13,17 +17,39 @@ from rating_app.ioc_container.repositories import (
 from rating_app.ioc_container.services import student_service
 from scraper.services.db_ingestion.progress_tracker import InjectionProgressTracker
 
+from ..services.db_ingestion.bulk_injector import BulkCourseDbInjector
+from ..services.db_ingestion.change_detection import ChangeDetector
 from ..services.db_ingestion.composite import CoursesIngestion
 from ..services.db_ingestion.file_reader import CoursesJSONLFileReader
+from ..services.db_ingestion.identity_map import IngestionIdentityMap
 from ..services.db_ingestion.injector import CourseDbInjector
+from ..services.db_ingestion.parallel import ParallelCourseDbInjector, ParallelCoursesIngestion
+from ..services.db_ingestion.staging_loader import StagedCoursesIngestion, StagingCourseDbInjector
+
+
+def course_file_reader(prefetch_batches: int = 0) -> CoursesJSONLFileReader:
+    return CoursesJSONLFileReader(prefetch_batches=prefetch_batches)
+
+
+def course_db_injector(skip_unchanged: bool = True) -> CourseDbInjector:
+    return _build_injector(CourseDbInjector, skip_unchanged)
+
+
+def bulk_course_db_injector(skip_unchanged: bool = True) -> BulkCourseDbInjector:
+    return _build_injector(BulkCourseDbInjector, skip_unchanged)
 
 
-def course_file_reader() -> CoursesJSONLFileReader:
-    return CoursesJSONLFileReader()
+def staging_course_db_injector(skip_unchanged: bool = True) -> StagingCourseDbInjector:
+    return _build_injector(StagingCourseDbInjector, skip_unchanged)
 
 
-def course_db_injector() -> CourseDbInjector:
-    return CourseDbInjector(
+def parallel_course_db_injector(skip_unchanged: bool = True) -> ParallelCourseDbInjector:
+    return _build_injector(ParallelCourseDbInjector, skip_unchanged)
+
+
+def _build_injector[I: CourseDbInjector](cls: type[I], skip_unchanged: bool) -> I:
+    # every injector variant shares the base constructor
+    return cls(
         course_repository(),
         department_repository(),
         faculty_repository(),
@@ -36,15 +62,48 @@ def course_db_injector() -> CourseDbInjector:
         student_service(),
         redis_cache_manager(),
         student_mapper(),
+        ingestion_identity_map(),
+        ingestion_change_detector(skip_unchanged),
     )
 
 
-def courses_ingestion() -> CoursesIngestion:
+def courses_ingestion(
+    bulk: bool = False,
+    staged: bool = False,
+    workers: int = 1,
+    prefetch_batches: int = 0,
+    force: bool = False,
+    resume: bool = False,
+) -> CoursesIngestion:
+    file_reader = course_file_reader(prefetch_batches)
+    skip_unchanged = not force
+    if workers > 1:
+        return ParallelCoursesIngestion(
+            file_reader,
+            parallel_course_db_injector(skip_unchanged),
+            # handed to the worker processes by reference; each builds its own injector
+            partial(parallel_course_db_injector, skip_unchanged),
+            workers,
+        )
+    if staged:
+        return StagedCoursesIngestion(file_reader, staging_course_db_injector(skip_unchanged))
+    # only batch-committing runs checkpoint: a staged run is one transaction and the
+    # parallel workers each re-read the whole file
     return CoursesIngestion(
-        course_file_reader(),
-        course_db_injector(),
+        file_reader,
+        bulk_course_db_injector(skip_unchanged) if bulk else course_db_injector(skip_unchanged),
+        ingestion_checkpoint_repository(),
+        resume,
     )
 
 
 def injection_progress_tracker() -> InjectionProgressTracker:
     return InjectionProgressTracker()
+
+
+def ingestion_identity_map() -> IngestionIdentityMap:
+    return IngestionIdentityMap()
+
+
+def ingestion_change_detector(skip_unchanged: bool = True) -> ChangeDetector:
+    return ChangeDetector(ingestion_fingerprint_repository(), skip_unchanged)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 import structlog
 
@@ -21,10 +21,76 @@ class Command(BaseCommand):
             default=False,
             help="Run in dry-run mode (no database changes)",
         )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--bulk",
+            action="store_true",
+            default=False,
+            help="Write each batch with set-based upserts instead of row by row",
+        )
+        mode.add_argument(
+            "--staged",
+            action="store_true",
+            default=False,
+            help=(
+                "Full catalog load: stage the whole file and merge it in one transaction "
+                "(COPY on PostgreSQL)"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes; above 1, departments are ingested in parallel in bulk mode",
+        )
+        parser.add_argument(
+            "--prefetch-batches",
+            type=int,
+            default=0,
+            help="Parse up to this many batches ahead in a background thread (0 disables)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            default=False,
+            help="Write every record, including those unchanged since they were last ingested",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            default=False,
+            help="Continue an interrupted run of the same file after its last committed batch",
+        )
 
     def handle(self, *args, **options):
-        ingestion_operation = courses_ingestion()
-        logger.info("insert_scraped_started")
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+        if workers > 1 and options["staged"]:
+            raise CommandError("--staged loads in one transaction and cannot use --workers")
+        prefetch_batches = options["prefetch_batches"]
+        if prefetch_batches < 0:
+            raise CommandError("--prefetch-batches cannot be negative")
+        if options["resume"] and (workers > 1 or options["staged"]):
+            raise CommandError("--resume needs a batch-by-batch run; drop --workers and --staged")
+
+        ingestion_operation = courses_ingestion(
+            bulk=options["bulk"],
+            staged=options["staged"],
+            workers=workers,
+            prefetch_batches=prefetch_batches,
+            force=options["force"],
+            resume=options["resume"],
+        )
+        logger.info(
+            "insert_scraped_started",
+            bulk=options["bulk"],
+            staged=options["staged"],
+            workers=workers,
+            prefetch_batches=prefetch_batches,
+            force=options["force"],
+            resume=options["resume"],
+        )
         file_path = options["file"]
         batch_size = options["batch_size"]
         dry_run = options["dry_run"]
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
 
 import pytest
 
@@ -52,3 +53,91 @@ def test_insert_scraped_dry_run(mock_ingestion):
     mock_operation.execute.assert_called_once()
     call_args = mock_operation.execute.call_args
     assert call_args.kwargs["dry_run"] is True
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_bulk_selects_bulk_injector(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--bulk")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=True, staged=False, workers=1, prefetch_batches=0, force=False, resume=False
+    )
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_staged_selects_staged_ingestion(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--staged")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=False, staged=True, workers=1, prefetch_batches=0, force=False, resume=False
+    )
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_passes_workers(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--workers", "4")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=False, staged=False, workers=4, prefetch_batches=0, force=False, resume=False
+    )
+
+
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_rejects_staged_with_workers(mock_ingestion):
+    # Act & Assert
+    with pytest.raises(CommandError):
+        call_command("insert_scraped", "--file", "courses.jsonl", "--staged", "--workers", "2")
+    mock_ingestion.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_passes_prefetch_batches(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--prefetch-batches", "2")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=False, staged=False, workers=1, prefetch_batches=2, force=False, resume=False
+    )
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_force_writes_unchanged_records(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--force")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=False, staged=False, workers=1, prefetch_batches=0, force=True, resume=False
+    )
+
+
+@pytest.mark.django_db
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_passes_resume(mock_ingestion):
+    # Act
+    call_command("insert_scraped", "--file", "courses.jsonl", "--resume")
+
+    # Assert
+    mock_ingestion.assert_called_once_with(
+        bulk=False, staged=False, workers=1, prefetch_batches=0, force=False, resume=True
+    )
+
+
+@patch("scraper.management.commands.insert_scraped.courses_ingestion")
+def test_insert_scraped_rejects_resume_with_workers(mock_ingestion):
+    # Act & Assert
+    with pytest.raises(CommandError):
+        call_command("insert_scraped", "--file", "courses.jsonl", "--resume", "--workers", "2")
+    mock_ingestion.assert_not_called()
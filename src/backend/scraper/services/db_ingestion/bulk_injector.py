@@ -0,0 +1,219 @@
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from rating_app.application_schemas.course_offering import CourseOfferingInput
+from rating_app.application_schemas.enrollment import EnrollmentInput
+from rating_app.application_schemas.ingestion import UpsertCounts
+from rating_app.application_schemas.student import StudentInput
+from rating_app.constants import INGESTION_BULK_WRITE_BATCH_SIZE
+from rating_app.models import (
+    Course,
+    CourseOfferingSpeciality,
+    CourseOfferingTerm,
+    Semester,
+    Speciality,
+    Student,
+)
+
+from ...models.deduplicated import DeduplicatedCourse, DeduplicatedEnrollment
+from .injector import CourseDbInjector
+
+logger = structlog.get_logger(__name__)
+
+_TERM_UPDATE_FIELDS = [
+    "credits",
+    "weekly_hours",
+    "exam_type",
+    "lecture_count",
+    "practice_count",
+    "practice_type",
+]
+
+
+@dataclass
+class _BatchPlan:
+    """Rows collected for one batch, keyed by offering code until offerings get their ids."""
+
+    offerings: list[CourseOfferingInput] = field(default_factory=list)
+    terms: list[tuple[str, Semester, dict[str, Any]]] = field(default_factory=list)
+    offering_specialities: list[tuple[str, Speciality, str | None]] = field(default_factory=list)
+    enrollments: list[tuple[str, DeduplicatedEnrollment, Speciality]] = field(default_factory=list)
+
+
+class BulkCourseDbInjector(CourseDbInjector):
+    """
+    Set-based variant of CourseDbInjector that ends in the same database state.
+
+    Reference entities (faculties, departments, specialities, semesters) are few and
+    resolved through the same cached lookups as the row path. Everything else is
+    collected for the whole batch and written with one statement per table, in
+    dependency order: courses, offerings, terms and speciality links, students,
+    enrollments.
+    """
+
+    def _inject_to_db(self, models: Sequence[DeduplicatedCourse]) -> None:
+        courses = self._upsert_courses(models)
+        plan = self._plan_batch(models, courses)
+
+        known_ids = self.identity_map.offering_ids if self.identity_map else None
+        offering_ids = self.course_offering_repository.bulk_upsert(plan.offerings, known_ids)
+        if self.identity_map is not None:
+            self.identity_map.offering_ids.update(offering_ids)
+        self._upsert_offering_terms(plan, offering_ids)
+        self._upsert_offering_specialities(plan, offering_ids)
+        students = self._upsert_students(plan)
+        self._upsert_enrollments(plan, offering_ids, students)
+
+    def _upsert_courses(
+        self, models: Sequence[DeduplicatedCourse], counts: UpsertCounts | None = None
+    ) -> list[Course]:
+        keys: list[tuple[str, str, str]] = []
+        pending = {}
+        for course_data in models:
+            faculty = self._process_faculty(course_data)
+            department = self._get_or_create_department(course_data, faculty)
+            key = self._course_key(course_data, department)
+            if key not in self._course_cache and key not in pending:
+                pending[key] = self._build_course_input(course_data, department, faculty)
+            keys.append(key)
+
+        inputs = list(pending.values())
+        candidates = self.identity_map.course_candidates(inputs) if self.identity_map else None
+        upserted = self.course_repository.bulk_get_or_upsert(inputs, counts, candidates)
+        if self.identity_map is not None:
+            self.identity_map.add_courses(upserted)
+        self._course_cache.update(zip(pending, upserted, strict=True))
+        return [self._course_cache[key] for key in keys]
+
+    def _plan_batch(
+        self, models: Sequence[DeduplicatedCourse], courses: list[Course]
+    ) -> _BatchPlan:
+        # walks the batch in the row path's order: which specialities are known when an
+        # offering links them depends on the students resolved before it
+        plan = _BatchPlan()
+        for course_data, course in zip(models, courses, strict=True):
+            self.tracker.increment()
+            self._process_specialities(course, course_data)
+
+            for offering_data in course_data.offerings:
+                code = offering_data.code
+                semester = self._get_or_create_semester(offering_data.semester)
+                plan.offerings.append(self._build_offering_input(course, offering_data, semester))
+
+                for term_data in offering_data.terms:
+                    term_semester = self._get_or_create_semester(term_data.semester)
+                    plan.terms.append((code, term_semester, self._build_term_defaults(term_data)))
+
+                for spec_data in offering_data.specialities:
+                    speciality = self._speciality_cache.get(spec_data.name)
+                    if speciality is None:
+                        logger.warning(
+                            "injector.offering_speciality_not_in_cache",
+                            offering_code=code,
+                            speciality=spec_data.name,
+                        )
+                        continue
+                    type_kind = spec_data.type_kind.value if spec_data.type_kind else None
+                    plan.offering_specialities.append((code, speciality, type_kind))
+
+                for enrollment_data in offering_data.enrollments:
+                    speciality = self._get_student_speciality(enrollment_data.student)
+                    if speciality:
+                        plan.enrollments.append((code, enrollment_data, speciality))
+        return plan
+
+    def _upsert_offering_terms(self, plan: _BatchPlan, offering_ids: dict[str, Any]) -> None:
+        latest = {
+            (offering_ids[code], semester.id): (semester, defaults)
+            for code, semester, defaults in plan.terms
+        }
+        CourseOfferingTerm.objects.bulk_create(
+            [
+                CourseOfferingTerm(offering_id=offering_id, semester=semester, **defaults)
+                for (offering_id, _), (semester, defaults) in latest.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["offering", "semester"],
+            update_fields=_TERM_UPDATE_FIELDS,
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+
+    def _upsert_offering_specialities(self, plan: _BatchPlan, offering_ids: dict[str, Any]) -> None:
+        latest = {
+            (offering_ids[code], speciality.id): (speciality, type_kind)
+            for code, speciality, type_kind in plan.offering_specialities
+        }
+        CourseOfferingSpeciality.objects.bulk_create(
+            [
+                CourseOfferingSpeciality(
+                    offering_id=offering_id, speciality=speciality, type_kind=type_kind
+                )
+                for (offering_id, _), (speciality, type_kind) in latest.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["offering", "speciality"],
+            update_fields=["type_kind"],
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+
+    def _upsert_students(
+        self, plan: _BatchPlan, counts: UpsertCounts | None = None
+    ) -> list[Student]:
+        keys: list[tuple[str, str, str, str, str]] = []
+        pending: dict[tuple[str, str, str, str, str], StudentInput] = {}
+        program_starts: list[tuple[tuple[str, str, str, str, str], int | None]] = []
+        for _, enrollment_data, speciality in plan.enrollments:
+            student_data = enrollment_data.student
+            key = self._student_key(student_data, speciality)
+            keys.append(key)
+            if key not in self._student_cache and key not in pending:
+                pending[key] = self._build_student_input(student_data, speciality)
+            else:
+                program_starts.append((key, student_data.program_start_academic_year_start))
+
+        inputs = list(pending.values())
+        candidates = self.identity_map.student_candidates(inputs) if self.identity_map else None
+        upserted = self.student_repository.bulk_get_or_upsert(inputs, counts, candidates)
+        if self.identity_map is not None:
+            self.identity_map.index_students(student for student, _ in upserted)
+        to_link: list[Student] = []
+        for key, (student, created) in zip(pending, upserted, strict=True):
+            self._student_cache[key] = student
+            if created or (pending[key].email and student.user_id is None):
+                to_link.append(student)
+
+        # repeated students only ever lower the program start, as in the row path
+        merged: dict[Any, Student] = {}
+        for key, year in program_starts:
+            student = self._student_cache[key]
+            if self._merge_program_start(student, year):
+                merged[student.pk] = student
+        Student.objects.bulk_update(
+            list(merged.values()),
+            fields=["program_start_academic_year_start"],
+            batch_size=INGESTION_BULK_WRITE_BATCH_SIZE,
+        )
+
+        self._link_students_to_users(to_link)
+
+        return [self._student_cache[key] for key in keys]
+
+    def _upsert_enrollments(
+        self,
+        plan: _BatchPlan,
+        offering_ids: dict[str, Any],
+        students: list[Student],
+    ) -> None:
+        enrollments = [
+            EnrollmentInput(
+                student_id=student.id,
+                offering_id=offering_ids[code],
+                status=enrollment_data.status.value,
+            )
+            for (code, enrollment_data, _), student in zip(plan.enrollments, students, strict=True)
+        ]
+        self.enrollment_repository.bulk_upsert(enrollments)
+        self._enrolled_student_ids.update(str(enrollment.student_id) for enrollment in enrollments)
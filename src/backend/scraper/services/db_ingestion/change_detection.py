@@ -0,0 +1,136 @@
+import hashlib
+from collections.abc import Sequence
+
+import structlog
+
+from rating_app.application_schemas.ingestion import ChangeCounts
+from rating_app.models.choices import IngestionFingerprintKind
+from rating_app.repositories import IngestionFingerprintRepository
+
+from ...models.deduplicated import DeduplicatedCourse, DeduplicatedCourseOffering
+
+logger = structlog.get_logger(__name__)
+
+_KINDS = (IngestionFingerprintKind.COURSE, IngestionFingerprintKind.OFFERING)
+
+
+def _sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def course_key(course: DeduplicatedCourse) -> str:
+    level = course.education_level.value if course.education_level else ""
+    return _sha256(course.faculty, course.department, course.title, level)
+
+
+class ChangeDetector:
+    """
+    Compares scraped courses and offerings with the content hashes stored when they
+    were last ingested. Unchanged courses are dropped from a batch, and changed
+    courses keep only their new or changed offerings.
+
+    Courses are keyed by faculty, department, title and education level, as the
+    injector matches them, and offerings by code. An offering's hash includes its
+    course's key, so an offering that moves to another course counts as changed.
+    Hashes of a batch are saved with the batch, in its transaction, so a rolled back
+    batch is compared again on the next run.
+    """
+
+    def __init__(
+        self, fingerprint_repository: IngestionFingerprintRepository, skip_unchanged: bool = True
+    ) -> None:
+        self.fingerprint_repository = fingerprint_repository
+        # when off, everything is written but the counts and hashes are still kept
+        self.skip_unchanged = skip_unchanged
+        self.loaded = False
+        self.counts = self._empty_counts()
+        self._hashes: dict[IngestionFingerprintKind, dict[str, str]] = {kind: {} for kind in _KINDS}
+        self._pending: dict[IngestionFingerprintKind, dict[str, str]] = {
+            kind: {} for kind in _KINDS
+        }
+        self._batch_counts = self._empty_counts()
+
+    def load(self) -> None:
+        self.clear()
+        for kind in _KINDS:
+            self._hashes[kind] = self.fingerprint_repository.get_hashes(kind)
+        self.loaded = True
+
+    def clear(self) -> None:
+        self.loaded = False
+        self.counts = self._empty_counts()
+        self._batch_counts = self._empty_counts()
+        for kind in _KINDS:
+            self._hashes[kind].clear()
+            self._pending[kind].clear()
+
+    def filter_changed(self, models: Sequence[DeduplicatedCourse]) -> list[DeduplicatedCourse]:
+        for kind in _KINDS:
+            self._pending[kind].clear()
+        self._batch_counts = self._empty_counts()
+
+        changed: list[DeduplicatedCourse] = []
+        for course in models:
+            key = course_key(course)
+            content_hash = _sha256(course.model_dump_json())
+            if self._compare(IngestionFingerprintKind.COURSE, key, content_hash):
+                self._batch_counts["offerings"].unchanged += len(course.offerings)
+                if not self.skip_unchanged:
+                    changed.append(course)
+                continue
+
+            offerings = [
+                offering
+                for offering in course.offerings
+                if not self._is_unchanged_offering(key, offering)
+            ]
+            if self.skip_unchanged and len(offerings) < len(course.offerings):
+                changed.append(course.model_copy(update={"offerings": offerings}))
+            else:
+                changed.append(course)
+
+        return changed
+
+    def save(self) -> None:
+        """Stores the hashes of the batch passed to filter_changed(); call once it is written."""
+        for kind, hashes in self._pending.items():
+            if hashes:
+                self.fingerprint_repository.bulk_upsert(kind, hashes)
+                self._hashes[kind].update(hashes)
+            hashes.clear()
+
+        for name, batch_counts in self._batch_counts.items():
+            self.counts[name] += batch_counts
+        logger.info(
+            "ingestion_changes_detected",
+            courses=vars(self._batch_counts["courses"]),
+            offerings=vars(self._batch_counts["offerings"]),
+        )
+        self._batch_counts = self._empty_counts()
+
+    def _is_unchanged_offering(self, course_key: str, offering: DeduplicatedCourseOffering) -> bool:
+        content_hash = _sha256(course_key, offering.model_dump_json())
+        return self._compare(IngestionFingerprintKind.OFFERING, offering.code, content_hash)
+
+    def _compare(self, kind: IngestionFingerprintKind, key: str, content_hash: str) -> bool:
+        counts = self._batch_counts[
+            "courses" if kind == IngestionFingerprintKind.COURSE else "offerings"
+        ]
+        stored = self._hashes[kind].get(key)
+        if stored == content_hash:
+            counts.unchanged += 1
+            return True
+
+        if stored is None:
+            counts.new += 1
+        else:
+            counts.changed += 1
+        self._pending[kind][key] = content_hash
+        return False
+
+    def _empty_counts(self) -> dict[str, ChangeCounts]:
+        return {"courses": ChangeCounts(), "offerings": ChangeCounts()}
@@ -1,48 +1,81 @@
+from dataclasses import asdict
 from pathlib import Path
 
+from django.db import transaction
+
 import structlog
+from structlog.contextvars import bound_contextvars
 
 from rateukma.protocols.artifacts import IOperation, implements
+from rating_app.application_schemas.ingestion import CheckpointPosition
+from rating_app.repositories import IngestionCheckpointRepository
 
 from ...models.deduplicated import DeduplicatedCourse
-from .file_reader import IFileReader
+from .file_reader import IFileReader, file_fingerprint
+from .ingestion_run import IngestionRun, IngestionRunSummary
 from .injector import IDbInjector
 
 logger = structlog.get_logger()
 
 
 class CoursesIngestion(IOperation[[Path, int, bool]]):
-    def __init__(self, file_reader: IFileReader[DeduplicatedCourse], db_injector: IDbInjector):
+    """
+    Reads a scraped file batch by batch into the injector. With a checkpoint
+    repository, every batch commits together with the byte offset after it, so a
+    run started with resume=True continues right after the last committed batch.
+    """
+
+    def __init__(
+        self,
+        file_reader: IFileReader[DeduplicatedCourse],
+        db_injector: IDbInjector,
+        checkpoint_repository: IngestionCheckpointRepository | None = None,
+        resume: bool = False,
+    ):
         self.file_reader = file_reader
         self.db_injector = db_injector
-
-    def _count_total_records(self, file_path: Path) -> int:
-        file_path = Path(file_path) if not isinstance(file_path, Path) else file_path
-        total = 0
-        with file_path.open("r", encoding="utf-8") as file:
-            for raw_line in file:
-                if raw_line.strip():
-                    total += 1
-        return total
+        self.checkpoint_repository = checkpoint_repository
+        self.resume = resume
+        self.last_run: IngestionRunSummary | None = None
 
     @implements
     def execute(self, file_path: Path, batch_size: int = 100, dry_run: bool = False) -> None:
-        if hasattr(self.db_injector, "reset_state"):
-            self.db_injector.reset_state()
+        run = IngestionRun()
+        with bound_contextvars(ingestion_run_id=run.run_id):
+            if hasattr(self.db_injector, "reset_state"):
+                self.db_injector.reset_state()
+
+            deferred = not dry_run and hasattr(self.db_injector, "begin_run")
+            if deferred:
+                self.db_injector.begin_run(run)
+            try:
+                self._ingest(Path(file_path), batch_size, dry_run, run.run_id)
+            finally:
+                # committed batches are applied even when a later batch fails
+                if deferred:
+                    self.last_run = self.db_injector.finish_run()
+                    logger.info("ingestion_run_finished", **asdict(self.last_run))
+
+    def _ingest(self, file_path: Path, batch_size: int, dry_run: bool, run_id: str) -> None:
+        # checkpoints are byte offsets, so they need a reader that reports them
+        checkpoints = self.checkpoint_repository
+        if dry_run or not hasattr(self.file_reader, "progress"):
+            checkpoints = None
+        fingerprint = file_fingerprint(file_path) if checkpoints is not None else ""
+        start = self._start_position(checkpoints, fingerprint)
 
-        total_records = 0
-        processed_records = 0
         if not dry_run:
-            total_records = self._count_total_records(file_path)
-            if total_records:
-                logger.info(
-                    "overall_injection_starting",
-                    total_courses=total_records,
-                    batch_size=batch_size,
-                )
+            logger.info(
+                "overall_injection_starting",
+                file=str(file_path),
+                batch_size=batch_size,
+                start_offset=start.byte_offset,
+                start_batch=start.batch_number,
+            )
 
-        batch_index = 0
-        for batch in self.file_reader.provide(file_path, batch_size):
+        processed_records = 0
+        batch_index = start.batch_number
+        for batch in self.file_reader.provide(file_path, batch_size, start.byte_offset):
             batch_index += 1
             if hasattr(self.db_injector, "set_batch_number"):
                 self.db_injector.set_batch_number(batch_index)
@@ -51,22 +84,56 @@ class CoursesIngestion(IOperation[[Path, int, bool]]):
                 logger.info("dry_run_mode_enabled", skipping_batch=True)
                 continue
 
-            self.db_injector.execute(batch)
-            if total_records:
-                processed_records += len(batch)
-                percentage = (processed_records / total_records) * 100
+            # the reader tracks byte offsets; a single pass needs no record pre-count
+            progress = getattr(self.file_reader, "progress", None)
+            if checkpoints is not None and progress is not None:
+                # the checkpoint commits with the batch, so a resume neither skips nor redoes it
+                with transaction.atomic():
+                    self.db_injector.execute(batch)
+                    checkpoints.save(
+                        fingerprint,
+                        str(file_path),
+                        CheckpointPosition(progress.bytes_read, batch_index),
+                        run_id,
+                    )
+            else:
+                self.db_injector.execute(batch)
+            processed_records += len(batch)
+            if progress is not None:
                 logger.info(
                     "overall_injection_progress",
                     processed=processed_records,
-                    total=total_records,
-                    percentage=f"{percentage:.1f}%",
+                    bytes_read=progress.bytes_read,
+                    remaining_bytes=progress.remaining_bytes,
+                    total_bytes=progress.total_bytes,
+                    percentage=f"{progress.percentage:.1f}%",
                     batch_number=batch_index,
                 )
 
-        if total_records:
+        if not dry_run:
+            if checkpoints is not None:
+                checkpoints.delete(fingerprint)
             logger.info(
                 "overall_injection_completed",
                 processed=processed_records,
-                total=total_records,
+                batches=batch_index,
                 percentage="100.0%",
             )
+
+    def _start_position(
+        self, checkpoints: IngestionCheckpointRepository | None, fingerprint: str
+    ) -> CheckpointPosition:
+        if checkpoints is None or not self.resume:
+            return CheckpointPosition()
+
+        checkpoint = checkpoints.get(fingerprint)
+        if checkpoint is None:
+            logger.info("ingestion_checkpoint_not_found", file_fingerprint=fingerprint)
+            return CheckpointPosition()
+
+        logger.info(
+            "ingestion_resuming_from_checkpoint",
+            byte_offset=checkpoint.byte_offset,
+            batch_number=checkpoint.batch_number,
+        )
+        return checkpoint
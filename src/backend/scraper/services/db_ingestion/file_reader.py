@@ -1,7 +1,10 @@
-import json
+import hashlib
+import queue
+import threading
 from collections.abc import Generator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TypeVar
+from typing import Any, TypeVar
 
 import structlog
 from pydantic import BaseModel, ValidationError
@@ -15,43 +18,118 @@ logger = structlog.get_logger(__name__)
 
 _T = TypeVar("_T", bound=BaseModel)
 
+_END_OF_FILE = object()
+_PREFETCH_POLL_SECONDS = 0.1
+_FINGERPRINT_SAMPLE_BYTES = 1 << 20
 
-class IFileReader[T](IProvider[[Path, int], Generator[list[T], None, None]]):
+
+class IFileReader[T](IProvider[[Path, int, int], Generator[list[T], None, None]]):
     _is_protocol = True
 
-    def provide(self, file_path: Path, batch_size: int = 100) -> Generator[list[T], None, None]: ...
+    def provide(
+        self, file_path: Path, batch_size: int = 100, start_offset: int = 0
+    ) -> Generator[list[T], None, None]: ...
+
+
+def file_fingerprint(file_path: Path) -> str:
+    """
+    Identifies a file's content without reading all of it: its size and its first
+    and last MiB. A scrape that changes in between without changing size is not told
+    apart, which is acceptable for regenerated JSONL exports.
+    """
+    size = file_path.stat().st_size
+    digest = hashlib.sha256(str(size).encode())
+    with file_path.open("rb") as file:
+        digest.update(file.read(_FINGERPRINT_SAMPLE_BYTES))
+        if size > _FINGERPRINT_SAMPLE_BYTES:
+            file.seek(max(size - _FINGERPRINT_SAMPLE_BYTES, _FINGERPRINT_SAMPLE_BYTES))
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ReadProgress:
+    """
+    How far the consumer has got through the file, by bytes handed out. A resumed
+    read starts at start_bytes, and its percentage covers only the remaining work.
+    """
+
+    bytes_read: int = 0
+    total_bytes: int = 0
+    start_bytes: int = 0
+
+    @property
+    def remaining_bytes(self) -> int:
+        return self.total_bytes - self.bytes_read
+
+    @property
+    def percentage(self) -> float:
+        work = self.total_bytes - self.start_bytes
+        return ((self.bytes_read - self.start_bytes) / work) * 100 if work else 100.0
 
 
 class CoursesJSONLFileReader(IFileReader[DeduplicatedCourse]):
+    """
+    Reads the file in one pass, validating each raw line straight from JSON.
+    Progress is derived from byte offsets, so callers need no pre-count.
+
+    With ``prefetch_batches`` set, lines are parsed in a background thread that
+    stays up to that many batches ahead, overlapping decoding with database writes
+    (the database driver releases the GIL while it waits on queries).
+    """
+
     BATCH_SIZE = 100
 
+    def __init__(self, prefetch_batches: int = 0) -> None:
+        self.prefetch_batches = prefetch_batches
+        self.progress = ReadProgress()
+
     @implements
     def provide(
-        self, file_path: Path, batch_size: int = 100
+        self, file_path: Path, batch_size: int = 100, start_offset: int = 0
     ) -> Generator[list[DeduplicatedCourse], None, None]:
+        """Batches from start_offset on, which must be a line boundary such as a checkpoint."""
         file_path = Path(file_path) if isinstance(file_path, str) else file_path
         self._validate_file(file_path)
 
+        total_bytes = file_path.stat().st_size
+        if not 0 <= start_offset <= total_bytes:
+            raise ValueError(f"Offset {start_offset} is outside {file_path} ({total_bytes} bytes)")
+
+        self.progress = ReadProgress(
+            bytes_read=start_offset, total_bytes=total_bytes, start_bytes=start_offset
+        )
+        batches = (
+            self._read_in_background(file_path, batch_size, start_offset)
+            if self.prefetch_batches > 0
+            else self._read_batches(file_path, batch_size, start_offset)
+        )
+        for batch, offset in batches:
+            # updated on the consumer side, so it never runs ahead of what was handed out
+            self.progress = ReadProgress(
+                bytes_read=offset, total_bytes=total_bytes, start_bytes=start_offset
+            )
+            yield batch
+
+    def _read_batches(
+        self, file_path: Path, batch_size: int, start_offset: int = 0
+    ) -> Generator[tuple[list[DeduplicatedCourse], int], None, None]:
         line_num = 0
         valid_count = 0
         invalid_count = 0
+        offset = start_offset
         batch: list[DeduplicatedCourse] = []
 
-        with file_path.open("r", encoding="utf-8") as file:
+        with file_path.open("rb") as file:
+            file.seek(start_offset)
             for raw_line in file:
                 line_num += 1
-                course_raw_data = self._read_line(raw_line)
-                if not course_raw_data:
+                offset += len(raw_line)
+                if not raw_line.strip():
                     continue
 
-                course = self._read_course(course_raw_data)
+                course = self._read_course(raw_line, line_num)
                 if not course:
-                    logger.warning(
-                        "invalid_course",
-                        data_keys=list(course_raw_data.keys()),
-                        line_num=line_num,
-                        skipped=True,
-                    )
                     invalid_count += 1
                     continue
 
@@ -60,36 +138,69 @@ class CoursesJSONLFileReader(IFileReader[DeduplicatedCourse]):
                 logger.debug("course_read", course_title=course.title, line_num=line_num)
 
                 if len(batch) >= batch_size:
-                    yield batch
+                    yield batch, offset
                     batch = []
 
         if batch:
-            yield batch
+            yield batch, offset
 
         logger.info(
             "file_reading_completed",
             file=str(file_path),
+            start_offset=start_offset,
             total_lines=line_num,
             valid_records=valid_count,
             invalid_records=invalid_count,
         )
 
-    def _read_line(self, line: str) -> dict | None:
-        stripped_line = line.strip()
-        if not stripped_line:
-            return None
+    def _read_in_background(
+        self, file_path: Path, batch_size: int, start_offset: int = 0
+    ) -> Generator[tuple[list[DeduplicatedCourse], int], None, None]:
+        batches: queue.Queue[Any] = queue.Queue(maxsize=self.prefetch_batches)
+        stopped = threading.Event()
+
+        def put(item: object) -> None:
+            while not stopped.is_set():
+                try:
+                    batches.put(item, timeout=_PREFETCH_POLL_SECONDS)
+                    return
+                except queue.Full:
+                    continue
 
+        def produce() -> None:
+            try:
+                for item in self._read_batches(file_path, batch_size, start_offset):
+                    if stopped.is_set():
+                        return
+                    put(item)
+                put(_END_OF_FILE)
+            except Exception as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name="courses-jsonl-reader", daemon=True)
+        producer.start()
         try:
-            return json.loads(stripped_line)
-        except json.JSONDecodeError as e:
-            logger.error("json_decode_error", error=str(e), line_len=len(line))
-            return None
-
-    def _read_course(self, data: dict) -> DeduplicatedCourse | None:
+            while True:
+                item = batches.get()
+                if item is _END_OF_FILE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # also reached when the consumer stops early; let the producer wind down
+            stopped.set()
+            producer.join()
+
+    def _read_course(self, raw_line: bytes, line_num: int) -> DeduplicatedCourse | None:
         try:
-            return DeduplicatedCourse.model_validate(data)
+            return DeduplicatedCourse.model_validate_json(raw_line)
         except ValidationError as e:
-            logger.error("validation_error", error=str(e), fields=list(data.keys()))
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                logger.error("json_decode_error", error=str(e), line_len=len(raw_line))
+            else:
+                logger.error("validation_error", error=str(e), line_num=line_num)
+            logger.warning("invalid_course", line_num=line_num, skipped=True)
             return None
 
     def _validate_file(self, file_path: Path) -> None:
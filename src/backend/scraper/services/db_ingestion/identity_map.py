@@ -0,0 +1,117 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from uuid import UUID
+
+import structlog
+
+from rating_app.application_schemas.course import CourseInput
+from rating_app.application_schemas.student import StudentInput
+from rating_app.models import (
+    Course,
+    CourseOffering,
+    Department,
+    Faculty,
+    Semester,
+    Speciality,
+    Student,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class IngestionIdentityMap:
+    """
+    Existing rows the injector resolves scraped data against, loaded with one query
+    per table at the start of a run. Reference entities are keyed like the injector
+    caches they seed; courses and students are kept as match candidates for the
+    repositories' upsert rules, and offering codes map to their ids.
+
+    The injector adds what it creates, so lookups stay in memory for the whole run
+    and only true misses reach the database.
+    """
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self.faculties: dict[str, Faculty] = {}
+        self.departments: dict[tuple[str, str], Department] = {}
+        self.specialities: dict[str, Speciality] = {}
+        self.semesters: dict[tuple[int, str], Semester] = {}
+        self.offering_ids: dict[str, UUID] = {}
+        self._courses: dict[tuple[str, str], list[Course]] = defaultdict(list)
+        self._students_by_email: dict[str, dict[UUID, Student]] = defaultdict(dict)
+        self._students_by_name: dict[tuple[str, str], dict[UUID, Student]] = defaultdict(dict)
+        self._student_keys: dict[UUID, tuple[str, tuple[str, str]]] = {}
+
+    def load(self) -> None:
+        self.clear()
+        # ordered by pk so that the first row wins on duplicates, as .first() would
+        for faculty in Faculty.objects.order_by("pk"):
+            self.faculties.setdefault(faculty.name, faculty)
+        for department in Department.objects.select_related("faculty").order_by("pk"):
+            self.departments.setdefault((department.name, department.faculty.name), department)
+        for speciality in Speciality.objects.order_by("pk"):
+            self.specialities.setdefault(speciality.name, speciality)
+        for semester in Semester.objects.all():
+            self.semesters[(semester.year, semester.term)] = semester
+        self.add_courses(Course.objects.all())
+        self.index_students(Student.objects.select_related("speciality"))
+        self.offering_ids = dict(CourseOffering.objects.values_list("code", "id"))
+        self.loaded = True
+
+        logger.info(
+            "ingestion_identity_map_loaded",
+            faculties=len(self.faculties),
+            departments=len(self.departments),
+            specialities=len(self.specialities),
+            semesters=len(self.semesters),
+            courses=sum(len(courses) for courses in self._courses.values()),
+            students=len(self._student_keys),
+            offerings=len(self.offering_ids),
+        )
+
+    def clear(self) -> None:
+        self.loaded = False
+        self.faculties.clear()
+        self.departments.clear()
+        self.specialities.clear()
+        self.semesters.clear()
+        self.offering_ids.clear()
+        self._courses.clear()
+        self._students_by_email.clear()
+        self._students_by_name.clear()
+        self._student_keys.clear()
+
+    def course_candidates(self, data: Iterable[CourseInput]) -> list[Course]:
+        """Courses sharing a department and title with the inputs, i.e. all that can match."""
+        keys = {(str(item.department), item.title) for item in data}
+        return [course for key in keys for course in self._courses.get(key, ())]
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        for course in courses:
+            candidates = self._courses[(str(course.department_id), course.title)]
+            if all(existing.pk != course.pk for existing in candidates):
+                candidates.append(course)
+
+    def student_candidates(self, data: Iterable[StudentInput]) -> list[Student]:
+        """Students sharing an email or a first and last name with the inputs."""
+        candidates: dict[UUID, Student] = {}
+        for item in data:
+            if item.email:
+                candidates.update(self._students_by_email.get(item.email, {}))
+            candidates.update(self._students_by_name.get((item.first_name, item.last_name), {}))
+        return list(candidates.values())
+
+    def index_students(self, students: Iterable[Student]) -> None:
+        """Adds students, or re-indexes them after an upsert changed their email or name."""
+        for student in students:
+            previous = self._student_keys.get(student.pk)
+            if previous is not None:
+                email, name = previous
+                self._students_by_email.get(email, {}).pop(student.pk, None)
+                self._students_by_name.get(name, {}).pop(student.pk, None)
+
+            name = (student.first_name, student.last_name)
+            if student.email:
+                self._students_by_email[student.email][student.pk] = student
+            self._students_by_name[name][student.pk] = student
+            self._student_keys[student.pk] = (student.email, name)
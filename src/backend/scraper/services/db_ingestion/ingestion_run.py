@@ -0,0 +1,58 @@
+import time
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+import structlog
+
+from rating_app.application_schemas.ingestion import ChangeCounts
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class IngestionRunSummary:
+    run_id: str
+    batches: int
+    processed_courses: int
+    invalidated_students: int
+    duration_seconds: float
+    # new, changed and unchanged courses and offerings, when change detection is on
+    changes: dict[str, ChangeCounts] = field(default_factory=dict)
+
+
+class IngestionRun:
+    """
+    One ingestion run. Injectors record what their committed batches touched
+    instead of invalidating caches per batch; the injector applies it all once
+    when the run finishes.
+    """
+
+    def __init__(self, run_id: str | None = None) -> None:
+        self.run_id = run_id or uuid.uuid4().hex
+        self.batches = 0
+        self.processed_courses = 0
+        self.student_ids: set[str] = set()
+        self.changes: dict[str, ChangeCounts] = {}
+        self._started_at = time.monotonic()
+
+    def record_batch(
+        self, processed_courses: int, student_ids: Iterable[str], batches: int = 1
+    ) -> None:
+        self.batches += batches
+        self.processed_courses += processed_courses
+        self.student_ids.update(student_ids)
+
+    def record_changes(self, changes: Mapping[str, ChangeCounts]) -> None:
+        for name, counts in changes.items():
+            self.changes[name] = self.changes.get(name, ChangeCounts()) + counts
+
+    def summary(self) -> IngestionRunSummary:
+        return IngestionRunSummary(
+            run_id=self.run_id,
+            batches=self.batches,
+            processed_courses=self.processed_courses,
+            invalidated_students=len(self.student_ids),
+            duration_seconds=round(time.monotonic() - self._started_at, 3),
+            changes=dict(self.changes),
+        )
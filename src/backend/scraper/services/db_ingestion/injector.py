@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 from decimal import Decimal
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from django.db import transaction
 
@@ -9,9 +9,14 @@ from pydantic import BaseModel
 
 from rateukma.caching.cache_manager import ICacheManager
 from rateukma.caching.patterns import (
+    ANALYTICS_LIST_NAMESPACE,
     COURSE_PATTERN,
+    COURSES_LIST_NAMESPACE,
+    FILTER_OPTIONS_NAMESPACE,
     FILTER_OPTIONS_PATTERN,
     RATINGS_PATTERN,
+    REFERENCE_DATA_NAMESPACE,
+    student_enrollments_namespace,
 )
 from rateukma.protocols.decorators import implements
 from rateukma.protocols.generic import IOperation
@@ -47,12 +52,18 @@ from rating_app.repositories import (
 )
 from rating_app.repositories.to_domain_mappers import StudentMapper
 from rating_app.services import StudentService
+from scraper.services.db_ingestion.change_detection import ChangeDetector
+from scraper.services.db_ingestion.identity_map import IngestionIdentityMap
+from scraper.services.db_ingestion.ingestion_run import IngestionRun, IngestionRunSummary
 from scraper.services.db_ingestion.progress_tracker import InjectionProgressTracker
 
 from ...models.deduplicated import (
     DeduplicatedCourse,
     DeduplicatedCourseOffering,
+    DeduplicatedCourseOfferingTerm,
     DeduplicatedEnrollment,
+    DeduplicatedSemester,
+    DeduplicatedSpeciality,
     DeduplicatedStudent,
 )
 
@@ -71,6 +82,10 @@ class IDbInjector(IOperation[[Sequence[_T]]]):
 
     def set_batch_number(self, batch_number: int) -> None: ...
 
+    def begin_run(self, run: IngestionRun) -> None: ...
+
+    def finish_run(self) -> IngestionRunSummary: ...
+
 
 class CourseDbInjector(IDbInjector):
     def __init__(
@@ -87,6 +102,8 @@ class CourseDbInjector(IDbInjector):
         student_service: StudentService,
         cache_manager: ICacheManager,
         student_mapper: StudentMapper,
+        identity_map: IngestionIdentityMap | None = None,
+        change_detector: ChangeDetector | None = None,
     ):
         self.course_repository = course_repository
         self.department_repository = department_repository
@@ -100,6 +117,8 @@ class CourseDbInjector(IDbInjector):
         self.tracker = injection_progress_tracker
         self.student_service = student_service
         self.cache_manager = cache_manager
+        self.identity_map = identity_map
+        self.change_detector = change_detector
 
         self._faculty_cache: dict[str, Faculty] = {}
         self._department_cache: dict[tuple[str, str], Department] = {}
@@ -107,11 +126,18 @@ class CourseDbInjector(IDbInjector):
         self._speciality_cache: dict[str, Speciality | None] = {}
         self._semester_cache: dict[tuple[int, str], Semester] = {}
         self._student_cache: dict[tuple[str, str, str, str, str], Student] = {}
+        self._enrolled_student_ids: set[str] = set()
+        self._students_to_link: list[Student] = []
         self._batch_number: int | None = None
+        self._run: IngestionRun | None = None
 
     @transaction.atomic
     @implements
     def execute(self, models: Sequence[DeduplicatedCourse]) -> None:
+        self._enrolled_student_ids.clear()
+        self._preload()
+        if self.change_detector is not None:
+            models = self.change_detector.filter_changed(models)
         self.tracker.start(len(models))
 
         try:
@@ -120,8 +146,19 @@ class CourseDbInjector(IDbInjector):
             self.tracker.fail(str(e))
             raise e
 
+        if self.change_detector is not None:
+            self.change_detector.save()
         self.tracker.complete()
+        student_ids = frozenset(self._enrolled_student_ids)
+        if self._run is not None:
+            # the batch has committed (or is part of the run's transaction); finish_run applies it
+            self._run.record_batch(len(models), student_ids)
+            return
+
         self._invalidate_cache()
+        # readers must not re-cache the old data before the batch commits
+        transaction.on_commit(lambda: self._invalidate_student_enrollments(student_ids))
+        transaction.on_commit(self._invalidate_reference_data)
 
     def reset_state(self) -> None:
         self._reset_caches()
@@ -132,6 +169,37 @@ class CourseDbInjector(IDbInjector):
         if hasattr(self.tracker, "set_batch_number"):
             self.tracker.set_batch_number(batch_number)
 
+    def begin_run(self, run: IngestionRun) -> None:
+        """Defers cache invalidation of every following batch to finish_run()."""
+        self._run = run
+
+    def finish_run(self) -> IngestionRunSummary:
+        """Applies the run's side effects once, after the enclosing transaction (if any) commits."""
+        if self._run is None:
+            raise RuntimeError("No ingestion run in progress; call begin_run() first")
+
+        run, self._run = self._run, None
+        if self.change_detector is not None:
+            run.record_changes(self.change_detector.counts)
+        transaction.on_commit(lambda: self._apply_run_effects(run))
+        return run.summary()
+
+    def _apply_run_effects(self, run: IngestionRun) -> None:
+        if not run.batches:
+            return
+
+        self._invalidate_cache()
+        self._invalidate_student_enrollments(frozenset(run.student_ids))
+        self._invalidate_reference_data()
+        for namespace in (
+            COURSES_LIST_NAMESPACE,
+            ANALYTICS_LIST_NAMESPACE,
+            FILTER_OPTIONS_NAMESPACE,
+        ):
+            self.cache_manager.bump_version(namespace)
+
+        logger.info("ingestion_run_side_effects_applied", run_id=run.run_id, batches=run.batches)
+
     def _invalidate_cache(self) -> None:
         patterns = [
             COURSE_PATTERN,
@@ -143,6 +211,16 @@ class CourseDbInjector(IDbInjector):
 
         logger.info("cache_invalidated_after_ingestion", patterns=patterns)
 
+    def _invalidate_student_enrollments(self, student_ids: frozenset[str]) -> None:
+        for student_id in student_ids:
+            self.cache_manager.bump_version(student_enrollments_namespace(student_id))
+
+        logger.info("student_enrollments_invalidated", students=len(student_ids))
+
+    def _invalidate_reference_data(self) -> None:
+        version = self.cache_manager.bump_version(REFERENCE_DATA_NAMESPACE)
+        logger.info("reference_data_invalidated", version=version)
+
     def _reset_caches(self) -> None:
         self._faculty_cache.clear()
         self._department_cache.clear()
@@ -150,6 +228,23 @@ class CourseDbInjector(IDbInjector):
         self._speciality_cache.clear()
         self._semester_cache.clear()
         self._student_cache.clear()
+        if self.identity_map is not None:
+            self.identity_map.clear()
+        if self.change_detector is not None:
+            self.change_detector.clear()
+
+    def _preload(self) -> None:
+        # once per run: reset_state() clears the map, the first batch reloads it
+        if self.change_detector is not None and not self.change_detector.loaded:
+            self.change_detector.load()
+        if self.identity_map is None or self.identity_map.loaded:
+            return
+
+        self.identity_map.load()
+        self._faculty_cache.update(self.identity_map.faculties)
+        self._department_cache.update(self.identity_map.departments)
+        self._speciality_cache.update(self.identity_map.specialities)
+        self._semester_cache.update(self.identity_map.semesters)
 
     def _inject_to_db(self, models: Sequence[DeduplicatedCourse]) -> None:
         for course_data in models:
@@ -158,9 +253,13 @@ class CourseDbInjector(IDbInjector):
             course = self._process_course(course_data, faculty)
             self._process_specialities(course, course_data)
             self._process_offerings(course, course_data)
+        self._link_students_to_users(self._students_to_link)
+        self._students_to_link.clear()
 
     def _process_faculty(self, course_data: DeduplicatedCourse) -> Faculty:
-        faculty_name = course_data.faculty
+        return self._get_or_create_faculty(course_data.faculty)
+
+    def _get_or_create_faculty(self, faculty_name: str) -> Faculty:
         cached = self._faculty_cache.get(faculty_name)
         if cached:
             return cached
@@ -176,6 +275,26 @@ class CourseDbInjector(IDbInjector):
         return faculty
 
     def _process_course(self, course_data: DeduplicatedCourse, faculty: Faculty) -> Course:
+        department = self._get_or_create_department(course_data, faculty)
+        course_key = self._course_key(course_data, department)
+        course = self._course_cache.get(course_key)
+        if not course:
+            course_input = self._build_course_input(course_data, department, faculty)
+            if self.identity_map is not None:
+                [course] = self.course_repository.bulk_get_or_upsert(
+                    [course_input],
+                    candidates=self.identity_map.course_candidates([course_input]),
+                )
+                self.identity_map.add_courses([course])
+            else:
+                course, _ = self.course_repository.get_or_upsert(course_input, return_model=True)
+            self._course_cache[course_key] = course
+
+        return course
+
+    def _get_or_create_department(
+        self, course_data: DeduplicatedCourse, faculty: Faculty
+    ) -> Department:
         department_key = (course_data.department, faculty.name)
         department = self._department_cache.get(department_key)
         if not department:
@@ -188,30 +307,29 @@ class CourseDbInjector(IDbInjector):
                 return_model=True,
             )
             self._department_cache[department_key] = department
+        return department
 
+    def _course_key(
+        self, course_data: DeduplicatedCourse, department: Department
+    ) -> tuple[str, str, str]:
         course_level = course_data.education_level.value if course_data.education_level else ""
-        course_key = (course_data.title, department.name, course_level)
-        course = self._course_cache.get(course_key)
-        if not course:
-            course_dto = CourseInput(
-                title=course_data.title,
-                description=course_data.description or "",
-                status=CourseStatus(course_data.status.value),
-                education_level=EducationLevel(course_data.education_level.value)
-                if course_data.education_level
-                else None,
-                department=str(department.id),
-                department_name=department.name,
-                faculty=str(faculty.id),
-                faculty_name=faculty.name,
-            )
-            course, _ = self.course_repository.get_or_upsert(
-                course_dto,
-                return_model=True,
-            )
-            self._course_cache[course_key] = course
-
-        return course
+        return (course_data.title, department.name, course_level)
+
+    def _build_course_input(
+        self, course_data: DeduplicatedCourse, department: Department, faculty: Faculty
+    ) -> CourseInput:
+        return CourseInput(
+            title=course_data.title,
+            description=course_data.description or "",
+            status=CourseStatus(course_data.status.value),
+            education_level=EducationLevel(course_data.education_level.value)
+            if course_data.education_level
+            else None,
+            department=str(department.id),
+            department_name=department.name,
+            faculty=str(faculty.id),
+            faculty_name=faculty.name,
+        )
 
     def _process_specialities(
         self,
@@ -219,30 +337,7 @@ class CourseDbInjector(IDbInjector):
         course_data: DeduplicatedCourse,
     ) -> None:
         for spec_data in course_data.specialities:
-            speciality_dto = self.speciality_repository.get_by_name(name=spec_data.name)
-            if not speciality_dto:
-                speciality_faculty_dto = FacultyInput(
-                    name=spec_data.faculty,
-                )
-                speciality_faculty, _ = self.faculty_repository.get_or_create(
-                    speciality_faculty_dto,
-                    return_model=True,
-                )
-                speciality_dto_new = SpecialityInput(
-                    name=spec_data.name,
-                    faculty_id=speciality_faculty.id,
-                )
-                speciality, _ = self.speciality_repository.get_or_create(
-                    speciality_dto_new,
-                    return_model=True,
-                )
-                self._speciality_cache[spec_data.name] = speciality
-            else:
-                # Get ORM model from cache or fetch it
-                speciality = self._speciality_cache.get(spec_data.name)
-                if not speciality:
-                    speciality = Speciality.objects.get(id=speciality_dto.id)
-                    self._speciality_cache[spec_data.name] = speciality
+            self._cache_course_speciality(spec_data)
             if spec_data.type_kind is None:
                 logger.warning(
                     "injector.skipping_speciality_unknown_type_kind",
@@ -250,6 +345,23 @@ class CourseDbInjector(IDbInjector):
                     speciality=spec_data.name,
                 )
 
+    def _cache_course_speciality(self, spec_data: DeduplicatedSpeciality) -> None:
+        if self._speciality_cache.get(spec_data.name) is None:
+            self._speciality_cache[spec_data.name] = self._resolve_course_speciality(spec_data)
+
+    def _resolve_course_speciality(self, spec_data: DeduplicatedSpeciality) -> Speciality:
+        speciality_dto = self.speciality_repository.get_by_name(name=spec_data.name)
+        if speciality_dto:
+            # Fetch ORM model for M2M operations
+            return Speciality.objects.get(id=speciality_dto.id)
+
+        faculty = self._get_or_create_faculty(spec_data.faculty)
+        speciality, _ = self.speciality_repository.get_or_create(
+            SpecialityInput(name=spec_data.name, faculty_id=faculty.id),
+            return_model=True,
+        )
+        return speciality
+
     def _process_offerings(
         self,
         course: Course,
@@ -287,20 +399,35 @@ class CourseDbInjector(IDbInjector):
         course: Course,
         offering_data: DeduplicatedCourseOffering,
     ) -> CourseOffering:
-        semester_key = (offering_data.semester.year, offering_data.semester.term.value)
+        semester = self._get_or_create_semester(offering_data.semester)
+        course_offering, _ = self.course_offering_repository.get_or_upsert(
+            self._build_offering_input(course, offering_data, semester),
+            return_model=True,
+        )
+        return course_offering
+
+    def _get_or_create_semester(self, semester_data: DeduplicatedSemester) -> Semester:
+        semester_key = (semester_data.year, semester_data.term.value)
         semester = self._semester_cache.get(semester_key)
         if not semester:
             semester_dto = SemesterInput(
-                year=offering_data.semester.year,
-                term=offering_data.semester.term.value,
+                year=semester_data.year,
+                term=semester_data.term.value,
             )
             semester, _ = self.semester_repository.get_or_create(
                 semester_dto,
                 return_model=True,
             )
             self._semester_cache[semester_key] = semester
+        return semester
 
-        offering_dto = CourseOfferingInput(
+    def _build_offering_input(
+        self,
+        course: Course,
+        offering_data: DeduplicatedCourseOffering,
+        semester: Semester,
+    ) -> CourseOfferingInput:
+        return CourseOfferingInput(
             code=offering_data.code,
             course_id=course.id,
             semester_id=semester.id,
@@ -318,47 +445,33 @@ class CourseDbInjector(IDbInjector):
             group_size_min=offering_data.group_size_min,
             group_size_max=offering_data.group_size_max,
         )
-        course_offering, _ = self.course_offering_repository.get_or_upsert(
-            offering_dto,
-            return_model=True,
-        )
-        return course_offering
 
     def _process_offering_terms(
         self,
         offering: CourseOffering,
-        terms: Sequence,
+        terms: Sequence[DeduplicatedCourseOfferingTerm],
     ) -> None:
         for term_data in terms:
-            semester_key = (term_data.semester.year, term_data.semester.term.value)
-            semester = self._semester_cache.get(semester_key)
-            if not semester:
-                semester_dto = SemesterInput(
-                    year=term_data.semester.year,
-                    term=term_data.semester.term.value,
-                )
-                semester, _ = self.semester_repository.get_or_create(
-                    semester_dto,
-                    return_model=True,
-                )
-                self._semester_cache[semester_key] = semester
-
-            practice_type = (
-                PracticeType(term_data.practice_type.value) if term_data.practice_type else ""
-            )
+            semester = self._get_or_create_semester(term_data.semester)
             CourseOfferingTerm.objects.update_or_create(
                 offering=offering,
                 semester=semester,
-                defaults={
-                    "credits": Decimal(str(term_data.credits)),
-                    "weekly_hours": term_data.weekly_hours,
-                    "exam_type": ExamType(term_data.exam_type.value),
-                    "lecture_count": term_data.lecture_count,
-                    "practice_count": term_data.practice_count,
-                    "practice_type": practice_type,
-                },
+                defaults=self._build_term_defaults(term_data),
             )
 
+    def _build_term_defaults(self, term_data: DeduplicatedCourseOfferingTerm) -> dict[str, Any]:
+        practice_type = (
+            PracticeType(term_data.practice_type.value) if term_data.practice_type else ""
+        )
+        return {
+            "credits": Decimal(str(term_data.credits)),
+            "weekly_hours": term_data.weekly_hours,
+            "exam_type": ExamType(term_data.exam_type.value),
+            "lecture_count": term_data.lecture_count,
+            "practice_count": term_data.practice_count,
+            "practice_type": practice_type,
+        }
+
     def _process_enrollments(
         self,
         course_offering: CourseOffering,
@@ -375,69 +488,95 @@ class CourseDbInjector(IDbInjector):
                 status=enrollment_data.status.value,
             )
             self.enrollment_repository.get_or_upsert(enrollment_input)
+            self._enrolled_student_ids.add(str(student.id))
 
     def _create_student(self, student_data: DeduplicatedStudent) -> Student | None:
-        if not student_data.speciality:
-            return None
-
-        student_speciality = self._get_or_create_speciality(student_data.speciality)
+        student_speciality = self._get_student_speciality(student_data)
         if not student_speciality:
             return None
 
-        education_level = ""
-        if student_data.education_level:
-            education_level = EducationLevel(student_data.education_level)
-
-        key = (
-            ("email", student_data.email.lower(), "", "", "")
-            if student_data.email
-            else (
-                student_data.first_name,
-                student_data.last_name,
-                student_data.patronymic or "",
-                str(education_level),
-                student_speciality.name,
-            )
-        )
+        key = self._student_key(student_data, student_speciality)
         cached = self._student_cache.get(key)
         if cached:
             self._merge_cached_program_start(cached, student_data.program_start_academic_year_start)
             return cached
 
-        student_input = StudentInput(
+        student_input = self._build_student_input(student_data, student_speciality)
+        if self.identity_map is not None:
+            [(student, created)] = self.student_repository.bulk_get_or_upsert(
+                [student_input],
+                candidates=self.identity_map.student_candidates([student_input]),
+            )
+            self.identity_map.index_students([student])
+        else:
+            student, created = self.student_repository.get_or_upsert(
+                student_input, return_model=True
+            )
+
+        if created or (student_data.email and student.user_id is None):
+            self._students_to_link.append(student)
+
+        self._student_cache[key] = student
+        return student
+
+    def _link_students_to_users(self, students: Sequence[Student]) -> None:
+        # once per batch, after its students are written
+        if students:
+            self.student_service.link_students_to_users(students)
+
+    def _get_student_speciality(self, student_data: DeduplicatedStudent) -> Speciality | None:
+        if not student_data.speciality:
+            return None
+        return self._get_or_create_speciality(student_data.speciality)
+
+    def _student_key(
+        self, student_data: DeduplicatedStudent, speciality: Speciality
+    ) -> tuple[str, str, str, str, str]:
+        if student_data.email:
+            return ("email", student_data.email.lower(), "", "", "")
+        return (
+            student_data.first_name,
+            student_data.last_name,
+            student_data.patronymic or "",
+            str(self._student_education_level(student_data)),
+            speciality.name,
+        )
+
+    def _build_student_input(
+        self, student_data: DeduplicatedStudent, speciality: Speciality
+    ) -> StudentInput:
+        return StudentInput(
             first_name=student_data.first_name,
             last_name=student_data.last_name,
             patronymic=student_data.patronymic or "",
-            education_level=education_level,
-            speciality_id=student_speciality.id,
+            education_level=self._student_education_level(student_data),
+            speciality_id=speciality.id,
             email=student_data.email or "",
             program_start_academic_year_start=student_data.program_start_academic_year_start,
         )
-        student, created = self.student_repository.get_or_upsert(
-            student_input,
-            return_model=True,
-        )
-
-        if created or (student_data.email and not student.user):
-            student_dto = self.student_mapper.process(student)
-            self.student_service.link_student_to_user(student_dto)
 
-        self._student_cache[key] = student
-        return student
+    def _student_education_level(self, student_data: DeduplicatedStudent) -> EducationLevel | str:
+        if student_data.education_level:
+            return EducationLevel(student_data.education_level)
+        return ""
 
     def _merge_cached_program_start(self, student: Student, incoming_year: int | None) -> None:
+        if self._merge_program_start(student, incoming_year):
+            student.save(update_fields=["program_start_academic_year_start"])
+
+    def _merge_program_start(self, student: Student, incoming_year: int | None) -> bool:
         if incoming_year is None:
-            return
+            return False
         existing_year = student.program_start_academic_year_start
         if existing_year is not None and existing_year <= incoming_year:
-            return
+            return False
         student.program_start_academic_year_start = incoming_year
-        student.save(update_fields=["program_start_academic_year_start"])
+        return True
 
     def _get_or_create_speciality(self, speciality_name: str) -> Speciality | None:
-        cached = self._speciality_cache.get(speciality_name)
-        if cached is not None:
-            return cached
+        # a cached None is a speciality known to be unresolvable
+        if speciality_name in self._speciality_cache:
+            return self._speciality_cache[speciality_name]
 
         speciality_dto = self.speciality_repository.get_by_name(name=speciality_name)
         if speciality_dto:
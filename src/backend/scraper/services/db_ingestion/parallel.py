@@ -0,0 +1,239 @@
+import multiprocessing
+import zlib
+from collections.abc import Callable, Generator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+import django
+from django.db import connections, transaction
+
+import structlog
+from structlog.contextvars import bound_contextvars
+
+from rating_app.application_schemas.ingestion import ChangeCounts, UpsertCounts
+from rating_app.models import Student
+
+from ...models.deduplicated import DeduplicatedCourse
+from .bulk_injector import BulkCourseDbInjector, _BatchPlan
+from .composite import CoursesIngestion
+from .file_reader import IFileReader
+from .ingestion_run import IngestionRun
+from .progress_tracker import InjectionProgressSummary
+
+logger = structlog.get_logger(__name__)
+
+StudentKey = tuple[str, str, str, str, str]
+
+
+def partition_of(course: DeduplicatedCourse, workers: int) -> int:
+    """
+    Stable worker index for a course. Courses of one department always land on the
+    same worker, so no two workers write the same course or offering rows.
+    """
+    key = f"{course.faculty}\x1f{course.department}".encode()
+    return zlib.crc32(key) % workers
+
+
+class ParallelCourseDbInjector(BulkCourseDbInjector):
+    """
+    Bulk injector split into the two passes of a parallel run.
+
+    resolve_shared() runs serially over the whole file and writes the rows every
+    worker depends on: faculties, departments, specialities, semesters and students.
+    Workers are then handed the resolved student ids, so students (who enrol across
+    departments) are only looked up, never written concurrently.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._student_ids: Mapping[StudentKey, UUID] | None = None
+
+    @transaction.atomic
+    def resolve_shared(self, models: Sequence[DeduplicatedCourse]) -> None:
+        self._preload()
+        enrollments = []
+        for course_data in models:
+            faculty = self._process_faculty(course_data)
+            self._get_or_create_department(course_data, faculty)
+            for spec_data in course_data.specialities:
+                self._cache_course_speciality(spec_data)
+
+            for offering_data in course_data.offerings:
+                self._get_or_create_semester(offering_data.semester)
+                for term_data in offering_data.terms:
+                    self._get_or_create_semester(term_data.semester)
+                for enrollment_data in offering_data.enrollments:
+                    speciality = self._get_student_speciality(enrollment_data.student)
+                    if speciality:
+                        enrollments.append((offering_data.code, enrollment_data, speciality))
+
+        self._upsert_students(_BatchPlan(enrollments=enrollments))
+
+    @property
+    def student_ids(self) -> dict[StudentKey, UUID]:
+        return {key: student.pk for key, student in self._student_cache.items()}
+
+    def use_student_ids(self, student_ids: Mapping[StudentKey, UUID]) -> None:
+        self._student_ids = student_ids
+
+    def _upsert_students(
+        self, plan: _BatchPlan, counts: UpsertCounts | None = None
+    ) -> list[Student]:
+        if self._student_ids is None:
+            return super()._upsert_students(plan, counts)
+
+        keys = [
+            self._student_key(enrollment_data.student, speciality)
+            for _, enrollment_data, speciality in plan.enrollments
+        ]
+        missing = [key for key in keys if key not in self._student_ids]
+        if missing:
+            raise RuntimeError(f"{len(missing)} students were not resolved by the first pass")
+        # enrollments only need the id
+        return [Student(pk=self._student_ids[key]) for key in keys]
+
+
+@dataclass(frozen=True)
+class _PartitionTask:
+    file_path: Path
+    batch_size: int
+    partition: int
+    workers: int
+    file_reader: IFileReader[DeduplicatedCourse]
+    injector_factory: Callable[[], ParallelCourseDbInjector]
+    student_ids: Mapping[StudentKey, UUID]
+    run_id: str
+
+
+def _partition_batches(task: _PartitionTask) -> Generator[list[DeduplicatedCourse], None, None]:
+    batch: list[DeduplicatedCourse] = []
+    for read_batch in task.file_reader.provide(task.file_path, task.batch_size):
+        for course in read_batch:
+            if partition_of(course, task.workers) != task.partition:
+                continue
+            batch.append(course)
+            if len(batch) >= task.batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _ingest_partition(
+    task: _PartitionTask,
+) -> tuple[InjectionProgressSummary, dict[str, ChangeCounts]]:
+    """Worker entry point: each batch commits in its own transaction on the worker's connection."""
+    injector = task.injector_factory()
+    injector.reset_state()
+    injector.use_student_ids(task.student_ids)
+    # side effects are applied once by the parent for the whole run
+    injector.begin_run(IngestionRun(task.run_id))
+    for batch_number, batch in enumerate(_partition_batches(task), start=1):
+        injector.set_batch_number(batch_number)
+        try:
+            injector.execute(batch)
+        except Exception as e:
+            logger.error(
+                "parallel_ingestion_partition_failed",
+                partition=task.partition,
+                batch_number=batch_number,
+                error=str(e),
+            )
+            break
+    changes = injector.change_detector.counts if injector.change_detector else {}
+    return injector.tracker.summary(), changes
+
+
+class ParallelCoursesIngestion(CoursesIngestion):
+    """
+    Ingests a file with several worker processes. The shared rows are resolved
+    serially first, then each worker re-reads the file and writes its own partition
+    of departments. Per-worker progress is merged into one report at the end.
+    """
+
+    def __init__(
+        self,
+        file_reader: IFileReader[DeduplicatedCourse],
+        db_injector: ParallelCourseDbInjector,
+        injector_factory: Callable[[], ParallelCourseDbInjector],
+        workers: int,
+    ):
+        super().__init__(file_reader, db_injector)
+        self.shared_injector = db_injector
+        self.injector_factory = injector_factory
+        self.workers = workers
+        self.last_summary = InjectionProgressSummary()
+
+    def execute(self, file_path: Path, batch_size: int = 100, dry_run: bool = False) -> None:
+        if dry_run:
+            super().execute(file_path, batch_size, dry_run=True)
+            return
+
+        run = IngestionRun()
+        with bound_contextvars(ingestion_run_id=run.run_id):
+            self._execute_run(run, Path(file_path), batch_size)
+
+    def _execute_run(self, run: IngestionRun, file_path: Path, batch_size: int) -> None:
+        student_ids = self._resolve_shared(file_path, batch_size)
+        self.shared_injector.begin_run(run)
+        tasks = [
+            _PartitionTask(
+                file_path=file_path,
+                batch_size=batch_size,
+                partition=partition,
+                workers=self.workers,
+                file_reader=self.file_reader,
+                injector_factory=self.injector_factory,
+                student_ids=student_ids,
+                run_id=run.run_id,
+            )
+            for partition in range(self.workers)
+        ]
+        try:
+            results = self._run_workers(tasks)
+            summaries = [summary for summary, _ in results]
+            self.last_summary = sum(summaries, InjectionProgressSummary())
+            for _, changes in results:
+                run.record_changes(changes)
+            # every resolved student may have new enrollments in a committed partition
+            run.record_batch(
+                self.last_summary.processed_courses,
+                (str(student_id) for student_id in student_ids.values()),
+                batches=self.last_summary.completed_batches,
+            )
+        finally:
+            self.last_run = self.shared_injector.finish_run()
+
+        logger.info(
+            "parallel_ingestion_completed",
+            workers=self.workers,
+            processed_courses=self.last_summary.processed_courses,
+            completed_batches=self.last_summary.completed_batches,
+            failed_batches=self.last_summary.failed_batches,
+            per_worker=[summary.processed_courses for summary in summaries],
+        )
+        if self.last_summary.failed_batches:
+            # the other partitions are committed; a re-run upserts the failed ones
+            raise RuntimeError(f"{self.last_summary.failed_batches} batches failed to ingest")
+
+    def _resolve_shared(self, file_path: Path, batch_size: int) -> dict[StudentKey, UUID]:
+        self.shared_injector.reset_state()
+        for batch in self.file_reader.provide(file_path, batch_size):
+            self.shared_injector.resolve_shared(batch)
+
+        student_ids = self.shared_injector.student_ids
+        logger.info("parallel_ingestion_shared_rows_resolved", students=len(student_ids))
+        return student_ids
+
+    def _run_workers(
+        self, tasks: list[_PartitionTask]
+    ) -> list[tuple[InjectionProgressSummary, dict[str, ChangeCounts]]]:
+        # workers open their own connections; never hand them the parent's sockets
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=len(tasks), mp_context=context, initializer=django.setup
+        ) as executor:
+            return list(executor.map(_ingest_partition, tasks))
@@ -1,8 +1,26 @@
+from dataclasses import dataclass
+
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class InjectionProgressSummary:
+    """Run totals of one tracker; summaries of parallel workers add up."""
+
+    processed_courses: int = 0
+    completed_batches: int = 0
+    failed_batches: int = 0
+
+    def __add__(self, other: "InjectionProgressSummary") -> "InjectionProgressSummary":
+        return InjectionProgressSummary(
+            processed_courses=self.processed_courses + other.processed_courses,
+            completed_batches=self.completed_batches + other.completed_batches,
+            failed_batches=self.failed_batches + other.failed_batches,
+        )
+
+
 class InjectionProgressTracker:
     LOG_INTERVAL = 20
 
@@ -10,6 +28,9 @@ class InjectionProgressTracker:
         self.total_courses = 0
         self.processed_courses = 0
         self.batch_number: int | None = None
+        self._committed_courses = 0
+        self._completed_batches = 0
+        self._failed_batches = 0
 
     def set_batch_number(self, batch_number: int | None) -> None:
         self.batch_number = batch_number
@@ -44,14 +65,24 @@ class InjectionProgressTracker:
             percentage=percentage,
             batch_number=self.batch_number,
         )
+        self._committed_courses += processed
+        self._completed_batches += 1
         self.reset()
 
     def fail(self, error: str) -> None:
         logger.error(
             "injection_failed", error=error, processed_before_failure=self.processed_courses
         )
+        self._failed_batches += 1
         self.reset()
 
+    def summary(self) -> InjectionProgressSummary:
+        return InjectionProgressSummary(
+            processed_courses=self._committed_courses,
+            completed_batches=self._completed_batches,
+            failed_batches=self._failed_batches,
+        )
+
     def reset(self) -> None:
         self.total_courses = 0
         self.processed_courses = 0
@@ -0,0 +1,343 @@
+import csv
+import io
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+from django.db import connection, models, transaction
+
+import structlog
+
+from rating_app.application_schemas.ingestion import UpsertCounts
+from rating_app.models import (
+    CourseOffering,
+    CourseOfferingSpeciality,
+    CourseOfferingTerm,
+    Enrollment,
+    Student,
+)
+
+from ...models.deduplicated import DeduplicatedCourse
+from .bulk_injector import _TERM_UPDATE_FIELDS, BulkCourseDbInjector, _BatchPlan
+from .composite import CoursesIngestion
+from .file_reader import IFileReader
+
+logger = structlog.get_logger(__name__)
+
+_SEQ_COLUMN = "stage_seq"
+_OFFERING_CODE_COLUMN = "stage_offering_code"
+# COPY csv marks NULL explicitly so that empty strings stay empty strings
+_COPY_NULL = r"\N"
+
+
+@dataclass(frozen=True)
+class _StagedTable:
+    """A merge target: the fields copied into it and the unique key it conflicts on."""
+
+    name: str
+    model: type[models.Model]
+    fields: tuple[str, ...]
+    unique_fields: tuple[str, ...]
+    update_fields: tuple[str, ...]
+    # dependents are staged by offering code and get the offering id after offerings merge
+    by_offering_code: bool = False
+
+    def column(self, field_name: str) -> str:
+        return self.model._meta.get_field(field_name).column  # type: ignore[union-attr]
+
+
+_OFFERINGS = _StagedTable(
+    name="offerings",
+    model=CourseOffering,
+    fields=(
+        "id",
+        "code",
+        "course",
+        "semester",
+        "exam_type",
+        "practice_type",
+        "credits",
+        "weekly_hours",
+        "study_year",
+        "lecture_count",
+        "practice_count",
+        "max_students",
+        "max_groups",
+        "group_size_min",
+        "group_size_max",
+    ),
+    unique_fields=("code",),
+    update_fields=(
+        "course",
+        "semester",
+        "exam_type",
+        "practice_type",
+        "credits",
+        "weekly_hours",
+        "study_year",
+        "lecture_count",
+        "practice_count",
+        "max_students",
+        "max_groups",
+        "group_size_min",
+        "group_size_max",
+    ),
+)
+_OFFERING_TERMS = _StagedTable(
+    name="offering_terms",
+    model=CourseOfferingTerm,
+    fields=("id", "offering", "semester", *_TERM_UPDATE_FIELDS),
+    unique_fields=("offering", "semester"),
+    update_fields=tuple(_TERM_UPDATE_FIELDS),
+    by_offering_code=True,
+)
+_OFFERING_SPECIALITIES = _StagedTable(
+    name="offering_specialities",
+    model=CourseOfferingSpeciality,
+    fields=("id", "offering", "speciality", "type_kind"),
+    unique_fields=("offering", "speciality"),
+    update_fields=("type_kind",),
+    by_offering_code=True,
+)
+_ENROLLMENTS = _StagedTable(
+    name="enrollments",
+    model=Enrollment,
+    fields=("id", "student", "offering", "status", "enrolled_at"),
+    unique_fields=("student", "offering"),
+    update_fields=("status",),
+    by_offering_code=True,
+)
+# merge order: dependents need the offering ids
+_STAGED_TABLES = (_OFFERINGS, _OFFERING_TERMS, _OFFERING_SPECIALITIES, _ENROLLMENTS)
+
+
+class _StagingTables:
+    """
+    Temporary tables shaped like the merge targets, loaded with COPY on PostgreSQL
+    (plain inserts elsewhere) and merged with one INSERT ... SELECT ... ON CONFLICT
+    per target. They are created inside the caller's transaction, so a rollback
+    discards them with everything else.
+    """
+
+    def __init__(self) -> None:
+        self._seq = count(1)
+        self._use_copy = connection.vendor == "postgresql"
+
+    def create(self) -> None:
+        with connection.cursor() as cursor:
+            for table in _STAGED_TABLES:
+                columns = ", ".join(self._quoted_columns(table))
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {self._stage_name(table)} AS "
+                    f"SELECT {columns}, CAST(NULL AS bigint) AS {_SEQ_COLUMN}, "
+                    f"CAST(NULL AS varchar(6)) AS {_OFFERING_CODE_COLUMN} "
+                    f"FROM {self._quote(table.model._meta.db_table)} WHERE 1 = 0"
+                )
+
+    def drop(self) -> None:
+        with connection.cursor() as cursor:
+            for table in _STAGED_TABLES:
+                cursor.execute(f"DROP TABLE IF EXISTS {self._stage_name(table)}")
+
+    def load(self, table: _StagedTable, rows: Sequence[tuple[models.Model, str | None]]) -> None:
+        """Stages unsaved models in arrival order; the last row for a unique key wins."""
+        if not rows:
+            return
+
+        fields = [table.model._meta.get_field(name) for name in table.fields]
+        values = [
+            [
+                field.get_db_prep_save(field.pre_save(obj, add=True), connection)  # type: ignore[union-attr]
+                for field in fields
+            ]
+            + [next(self._seq), offering_code]
+            for obj, offering_code in rows
+        ]
+        columns = [*self._quoted_columns(table), _SEQ_COLUMN, _OFFERING_CODE_COLUMN]
+        stage = self._stage_name(table)
+
+        with connection.cursor() as cursor:
+            if self._use_copy:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in values:
+                    writer.writerow(_COPY_NULL if value is None else value for value in row)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {stage} ({', '.join(columns)}) FROM STDIN "
+                    f"WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                    buffer,
+                )
+            else:
+                placeholders = ", ".join(["%s"] * len(columns))
+                cursor.executemany(
+                    f"INSERT INTO {stage} ({', '.join(columns)}) VALUES ({placeholders})",
+                    values,
+                )
+
+    def merge(self, table: _StagedTable) -> UpsertCounts:
+        target = self._quote(table.model._meta.db_table)
+        stage = self._stage_name(table)
+        pk = self._quote(table.model._meta.pk.column)  # type: ignore[union-attr]
+        columns = self._quoted_columns(table)
+        unique = [self._quote(table.column(name)) for name in table.unique_fields]
+        updates = [self._quote(table.column(name)) for name in table.update_fields]
+
+        with connection.cursor() as cursor:
+            if table.by_offering_code:
+                offering_column = self._quote(table.column("offering"))
+                cursor.execute(
+                    f"UPDATE {stage} SET {offering_column} = ("
+                    f"SELECT o.{self._quote(CourseOffering._meta.pk.column)} "  # type: ignore[union-attr]
+                    f"FROM {self._quote(CourseOffering._meta.db_table)} o "
+                    f"WHERE o.{self._quote(_OFFERINGS.column('code'))} = "
+                    f"{stage}.{_OFFERING_CODE_COLUMN})"
+                )
+
+            latest = (
+                f"{_SEQ_COLUMN} IN (SELECT MAX({_SEQ_COLUMN}) FROM {stage} "
+                f"GROUP BY {', '.join(unique)})"
+            )
+            changed = " OR ".join(f"t.{col} IS DISTINCT FROM s.{col}" for col in updates)
+            cursor.execute(
+                f"SELECT COUNT(*), "
+                f"COALESCE(SUM(CASE WHEN t.{pk} IS NULL THEN 1 ELSE 0 END), 0), "
+                f"COALESCE(SUM(CASE WHEN t.{pk} IS NOT NULL AND ({changed}) THEN 1 ELSE 0 END), 0) "
+                f"FROM {stage} s LEFT JOIN {target} t ON "
+                + " AND ".join(f"t.{col} = s.{col}" for col in unique)
+                + f" WHERE s.{latest}"
+            )
+            row = cursor.fetchone()
+            assert row is not None
+            staged, inserted, updated = (int(value) for value in row)
+
+            # the WHERE on DO UPDATE skips rows that would not change
+            cursor.execute(
+                f"INSERT INTO {target} ({', '.join(columns)}) "
+                f"SELECT {', '.join(columns)} FROM {stage} WHERE {latest} "
+                f"ON CONFLICT ({', '.join(unique)}) DO UPDATE SET "
+                + ", ".join(f"{col} = EXCLUDED.{col}" for col in updates)
+                + " WHERE "
+                + " OR ".join(f"{target}.{col} IS DISTINCT FROM EXCLUDED.{col}" for col in updates)
+            )
+
+        return UpsertCounts(
+            inserted=inserted,
+            updated=updated,
+            unchanged=staged - inserted - updated,
+        )
+
+    def _stage_name(self, table: _StagedTable) -> str:
+        return self._quote(f"staging_{table.name}")
+
+    def _quoted_columns(self, table: _StagedTable) -> list[str]:
+        return [self._quote(table.column(name)) for name in table.fields]
+
+    def _quote(self, name: str) -> str:
+        return connection.ops.quote_name(name)
+
+
+class StagingCourseDbInjector(BulkCourseDbInjector):
+    """
+    Full-catalog variant of the bulk injector. Batches are resolved as in the bulk
+    path, but offerings, offering terms, offering speciality links and enrollments
+    are only staged; merge_staged() writes them with one set-based statement per
+    table once the whole file has been read.
+
+    Courses and students have no unique constraint to merge on, so they keep the
+    repositories' matching rules and are written batch by batch.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._staging: _StagingTables | None = None
+        self._counts: dict[str, UpsertCounts] = {}
+
+    def open_staging(self) -> None:
+        """Creates the staging tables; must run inside the transaction that merges."""
+        self._staging = _StagingTables()
+        self._staging.create()
+        self._counts = {"courses": UpsertCounts(), "students": UpsertCounts()}
+
+    def merge_staged(self) -> dict[str, UpsertCounts]:
+        """Merges everything staged since open_staging() and returns per-table counts."""
+        staging = self._require_staging()
+        for table in _STAGED_TABLES:
+            self._counts[table.name] = staging.merge(table)
+        staging.drop()
+        self._staging = None
+        return self._counts
+
+    def _inject_to_db(self, models: Sequence[DeduplicatedCourse]) -> None:
+        staging = self._require_staging()
+        courses = self._upsert_courses(models, self._counts["courses"])
+        plan = self._plan_batch(models, courses)
+        students = self._upsert_students(plan, self._counts["students"])
+        self._stage(staging, plan, students)
+
+    def _stage(self, staging: _StagingTables, plan: _BatchPlan, students: list[Student]) -> None:
+        staging.load(
+            _OFFERINGS,
+            [(self.course_offering_repository.to_model(item), None) for item in plan.offerings],
+        )
+        staging.load(
+            _OFFERING_TERMS,
+            [
+                (CourseOfferingTerm(semester=semester, **defaults), code)
+                for code, semester, defaults in plan.terms
+            ],
+        )
+        staging.load(
+            _OFFERING_SPECIALITIES,
+            [
+                (CourseOfferingSpeciality(speciality=speciality, type_kind=type_kind), code)
+                for code, speciality, type_kind in plan.offering_specialities
+            ],
+        )
+        staging.load(
+            _ENROLLMENTS,
+            [
+                (Enrollment(student=student, status=enrollment_data.status.value), code)
+                for (code, enrollment_data, _), student in zip(
+                    plan.enrollments, students, strict=True
+                )
+            ],
+        )
+        self._enrolled_student_ids.update(str(student.id) for student in students)
+
+    def _require_staging(self) -> _StagingTables:
+        if self._staging is None:
+            raise RuntimeError("Staging tables are not open; call open_staging() first")
+        return self._staging
+
+
+class StagedCoursesIngestion(CoursesIngestion):
+    """
+    Loads a whole catalog file through staging tables in one transaction: every
+    batch is staged, then each table is merged once and its counts are logged.
+    """
+
+    def __init__(
+        self,
+        file_reader: IFileReader[DeduplicatedCourse],
+        db_injector: StagingCourseDbInjector,
+    ):
+        super().__init__(file_reader, db_injector)
+        self.staging_injector = db_injector
+        self.last_counts: dict[str, UpsertCounts] = {}
+
+    def execute(self, file_path: Path, batch_size: int = 100, dry_run: bool = False) -> None:
+        if dry_run:
+            super().execute(file_path, batch_size, dry_run=True)
+            return
+
+        with transaction.atomic():
+            self.staging_injector.open_staging()
+            super().execute(file_path, batch_size)
+            counts = self.staging_injector.merge_staged()
+
+        self.last_counts = counts
+        for table, table_counts in counts.items():
+            logger.info("staged_ingestion_table_merged", table=table, **asdict(table_counts))
@@ -0,0 +1,287 @@
+import re
+from collections import Counter
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from rating_app.models import (
+    Course,
+    CourseOffering,
+    CourseOfferingSpeciality,
+    CourseOfferingTerm,
+    Department,
+    Enrollment,
+    Faculty,
+    Semester,
+    Speciality,
+    Student,
+)
+from rating_app.tests.factories import (
+    CourseFactory,
+    DepartmentFactory,
+    FacultyFactory,
+    StudentFactory,
+    UserFactory,
+)
+from scraper.ioc_container.common import bulk_course_db_injector, course_db_injector
+from scraper.models.deduplicated import (
+    CourseTypeKind,
+    DeduplicatedEnrollment,
+    DeduplicatedStudent,
+    EducationLevel,
+    EnrollmentStatus,
+    SemesterTerm,
+)
+from scraper.services.db_ingestion.test_injector import (
+    create_mock_course,
+    create_mock_enrollment,
+    create_mock_offering,
+    create_mock_spec,
+)
+
+
+def _student_enrollment(
+    first_name: str,
+    *,
+    email: str = "",
+    program_start: int | None = None,
+    status: EnrollmentStatus = EnrollmentStatus.ENROLLED,
+) -> DeduplicatedEnrollment:
+    return DeduplicatedEnrollment(
+        student=DeduplicatedStudent(
+            first_name=first_name,
+            last_name="Shevchenko",
+            speciality="SpecX",
+            education_level=EducationLevel.BACHELOR,
+            email=email,
+            program_start_academic_year_start=program_start,
+        ),
+        status=status,
+    )
+
+
+def _first_batch():
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    return [
+        create_mock_course(
+            title="Course A",
+            education_level=EducationLevel.BACHELOR,
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code="AAA111",
+                    specialities=[spec_x, create_mock_spec("Unknown", "Fac")],
+                    enrollments=[
+                        _student_enrollment("Ivan", program_start=2023),
+                        _student_enrollment("Olena", email="olena@ukma.edu.ua"),
+                        _student_enrollment("Taras", email="taras@ukma.edu.ua"),
+                        create_mock_enrollment(first_name="Nobody", speciality=""),
+                    ],
+                ),
+                create_mock_offering(
+                    code="AAA222",
+                    term=SemesterTerm.SPRING,
+                    year=2025,
+                    enrollments=[_student_enrollment("Ivan", program_start=2021)],
+                ),
+            ],
+        ),
+        create_mock_course(
+            title="Course B",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code="BBB111",
+                    credits=5.0,
+                    enrollments=[
+                        _student_enrollment("Olena", email="olena@ukma.edu.ua"),
+                        _student_enrollment(
+                            "Ivan", program_start=2022, status=EnrollmentStatus.DROPPED
+                        ),
+                    ],
+                ),
+                # the same code again later in the batch wins, as with update_or_create
+                create_mock_offering(code="AAA222", credits=4.0, weekly_hours=6),
+            ],
+        ),
+    ]
+
+
+def _second_batch():
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.ELECTIVE)
+    return [
+        create_mock_course(
+            title="Course A",
+            description="Updated",
+            education_level=EducationLevel.BACHELOR,
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code="AAA111",
+                    specialities=[spec_x],
+                    enrollments=[
+                        _student_enrollment("Ivan", program_start=2020),
+                        _student_enrollment("Olena", email="OLENA@ukma.edu.ua"),
+                    ],
+                )
+            ],
+        )
+    ]
+
+
+def _arrange_existing_state():
+    faculty = FacultyFactory(name="Fac")
+    department = DepartmentFactory(name="Dept", faculty=faculty)
+    # an untyped course is adopted by the first course with a level
+    CourseFactory(title="Course A", department=department, education_level="")
+    UserFactory(email="taras@ukma.edu.ua")
+    linked_user = UserFactory(email="olena@ukma.edu.ua")
+    other_speciality = Speciality.objects.create(name="Other", faculty=faculty)
+    StudentFactory(
+        first_name="Olena",
+        last_name="Old",
+        email="olena@ukma.edu.ua",
+        speciality=other_speciality,
+        user=linked_user,
+        program_start_academic_year_start=2024,
+    )
+
+
+def _snapshot() -> dict[str, list[tuple]]:
+    return {
+        "faculties": sorted(Faculty.objects.values_list("name")),
+        "departments": sorted(Department.objects.values_list("name", "faculty__name")),
+        "specialities": sorted(Speciality.objects.values_list("name", "faculty__name")),
+        "semesters": sorted(Semester.objects.values_list("year", "term")),
+        "courses": sorted(
+            Course.objects.values_list(
+                "title", "department__name", "education_level", "status", "description"
+            )
+        ),
+        "offerings": sorted(
+            CourseOffering.objects.values_list(
+                "code",
+                "course__title",
+                "semester__year",
+                "semester__term",
+                "credits",
+                "weekly_hours",
+                "exam_type",
+                "practice_type",
+                "lecture_count",
+                "practice_count",
+                "max_students",
+                "max_groups",
+                "group_size_min",
+                "group_size_max",
+            )
+        ),
+        "terms": sorted(
+            CourseOfferingTerm.objects.values_list(
+                "offering__code",
+                "semester__year",
+                "semester__term",
+                "credits",
+                "weekly_hours",
+                "exam_type",
+                "practice_type",
+                "lecture_count",
+                "practice_count",
+            )
+        ),
+        "offering_specialities": sorted(
+            CourseOfferingSpeciality.objects.values_list(
+                "offering__code", "speciality__name", "type_kind"
+            )
+        ),
+        "students": sorted(
+            Student.objects.values_list(
+                "first_name",
+                "last_name",
+                "education_level",
+                "speciality__name",
+                "email",
+                "program_start_academic_year_start",
+                "user__email",
+            ),
+            key=repr,
+        ),
+        "enrollments": sorted(
+            Enrollment.objects.values_list("student__first_name", "offering__code", "status")
+        ),
+    }
+
+
+def _ingest(injector_factory) -> dict[str, list[tuple]]:
+    with transaction.atomic():
+        _arrange_existing_state()
+        injector = injector_factory()
+        injector.set_batch_number(1)
+        injector.execute(_first_batch())
+        injector.set_batch_number(2)
+        injector.execute(_second_batch())
+        snapshot = _snapshot()
+        transaction.set_rollback(True)
+    return snapshot
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_bulk_injector_ends_in_same_state_as_row_injector():
+    # Arrange
+    expected = _ingest(course_db_injector)
+
+    # Act
+    actual = _ingest(bulk_course_db_injector)
+
+    # Assert
+    assert actual == expected
+    assert ("AAA222", "Course B") == expected["offerings"][1][:2]
+    assert ("Ivan", "Shevchenko", "BACHELOR", "SpecX", "", 2020, None) in expected["students"]
+    assert expected["courses"][0][:3] == ("Course A", "Dept", "BACHELOR")
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_bulk_injector_writes_each_table_once_per_batch():
+    # Arrange
+    FacultyFactory(name="Fac")
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    batch = [
+        create_mock_course(
+            title=f"Course {index}",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code=f"C{index:05d}",
+                    specialities=[spec_x],
+                    enrollments=[_student_enrollment(f"Student {index}")],
+                )
+            ],
+        )
+        for index in range(20)
+    ]
+    injector = bulk_course_db_injector()
+
+    # Act
+    with CaptureQueriesContext(connection) as queries:
+        injector.execute(batch)
+
+    # Assert
+    writes = Counter(
+        match.group(1)
+        for query in queries.captured_queries
+        if (match := re.match(r'(?:INSERT INTO|UPDATE) "(\w+)"', query["sql"]))
+    )
+    for model in (
+        Course,
+        CourseOffering,
+        CourseOfferingTerm,
+        CourseOfferingSpeciality,
+        Student,
+        Enrollment,
+    ):
+        assert writes[model._meta.db_table] == 1, model.__name__
+    assert Enrollment.objects.count() == 20
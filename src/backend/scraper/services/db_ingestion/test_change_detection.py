@@ -0,0 +1,132 @@
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from rating_app.application_schemas.ingestion import ChangeCounts
+from rating_app.models import CourseOffering, Enrollment
+from rating_app.tests.factories import FacultyFactory
+from scraper.ioc_container.common import courses_ingestion
+from scraper.models.deduplicated import CourseTypeKind, EducationLevel
+from scraper.services.db_ingestion.test_bulk_injector import _student_enrollment
+from scraper.services.db_ingestion.test_injector import (
+    create_mock_course,
+    create_mock_offering,
+    create_mock_spec,
+)
+
+# fingerprints and checkpoints are run bookkeeping, not catalog writes
+_WRITE = re.compile(
+    r'^(INSERT INTO|UPDATE) "rating_app_(?!ingestionfingerprint|ingestioncheckpoint)'
+)
+
+
+def _catalog(credits: float = 3.0) -> list:
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    return [
+        create_mock_course(
+            title=f"Course {index}",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code=f"C{index}A",
+                    specialities=[spec_x],
+                    enrollments=[_student_enrollment("Ivan")],
+                ),
+                create_mock_offering(code=f"C{index}B", credits=credits if index == 0 else 3.0),
+            ],
+        )
+        for index in range(3)
+    ]
+
+
+def _ingest(tmp_path, catalog: list, **options):
+    file_path = tmp_path / "courses.jsonl"
+    file_path.write_text("".join(course.model_dump_json() + "\n" for course in catalog))
+    ingestion = courses_ingestion(**options)
+    with CaptureQueriesContext(connection) as queries:
+        ingestion.execute(file_path=file_path, batch_size=2)
+    assert ingestion.last_run is not None
+    writes = [query["sql"] for query in queries.captured_queries if _WRITE.match(query["sql"])]
+    return ingestion.last_run, writes
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+@pytest.mark.parametrize("bulk", [False, True])
+def test_rerun_of_identical_scrape_writes_nothing(tmp_path, bulk):
+    # Arrange
+    FacultyFactory(name="Fac")
+    first_run, _ = _ingest(tmp_path, _catalog(), bulk=bulk)
+
+    # Act
+    run, writes = _ingest(tmp_path, _catalog(), bulk=bulk)
+
+    # Assert
+    assert first_run.changes["courses"] == ChangeCounts(new=3)
+    assert run.changes["courses"] == ChangeCounts(unchanged=3)
+    assert run.changes["offerings"] == ChangeCounts(unchanged=6)
+    assert writes == []
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_only_changed_offerings_are_written(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    _ingest(tmp_path, _catalog(credits=3.0))
+    catalog = _catalog(credits=4.0)
+    catalog[1].offerings.append(create_mock_offering(code="C1C"))
+
+    # Act
+    run, writes = _ingest(tmp_path, catalog)
+
+    # Assert
+    assert run.changes["courses"] == ChangeCounts(changed=2, unchanged=1)
+    assert run.changes["offerings"] == ChangeCounts(new=1, changed=1, unchanged=5)
+    assert CourseOffering.objects.get(code="C0B").credits == 4
+    assert CourseOffering.objects.filter(code="C1C").exists()
+    assert not any("rating_app_enrollment" in sql for sql in writes)
+    assert Enrollment.objects.count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_force_writes_unchanged_records_and_still_counts_them(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    _ingest(tmp_path, _catalog())
+
+    # Act
+    run, writes = _ingest(tmp_path, _catalog(), force=True)
+
+    # Assert
+    assert run.changes["courses"] == ChangeCounts(unchanged=3)
+    assert any("rating_app_enrollment" in sql for sql in writes)
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_same_title_at_two_education_levels_is_tracked_separately(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    catalog = [
+        create_mock_course(
+            title="Seminar",
+            education_level=level,
+            offerings=[create_mock_offering(code=f"S-{level.value}")],
+        )
+        for level in EducationLevel
+    ]
+    first_run, _ = _ingest(tmp_path, catalog)
+
+    # Act
+    run, writes = _ingest(tmp_path, catalog)
+
+    # Assert
+    assert first_run.changes["courses"] == ChangeCounts(new=2)
+    assert run.changes["courses"] == ChangeCounts(unchanged=2)
+    assert run.changes["offerings"] == ChangeCounts(unchanged=2)
+    assert writes == []
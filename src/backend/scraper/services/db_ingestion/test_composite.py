@@ -0,0 +1,76 @@
+import pytest
+
+from rating_app.application_schemas.ingestion import CheckpointPosition
+from rating_app.models import Course, IngestionCheckpoint
+from rating_app.repositories import IngestionCheckpointRepository
+from rating_app.tests.factories import FacultyFactory
+from scraper.ioc_container.common import courses_ingestion
+from scraper.services.db_ingestion.file_reader import file_fingerprint
+from scraper.services.db_ingestion.test_injector import create_mock_course
+
+
+def _write_catalog(tmp_path):
+    file_path = tmp_path / "courses.jsonl"
+    catalog = [create_mock_course(title=f"Course {index}") for index in range(3)]
+    file_path.write_text("".join(course.model_dump_json() + "\n" for course in catalog))
+    return file_path
+
+
+def _record_batches(ingestion, fail_on_batch: int | None = None) -> list[list[str]]:
+    batches: list[list[str]] = []
+    execute = ingestion.db_injector.execute
+
+    def recording_execute(models):
+        batches.append([course.title for course in models])
+        if len(batches) == fail_on_batch:
+            raise RuntimeError("database went away")
+        execute(models)
+
+    ingestion.db_injector.execute = recording_execute
+    return batches
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_resume_continues_after_the_last_committed_batch(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    file_path = _write_catalog(tmp_path)
+    failing = courses_ingestion()
+    _record_batches(failing, fail_on_batch=2)
+    with pytest.raises(RuntimeError):
+        failing.execute(file_path=file_path, batch_size=1)
+    checkpoint = IngestionCheckpointRepository().get(file_fingerprint(file_path))
+
+    resumed = courses_ingestion(resume=True)
+    batches = _record_batches(resumed)
+
+    # Act
+    resumed.execute(file_path=file_path, batch_size=1)
+
+    # Assert
+    assert checkpoint is not None
+    assert checkpoint.batch_number == 1
+    assert batches == [["Course 1"], ["Course 2"]]
+    assert Course.objects.count() == 3
+    assert not IngestionCheckpoint.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_run_without_resume_ignores_a_stale_checkpoint(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    file_path = _write_catalog(tmp_path)
+    IngestionCheckpointRepository().save(
+        file_fingerprint(file_path), str(file_path), CheckpointPosition(1, 1), "stale"
+    )
+    ingestion = courses_ingestion()
+    batches = _record_batches(ingestion)
+
+    # Act
+    ingestion.execute(file_path=file_path, batch_size=1)
+
+    # Assert
+    assert len(batches) == 3
+    assert not IngestionCheckpoint.objects.exists()
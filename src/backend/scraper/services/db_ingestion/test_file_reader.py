@@ -1,9 +1,10 @@
+import threading
 from pathlib import Path
 
 import pytest
 
 from ...models.deduplicated import CourseStatus, DeduplicatedCourse
-from .file_reader import CoursesJSONLFileReader
+from .file_reader import CoursesJSONLFileReader, file_fingerprint
 
 
 @pytest.fixture
@@ -79,3 +80,129 @@ def test_batches_by_size(
     # Assert
     assert len(batches) == 3
     assert len(batches[0]) == 2
+
+
+def test_progress_follows_byte_offsets(
+    file_reader: CoursesJSONLFileReader, tmp_path: Path, valid_course_data: DeduplicatedCourse
+):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text("".join(valid_course_data.model_dump_json() + "\n" for _ in range(4)))
+    line_size = file.stat().st_size // 4
+
+    # Act
+    offsets = [file_reader.progress.bytes_read for _ in file_reader.provide(file, batch_size=2)]
+
+    # Assert
+    assert offsets == [2 * line_size, 4 * line_size]
+    assert file_reader.progress.total_bytes == file.stat().st_size
+    assert file_reader.progress.percentage == 100.0
+
+
+def test_provide_resumes_from_start_offset(
+    file_reader: CoursesJSONLFileReader, tmp_path: Path, valid_course_data: DeduplicatedCourse
+):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text("".join(valid_course_data.model_dump_json() + "\n" for _ in range(4)))
+    line_size = file.stat().st_size // 4
+
+    # Act
+    batches = list(file_reader.provide(file, batch_size=1, start_offset=3 * line_size))
+
+    # Assert
+    assert len(batches) == 1
+    assert file_reader.progress.start_bytes == 3 * line_size
+    assert file_reader.progress.remaining_bytes == 0
+    assert file_reader.progress.percentage == 100.0
+
+
+def test_progress_percentage_covers_remaining_work(
+    file_reader: CoursesJSONLFileReader, tmp_path: Path, valid_course_data: DeduplicatedCourse
+):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text("".join(valid_course_data.model_dump_json() + "\n" for _ in range(4)))
+    line_size = file.stat().st_size // 4
+    batches = file_reader.provide(file, batch_size=1, start_offset=2 * line_size)
+
+    # Act
+    next(batches)
+
+    # Assert
+    assert file_reader.progress.remaining_bytes == line_size
+    assert file_reader.progress.percentage == 50.0
+
+
+def test_provide_rejects_offset_past_end_of_file(
+    file_reader: CoursesJSONLFileReader, tmp_path: Path, valid_course_data: DeduplicatedCourse
+):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text(valid_course_data.model_dump_json() + "\n")
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        list(file_reader.provide(file, start_offset=file.stat().st_size + 1))
+
+
+def test_file_fingerprint_follows_content(tmp_path: Path, valid_course_data: DeduplicatedCourse):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    copy = tmp_path / "copy.jsonl"
+    file.write_text(valid_course_data.model_dump_json() + "\n")
+    copy.write_bytes(file.read_bytes())
+
+    # Act
+    before = file_fingerprint(file)
+    with file.open("a") as handle:
+        handle.write(valid_course_data.model_dump_json() + "\n")
+
+    # Assert
+    assert before == file_fingerprint(copy)
+    assert before != file_fingerprint(file)
+
+
+def test_prefetch_yields_same_batches(tmp_path: Path, valid_course_data: DeduplicatedCourse):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text("\n".join(valid_course_data.model_dump_json() for _ in range(5)))
+
+    # Act
+    batches = list(CoursesJSONLFileReader(prefetch_batches=1).provide(file, batch_size=2))
+
+    # Assert
+    assert batches == list(CoursesJSONLFileReader().provide(file, batch_size=2))
+
+
+def test_prefetch_forwards_reader_errors(
+    tmp_path: Path, valid_course_data: DeduplicatedCourse, monkeypatch: pytest.MonkeyPatch
+):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text(valid_course_data.model_dump_json() + "\n")
+    file_reader = CoursesJSONLFileReader(prefetch_batches=1)
+
+    def fail(*args):
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(file_reader, "_read_course", fail)
+
+    # Act & Assert
+    with pytest.raises(OSError, match="disk went away"):
+        list(file_reader.provide(file))
+
+
+def test_prefetch_stops_when_consumer_stops(tmp_path: Path, valid_course_data: DeduplicatedCourse):
+    # Arrange
+    file = tmp_path / "courses.jsonl"
+    file.write_text("\n".join(valid_course_data.model_dump_json() for _ in range(10)))
+    batches = CoursesJSONLFileReader(prefetch_batches=1).provide(file, batch_size=1)
+
+    # Act
+    first = next(batches)
+    batches.close()
+
+    # Assert
+    assert len(first) == 1
+    assert not any(thread.name == "courses-jsonl-reader" for thread in threading.enumerate())
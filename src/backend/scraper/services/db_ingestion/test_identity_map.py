@@ -0,0 +1,149 @@
+import re
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from rating_app.application_schemas.course import CourseInput
+from rating_app.application_schemas.student import StudentInput
+from rating_app.models import (
+    Course,
+    CourseOffering,
+    Department,
+    Faculty,
+    Semester,
+    Speciality,
+    Student,
+)
+from rating_app.tests.factories import (
+    CourseFactory,
+    DepartmentFactory,
+    FacultyFactory,
+    StudentFactory,
+)
+from scraper.ioc_container.common import course_db_injector
+from scraper.models.deduplicated import CourseTypeKind
+from scraper.services.db_ingestion.identity_map import IngestionIdentityMap
+from scraper.services.db_ingestion.test_bulk_injector import _student_enrollment
+from scraper.services.db_ingestion.test_injector import (
+    create_mock_course,
+    create_mock_offering,
+    create_mock_spec,
+)
+
+_LOOKUP_MODELS = (Faculty, Department, Speciality, Semester, Course, Student, CourseOffering)
+
+
+def _selects_by_table(queries: CaptureQueriesContext) -> Counter[str]:
+    return Counter(
+        match.group(1)
+        for query in queries.captured_queries
+        if (match := re.match(r'SELECT .*? FROM "(\w+)"', query["sql"]))
+    )
+
+
+def _catalog() -> list:
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    return [
+        create_mock_course(
+            title=f"Course {index}",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code=f"C{index:05d}",
+                    specialities=[spec_x],
+                    enrollments=[_student_enrollment("Ivan"), _student_enrollment("Olena")],
+                )
+            ],
+        )
+        for index in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_load_reads_each_table_once(django_assert_num_queries):
+    # Arrange
+    faculty = FacultyFactory(name="Fac")
+    department = DepartmentFactory(name="Dept", faculty=faculty)
+    course = CourseFactory(title="Course A", department=department)
+    student = StudentFactory(first_name="Ivan", last_name="Shevchenko", email="ivan@ukma.edu.ua")
+    identity_map = IngestionIdentityMap()
+
+    # Act
+    with django_assert_num_queries(len(_LOOKUP_MODELS)):
+        identity_map.load()
+
+    # Assert
+    assert identity_map.faculties["Fac"] == faculty
+    assert identity_map.departments[("Dept", "Fac")] == department
+    assert identity_map.specialities[student.speciality.name] == student.speciality
+    assert course in identity_map.course_candidates([_course_input(course)])
+    assert [student] == identity_map.student_candidates([_student_input(student)])
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_rerun_resolves_existing_rows_from_the_preloaded_map():
+    # Arrange
+    FacultyFactory(name="Fac")
+    course_db_injector().execute(_catalog())
+    # an identical catalog would otherwise be skipped by change detection
+    injector = course_db_injector(skip_unchanged=False)
+
+    # Act
+    with CaptureQueriesContext(connection) as queries:
+        injector.execute(_catalog())
+
+    # Assert
+    selects = _selects_by_table(queries)
+    # offerings are still read by update_or_create, which is the write itself
+    for model in (Faculty, Department, Speciality, Semester, Course, Student):
+        assert selects[model._meta.db_table] == 1, model.__name__
+    assert Course.objects.count() == 5
+    assert Student.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_index_students_follows_email_changes():
+    # Arrange
+    student = StudentFactory(first_name="Ivan", last_name="Shevchenko", email="")
+    identity_map = IngestionIdentityMap()
+    identity_map.index_students([student])
+
+    # Act
+    student.email = "ivan@ukma.edu.ua"
+    student.first_name = "Ivanna"
+    identity_map.index_students([student])
+
+    # Assert
+    assert identity_map.student_candidates([_student_input(student)]) == [student]
+    old_name = _student_input(student, first_name="Ivan", email="")
+    assert identity_map.student_candidates([old_name]) == []
+
+
+def _course_input(course: Course) -> CourseInput:
+    return CourseInput(
+        title=course.title,
+        description="",
+        status=course.status,
+        education_level=None,
+        department=str(course.department_id),
+        department_name="",
+        faculty="",
+        faculty_name="",
+    )
+
+
+def _student_input(student: Student, **overrides) -> StudentInput:
+    values = {
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "patronymic": student.patronymic,
+        "education_level": student.education_level,
+        "speciality_id": student.speciality_id,
+        "email": student.email,
+        "program_start_academic_year_start": None,
+    }
+    return StudentInput(**{**values, **overrides})
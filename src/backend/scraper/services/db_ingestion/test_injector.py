@@ -21,6 +21,7 @@ from scraper.models.deduplicated import (
     PracticeType,
     SemesterTerm,
 )
+from scraper.services.db_ingestion.ingestion_run import IngestionRun
 from scraper.services.db_ingestion.injector import CourseDbInjector
 
 faker = Faker()
@@ -541,6 +542,59 @@ def test_injector_invalidates_cache_after_successful_execution(injector, repo_mo
     repo_mocks.cache_manager.invalidate_pattern.assert_any_call("*get_filter_options*")
 
 
+@pytest.mark.django_db
+def test_injector_bumps_enrollments_and_reference_data_after_commit(
+    injector, repo_mocks, django_capture_on_commit_callbacks
+):
+    # Arrange
+    models = create_mock_payload()
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True):
+        injector.execute(models)
+        repo_mocks.cache_manager.bump_version.assert_not_called()
+
+    # Assert
+    bumped = [call.args[0] for call in repo_mocks.cache_manager.bump_version.call_args_list]
+    assert bumped == [f"enrollments:student:{repo_mocks.student.id}", "reference-data"]
+
+
+@pytest.mark.django_db
+def test_injector_defers_side_effects_to_the_end_of_a_run(
+    injector, repo_mocks, django_capture_on_commit_callbacks
+):
+    # Arrange
+    run = IngestionRun("run-1")
+    injector.begin_run(run)
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True):
+        injector.execute(create_mock_payload())
+        injector.execute(create_mock_payload())
+        repo_mocks.cache_manager.invalidate_pattern.assert_not_called()
+        repo_mocks.cache_manager.bump_version.assert_not_called()
+        summary = injector.finish_run()
+
+    # Assert
+    assert summary.run_id == "run-1"
+    assert (summary.batches, summary.processed_courses, summary.invalidated_students) == (2, 2, 1)
+    assert repo_mocks.cache_manager.invalidate_pattern.call_count == 3
+    bumped = [call.args[0] for call in repo_mocks.cache_manager.bump_version.call_args_list]
+    assert bumped == [
+        f"enrollments:student:{repo_mocks.student.id}",
+        "reference-data",
+        "courses:list",
+        "analytics:list",
+        "courses:filter-options",
+    ]
+
+
+def test_injector_finish_run_without_begin_raises(injector):
+    # Act & Assert
+    with pytest.raises(RuntimeError):
+        injector.finish_run()
+
+
 @pytest.mark.django_db
 def test_injector_logs_warning_when_type_kind_is_none(injector, repo_mocks):
     # Arrange
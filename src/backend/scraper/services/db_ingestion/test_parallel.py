@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+
+from rating_app.models import Course, Enrollment, Student
+from rating_app.tests.factories import FacultyFactory
+from scraper.ioc_container.common import course_file_reader, parallel_course_db_injector
+from scraper.models.deduplicated import CourseTypeKind
+from scraper.services.db_ingestion.parallel import (
+    ParallelCoursesIngestion,
+    _ingest_partition,
+    _PartitionTask,
+    partition_of,
+)
+from scraper.services.db_ingestion.progress_tracker import InjectionProgressSummary
+from scraper.services.db_ingestion.test_bulk_injector import _student_enrollment
+from scraper.services.db_ingestion.test_injector import (
+    create_mock_course,
+    create_mock_offering,
+    create_mock_spec,
+)
+
+
+def _write_catalog(path: Path) -> Path:
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    courses = [
+        create_mock_course(
+            title=f"Course {index}",
+            department=f"Dept {index % 3}",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code=f"C{index:05d}",
+                    specialities=[spec_x],
+                    # the same students enrol in every department
+                    enrollments=[
+                        _student_enrollment("Ivan", program_start=2020 + index),
+                        _student_enrollment("Olena", email="olena@ukma.edu.ua"),
+                    ],
+                )
+            ],
+        )
+        for index in range(9)
+    ]
+    file_path = path / "courses.jsonl"
+    file_path.write_text("".join(course.model_dump_json() + "\n" for course in courses))
+    return file_path
+
+
+def test_partition_keeps_departments_together():
+    # Arrange
+    courses = [
+        create_mock_course(title=f"Course {index}", department=f"Dept {index % 4}")
+        for index in range(20)
+    ]
+
+    # Act
+    partitions = {(course.department, partition_of(course, 3)) for course in courses}
+
+    # Assert
+    assert len(partitions) == 4
+    assert all(0 <= partition < 3 for _, partition in partitions)
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_partitions_write_disjoint_departments_with_shared_students(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    file_path = _write_catalog(tmp_path)
+    ingestion = ParallelCoursesIngestion(
+        course_file_reader(), parallel_course_db_injector(), parallel_course_db_injector, 2
+    )
+    student_ids = ingestion._resolve_shared(file_path, batch_size=4)
+    tasks = [
+        _PartitionTask(
+            file_path=file_path,
+            batch_size=4,
+            partition=partition,
+            workers=2,
+            file_reader=course_file_reader(),
+            injector_factory=parallel_course_db_injector,
+            student_ids=student_ids,
+            run_id="run",
+        )
+        for partition in range(2)
+    ]
+
+    # Act
+    summaries = [_ingest_partition(task)[0] for task in tasks]
+
+    # Assert
+    total = sum(summaries, InjectionProgressSummary())
+    assert total.processed_courses == 9
+    assert total.failed_batches == 0
+    assert Course.objects.count() == 9
+    assert Student.objects.count() == 2
+    assert Student.objects.get(first_name="Ivan").program_start_academic_year_start == 2020
+    assert Enrollment.objects.count() == 18
+
+
+def test_progress_summaries_add_up():
+    # Arrange
+    first = InjectionProgressSummary(processed_courses=5, completed_batches=1)
+    second = InjectionProgressSummary(processed_courses=3, completed_batches=1, failed_batches=1)
+
+    # Act
+    total = sum([first, second], InjectionProgressSummary())
+
+    # Assert
+    assert total == InjectionProgressSummary(
+        processed_courses=8, completed_batches=2, failed_batches=1
+    )
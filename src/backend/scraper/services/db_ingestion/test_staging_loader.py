@@ -0,0 +1,126 @@
+from django.db import transaction
+
+import pytest
+
+from rating_app.application_schemas.ingestion import UpsertCounts
+from rating_app.models import CourseOffering, Enrollment
+from rating_app.tests.factories import FacultyFactory
+from scraper.ioc_container.common import (
+    course_db_injector,
+    courses_ingestion,
+    staging_course_db_injector,
+)
+from scraper.models.deduplicated import CourseTypeKind
+from scraper.services.db_ingestion.staging_loader import StagedCoursesIngestion
+from scraper.services.db_ingestion.test_bulk_injector import (
+    _arrange_existing_state,
+    _first_batch,
+    _second_batch,
+    _snapshot,
+    _student_enrollment,
+)
+from scraper.services.db_ingestion.test_injector import (
+    create_mock_course,
+    create_mock_offering,
+    create_mock_spec,
+)
+
+
+def _ingest_row_by_row() -> dict[str, list[tuple]]:
+    with transaction.atomic():
+        _arrange_existing_state()
+        injector = course_db_injector()
+        injector.execute(_first_batch())
+        injector.execute(_second_batch())
+        snapshot = _snapshot()
+        transaction.set_rollback(True)
+    return snapshot
+
+
+def _ingest_staged() -> tuple[dict[str, list[tuple]], dict[str, UpsertCounts]]:
+    with transaction.atomic():
+        _arrange_existing_state()
+        injector = staging_course_db_injector()
+        injector.open_staging()
+        injector.execute(_first_batch())
+        injector.execute(_second_batch())
+        counts = injector.merge_staged()
+        snapshot = _snapshot()
+        transaction.set_rollback(True)
+    return snapshot, counts
+
+
+def _catalog(credits: float) -> list:
+    spec_x = create_mock_spec("SpecX", "Fac", CourseTypeKind.COMPULSORY)
+    return [
+        create_mock_course(
+            title="Course A",
+            specialities=[spec_x],
+            offerings=[
+                create_mock_offering(
+                    code="AAA111",
+                    specialities=[spec_x],
+                    enrollments=[_student_enrollment("Ivan")],
+                ),
+                create_mock_offering(code="AAA222", credits=credits),
+            ],
+        )
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_staged_load_ends_in_same_state_as_row_injector():
+    # Arrange
+    expected = _ingest_row_by_row()
+
+    # Act
+    actual, counts = _ingest_staged()
+
+    # Assert
+    assert actual == expected
+    assert counts["offerings"] == UpsertCounts(inserted=3)
+    assert counts["courses"] == UpsertCounts(inserted=1, updated=1)
+    assert counts["enrollments"].inserted == len(expected["enrollments"])
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+def test_staged_ingestion_reports_inserted_updated_and_unchanged(tmp_path):
+    # Arrange
+    FacultyFactory(name="Fac")
+    injector = staging_course_db_injector()
+    with transaction.atomic():
+        injector.open_staging()
+        injector.execute(_catalog(credits=3.0))
+        injector.merge_staged()
+
+    catalog = _catalog(credits=4.0)
+    catalog[0].offerings.append(create_mock_offering(code="AAA333"))
+    file_path = tmp_path / "courses.jsonl"
+    file_path.write_text("".join(course.model_dump_json() + "\n" for course in catalog))
+    # forced, so that the unchanged offering reaches the merge instead of being skipped
+    ingestion = courses_ingestion(staged=True, force=True)
+    assert isinstance(ingestion, StagedCoursesIngestion)
+
+    # Act
+    ingestion.execute(file_path=file_path, batch_size=1)
+
+    # Assert
+    counts = ingestion.last_counts
+    assert counts["offerings"] == UpsertCounts(inserted=1, updated=1, unchanged=1)
+    assert counts["enrollments"] == UpsertCounts(unchanged=1)
+    assert counts["students"] == UpsertCounts(unchanged=1)
+    assert CourseOffering.objects.get(code="AAA222").credits == 4
+    assert Enrollment.objects.count() == 1
+    assert ingestion.last_run is not None
+    assert (ingestion.last_run.batches, ingestion.last_run.processed_courses) == (1, 1)
+
+
+def test_merge_without_open_staging_raises():
+    # Arrange
+    injector = staging_course_db_injector()
+
+    # Act & Assert
+    with pytest.raises(RuntimeError):
+        injector.merge_staged()
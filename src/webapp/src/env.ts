@@ -12,6 +12,9 @@ const rawEnv = createEnv({
 
 	client: {
 		VITE_API_BASE_URL: z.url().default("http://localhost:8000"),
+		// the ASGI service behind /api/v1/notifications/stream/, when not proxied
+		// under VITE_API_BASE_URL (local development)
+		VITE_NOTIFICATION_STREAM_URL: z.url().optional(),
 		VITE_SENTRY_DSN_FRONTEND: z.string().optional(),
 		VITE_ENVIRONMENT: z
 			.enum(["development", "staging", "live"])
@@ -0,0 +1,81 @@
+import { QueryClient } from "@tanstack/react-query";
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+
+import { getNotificationsUnreadCountRetrieveQueryKey } from "@/lib/api/generated";
+import {
+	isUnreadCountStreamOpen,
+	joinUnreadCountStream,
+} from "./unreadCountStream";
+
+class FakeEventSource {
+	static instances: FakeEventSource[] = [];
+
+	onopen: (() => void) | null = null;
+	onerror: (() => void) | null = null;
+	close = vi.fn();
+	private listeners = new Map<string, (event: MessageEvent) => void>();
+
+	constructor(
+		public url: string,
+		public init?: EventSourceInit,
+	) {
+		FakeEventSource.instances.push(this);
+	}
+
+	addEventListener(type: string, listener: (event: MessageEvent) => void) {
+		this.listeners.set(type, listener);
+	}
+
+	emit(type: string, data: unknown) {
+		this.listeners.get(type)?.({ data: JSON.stringify(data) } as MessageEvent);
+	}
+}
+
+describe("unreadCountStream", () => {
+	let queryClient: QueryClient;
+
+	beforeEach(() => {
+		FakeEventSource.instances = [];
+		vi.stubGlobal("EventSource", FakeEventSource);
+		queryClient = new QueryClient();
+	});
+
+	afterEach(() => {
+		vi.unstubAllGlobals();
+	});
+
+	it("should share one connection and cache pushed counts", () => {
+		const leaveFirst = joinUnreadCountStream(queryClient);
+		const leaveSecond = joinUnreadCountStream(queryClient);
+
+		expect(FakeEventSource.instances).toHaveLength(1);
+		const [source] = FakeEventSource.instances;
+		expect(source.url).toContain("/api/v1/notifications/stream/");
+		expect(source.init).toEqual({ withCredentials: true });
+
+		source.emit("unread_count", { count: 4 });
+		expect(
+			queryClient.getQueryData(getNotificationsUnreadCountRetrieveQueryKey()),
+		).toEqual({ count: 4 });
+
+		leaveFirst();
+		expect(source.close).not.toHaveBeenCalled();
+		leaveSecond();
+		expect(source.close).toHaveBeenCalledOnce();
+	});
+
+	it("should report whether the stream is open so polling can stand in", () => {
+		const leave = joinUnreadCountStream(queryClient);
+		const [source] = FakeEventSource.instances;
+
+		expect(isUnreadCountStreamOpen()).toBe(false);
+		source.onopen?.();
+		expect(isUnreadCountStreamOpen()).toBe(true);
+		source.onerror?.();
+		expect(isUnreadCountStreamOpen()).toBe(false);
+
+		source.onopen?.();
+		leave();
+		expect(isUnreadCountStreamOpen()).toBe(false);
+	});
+});
@@ -0,0 +1,64 @@
+import type { QueryClient } from "@tanstack/react-query";
+
+import { env } from "@/env";
+import type { UnreadCount } from "@/lib/api/generated";
+import { getNotificationsUnreadCountRetrieveQueryKey } from "@/lib/api/generated";
+
+const STREAM_URL =
+	env.VITE_NOTIFICATION_STREAM_URL ??
+	`${env.VITE_API_BASE_URL}/api/v1/notifications/stream/`;
+
+// one connection is shared by every component that shows the unread count
+let source: EventSource | null = null;
+let subscribers = 0;
+let isOpen = false;
+const statusListeners = new Set<() => void>();
+
+function setOpen(open: boolean) {
+	if (isOpen === open) return;
+	isOpen = open;
+	for (const listener of statusListeners) listener();
+}
+
+/**
+ * Joins the unread-count event stream, opening it for the first subscriber.
+ * Pushed counts are written into the unread-count query cache. Returns a
+ * function that leaves the stream and closes it after the last subscriber.
+ */
+export function joinUnreadCountStream(queryClient: QueryClient): () => void {
+	subscribers += 1;
+	if (!source && typeof EventSource !== "undefined") {
+		const stream = new EventSource(STREAM_URL, { withCredentials: true });
+		stream.onopen = () => setOpen(true);
+		// the browser reconnects on its own; a refused stream stays closed
+		stream.onerror = () => setOpen(false);
+		stream.addEventListener("unread_count", (event) => {
+			const data = JSON.parse(event.data) as UnreadCount;
+			queryClient.setQueryData(
+				getNotificationsUnreadCountRetrieveQueryKey(),
+				data,
+			);
+		});
+		source = stream;
+	}
+
+	return () => {
+		subscribers -= 1;
+		if (subscribers === 0 && source) {
+			source.close();
+			source = null;
+			setOpen(false);
+		}
+	};
+}
+
+export function subscribeToUnreadCountStreamStatus(listener: () => void) {
+	statusListeners.add(listener);
+	return () => {
+		statusListeners.delete(listener);
+	};
+}
+
+export function isUnreadCountStreamOpen() {
+	return isOpen;
+}
@@ -1,4 +1,4 @@
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useState, useSyncExternalStore } from "react";
 
 import { useQueryClient } from "@tanstack/react-query";
 
@@ -13,6 +13,11 @@ import {
 	useNotificationsUnreadCountRetrieve,
 } from "@/lib/api/generated";
 import { useAuth } from "@/lib/auth";
+import {
+	isUnreadCountStreamOpen,
+	joinUnreadCountStream,
+	subscribeToUnreadCountStreamStatus,
+} from "./unreadCountStream";
 
 const UNREAD_COUNT_POLL_INTERVAL = 30_000;
 const PAGE_SIZE = 20;
@@ -20,16 +25,32 @@ const PAGE_SIZE = 20;
 export function useUnreadCount() {
 	const { status } = useAuth();
 	const isAuthenticated = status === "authenticated";
+	const isStreaming = useUnreadCountStream(isAuthenticated);
 
 	return useNotificationsUnreadCountRetrieve({
 		query: {
 			enabled: isAuthenticated,
-			refetchInterval: UNREAD_COUNT_POLL_INTERVAL,
+			// the stream pushes every change; poll only while it is down
+			refetchInterval: isStreaming ? false : UNREAD_COUNT_POLL_INTERVAL,
 			staleTime: UNREAD_COUNT_POLL_INTERVAL,
 		},
 	});
 }
 
+function useUnreadCountStream(enabled: boolean) {
+	const queryClient = useQueryClient();
+
+	useEffect(() => {
+		if (!enabled) return;
+		return joinUnreadCountStream(queryClient);
+	}, [enabled, queryClient]);
+
+	return useSyncExternalStore(
+		subscribeToUnreadCountStreamStatus,
+		isUnreadCountStreamOpen,
+	);
+}
+
 export function useNotifications() {
 	const { data, isLoading, isError, refetch, isRefetching } =
 		useNotificationsList({ limit: PAGE_SIZE, offset: 0 });